@@ -53,6 +53,8 @@ setup(
     package_data={
         # If any package contains *.md or *.rst ...  files, include them:
         '': ['*.md', '*.rst', "*.txt", "*.cfg"],
+        # client-side summary renderer served by webapp/EntityWebApp.py
+        'wwpdb.apps.entity_transform.webapp': ['*.js'],
     },
     #
     # These basic tests require no database services -
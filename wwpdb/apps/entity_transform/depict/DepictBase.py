@@ -2,6 +2,8 @@
 # File:  DepictBase.py
 # Date:  22-Jan-2018
 # Updates:
+#  19-Oct-2026  zf   count and time template rendering in request metrics
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
 ##
 """
 Base depiction class
@@ -25,6 +27,9 @@ import os
 import sys
 import inspect
 
+from wwpdb.apps.entity_transform.utils import MetricsUtil
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+
 
 class DepictBase(object):
     """ Base depiction class
@@ -69,16 +74,19 @@ class DepictBase(object):
             parameterDict = {}
         tPath = self._reqObj.getValue("TemplatePath")
         fPath = os.path.join(tPath, fn)
-        ifh = open(fPath, 'r')
-        sIn = ifh.read()
-        ifh.close()
-        return (sIn % parameterDict)
+        with MetricsUtil.timer('template_render'):
+            MetricsUtil.addCount('file_read')
+            ifh = open(fPath, 'r')
+            sIn = ifh.read()
+            ifh.close()
+            return (sIn % parameterDict)
+        #
 
     def __getSession(self):
         """ Join existing session or create new session as required.
         """
         #
-        self._sObj = self._reqObj.newSessionObj()
+        self._sObj = getRequestContext(self._reqObj).getSessionObj()
         self._sessionId = self._sObj.getId()
         self._sessionPath = self._sObj.getPath()
         self._rltvSessionPath = self._sObj.getRelativePath()
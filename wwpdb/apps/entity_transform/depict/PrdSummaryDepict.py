@@ -6,6 +6,9 @@
 #                       Unknown CCD ID covalently linked to a polymer residue, or in the polymer sequence
 #                       Existing CCD ID without PCM data covalently linked to a polymer residue, or in the polymer sequence
 #                       CCD ID that should be not used as PCM/PTM observed  covalently linked to a polymer residue, or in the polymer sequence
+# 19-Oct-2026  zf   add getSummaryData() returning summary tree as compact dictionary for client-side rendering
+# 19-Oct-2026  zf   look up 2D images in search image manifest, show ligand thumbnails and lazy-load full size image
+#                   when list is expanded
 ##
 """
 Create HTML depiction for PRD search summary.
@@ -30,6 +33,7 @@ import sys
 
 from wwpdb.apps.entity_transform.depict.DepictBase import DepictBase
 from wwpdb.apps.entity_transform.depict.ProcessPrdSummary import ProcessPrdSummary
+from wwpdb.apps.entity_transform.utils.ImageManifest import ImageManifest
 
 
 class PrdSummaryDepict(DepictBase):
@@ -44,18 +48,12 @@ class PrdSummaryDepict(DepictBase):
         self.__combResidueFlag = False
         self.__splitPolymerResidueFlag = False
         self.__pcmLabelList = []
+        self.__imageManifest = None
 
     def DoRenderSummaryPage(self, imageFlag=True):
         """
         """
-        prdUtil = ProcessPrdSummary(reqObj=self._reqObj, summaryCifObj=self._cifObj, verbose=self._verbose, log=self._lfh)
-        prdUtil.run(imageFlag)
-        self.__data = prdUtil.getPrdData()
-        self.__matchResultFlag = prdUtil.getMatchResultFlag()
-        self.__graphmatchResultFlag = prdUtil.getGraphmatchResultFlag()
-        self.__combResidueFlag = prdUtil.getCombResidueFlag()
-        self.__splitPolymerResidueFlag = prdUtil.getSplitPolymerResidueFlag()
-        self.__pcmLabelList = prdUtil.getPcmLabelList()
+        self.__readSummary(imageFlag)
         #
         input_data = 'sessionid=' + self._sessionId + '&identifier=' + self._identifier + '&pdbid=' + self._pdbId
         #
@@ -104,6 +102,80 @@ class PrdSummaryDepict(DepictBase):
         #
         return text
 
+    def getSummaryData(self, imageFlag=False):
+        """ Return the summary tree depicted by DoRenderSummaryPage() as dictionary (rendered by client):
+
+                {"type": "prd_summary", "version": 1, "sessionid": ..., "identifier": ..., "pdbid": ..., "session_url": ...,
+                 "row_fields": [...], "tree": [node, ...], "flags": {...}, "pcm_labels": [...]}
+
+            A node has "id", "text", "open" (1 if expanded) and either "list" (child nodes) or "residues" with
+            instance "rows" (values in "row_fields" order, "message" only for not connected instances), "image" and
+            "thumbnail"/"thumbnail_size" (if a thumbnail is available).
+        """
+        self.__readSummary(imageFlag)
+        #
+        myD = {}
+        myD['type'] = 'prd_summary'
+        myD['version'] = 1
+        myD['sessionid'] = self._sessionId
+        myD['identifier'] = self._identifier
+        myD['pdbid'] = self._pdbId
+        myD['session_url'] = self._rltvSessionPath
+        myD['row_fields'] = ['id', 'label', 'focus', 'linked', 'has_2d', 'matched', 'message']
+        myD['tree'] = self.__getTreeData(self.__data)
+        myD['flags'] = {'match_result': bool(self.__matchResultFlag), 'graph_match': bool(self.__graphmatchResultFlag),
+                        'comb_residue': bool(self.__combResidueFlag), 'split_polymer_residue': bool(self.__splitPolymerResidueFlag)}
+        myD['pcm_labels'] = self.__pcmLabelList
+        return myD
+
+    def __readSummary(self, imageFlag):
+        prdUtil = ProcessPrdSummary(reqObj=self._reqObj, summaryCifObj=self._cifObj, verbose=self._verbose, log=self._lfh)
+        prdUtil.run(imageFlag)
+        self.__data = prdUtil.getPrdData()
+        self.__matchResultFlag = prdUtil.getMatchResultFlag()
+        self.__graphmatchResultFlag = prdUtil.getGraphmatchResultFlag()
+        self.__combResidueFlag = prdUtil.getCombResidueFlag()
+        self.__splitPolymerResidueFlag = prdUtil.getSplitPolymerResidueFlag()
+        self.__pcmLabelList = prdUtil.getPcmLabelList()
+
+    def __getTreeData(self, datalist):
+        """ Compact copy of summary tree (see getSummaryData)
+        """
+        nodeList = []
+        if not datalist:
+            return nodeList
+        #
+        for d in datalist:
+            node = {'id': d.get('id', ''), 'text': d.get('text', '')}
+            if d.get('display', '') == 'block':
+                node['open'] = 1
+            #
+            if 'list_text' in d:
+                node['residues'] = d['list_text']
+                if 'list' in d:
+                    node['rows'] = [self.__getRowData(row) for row in d['list']]
+                    if 'list_image_key' in d:
+                        imageD = self.__get2DLigandImage(d['list_image_key'], d['list'])
+                        if imageD:
+                            node.update(imageD)
+                        #
+                    #
+                #
+            elif 'list' in d:
+                node['list'] = self.__getTreeData(d['list'])
+            #
+            nodeList.append(node)
+        #
+        return nodeList
+
+    def __getRowData(self, d):
+        linked = d['linkage_info'] == 'linked'
+        row = [d['id'], d['label'], d['focus'], int(linked), int(self.__has2D_Image(d['id'], d['label'])), int(d['id'] in self.__matchResultFlag)]
+        if (not linked) and ('message' in d):
+            row.append(d['message'])
+        #
+        return row
+
     def __depiction(self, datalist):
         """
         """
@@ -125,7 +197,8 @@ class PrdSummaryDepict(DepictBase):
                 if 'list' in d:
                     list_text += self.__depictInstanceTable(d['list'])
                     if 'list_image_key' in d:
-                        myD['image2d'] = self.__depict2DLigandImage(d['list_image_key'], d['list'])
+                        myD['image2d'], fullImage = self.__depict2DLigandImage(d['list_image_key'], d['list'])
+                        list_text = fullImage + list_text
                     #
                 #
                 myD['list'] = list_text
@@ -177,39 +250,51 @@ class PrdSummaryDepict(DepictBase):
         return text
 
     def __depict2DLigandImage(self, key, datalist):
+        """ Return (list header image, full size image shown when list is expanded). The header shows the thumbnail
+            when there is one; the full size image is then loaded by the browser only once the list is displayed.
         """
+        imageD = self.__get2DLigandImage(key, datalist)
+        if not imageD:
+            return "", ""
+        #
+        myD = {}
+        myD["2dpath"] = imageD.get("thumbnail", imageD["image"])
+        if "thumbnail" not in imageD:
+            return self._processTemplate("summary_view/ligand_2D_view_tmplt.html", myD), ""
+        #
+        fullImage = '<li><img src="' + imageD["image"] + '" loading="lazy" alt="' + key + '" /></li>\n'
+        return self._processTemplate("summary_view/ligand_2D_view_tmplt.html", myD), fullImage
+
+    def __get2DLigandImage(self, key, datalist):
+        """ Return {"image": path, "thumbnail": path, "thumbnail_size": [width, height]} (session relative paths) of first
+            2D ligand image found for instances in datalist, {} if there is none
         """
         if not datalist:
-            return ""
+            return {}
         #
+        manifest = self.__getImageManifest()
         for d in datalist:
-            imagePath = os.path.join(self._sessionPath, "search", d["id"], key + "-200.gif")
-            if os.access(imagePath, os.F_OK):
-                myD = {}
-                myD["2dpath"] = os.path.join(self._rltvSessionPath, "search", d["id"], key + "-200.gif")
-                return self._processTemplate("summary_view/ligand_2D_view_tmplt.html", myD)
+            record = manifest.getLigandImage(d["id"], key)
+            if not record:
+                continue
             #
-            imagePath = os.path.join(self._sessionPath, "search", d["id"], key + "-200.png")
-            if os.access(imagePath, os.F_OK):
-                myD = {}
-                myD["2dpath"] = os.path.join(self._rltvSessionPath, "search", d["id"], key + "-200.png")
-                return self._processTemplate("summary_view/ligand_2D_view_tmplt.html", myD)
+            imageD = {}
+            imageD["image"] = os.path.join(self._rltvSessionPath, "search", d["id"], record["file"])
+            if "thumbnail" in record:
+                imageD["thumbnail"] = os.path.join(self._rltvSessionPath, "search", d["id"], record["thumbnail"])
+                imageD["thumbnail_size"] = record["thumbnail_size"]
             #
+            return imageD
         #
-        return ""
+        return {}
 
     def __has2D_Image(self, instanceid, label):
         """
         """
-        imagePath = os.path.join(self._sessionPath, 'search', instanceid, label + '.gif')
-        if not os.access(imagePath, os.F_OK):
-            imagePath = os.path.join(self._sessionPath, 'search', instanceid, label + '.png')
-            if not os.access(imagePath, os.F_OK):
-                return False
-            #
-        #
-        statinfo = os.stat(imagePath)
-        if statinfo.st_size == 0:
-            return False
+        return self.__getImageManifest().getImage(instanceid, label) is not None
+
+    def __getImageManifest(self):
+        if self.__imageManifest is None:
+            self.__imageManifest = ImageManifest(searchPath=os.path.join(self._sessionPath, "search"), verbose=self._verbose, log=self._lfh)
         #
-        return True
+        return self.__imageManifest
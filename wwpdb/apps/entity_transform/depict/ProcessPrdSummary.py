@@ -4,6 +4,7 @@
 # Updates:
 #  25-Aug-2024  zf   add getPcmLabelList()
 #                    change the default 'red' color code to different color codes read from '_pdbx_non_polymer_info.highlight_with_color' item
+#  19-Oct-2026  zf   add setImageNumProc() and getImageCount() for batch pre-computation
 ##
 """
 Process PRD search results and generate images.
@@ -47,6 +48,7 @@ class ProcessPrdSummary(object):
                           'polysaccharide(D)' : 'Sugar', 'polysaccharide(L)' : 'Sugar'}
         #
         self.__topDirPath = None
+        self.__imageNumProc = None
         self.__image_data = []
         #
         self.__data = []
@@ -62,6 +64,11 @@ class ProcessPrdSummary(object):
     def setTopDirPath(self, topPath):
         self.__topDirPath = topPath
 
+    def setImageNumProc(self, numProc):
+        """ Set number of processes used to generate images (default: half of the CPUs)
+        """
+        self.__imageNumProc = numProc
+
     def setPrdSummaryFile(self, summaryfilePath):
         self.__cifObj = SummaryCifUtil(summaryFile=summaryfilePath, verbose=self.__verbose, log=self.__lfh)
 
@@ -122,6 +129,11 @@ class ProcessPrdSummary(object):
     def getPcmLabelList(self):
         return self.__pcmLabelList
 
+    def getImageCount(self):
+        """ Return number of instances images were generated for
+        """
+        return len(self.__image_data)
+
     def __readEntityData(self):
         elist = self.__cifObj.getValueList("pdbx_entity_info")
         if not elist:
@@ -507,6 +519,9 @@ class ProcessPrdSummary(object):
         if self.__topDirPath:
             iGenerator.setSessionPath(path=self.__topDirPath)
         #
+        if self.__imageNumProc:
+            iGenerator.setNumProc(self.__imageNumProc)
+        #
         iGenerator.run(self.__image_data)
 
     def __processingOneLetterSeq(self, input_seq, colorResMap):
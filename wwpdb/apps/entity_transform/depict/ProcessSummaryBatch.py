@@ -0,0 +1,193 @@
+##
+# File:  ProcessSummaryBatch.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   rewrite image manifest of every processed entry (an old manifest marked it outdated forever)
+##
+"""
+Batch pre-computation of PRD search result images for many depositions (see ProcessSummary_main.py).
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+
+from wwpdb.apps.entity_transform.utils.ImageManifest import ImageManifest, MANIFEST_FILE_NAME
+
+# request values of the worker process (set once by _initWorker)
+_workerReqD = {}
+
+
+def _initWorker(reqD):
+    """ Pool initializer: configuration and imports are paid once per worker process, not once per entry
+    """
+    _workerReqD.clear()
+    _workerReqD.update(reqD)
+    # imported here so that the parent process does not load the depiction/back-end modules
+    from wwpdb.apps.entity_transform.depict.ProcessPrdSummary import ProcessPrdSummary  # noqa: F401 pylint: disable=import-outside-toplevel,unused-import
+
+
+def _processEntry(entry):
+    """ Generate images and image manifest of one entry (summary file, top directory path). Runs in a worker process.
+    """
+    from wwpdb.apps.entity_transform.depict.ProcessPrdSummary import ProcessPrdSummary  # pylint: disable=import-outside-toplevel
+    from wwpdb.utils.session.WebRequest import InputRequest  # pylint: disable=import-outside-toplevel
+    #
+    summaryFile, dirPath = entry
+    resultD = {'summary_file': summaryFile, 'path': dirPath, 'status': 'processed', 'pid': os.getpid()}
+    start = time.time()
+    try:
+        reqObj = InputRequest({}, verbose=False, log=sys.stderr)
+        for key, value in _workerReqD.items():
+            reqObj.setValue(key, value)
+        #
+        prdUtil = ProcessPrdSummary(reqObj=reqObj, verbose=False, log=sys.stderr)
+        prdUtil.setTopDirPath(dirPath)
+        prdUtil.setPrdSummaryFile(summaryFile)
+        prdUtil.setImageNumProc(1)
+        prdUtil.run()
+        resultD['images'] = prdUtil.getImageCount()
+        #
+        searchPath = os.path.join(dirPath, 'search')
+        if os.path.isdir(searchPath):
+            # the manifest is rewritten even if no image was generated: its mtime marks the entry up to date
+            ImageManifest(searchPath=searchPath, verbose=False, log=sys.stderr).build()
+        #
+    except:  # noqa: E722 pylint: disable=bare-except
+        traceback.print_exc(file=sys.stderr)
+        resultD['status'] = 'failed'
+        resultD['error'] = traceback.format_exc().strip().split('\n')[-1]
+    #
+    resultD['seconds'] = round(time.time() - start, 3)
+    return resultD
+
+
+class ProcessSummaryBatch(object):
+    """ Class responsible for processing the PRD search results of many entries in a process pool.
+
+        An entry is a summary file and the directory holding its search/ results (by default the directory of the
+        summary file). Entries whose search/image_manifest.json is newer than the summary file are skipped. All
+        workers use the same TopSessionPath, so the back-end command result cache (entity_transform_cache) is shared.
+    """
+    def __init__(self, reqD=None, numProc=None, forceFlag=False, verbose=False, log=sys.stderr):
+        """
+         :param `reqD`: request values (TopSessionPath, TopPath, WWPDB_SITE_ID) set on the request object of every entry
+         :param `numProc`: number of worker processes (default: half of the CPUs)
+         :param `forceFlag`: process entries even if their outputs are up to date
+        """
+        self.__reqD = reqD if reqD else {}
+        self.__numProc = numProc or max(1, int(multiprocessing.cpu_count() / 2))
+        self.__forceFlag = forceFlag
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__entryList = []
+        self.__entrySet = set()
+        self.__report = {}
+
+    def addEntry(self, summaryFile, dirPath=None):
+        """ Add entry, dirPath defaults to the directory of summaryFile
+        """
+        summaryFile = os.path.abspath(summaryFile)
+        if not dirPath:
+            dirPath = os.path.dirname(summaryFile)
+        #
+        dirPath = os.path.abspath(dirPath)
+        if (summaryFile, dirPath) in self.__entrySet:
+            return
+        #
+        self.__entrySet.add((summaryFile, dirPath))
+        self.__entryList.append((summaryFile, dirPath))
+
+    def addEntriesFromList(self, listFile):
+        """ Add entries from file with one 'summary_file [dir_path]' per line ('#' starts a comment)
+        """
+        with open(listFile, 'r') as ifh:
+            for line in ifh:
+                fields = line.split('#')[0].split()
+                if fields:
+                    self.addEntry(fields[0], fields[1] if len(fields) > 1 else None)
+                #
+            #
+        #
+
+    def addEntriesFromGlob(self, pattern):
+        """ Add entries for all summary files matching pattern
+        """
+        for summaryFile in sorted(glob.glob(pattern)):
+            self.addEntry(summaryFile)
+        #
+
+    def getEntryCount(self):
+        return len(self.__entryList)
+
+    def run(self):
+        """ Process entries, return timing report dictionary (see getReport)
+        """
+        start = time.time()
+        resultList = []
+        todoList = []
+        for summaryFile, dirPath in self.__entryList:
+            if not os.access(summaryFile, os.F_OK):
+                resultList.append({'summary_file': summaryFile, 'path': dirPath, 'status': 'failed', 'error': 'summary file not found', 'seconds': 0.0})
+            elif (not self.__forceFlag) and self.__isUpToDate(summaryFile, dirPath):
+                resultList.append({'summary_file': summaryFile, 'path': dirPath, 'status': 'skipped', 'seconds': 0.0})
+            else:
+                todoList.append((summaryFile, dirPath))
+            #
+        #
+        if todoList:
+            numProc = min(self.__numProc, len(todoList))
+            with ProcessPoolExecutor(max_workers=numProc, initializer=_initWorker, initargs=(self.__reqD,)) as executor:
+                for resultD in executor.map(_processEntry, todoList):
+                    if self.__verbose:
+                        self.__lfh.write("+ProcessSummaryBatch.run() - %s %s in %.3f s\n" % (resultD['summary_file'], resultD['status'], resultD['seconds']))
+                    #
+                    resultList.append(resultD)
+                #
+            #
+        #
+        self.__report = {'entries': resultList, 'processes': self.__numProc, 'total_seconds': round(time.time() - start, 3)}
+        for status in ('processed', 'skipped', 'failed'):
+            self.__report[status] = len([resultD for resultD in resultList if resultD['status'] == status])
+        #
+        return self.__report
+
+    def getReport(self):
+        """ Return report: {"entries": [{"summary_file", "path", "status" (processed|skipped|failed), "seconds", "images", ...}],
+                            "processed": n, "skipped": n, "failed": n, "processes": n, "total_seconds": ...}
+        """
+        return self.__report
+
+    def writeReport(self, reportFile):
+        with open(reportFile, 'w') as ofh:
+            json.dump(self.__report, ofh, indent=2, sort_keys=True)
+            ofh.write('\n')
+        #
+
+    def __isUpToDate(self, summaryFile, dirPath):
+        manifestPath = os.path.join(dirPath, 'search', MANIFEST_FILE_NAME)
+        try:
+            return os.stat(manifestPath).st_mtime >= os.stat(summaryFile).st_mtime
+        except OSError:
+            return False
+        #
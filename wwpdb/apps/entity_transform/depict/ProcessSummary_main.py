@@ -2,10 +2,19 @@
 # File:  ProcessSummary_main.py
 # Date:  27-Mar-2019
 # Updates:
+#  19-Oct-2026  zf   batch mode (-l list file, -g glob) processing many entries in a process pool
 ##
 """
 Process PRD search results and generate images.
 
+Usage:
+    python ProcessSummary_main.py -i summary_file -p path
+    python ProcessSummary_main.py [-l list_file] [-g 'summary_file_pattern'] [-n processes] [-o report.json] [-f]
+
+In batch mode every entry of the list file ('summary_file [path]' per line) and every file matching the glob pattern
+(path is the directory of the summary file) is processed in a pool of worker processes. Entries whose image manifest is
+newer than the summary file are skipped unless -f is given. A JSON timing report is written with -o.
+
 This software was developed as part of the World Wide Protein Data Bank
 Common Deposition and Annotation System Project
 
@@ -26,23 +35,62 @@ import sys
 import traceback
 
 from wwpdb.apps.entity_transform.depict.ProcessPrdSummary import ProcessPrdSummary
+from wwpdb.apps.entity_transform.depict.ProcessSummaryBatch import ProcessSummaryBatch
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.session.WebRequest import InputRequest
 
 if __name__ == "__main__":
-    opts, args = getopt.getopt(sys.argv[1:], "i:p:", ["input=", "path="])
+    opts, args = getopt.getopt(sys.argv[1:], "i:p:l:g:n:o:f", ["input=", "path=", "list=", "glob=", "processes=", "report=", "force"])
 
     resultFilePath = None
     dirPath = None
+    listFile = None
+    pattern = None
+    numProc = None
+    reportFile = None
+    forceFlag = False
     for opt, arg in opts:
         if opt in ("-i", "--input"):
             resultFilePath = arg
         elif opt in ("-p", "--path"):
             dirPath = arg
+        elif opt in ("-l", "--list"):
+            listFile = arg
+        elif opt in ("-g", "--glob"):
+            pattern = arg
+        elif opt in ("-n", "--processes"):
+            numProc = int(arg)
+        elif opt in ("-o", "--report"):
+            reportFile = arg
+        elif opt in ("-f", "--force"):
+            forceFlag = True
         #
     #
 
-    if resultFilePath and dirPath:
+    if listFile or pattern:
+        try:
+            cI = ConfigInfo()
+            reqD = {}
+            reqD["TopSessionPath"] = cI.get("SITE_WEB_APPS_TOP_SESSIONS_PATH")
+            reqD["TopPath"] = cI.get("SITE_WEB_APPS_TOP_PATH")
+            reqD["WWPDB_SITE_ID"] = cI.get("SITE_PREFIX")
+            batch = ProcessSummaryBatch(reqD=reqD, numProc=numProc, forceFlag=forceFlag, verbose=True, log=sys.stderr)
+            if listFile:
+                batch.addEntriesFromList(listFile)
+            #
+            if pattern:
+                batch.addEntriesFromGlob(pattern)
+            #
+            report = batch.run()
+            sys.stderr.write("ProcessSummary_main: %d entries processed, %d skipped, %d failed in %.1f s\n"
+                             % (report["processed"], report["skipped"], report["failed"], report["total_seconds"]))
+            if reportFile:
+                batch.writeReport(reportFile)
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=sys.stderr)
+        #
+    elif resultFilePath and dirPath:
         try:
             cI = ConfigInfo()
             siteId = cI.get("SITE_PREFIX")
@@ -2,6 +2,10 @@
 # File:  ResultDepict.py
 # Date:  15-Oct-2012
 # Updates:
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
+#  19-Oct-2026  zf   add getResultData() returning search results as compact dictionary for client-side rendering,
+#                    read release status of each CC/PRD once per page
+#  19-Oct-2026  zf   add getReferenceFilePaths() (CC/PRD files whose release status is shown) for page validators
 ##
 """
 Create HTML depiction for PRD search result summary.
@@ -25,8 +29,8 @@ import os
 import sys
 
 from wwpdb.io.file.mmCIFUtil import mmCIFUtil
-from wwpdb.io.locator.ChemRefPathInfo import ChemRefPathInfo
 from wwpdb.apps.entity_transform.depict.DepictBase import DepictBase
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
 #
 
 
@@ -37,10 +41,11 @@ class ResultDepict(DepictBase):
         super(ResultDepict, self).__init__(reqObj=reqObj, summaryCifObj=summaryCifObj, verbose=verbose, log=log)
         #
         self.__siteId = str(self._reqObj.getValue("WWPDB_SITE_ID"))
-        self.__crpi = ChemRefPathInfo(siteId=self.__siteId, verbose=verbose, log=log)
+        self.__crpi = getSiteConfig(self.__siteId).getChemRefPathInfo()
         #
         self.__instIds = self._cifObj.getMatchInstIds()
         self.__matchResults = self._cifObj.getMatchResults()
+        self.__statusD = {}
 
     def getSeqs(self, instId):
         return self._cifObj.getSeq(instId)
@@ -61,6 +66,77 @@ class ResultDepict(DepictBase):
             content += self.__processMatch(instId)
         return content
 
+    def getResultData(self, instId=''):
+        """ Return the search results depicted by DoRenderResultPage() as dictionary (rendered by client):
+
+                {"type": "result", "version": 1, "sessionid": ..., "identifier": ..., "pdbid": ...,
+                 "instances": [{"id": ..., "label": ..., "sequence": ..., "graph": [hit, ...], "sequence_hits": [hit, ...]}, ...],
+                 "status": {ccid/prdid: release status}}
+
+            A hit has "value" and "prdid" and/or "ccid" (and "sequence" for sequence similarity hits). The release
+            status of each CC/PRD appears once in "status" instead of once per hit.
+        """
+        if instId:
+            instIdList = [instId]
+        else:
+            instIdList = [v for v in self.__instIds if not v.startswith('merge')]
+        #
+        instanceList = []
+        statusD = {}
+        for instId in instIdList:
+            if instId not in self.__matchResults:
+                continue
+            #
+            myD = {'id': instId, 'label': self._cifObj.getLabel(instId), 'sequence': self.getSeqs(instId)}
+            for key, dataKey in (('graph', 'graph'), ('sequence', 'sequence_hits')):
+                if key not in self.__matchResults[instId]:
+                    continue
+                #
+                myD[dataKey] = self.__matchResults[instId][key]
+                for d in myD[dataKey]:
+                    for idKey in ('prdid', 'ccid'):
+                        if (idKey in d) and (d[idKey] not in statusD):
+                            statusD[d[idKey]] = self.__getStatus(d[idKey])
+                        #
+                    #
+                #
+            #
+            instanceList.append(myD)
+        #
+        resultD = {}
+        resultD['type'] = 'result'
+        resultD['version'] = 1
+        resultD['sessionid'] = self._sessionId
+        resultD['identifier'] = self._identifier
+        resultD['pdbid'] = self._pdbId
+        resultD['instances'] = instanceList
+        resultD['status'] = statusD
+        return resultD
+
+    def getReferenceFilePaths(self):
+        """ Return paths of the CC/PRD definition files whose release status appears on the result pages
+        """
+        cidSet = set()
+        for dic in self.__matchResults.values():
+            for hlist in dic.values():
+                for d in hlist:
+                    for idKey in ('prdid', 'ccid'):
+                        if idKey in d:
+                            cidSet.add(d[idKey])
+                        #
+                    #
+                #
+            #
+        #
+        pathList = []
+        for cid in sorted(cidSet):
+            sourcefile = self.__getReferenceFilePath(cid)
+            if sourcefile:
+                pathList.append(sourcefile)
+            #
+        #
+        return pathList
+
     def DoRenderUpdatePage(self):
         content = ''
         count = 0
@@ -263,16 +339,26 @@ class ResultDepict(DepictBase):
         return content
 
     def __getStatus(self, cid):
-        sourcefile = ''
+        if cid not in self.__statusD:
+            self.__statusD[cid] = self.__readStatus(cid)
+        #
+        return self.__statusD[cid]
+
+    def __getReferenceFilePath(self, cid):
+        if cid[:4] == 'PRD_':
+            return self.__crpi.getFilePath(cid, "PRD")
+        #
+        return self.__crpi.getFilePath(cid, "CC")
+
+    def __readStatus(self, cid):
+        sourcefile = self.__getReferenceFilePath(cid)
         category = ''
         item = ''
 
         if cid[:4] == 'PRD_':
-            sourcefile = self.__crpi.getFilePath(cid, "PRD")
             category = 'pdbx_reference_molecule'
             item = 'release_status'
         else:
-            sourcefile = self.__crpi.getFilePath(cid, "CC")
             category = 'chem_comp'
             item = 'pdbx_release_status'
         #
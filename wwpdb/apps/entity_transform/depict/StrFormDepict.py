@@ -2,6 +2,8 @@
 # File:  StrFormDepict.py
 # Date:  02-Dec-2012
 # Updates:
+#  19-Oct-2026  zf   take chopper workspace from ChopperPrepUtil (prepared in background when available)
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
 ##
 """
 Create HTML depiction for various merge/split scenarios
@@ -26,8 +28,8 @@ import sys
 
 from wwpdb.apps.entity_transform.depict.DepictBase import DepictBase
 from wwpdb.apps.entity_transform.depict.SeqDepict import SeqDepict
-from wwpdb.apps.entity_transform.update.CombineCoord import CombineCoord
-from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from wwpdb.apps.entity_transform.update.ChopperPrepUtil import ChopperPrepUtil
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
 #
 
 
@@ -38,7 +40,7 @@ class StrFormDepict(DepictBase):
         super(StrFormDepict, self).__init__(reqObj=reqObj, summaryCifObj=summaryCifObj, verbose=verbose, log=log)
         #
         self.__siteId = str(self._reqObj.getValue("WWPDB_SITE_ID"))
-        self.__cI = ConfigInfo(self.__siteId)
+        self.__cI = getSiteConfig(self.__siteId)
         #
         self.__submitValue = str(self._reqObj.getValue('submit'))
         self.__entityList = self._reqObj.getValueList('entity')
@@ -136,15 +138,13 @@ class StrFormDepict(DepictBase):
             residueId = '_'.join([str(self._reqObj.getValue('chain_id')), str(self._reqObj.getValue('res_name')),
                                   str(self._reqObj.getValue('res_num')), str(self._reqObj.getValue('ins_code'))])
         #
-        combObj = CombineCoord(reqObj=self._reqObj, instList=[residueId], cifFile=ciffile, verbose=self._verbose, log=self._lfh)
-        combObj.processWithCopy(submitValue=self.__submitValue)
-        message = combObj.getMessage()
+        prepUtil = ChopperPrepUtil(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        instId, message = prepUtil.getWorkspace(self.__submitValue, [residueId], ciffile)
         #
         if message:
             myD['data'] = message
             return 'update_form/update_result_tmplt.html', myD
         #
-        instId = combObj.getInstId()
         myD['instanceid'] = instId
         myD['comp'] = os.path.join(self._rltvSessionPath, instId, instId + '.comp.cif')
         myD['button'] = self._processTemplate('chopper/button_tmplt.html', {'value' : 'Split', 'option' : 'split_residue'})
@@ -246,15 +246,13 @@ class StrFormDepict(DepictBase):
         self.__getList(self.__ligandList, instlist)
         self.__getList(self.__groupList, instlist)
         ciffile = self._identifier + '_model_P1.cif'
-        combObj = CombineCoord(reqObj=self._reqObj, instList=instlist, cifFile=ciffile, verbose=self._verbose, log=self._lfh)
-        combObj.processWithCombine(submitValue=self.__submitValue)
-        message = combObj.getMessage()
+        prepUtil = ChopperPrepUtil(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        instId, message = prepUtil.getWorkspace(self.__submitValue, instlist, ciffile)
         #
         if message:
             myD['data'] = message
             return 'update_form/update_result_tmplt.html', myD
         #
-        instId = combObj.getInstId()
         myD['instanceid'] = instId
         myD['comp'] = os.path.join(self._rltvSessionPath, instId, instId + '.comp.cif')
         myD['button'] = self._processTemplate('chopper/button_tmplt.html', {'value' : 'Merge', 'option' : 'merge'}) \
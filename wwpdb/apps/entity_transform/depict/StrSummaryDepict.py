@@ -2,6 +2,7 @@
 # File:  StrSummaryDepict.py
 # Date:  29-Nov-2012
 # Updates:
+#  19-Oct-2026  zf   add getSummaryData() returning structure summary as compact dictionary for client-side rendering
 ##
 """
 Create HTML depiction for structure summary.
@@ -72,6 +73,30 @@ class StrSummaryDepict(DepictBase):
         text += "</ul>\n"
         return text
 
+    def getSummaryData(self):
+        """ Return the content depicted by DoRenderSummaryPage() as dictionary (rendered by client):
+
+                {"type": "structure_summary", "version": 1, "sessionid": ..., "identifier": ..., "pdbid": ...,
+                 "entities": [[entity_id, [chain_id, ...], name], ...] or "chains": [chain_id, ...],
+                 "ligands": [[3 letter code, chain_id, resnum, insertion code], ...], "groups": [component_ids, ...],
+                 "links": [id, ...]}
+        """
+        myD = {}
+        myD['type'] = 'structure_summary'
+        myD['version'] = 1
+        myD['sessionid'] = self._sessionId
+        myD['identifier'] = self._identifier
+        myD['pdbid'] = self._pdbId
+        if self.__entities:
+            myD['entities'] = [[d['entity_id'], d['pdbx_strand_id'].split(',') if 'pdbx_strand_id' in d else [], d.get('name', '')] for d in self.__entities]
+        elif self.__chain_ids:
+            myD['chains'] = self.__chain_ids
+        #
+        myD['ligands'] = self.__ligands
+        myD['groups'] = self.__groups
+        myD['links'] = sorted(self.__links.keys())
+        return myD
+
     def __readEntityData(self):
         dlist = self._cifObj.getValueList('entity_poly')
         if not dlist:
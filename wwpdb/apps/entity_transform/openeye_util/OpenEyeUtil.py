@@ -2,6 +2,7 @@
 # File:  OpenEyeUtil.py
 # Date:  16-Oct-2012
 # Updates:
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
 ##
 """
 Utility class to utilize OpenEye MCS functionalities
@@ -28,6 +29,7 @@ import inspect
 
 from wwpdb.utils.oe_util.oedepict.OeAlignDepict import OeDepictMCSAlign
 from wwpdb.apps.entity_transform.utils.CompUtil import CompUtil
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
 from wwpdb.io.file.mmCIFUtil import mmCIFUtil
 #
 
@@ -64,7 +66,7 @@ class OpenEyeUtil(object):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionId = self.__sObj.getId()
         self.__sessionPath = self.__sObj.getPath()
         self.__rltvSessionPath = self.__sObj.getRelativePath()
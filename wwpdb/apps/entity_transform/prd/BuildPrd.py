@@ -2,6 +2,9 @@
 # File:  BuildPrd.py
 # Date:  09-Oct-2012
 # Updates:
+#  19-Oct-2026  zf   record PRD/PRDCC files copied into session in session manifest
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
 ##
 """
 Build PRD definition.
@@ -25,8 +28,10 @@ import os
 import shutil
 import sys
 
-from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon, ConfigInfoAppCc
 from wwpdb.apps.entity_transform.prd.BuildPrdUtil import BuildPrdUtil
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SessionManifest import SessionManifest
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
 #
 
 
@@ -43,8 +48,7 @@ class BuildPrd(object):
         self.__sessionPath = None
         self.__instanceId = str(self.__reqObj.getValue("instanceid"))
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__cICommon = ConfigInfoAppCommon(self.__siteId)
-        self.__cIAppCc = ConfigInfoAppCc(self.__siteId)
+        self.__siteConfig = getSiteConfig(self.__siteId)
         #
         self.__getSession()
         self.__instancePath = os.path.join(self.__sessionPath, "search", self.__instanceId)
@@ -78,9 +82,12 @@ class BuildPrd(object):
         self.__getNewPrdID()
         self.__replacePrdIDs(builtPrdPath, builtPrdCcPath)
         #
+        manifest = SessionManifest(dirPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
         self.__copyFile(os.path.join(self.__instancePath, self.__prdID + ".cif"), os.path.join(self.__sessionPath, self.__prdID + ".cif"))
+        manifest.addFile(self.__prdID + ".cif", "prd")
         if os.access(os.path.join(self.__instancePath, self.__prdccID + ".cif"), os.F_OK):
             self.__copyFile(os.path.join(self.__instancePath, self.__prdccID + ".cif"), os.path.join(self.__sessionPath, self.__prdccID + ".cif"))
+            manifest.addFile(self.__prdccID + ".cif", "prdcc")
         #
         return self.__message
 
@@ -93,7 +100,7 @@ class BuildPrd(object):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionPath = self.__sObj.getPath()
         if (self.__verbose):
             self.__lfh.write("------------------------------------------------------\n")
@@ -102,7 +109,7 @@ class BuildPrd(object):
     def __getNewPrdID(self):
         """ Get new PRDID from unusedPrdId.lst file
         """
-        filePath = self.__cIAppCc.get_unused_prd_file()
+        filePath = self.__siteConfig.getUnusedPrdFile()
         f = open(filePath, "r")
         data = f.read()
         f.close()
@@ -111,7 +118,7 @@ class BuildPrd(object):
         idx = 0
         for prdid in idlist:
             idx += 1
-            prdfile = os.path.join(self.__cIAppCc.get_site_prd_cvs_path(), prdid[len(prdid) - 1], prdid + ".cif")
+            prdfile = os.path.join(self.__siteConfig.getPrdCvsPath(), prdid[len(prdid) - 1], prdid + ".cif")
             if not os.access(prdfile, os.F_OK):
                 self.__prdID = prdid
                 self.__prdccID = self.__prdID.replace("PRD", "PRDCC")
@@ -137,7 +144,7 @@ class BuildPrd(object):
                 os.remove(filePath)
             #
         #
-        setting = " RCSBROOT=" + self.__cICommon.get_site_annot_tools_path() + "; export RCSBROOT; "
+        setting = " RCSBROOT=" + self.__siteConfig.getAnnotToolsPath() + "; export RCSBROOT; "
         #
         cmd = setting + "${RCSBROOT}/bin/UpdatePrdId -input " + builtPrdPath + " -prd_id " + self.__prdID + " -output " + realPrdPath + " -log " \
             + os.path.join(self.__instancePath, "update_prd.log") + " > " + os.path.join(self.__instancePath, "update_prd.clog") + " 2>&1; "
@@ -2,6 +2,7 @@
 # File:  BuildPrdUtil.py
 # Date:  31-Jul-2020
 # Updates:
+#  19-Oct-2026  zf   use CommandUtil result cache for annotateComp
 ##
 """
 Build PRD definition.
@@ -171,7 +172,7 @@ class BuildPrdUtil(object):
             return
         #
         rootName = self.__cmdUtil.getRootFileName("annotate-prdcc")
-        self.__cmdUtil.runAnnotateComp(self.__prdID + ".comp.cif", self.__prdccID + ".cif", rootName + ".clog")
+        self.__cmdUtil.runAnnotateComp(self.__prdID + ".comp.cif", self.__prdccID + ".cif", rootName + ".clog", useCache=True)
         self.__cmdUtil.removeSelectedFiles("__" + self.__prdID + "__")
 
     def __update_PRD_PRDCC(self):
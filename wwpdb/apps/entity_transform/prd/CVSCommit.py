@@ -2,6 +2,9 @@
 # File:  CVSCommit.py
 # Date:  09-May-2014
 # Updates:
+#  19-Oct-2026  zf   get cvs_commit script/log names from session manifest counter
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
 ##
 """
 CVS commit utility.
@@ -24,10 +27,11 @@ __version__ = "V0.07"
 import os
 import sys
 
-from wwpdb.utils.config.ConfigInfo import ConfigInfo
-from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
 
 from wwpdb.apps.entity_transform.utils.GetLogMessage import GetLogMessage
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SessionManifest import SessionManifest
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
 
 
 #
@@ -46,10 +50,9 @@ class CVSCommit(object):
         self.__sessionPath = None
         # self.__rltvSessionPath = None
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__cI = ConfigInfo(self.__siteId)
-        self.__cIACc = ConfigInfoAppCc(self.__siteId, verbose=verbose, log=log)
-        self.__prdRoot = self.__cIACc.get_site_prd_cvs_path()
-        self.__prdccRoot = self.__cIACc.get_site_prdcc_cvs_path()
+        self.__cI = getSiteConfig(self.__siteId)
+        self.__prdRoot = self.__cI.getPrdCvsPath()
+        self.__prdccRoot = self.__cI.getPrdccCvsPath()
         #
         self.__PrdIDList = None
         self.__returnError = ""
@@ -65,8 +68,7 @@ class CVSCommit(object):
         if not self.__PrdIDList:
             return "No PRD entry selected"
         #
-        scriptfile = self.__getFileName(self.__sessionPath, "cvs_commit", "csh")
-        logfile = self.__getFileName(self.__sessionPath, "cvs_commit", "log")
+        scriptfile, logfile = self.__getFileName(self.__sessionPath, "cvs_commit", ("csh", "log"))
         script = os.path.join(self.__sessionPath, scriptfile)
         cvs_username = self.__cI.get("SITE_REFDATA_CVS_USER")
         cvs_password = self.__cI.get("SITE_REFDATA_CVS_PASSWORD")
@@ -102,19 +104,26 @@ class CVSCommit(object):
         logPath = os.path.join(self.__sessionPath, logfile)
         return GetLogMessage(logPath)
 
-    def __getFileName(self, path, root, ext):
-        """Create unique file name.
+    def __getFileName(self, path, root, extList):
+        """Create unique file names root_N.ext for each ext in extList, N from session manifest counter.
         """
-        count = 1
+        manifest = SessionManifest(dirPath=path, verbose=self.__verbose, log=self.__lfh)
+        count = 0
         while True:
-            filename = root + "_" + str(count) + "." + ext
-            fullname = os.path.join(path, filename)
-            if not os.access(fullname, os.F_OK):
-                return filename
+            nextCount = manifest.nextCounter(root)
+            if nextCount is None:
+                count += 1
+            else:
+                count = nextCount
+            #
+            filenameList = [root + "_" + str(count) + "." + ext for ext in extList]
+            if not [filename for filename in filenameList if os.access(os.path.join(path, filename), os.F_OK)]:
+                for filename in filenameList:
+                    manifest.addFile(filename, root)
+                #
+                return filenameList
             #
-            count += 1
         #
-        return root + "_1." + ext
 
     def __RunScript(self, path, script, log):
         """Run script command
@@ -127,7 +136,7 @@ class CVSCommit(object):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionId = self.__sObj.getId()
         self.__sessionPath = self.__sObj.getPath()
         # self.__rltvSessionPath = self.__sObj.getRelativePath()
@@ -2,6 +2,9 @@
 # File:  DepictPrd.py
 # Date:  23-Apr-2014
 # Updates:
+#  19-Oct-2026  zf   get enumeration lists from process-wide DictEnumUtil cache
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
 ##
 """
 Create HTML depiction for PRD entry.
@@ -25,10 +28,11 @@ import os
 import sys
 
 from wwpdb.apps.entity_transform.prd.DepictUtil import DepictUtil
+from wwpdb.apps.entity_transform.prd.DictEnumUtil import DictEnumUtil
 from wwpdb.apps.entity_transform.prd.HtmlUtil import HtmlUtil
-from wwpdb.apps.entity_transform.utils.CommandUtil import CommandUtil
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
 from wwpdb.io.file.mmCIFUtil import mmCIFUtil
-from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon
 #
 
 
@@ -48,9 +52,9 @@ class DepictPrd(object):
         self.__sessionId = None
         self.__sessionPath = None
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__cICommon = ConfigInfoAppCommon(self.__siteId)
-        self.__dictRoot = self.__cICommon.get_mmcif_dict_path()
-        self.__dictionary_v5 = self.__cICommon.get_mmcif_archive_next_dict_filename() + '.odb'
+        self.__siteConfig = getSiteConfig(self.__siteId)
+        self.__dictRoot = self.__siteConfig.getMmcifDictPath()
+        self.__dictionary_v5 = self.__siteConfig.getMmcifArchiveNextDictFileName() + '.odb'
         #
         self.__depictUtil = None
         self.__htmlUtil = None
@@ -100,7 +104,7 @@ class DepictPrd(object):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionId = self.__sObj.getId()
         self.__sessionPath = self.__sObj.getPath()
         if (self.__verbose):
@@ -286,24 +290,9 @@ class DepictPrd(object):
     def __getEnumList(self, item):
         """ Get enumeration list from from cif dictionary
         """
-        enumList = []
-        #
-        cmdUtil = CommandUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
-        rootName = cmdUtil.getRootFileName('Enum')
-        cmdUtil.runAnnotCmd('GetEnumValue', os.path.join(self.__dictRoot, self.__dictionary_v5), rootName + '.txt',
-                            rootName + '.log', '', ' -item ' + item)
-        #
-        filepath = os.path.join(self.__sessionPath, rootName + '.txt')
-        if not os.access(filepath, os.F_OK):
-            return enumList
-        #
-        f = open(filepath, 'r')
-        data = f.read()
-        f.close()
-        #
-        enumList = data.split('\n')
-        enumList.sort()
-        return enumList
+        enumUtil = DictEnumUtil(reqObj=self.__reqObj, dictPath=os.path.join(self.__dictRoot, self.__dictionary_v5), sessionPath=self.__sessionPath,
+                                verbose=self.__verbose, log=self.__lfh)
+        return enumUtil.getEnumList(item)
 
     def __getMissingResidues(self):
         """ Get missing residues
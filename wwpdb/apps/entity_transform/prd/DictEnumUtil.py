@@ -0,0 +1,221 @@
+##
+# File:  DictEnumUtil.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   cache/persist enumeration index only if every item has a non-empty enumeration list
+##
+"""
+Process-wide cache of cif dictionary enumerations used by PRD form.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import traceback
+
+from mmcif.io.PdbxReader import PdbxReader
+from wwpdb.apps.entity_transform.utils.CommandUtil import CommandUtil
+#
+
+# enumerated items shown in Build/Update PRD form
+PRD_ENUM_ITEM_LIST = ['_pdbx_reference_molecule.class', '_pdbx_reference_molecule.type',
+                      '_pdbx_reference_molecule.release_status', '_pdbx_prd_audit.action_type']
+
+# (dictionary path, mtime) -> { item: enumeration list }
+_enumIndexD = {}
+_enumIndexLock = threading.Lock()
+
+
+class DictEnumUtil(object):
+    """ Class responsible for serving enumeration lists of PRD form items.
+
+        All enumerations are extracted in one pass over the dictionary, then kept in memory for the life of the
+        process and persisted in an index file keyed by dictionary path and modification time. An incomplete index
+        (failed GetEnumValue run or empty enumeration) is only used for the current request.
+    """
+    def __init__(self, reqObj=None, dictPath=None, sessionPath=None, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__reqObj = reqObj
+        self.__dictPath = dictPath
+        self.__sessionPath = sessionPath
+        self.__itemList = PRD_ENUM_ITEM_LIST
+
+    def getEnumList(self, item):
+        """ Get sorted enumeration list (with leading empty value) for item
+        """
+        enumD = self.__getEnumIndex()
+        if item in enumD:
+            return list(enumD[item])
+        #
+        return []
+
+    def __getEnumIndex(self):
+        if not os.access(self.__dictPath, os.F_OK):
+            return {}
+        #
+        key = (self.__dictPath, os.stat(self.__dictPath).st_mtime)
+        with _enumIndexLock:
+            if key not in _enumIndexD:
+                enumD = self.__readIndexFile(key)
+                if enumD is None:
+                    enumD = self.__buildEnumIndex()
+                    if not self.__isComplete(enumD):
+                        return enumD
+                    #
+                    self.__writeIndexFile(key, enumD)
+                #
+                _enumIndexD.clear()
+                _enumIndexD[key] = enumD
+            #
+            return _enumIndexD[key]
+        #
+
+    def __buildEnumIndex(self):
+        """ Extract enumerations for all items. The text version of the dictionary (if installed next to the
+            serialized one) is read once; otherwise GetEnumValue is run once per item.
+        """
+        enumD = {}
+        dicPath = os.path.splitext(self.__dictPath)[0] + '.dic'
+        if os.access(dicPath, os.F_OK):
+            enumD = self.__readDictionary(dicPath)
+        #
+        for item in self.__itemList:
+            if item not in enumD:
+                enumD[item] = self.__runGetEnumValue(item)
+            #
+        #
+        if self.__verbose:
+            self.__lfh.write("+DictEnumUtil.__buildEnumIndex() - built enumeration index for %s\n" % self.__dictPath)
+        #
+        return enumD
+
+    def __isComplete(self, enumD):
+        """ Check every item has enumeration value(s) besides the leading empty one
+        """
+        for item in self.__itemList:
+            if (item not in enumD) or (not [value for value in enumD[item] if value]):
+                if self.__verbose:
+                    self.__lfh.write("+DictEnumUtil.__isComplete() - no enumeration found for %s\n" % item)
+                #
+                return False
+            #
+        #
+        return True
+
+    def __readDictionary(self, dicPath):
+        enumD = {}
+        try:
+            myContainerList = []
+            ifh = open(dicPath, 'r')
+            pRd = PdbxReader(ifh)
+            pRd.read(myContainerList)
+            ifh.close()
+            #
+            for container in myContainerList:
+                if container.getName() not in self.__itemList:
+                    continue
+                #
+                catObj = container.getObj('item_enumeration')
+                if catObj is None:
+                    continue
+                #
+                valueList = ['']
+                for row in range(catObj.getRowCount()):
+                    value = catObj.getValue('value', row)
+                    if value:
+                        valueList.append(value)
+                    #
+                #
+                valueList.sort()
+                enumD[container.getName()] = valueList
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return enumD
+
+    def __runGetEnumValue(self, item):
+        enumList = []
+        #
+        cmdUtil = CommandUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        cmdUtil.setSessionPath(self.__sessionPath)
+        rootName = cmdUtil.getRootFileName('Enum')
+        cmdUtil.runAnnotCmd('GetEnumValue', self.__dictPath, rootName + '.txt', rootName + '.log', '', ' -item ' + item,
+                            cacheOutputs=[rootName + '.txt'])
+        #
+        filepath = os.path.join(self.__sessionPath, rootName + '.txt')
+        if not os.access(filepath, os.F_OK):
+            return enumList
+        #
+        f = open(filepath, 'r')
+        data = f.read()
+        f.close()
+        #
+        enumList = data.split('\n')
+        enumList.sort()
+        return enumList
+
+    def __getIndexFilePath(self):
+        topSessionPath = str(self.__reqObj.getValue('TopSessionPath'))
+        if not topSessionPath or not os.access(topSessionPath, os.W_OK):
+            return ''
+        #
+        indexName = 'dict-enum-' + hashlib.sha1(self.__dictPath.encode('utf-8')).hexdigest() + '.json'
+        return os.path.join(topSessionPath, 'entity_transform_cache', indexName)
+
+    def __readIndexFile(self, key):
+        indexPath = self.__getIndexFilePath()
+        if not indexPath or not os.access(indexPath, os.F_OK):
+            return None
+        #
+        try:
+            with open(indexPath, 'r') as ifh:
+                indexD = json.load(ifh)
+            #
+            if (indexD['path'] == key[0]) and (indexD['mtime'] == key[1]) and (indexD['items'] == self.__itemList) and \
+               self.__isComplete(indexD['enum']):
+                return indexD['enum']
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return None
+
+    def __writeIndexFile(self, key, enumD):
+        indexPath = self.__getIndexFilePath()
+        if not indexPath:
+            return
+        #
+        try:
+            if not os.access(os.path.dirname(indexPath), os.F_OK):
+                try:
+                    os.makedirs(os.path.dirname(indexPath))
+                except OSError:
+                    pass
+                #
+            #
+            tmpPath = indexPath + '.' + str(os.getpid())
+            with open(tmpPath, 'w') as ofh:
+                json.dump({'path': key[0], 'mtime': key[1], 'items': self.__itemList, 'enum': enumD}, ofh)
+            #
+            os.rename(tmpPath, indexPath)
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
@@ -2,6 +2,7 @@
 # File:  ReadFormUtil.py
 # Date:  30-Apr-2014
 # Updates:
+#  19-Oct-2026  zf   keyed row index for category updates instead of row scans
 ##
 """
 Update PRD definition based on input form.
@@ -45,6 +46,7 @@ class ReadFormUtil(object):
         self.__inputFile = str(self.__reqObj.getValue('prdfile'))
         self.__outputFile = outputFile
         self.__status = True
+        self.__rowIndexD = {}
         #
         self.__readCif()
 
@@ -73,6 +75,7 @@ class ReadFormUtil(object):
             return False
         #
         self.__status = True
+        self.__rowIndexD = {}
         self.__updateMolecule()
         self.__updateEntityList()
         self.__updateSourceInfo()
@@ -118,10 +121,9 @@ class ReadFormUtil(object):
             return
         #
         cat = self.__myBlock.getObj('pdbx_reference_entity_list')
-        for row in range(0, cat.getRowCount()):
-            v = cat.getValue('component_id', row)
-            if v in valMap:
-                cat.setValue(valMap[v], 'details', row)
+        for v, val in valMap.items():
+            for row in self.__getRowList(cat, ('component_id',), v):
+                cat.setValue(val, 'details', row)
             #
         #
 
@@ -240,12 +242,9 @@ class ReadFormUtil(object):
             return
         #
         cat = self.__myBlock.getObj('pdbx_reference_entity_poly_seq')
-        for row in range(0, cat.getRowCount()):
-            v1 = cat.getValue('ref_entity_id', row)
-            v2 = cat.getValue('num', row)
-            key = v1 + '_' + v2
-            if key in valMap:
-                cat.setValue(valMap[key], 'parent_mon_id', row)
+        for key, val in valMap.items():
+            for row in self.__getRowList(cat, ('ref_entity_id', 'num'), key):
+                cat.setValue(val, 'parent_mon_id', row)
             #
         #
         one_letter_code_map = self.__getOneLetterCodeMap(cat)
@@ -253,10 +252,9 @@ class ReadFormUtil(object):
             return
         #
         seqCat = self.__myBlock.getObj('pdbx_reference_entity_sequence')
-        for row in range(0, seqCat.getRowCount()):
-            v1 = cat.getValue('ref_entity_id', row)
-            if v1 in one_letter_code_map:
-                seqCat.setValue(one_letter_code_map[v1], 'one_letter_codes', row)
+        for v1, one_letter_code in one_letter_code_map.items():
+            for row in self.__getRowList(seqCat, ('ref_entity_id',), v1):
+                seqCat.setValue(one_letter_code, 'one_letter_codes', row)
             #
         #
 
@@ -310,14 +308,11 @@ class ReadFormUtil(object):
         """ update linkage category
         """
         cat = self.__myBlock.getObj(catName)
-        for row in range(0, cat.getRowCount()):
-            v = cat.getValue('link_id', row)
-            if v in link:
-                cat.setValue(link[v], 'value_order', row)
-            if v in atom1:
-                cat.setValue(atom1[v], 'atom_id_1', row)
-            if v in atom2:
-                cat.setValue(atom2[v], 'atom_id_2', row)
+        for valMap, item in ((link, 'value_order'), (atom1, 'atom_id_1'), (atom2, 'atom_id_2')):
+            for v, val in valMap.items():
+                for row in self.__getRowList(cat, ('link_id',), v):
+                    cat.setValue(val, item, row)
+                #
             #
         #
 
@@ -330,14 +325,40 @@ class ReadFormUtil(object):
             return
         #
         cat = self.__myBlock.getObj('pdbx_reference_entity_poly')
-        for row in range(0, cat.getRowCount()):
-            v = cat.getValue('ref_entity_id', row)
-            if v in dbname and v in dbcode:
-                cat.setValue(dbname[v], 'db_name', row)
+        for v, val in dbname.items():
+            if v not in dbcode:
+                continue
+            #
+            for row in self.__getRowList(cat, ('ref_entity_id',), v):
+                cat.setValue(val, 'db_name', row)
                 cat.setValue(dbcode[v], 'db_code', row)
             #
         #
 
+    def __getRowList(self, cat, itemTuple, value):
+        """ Get row numbers in category cat where the '_' joined values of items in itemTuple equal value.
+            The index is built on first use and extended with rows added since.
+        """
+        if not cat:
+            return []
+        #
+        indexKey = (cat.getName(), itemTuple)
+        if (indexKey not in self.__rowIndexD) or (self.__rowIndexD[indexKey][0] is not cat):
+            self.__rowIndexD[indexKey] = [cat, 0, {}]
+        #
+        rowIndex = self.__rowIndexD[indexKey]
+        rowCount = cat.getRowCount()
+        for row in range(rowIndex[1], rowCount):
+            key = '_'.join([cat.getValue(item, row) for item in itemTuple])
+            rowIndex[2].setdefault(key, []).append(row)
+        #
+        rowIndex[1] = rowCount
+        #
+        if value in rowIndex[2]:
+            return rowIndex[2][value]
+        #
+        return []
+
     def __updateAuditInfo(self):
         """ Update pdbx_prd_audit category
         """
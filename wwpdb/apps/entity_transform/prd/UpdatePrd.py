@@ -2,6 +2,9 @@
 # File:  UpdatePrd.py
 # Date:  29-Apr-2014
 # Updates:
+#  19-Oct-2026  zf   record written PRD file in session manifest
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
 ##
 """
 Update PRD definition based on input form.
@@ -24,8 +27,10 @@ __version__ = "V0.07"
 import os
 import sys
 
-from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
 from wwpdb.apps.entity_transform.prd.ReadFormUtil import ReadFormUtil
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SessionManifest import SessionManifest
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
 #
 
 
@@ -44,7 +49,7 @@ class UpdatePrd(object):
 
         # self.__rltvSessionPath = None
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__cIAppCc = ConfigInfoAppCc(self.__siteId)
+        self.__siteConfig = getSiteConfig(self.__siteId)
         #
         self.__getSession()
         #
@@ -75,7 +80,7 @@ class UpdatePrd(object):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionId = self.__sObj.getId()
         self.__sessionPath = self.__sObj.getPath()
         # self.__rltvSessionPath = self.__sObj.getRelativePath()
@@ -100,7 +105,7 @@ class UpdatePrd(object):
     def __getNewPrdID(self):
         """
         """
-        filePath = self.__cIAppCc.get_unused_prd_file()
+        filePath = self.__siteConfig.getUnusedPrdFile()
         with open(filePath, 'r') as f:
             data = f.read()
         #
@@ -109,7 +114,7 @@ class UpdatePrd(object):
         idx = 0
         for cid in idlist:
             idx += 1
-            prdfile = os.path.join(self.__cIAppCc.get_site_prd_cvs_path(), cid[len(cid) - 1], cid + '.cif')
+            prdfile = os.path.join(self.__siteConfig.getPrdCvsPath(), cid[len(cid) - 1], cid + '.cif')
             if not os.access(prdfile, os.F_OK):
                 newId = cid
                 break
@@ -137,3 +142,7 @@ class UpdatePrd(object):
         if not status:
             self.__updateStatus = False
         #
+        if os.access(filePath, os.F_OK):
+            manifest = SessionManifest(dirPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+            manifest.addFile(self.__inputData['prd_id'] + '.cif', 'prd')
+        #
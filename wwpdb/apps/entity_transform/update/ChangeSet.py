@@ -0,0 +1,246 @@
+##
+# File:  ChangeSet.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   conflict check on chains touched by the edits, commit groups keep the staging order of dependent
+#                    edits, removeEdits() removes committed edits under the change-set lock
+#  19-Oct-2026  zf   staged edits never share a chain, commit groups only group by (program, common options)
+##
+"""
+Session change-set of staged coordinate edits.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import fcntl
+import json
+import os
+import sys
+import time
+import traceback
+
+CHANGESET_FILE_NAME = 'staged_edits.json'
+CHANGESET_VERSION = 1
+
+
+class ChangeSet(object):
+    """ Class responsible for the edits staged in a session directory (<session>/staged_edits.json):
+
+            {"version": 1, "model": [mtime, size], "edits": [edit record, ...]}
+
+        with edit record {"id", "task", "program", "log_root", "common_options", "options", "targets", "time"}.
+        "model" is the fingerprint of the model coordinate file when the first edit was staged. The targets of an
+        edit ('chain:A', 'ligand:A_HEM_1', 'instance:A_1') are reduced to the chains they lie in: merge/split/edit
+        programs renumber or rename whole chains, so a ligand or instance edit depends on every edit of its chain.
+        An edit conflicts with the change-set if it touches a chain already touched by a staged edit (an edit
+        without targets touches the whole model), or if the model file was rewritten since the first edit was
+        staged (the staged options refer to chain/instance IDs of that model). Every read-modify-write runs under
+        an exclusive lock.
+    """
+    def __init__(self, sessionPath=None, modelFile=None, verbose=False, log=sys.stderr):
+        """
+         :param `sessionPath`: session directory
+         :param `modelFile`: name of model coordinate file in sessionPath
+        """
+        self.__sessionPath = sessionPath
+        self.__modelPath = os.path.join(sessionPath, modelFile)
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__changeSetPath = os.path.join(self.__sessionPath, CHANGESET_FILE_NAME)
+
+    def exists(self):
+        return os.access(self.__changeSetPath, os.F_OK)
+
+    def getEditList(self):
+        """ Return staged edit records in staging order
+        """
+        if not self.exists():
+            return []
+        #
+        try:
+            with open(self.__changeSetPath, 'r') as ifh:
+                fcntl.flock(ifh.fileno(), fcntl.LOCK_SH)
+                return self.__parse(ifh).get('edits', [])
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return []
+
+    def addEdit(self, taskName, progName, logRootName, options, targetList=None, commonOptions=''):
+        """ Stage edit, return error message ('' if the edit was staged)
+        """
+        editD = {'task': taskName, 'program': progName, 'log_root': logRootName, 'common_options': commonOptions,
+                 'options': options, 'targets': sorted(set(targetList or [])), 'time': time.time()}
+        messageList = []
+
+        def _add(changeSetD):
+            editList = changeSetD['edits']
+            if editList:
+                message = self.__checkConflict(changeSetD, editD)
+                if message:
+                    messageList.append(message)
+                    return False
+                #
+            else:
+                changeSetD['model'] = self.getModelFingerprint()
+            #
+            editD['id'] = max([0] + [edit['id'] for edit in editList]) + 1
+            editList.append(editD)
+            return True
+        #
+        if not self.__update(_add):
+            return messageList[0] if messageList else 'Staging edit "' + taskName + '" failed.'
+        #
+        return ''
+
+    def checkModel(self):
+        """ Return error message if the model file was rewritten since the first edit was staged
+        """
+        if not self.exists():
+            return ''
+        #
+        try:
+            with open(self.__changeSetPath, 'r') as ifh:
+                fcntl.flock(ifh.fileno(), fcntl.LOCK_SH)
+                changeSetD = self.__parse(ifh)
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+            return 'Reading staged edits failed.'
+        #
+        if changeSetD['edits'] and (changeSetD.get('model') != self.getModelFingerprint()):
+            return 'Model coordinate file was updated after the edits were staged.'
+        #
+        return ''
+
+    def removeEdits(self, editIdList):
+        """ Remove committed edits (edits staged meanwhile are kept)
+        """
+        def _remove(changeSetD):
+            changeSetD['edits'] = [editD for editD in changeSetD['edits'] if editD['id'] not in editIdList]
+            return True
+        #
+        return self.__update(_remove)
+
+    def discard(self):
+        """ Remove all staged edits
+        """
+        if self.exists():
+            os.remove(self.__changeSetPath)
+        #
+
+    def getModelFingerprint(self):
+        try:
+            statInfo = os.stat(self.__modelPath)
+            return [statInfo.st_mtime, statInfo.st_size]
+        except OSError:
+            return None
+        #
+
+    def getCommitGroups(self):
+        """ Group staged edits into runs of the same (program, common options), in the order of the first edit of each
+            group. The options of the edits of a group are concatenated, e.g. all '-mapping' options of chopper and
+            update_file edits are passed to a single UpdateEntry run. addEdit() rejects an edit touching a chain of a
+            staged edit, so the staged edits are independent and their order within the change-set does not matter.
+
+            Return list of {"program", "task", "log_root", "options", "edits": [edit id, ...]}
+        """
+        groupList = []
+        groupD = {}
+        for editD in self.getEditList():
+            key = (editD['program'], editD['common_options'])
+            if key not in groupD:
+                groupD[key] = {'program': editD['program'], 'task': editD['task'], 'log_root': editD['log_root'],
+                               'options': editD['common_options'], 'edits': []}
+                groupList.append(groupD[key])
+            #
+            groupD[key]['options'] += editD['options']
+            groupD[key]['edits'].append(editD['id'])
+        #
+        for group in groupList:
+            group['options'] += ' '
+        #
+        return groupList
+
+    def __checkConflict(self, changeSetD, editD):
+        if changeSetD.get('model') != self.getModelFingerprint():
+            return 'Model coordinate file was updated after the edits were staged. Commit or discard the staged edits first.'
+        #
+        chainSet = self.__getChainSet(editD['targets'])
+        for stagedD in changeSetD['edits']:
+            stagedSet = self.__getChainSet(stagedD['targets'])
+            if not self.__isDependent(chainSet, stagedSet):
+                continue
+            #
+            if (chainSet is None) or (stagedSet is None):
+                where = 'whole model'
+            else:
+                where = 'chain(s) ' + ', '.join(sorted(chainSet & stagedSet))
+            #
+            return 'Edit "' + editD['task'] + '" conflicts with staged edit ' + str(stagedD['id']) + ' "' + stagedD['task'] \
+                + '" (' + where + ').'
+        #
+        return ''
+
+    def __getChainSet(self, targetList):
+        """ Return set of chain IDs of targets ('chain:A', 'ligand:A_HEM_1', 'instance:A_1'), None (whole model)
+            if there is no target
+        """
+        if not targetList:
+            return None
+        #
+        return set([target.split(':', 1)[-1].split('_')[0] for target in targetList])
+
+    def __isDependent(self, chainSet1, chainSet2):
+        if (chainSet1 is None) or (chainSet2 is None):
+            return True
+        #
+        return len(chainSet1 & chainSet2) > 0
+
+    def __parse(self, fh):
+        text = fh.read()
+        if text.strip():
+            changeSetD = json.loads(text)
+            if changeSetD.get('version') == CHANGESET_VERSION:
+                return changeSetD
+            #
+        #
+        return {'version': CHANGESET_VERSION, 'model': None, 'edits': []}
+
+    def __update(self, func):
+        """ Lock change-set, apply func(changeSetD) and write the change-set if func returns True
+        """
+        try:
+            with open(self.__changeSetPath, 'a+') as fh:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                fh.seek(0)
+                changeSetD = self.__parse(fh)
+                if not func(changeSetD):
+                    return False
+                #
+                fh.seek(0)
+                fh.truncate()
+                json.dump(changeSetD, fh, indent=1, sort_keys=True)
+                fh.flush()
+            #
+            if self.__verbose:
+                self.__lfh.write("+ChangeSet.__update() - %d staged edits in %s\n" % (len(changeSetD['edits']), self.__changeSetPath))
+            #
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return False
@@ -2,6 +2,18 @@
 # File:  ChopperHandler.py
 # Date:  08-Dec-2012
 # Updates:
+#  19-Oct-2026  zf   run SearchAllInstances over shards of search/ in worker processes for 'apply to all',
+#                    with per-shard progress file
+#  19-Oct-2026  zf   stream chopper output from (gzip/deflate compressed) 'cif_file' upload to disk in chunks,
+#                    verify optional SHA-256 'checksum'
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
+#  19-Oct-2026  zf   stage UpdateEntry run in session change-set if request has staged=yes
+#  19-Oct-2026  zf   snapshot model file in session snapshot journal before UpdateEntry run
+#  19-Oct-2026  zf   UpdateEntry writes temporary file renamed over the model file, model file stays in place
+#  19-Oct-2026  zf   runSearchShard returns processed shards and diagnostics, a failing shard no longer blocks runMulti
+#  19-Oct-2026  zf   reject unknown cif_compression of chopper output upload
+#  19-Oct-2026  zf   staged chopper edit targets the search instances combined in the chopper workspace
+#  19-Oct-2026  zf   every shard search path holds the current instance, shard directories removed after the search
 ##
 """
 Merge/Split coordinates based on output from chopper tool.
@@ -27,11 +39,23 @@ except ImportError:
     import pickle as pickle
 #
 
+import hashlib
+import multiprocessing
 import os
+import shutil
 import sys
+import traceback
 
+from wwpdb.apps.entity_transform.update.ChangeSet import ChangeSet
 from wwpdb.apps.entity_transform.utils.CommandUtil import CommandUtil
 from wwpdb.apps.entity_transform.utils.GetLogMessage import GetLogMessage
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SnapshotJournal import SnapshotJournal
+from wwpdb.apps.entity_transform.utils.UploadFileUtil import COMPRESSION_LIST, UploadFileUtil
+from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
+
+# minimum number of candidate instances per SearchAllInstances shard
+MIN_SHARD_SIZE = 20
 
 
 class ChopperHandler(object):
@@ -52,6 +76,8 @@ class ChopperHandler(object):
         self.__instancePath = os.path.join(self.__sessionPath, self.__instId)
         #
         self.__allInstMappingFiles = []
+        self.__allInstIds = []
+        self.__stagedFlag = False
         self.__successful_message = ''
         self.__message = ''
         #
@@ -61,14 +87,18 @@ class ChopperHandler(object):
         """ Update model coordinate file
         """
         alloption = str(self.__reqObj.getValue('alloption'))
-        self.__downloadCompCif()
+        if not self.__downloadCompCif():
+            return self.__message
+        #
         self.__runMappingScript()
         if alloption == 'true':
             self.__searchOtherInstances()
         #
         self.__runUpdateScript()
         if not self.__message:
-            if self.__successful_message:
+            if self.__stagedFlag:
+                self.__message = 'staged'
+            elif self.__successful_message:
                 self.__message = self.__successful_message
             elif self.__option == 'merge':
                 self.__message = 'merged'
@@ -79,14 +109,42 @@ class ChopperHandler(object):
         return self.__message
 
     def __downloadCompCif(self):
-        """ Download chopper output file
+        """ Download chopper output file, either streamed from multipart 'cif_file' upload (optionally gzip/deflate
+            compressed, see 'cif_compression') or from 'cif' form value. If the SHA-256 'checksum' of the uncompressed
+            content is given, it is verified.
         """
-        cif = str(self.__reqObj.getValue('cif'))
         filePath = os.path.join(self.__instancePath, 'chopper_output.cif')
-        f = open(filePath, 'w')
-        f.write(cif + '\n')
-        f.close()
+        fs = self.__reqObj.getRawValue('cif_file')
+        if (fs is not None) and hasattr(fs, 'file'):
+            uploadUtil = UploadFileUtil(verbose=self.__verbose, log=self.__lfh)
+            compression = str(self.__reqObj.getValue('cif_compression'))
+            if compression and (not uploadUtil.setCompression(compression)):
+                self.__message = 'Unknown chopper output compression "' + compression + '" (expected ' + ', '.join(COMPRESSION_LIST) + ').'
+                return False
+            #
+            try:
+                uploadUtil.write(fs.file, filePath, ensureNewline=True)
+            except:  # noqa: E722 pylint: disable=bare-except
+                traceback.print_exc(file=self.__lfh)
+                self.__message = 'Reading chopper output failed.'
+                return False
+            #
+            checksum = uploadUtil.getChecksum()
+        else:
+            cif = str(self.__reqObj.getValue('cif'))
+            f = open(filePath, 'w')
+            f.write(cif + '\n')
+            f.close()
+            #
+            checksum = hashlib.sha256(cif.encode('utf-8')).hexdigest()
+        #
+        expected = str(self.__reqObj.getValue('checksum')).strip().lower()
+        if expected and (expected != checksum):
+            self.__message = 'Chopper output checksum mismatch.'
+            os.remove(filePath)
+            return False
         #
+        return True
 
     def __runMappingScript(self):
         """ Generate mapping file
@@ -112,44 +170,163 @@ class ChopperHandler(object):
         """
         residue_id = ''
         if self.__option == 'split_residue':
-            pickleFilePath = os.path.join(self.__instancePath, self.__instId + ".pkl")
-            if os.access(pickleFilePath, os.F_OK):
-                fb = open(pickleFilePath, "rb")
-                pickleD = pickle.load(fb)
-                fb.close()
-                #
-                if ('residue' in pickleD) and pickleD['residue']:
-                    residue_id = pickleD['residue']
-                #
+            pickleD = self.__readInstanceInfo()
+            if ('residue' in pickleD) and pickleD['residue']:
+                residue_id = pickleD['residue']
             #
         #
         self.__lfh.write("residue_id=%s\n" % residue_id)
         searchPath = os.path.join(self.__sessionPath, 'search')
-        extraOptions = ' -summaryfile ' + self.__summaryFile + ' -searchpath ' + searchPath + ' -merge_cif ' + self.__instId \
-            + '.merge.cif -chopper_cif ' + os.path.join(self.__instancePath, 'chopper_output.cif') + ' '
+        extraOptions = ' -summaryfile ' + self.__summaryFile + ' -merge_cif ' + os.path.join(self.__instancePath, self.__instId + '.merge.cif') \
+            + ' -chopper_cif ' + os.path.join(self.__instancePath, 'chopper_output.cif') + ' '
         #
         if residue_id != '':
             identifier = str(self.__reqObj.getValue("identifier"))
             ciffile = os.path.join(self.__sessionPath, identifier + '_model_P1.cif')
             extraOptions += ' -residue_id ' + residue_id + ' -model_cif ' + ciffile
         #
-        self.__cmdUtil.setSessionPath(self.__instancePath)
-        self.__cmdUtil.runAnnotCmd('SearchAllInstances', '', self.__instId + '.all_instance_search.list',
-                                   'search-instances.log', 'search-instances.clog', extraOptions)
+        candidateList = []
+        if os.access(searchPath, os.F_OK):
+            for dirName in sorted(os.listdir(searchPath)):
+                if (dirName != self.__instId) and os.path.isdir(os.path.join(searchPath, dirName)):
+                    candidateList.append(dirName)
+                #
+            #
         #
-        filename = os.path.join(self.__instancePath, self.__instId + '.all_instance_search.list')
-        if not os.access(filename, os.F_OK):
+        numProc = min(int(multiprocessing.cpu_count() / 2), int(len(candidateList) / MIN_SHARD_SIZE))
+        self.__writeProgress(0, max(numProc, 1))
+        #
+        if numProc < 2:
+            self.__cmdUtil.setSessionPath(self.__instancePath)
+            self.__cmdUtil.runAnnotCmd('SearchAllInstances', '', self.__instId + '.all_instance_search.list',
+                                       'search-instances.log', 'search-instances.clog', extraOptions + ' -searchpath ' + searchPath + ' ')
+            #
+            self.__readSearchResult([os.path.join(self.__instancePath, self.__instId + '.all_instance_search.list')])
+            self.__writeProgress(1, 1)
             return
         #
+        shardList = []
+        for i in range(0, numProc):
+            # hashable shard items, so that runMulti() can compute the list of failed shards
+            shardList.append(('shard_' + str(i + 1), tuple(candidateList[i::numProc]), extraOptions, numProc))
+        #
+        try:
+            mpu = MultiProcUtil(verbose=self.__verbose)
+            mpu.set(workerObj=self, workerMethod="runSearchShard")
+            mpu.setWorkingDir(self.__instancePath)
+            ok, failList, retLists, diagList = mpu.runMulti(dataList=shardList, numProc=numProc, numResults=1)
+            if not ok:
+                self.__lfh.write("+ChopperHandler.__searchOtherInstances() - %d of %d shards failed: %s\n"
+                                 % (len(failList), len(shardList), '; '.join(diagList)))
+            #
+            self.__readSearchResult(retLists[0])
+        finally:
+            for shard in shardList:
+                shardPath = os.path.join(self.__instancePath, 'search_' + shard[0])
+                if os.access(shardPath, os.F_OK):
+                    shutil.rmtree(shardPath, ignore_errors=True)
+                #
+            #
+        #
+
+    def runSearchShard(self, dataList, procName, optionsD, workingDir):  # pylint: disable=unused-argument
+        """ MultiProcUtil worker: run SearchAllInstances for each shard of dataList. Returns the shards processed
+            successfully, their search list files and diagnostics of failed shards; a failing shard never raises, so
+            that runMulti() gets a result for every sublist.
+        """
+        successList = []
+        rList = []
+        diagList = []
+        for shard in dataList:
+            shardName, instList, extraOptions, numShard = shard
+            try:
+                filename = self.__runSearchShard(shardName, instList, extraOptions)
+                if filename:
+                    successList.append(shard)
+                    rList.append(filename)
+                else:
+                    diagList.append(shardName + ': no search result list')
+                #
+            except:  # noqa: E722 pylint: disable=bare-except
+                traceback.print_exc(file=self.__lfh)
+                diagList.append(shardName + ': ' + traceback.format_exc().strip().split('\n')[-1])
+            #
+            self.__writeProgress(1, numShard, append=True)
+        #
+        return successList, rList, diagList
+
+    def __runSearchShard(self, shardName, instList, extraOptions):
+        """ Run SearchAllInstances over a search path holding only the shard's instances and the current instance (as
+            the non-sharded search over search/ does). Mapping files are moved into the instance directory; returns the
+            search list file (None if it was not written).
+        """
+        searchPath = os.path.join(self.__sessionPath, 'search')
+        shardPath = os.path.join(self.__instancePath, 'search_' + shardName)
+        if os.access(shardPath, os.F_OK):
+            shutil.rmtree(shardPath)
+        #
+        shardSearchPath = os.path.join(shardPath, 'search')
+        os.makedirs(shardSearchPath)
+        instSet = set(instList)
+        instSet.add(self.__instId)
+        for fileName in os.listdir(searchPath):
+            if (fileName in instSet) or (not os.path.isdir(os.path.join(searchPath, fileName))):
+                os.symlink(os.path.join(searchPath, fileName), os.path.join(shardSearchPath, fileName))
+            #
+        #
+        listFile = self.__instId + '.all_instance_search.list'
+        cmdUtil = CommandUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        cmdUtil.setSessionPath(shardPath)
+        cmdUtil.runAnnotCmd('SearchAllInstances', '', listFile, 'search-instances.log', 'search-instances.clog',
+                            extraOptions + ' -searchpath ' + shardSearchPath + ' ')
+        #
+        filename = os.path.join(shardPath, listFile)
+        if not os.access(filename, os.F_OK):
+            return None
+        #
         f = open(filename, 'r')
         data = f.read()
         f.close()
-        dlist = data.split('\n')
-        for line in dlist:
-            if not line:
+        for line in data.split('\n'):
+            list1 = line.split(' ')
+            if (len(list1) > 2) and (list1[1] == 'successful') and (list1[2] != 'self') and \
+               os.access(os.path.join(shardPath, list1[2]), os.F_OK):
+                os.rename(os.path.join(shardPath, list1[2]), os.path.join(self.__instancePath, list1[2]))
+            #
+        #
+        return filename
+
+    def __readSearchResult(self, fileList):
+        """ Merge SearchAllInstances result lists. An instance reported by several shards keeps its 'successful' line.
+        """
+        resultD = {}
+        orderList = []
+        for filename in fileList:
+            if not os.access(filename, os.F_OK):
                 continue
             #
-            list1 = line.split(' ')
+            f = open(filename, 'r')
+            data = f.read()
+            f.close()
+            dlist = data.split('\n')
+            for line in dlist:
+                if not line:
+                    continue
+                #
+                list1 = line.split(' ')
+                if (len(list1) < 2) or (list1[1] not in ('successful', 'failed:')):
+                    continue
+                #
+                if list1[0] not in resultD:
+                    orderList.append(list1[0])
+                elif resultD[list1[0]][1] == 'successful':
+                    continue
+                #
+                resultD[list1[0]] = list1
+            #
+        #
+        for instId in orderList:
+            list1 = resultD[instId]
             if list1[1] == 'successful':
                 if self.__option == 'merge':
                     self.__successful_message += list1[0] + ' merged\n'
@@ -160,19 +337,33 @@ class ChopperHandler(object):
                     continue
                 #
                 self.__allInstMappingFiles.append(list1[2])
+                self.__allInstIds.append(list1[0])
             elif list1[1] == 'failed:':
-                self.__successful_message += line + '\n'
+                self.__successful_message += ' '.join(list1) + '\n'
             #
         #
 
+    def __writeProgress(self, done, total, append=False):
+        """ Record SearchAllInstances progress as 'done total' lines (one line appended per finished shard)
+        """
+        progressFile = os.path.join(self.__instancePath, self.__instId + '.search_progress')
+        if append:
+            f = open(progressFile, 'a')
+        else:
+            f = open(progressFile, 'w')
+        #
+        f.write('%d %d\n' % (done, total))
+        f.close()
+
     def __runUpdateScript(self):
         if self.__message:
             return
         #
-        allinst_option = ''
+        split_option = ''
         if self.__option == 'split_residue':
-            allinst_option = ' -split_polymer_residue '
+            split_option = ' -split_polymer_residue '
         #
+        allinst_option = ''
         if self.__allInstMappingFiles:
             for file_name in self.__allInstMappingFiles:
                 allinst_option += ' -mapping ' + self.__instId + '/' + file_name
@@ -183,8 +374,38 @@ class ChopperHandler(object):
         updateid = 'update-entry-' + self.__instId
         mappingfile = self.__instId + '/' + self.__instId + '.mapping.cif'
         #
+        if str(self.__reqObj.getValue('staged')) == 'yes':
+            # mapping options of all staged chopper edits are passed to one UpdateEntry run on commit (see StagedUpdate)
+            # targets are the search instances combined in the chopper workspace and those found by 'apply to all'
+            # (no targets, i.e. the whole model, for a workspace without recorded instances)
+            targetList = []
+            sourceList = self.__readInstanceInfo().get('instances', [])
+            if sourceList:
+                targetList = ['instance:' + instId for instId in sourceList + self.__allInstIds]
+            #
+            changeSet = ChangeSet(sessionPath=self.__sessionPath, modelFile=ciffile, verbose=self.__verbose, log=self.__lfh)
+            error = changeSet.addEdit('Chopper ' + self.__option, 'UpdateEntry', 'update-entry', ' -mapping ' + mappingfile + allinst_option + ' ',
+                                      targetList=targetList, commonOptions=split_option)
+            if error:
+                self.__message += error + '\n'
+            else:
+                self.__stagedFlag = True
+            #
+            return
+        #
+        journal = SnapshotJournal(sessionPath=self.__sessionPath, fileName=ciffile, verbose=self.__verbose, log=self.__lfh)
+        step = journal.capture('Chopper ' + self.__option + ' ' + self.__instId)
+        if not step:
+            self.__message += 'Saving snapshot of ' + ciffile + ' failed.\n'
+            return
+        #
         self.__cmdUtil.setSessionPath(self.__sessionPath)
-        self.__cmdUtil.runAnnotCmd('UpdateEntry', ciffile, ciffile, updateid + '.log', updateid + '.clog', ' -mapping ' + mappingfile + allinst_option + ' ')
+        try:
+            self.__cmdUtil.runAnnotCmd('UpdateEntry', ciffile, journal.getOutputFile(step), updateid + '.log', updateid + '.clog',
+                                       ' -mapping ' + mappingfile + split_option + allinst_option + ' ')
+        finally:
+            journal.finish(step)
+        #
         #
         logfile = os.path.join(self.__sessionPath, updateid + '.log')
         if not os.access(logfile, os.F_OK):
@@ -193,6 +414,18 @@ class ChopperHandler(object):
         #
         self.__getLogMessage(logfile)
 
+    def __readInstanceInfo(self):
+        """ Read <instId>.pkl written by CombineCoord ('instances', 'residue', 'submit'), empty dictionary if missing
+        """
+        pickleFilePath = os.path.join(self.__instancePath, self.__instId + ".pkl")
+        if not os.access(pickleFilePath, os.F_OK):
+            return {}
+        #
+        fb = open(pickleFilePath, "rb")
+        pickleD = pickle.load(fb)
+        fb.close()
+        return pickleD
+
     def __getLogMessage(self, logfile):
         error = GetLogMessage(logfile)
         if error:
@@ -203,7 +436,7 @@ class ChopperHandler(object):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionPath = self.__sObj.getPath()
         if self.__verbose:
             self.__lfh.write("------------------------------------------------------\n")
@@ -0,0 +1,367 @@
+##
+# File:  ChopperPrepUtil.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
+#  19-Oct-2026  zf   record model file size/mtime in index entries, drop entries built from an older model file,
+#                    add needPrebuild()
+#  19-Oct-2026  zf   wait at most WAIT_SECONDS for a running background build, then build synchronously;
+#                    a replaced build no longer updates the index entry
+##
+"""
+Prepare chopper workspaces (CombineCoord) in the background and hand them out when the chopper is opened.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import fcntl
+import json
+import os
+import sys
+import time
+import traceback
+
+from wwpdb.apps.entity_transform.update.CombineCoord import CombineCoord
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
+
+INDEX_FILE_NAME = 'chopper_prepare.json'
+PREBUILD_LOCK_FILE_NAME = 'chopper_prebuild.lock'
+
+# site configuration key: maximum number of chopper workspaces built speculatively per session (unset or 0 disables)
+PREBUILD_KEY = 'SITE_ENTITY_TRANSFORM_CHOPPER_PREBUILD'
+
+# seconds the chopper page waits for a workspace still being built in the background before building its own
+WAIT_SECONDS = 10
+
+SPLIT_OPTION = 'Split with chopper'
+MERGE_SPLIT_OPTION = 'Merge/Split with chopper'
+
+
+class ChopperPrepUtil(object):
+    """ Class responsible for the chopper workspace index (chopper_prepare.json in session directory):
+
+            { "<option>|<inst1>,<inst2>": {"instid": "chopper_inst_N", "status": "running|done|failed", "stage": ...,
+                                           "message": ..., "claimed": bool, "speculative": bool, "pid": ..., "semaphore": ...,
+                                           "model": [<model file size>, <model file mtime>]} }
+
+        A workspace is claimed once by the chopper page; speculative workspaces are built in advance for every
+        instance in pdbx_split_polymer_residue_info and every action-required non-polymer instance. An entry built
+        from a model file whose size/mtime differ from the current model file is stale: it is never handed out
+        and is replaced by the next build.
+    """
+    def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__reqObj = reqObj
+        self.__sObj = None
+        self.__sessionPath = None
+        self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
+        #
+        self.__getSession()
+        self.__indexPath = os.path.join(self.__sessionPath, INDEX_FILE_NAME)
+
+    def getWorkspace(self, submitValue, instList, cifFile, waitSeconds=WAIT_SECONDS):
+        """ Return (instId, message) of workspace for chopper option and instance list: claim workspace prepared in
+            the background (waiting up to waitSeconds if it is still being built) or build one now
+        """
+        key = self.__getKey(submitValue, instList)
+        semaphore = str(self.__reqObj.getSemaphore())
+        entry = self.__claim(key, semaphore, self.__getModelStamp(cifFile))
+        startTime = time.time()
+        while (entry is not None) and (entry['status'] == 'running') and (time.time() - startTime < waitSeconds):
+            if not self.__isAlive(entry.get('pid')):
+                break
+            #
+            time.sleep(0.5)
+            entry = self.__getEntry(key)
+        #
+        if (entry is not None) and (entry['status'] == 'done'):
+            return entry['instid'], entry['message']
+        #
+        return self.prepare(submitValue, instList, cifFile, speculative=False, semaphore=semaphore)
+
+    def prepare(self, submitValue, instList, cifFile, speculative=False, semaphore=''):
+        """ Build workspace with CombineCoord and record its progress in the index. Returns (instId, message)
+        """
+        key = self.__getKey(submitValue, instList)
+        entry = {'instid': '', 'status': 'running', 'stage': 'start', 'message': '', 'claimed': not speculative,
+                 'speculative': speculative, 'pid': os.getpid(), 'semaphore': semaphore, 'start': time.time(),
+                 'model': self.__getModelStamp(cifFile)}
+        if not self.__setEntry(key, entry, replaceRunning=not speculative):
+            # another process has started the same speculative build
+            return None, ''
+        #
+        combObj = CombineCoord(reqObj=self.__reqObj, instList=instList, cifFile=cifFile, verbose=self.__verbose, log=self.__lfh)
+        instId = combObj.getInstId()
+        self.__updateEntry(key, entry, {'instid': instId})
+
+        def _progress(stage):
+            self.__updateEntry(key, entry, {'stage': stage})
+        #
+        combObj.setProgressCallback(_progress)
+        try:
+            if submitValue == SPLIT_OPTION:
+                combObj.processWithCopy(submitValue=submitValue)
+            else:
+                combObj.processWithCombine(submitValue=submitValue)
+            #
+            message = combObj.getMessage()
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+            message = 'Preparing chopper for ' + ','.join(instList) + ' failed.'
+        #
+        status = 'done'
+        if speculative and message:
+            status = 'failed'
+        #
+        self.__updateEntry(key, entry, {'status': status, 'stage': 'done', 'message': message, 'end': time.time()})
+        return instId, message
+
+    def prebuild(self, cifObj, cifFile):
+        """ Speculatively build workspaces for chopper candidates of summary file. Only one prebuild runs per session.
+        """
+        maxCount = self.getPrebuildCount()
+        if maxCount <= 0:
+            return
+        #
+        try:
+            with open(os.path.join(self.__sessionPath, PREBUILD_LOCK_FILE_NAME), 'a') as lfh:
+                try:
+                    fcntl.flock(lfh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except (IOError, OSError):
+                    return
+                #
+                for submitValue, instList in self.__getMissingList(cifObj, cifFile, maxCount):
+                    self.prepare(submitValue, instList, cifFile, speculative=True)
+                #
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+
+    def needPrebuild(self, cifObj, cifFile):
+        """ True if prebuild is enabled, no prebuild is running and a chopper candidate has no current workspace
+        """
+        maxCount = self.getPrebuildCount()
+        if maxCount <= 0:
+            return False
+        #
+        try:
+            with open(os.path.join(self.__sessionPath, PREBUILD_LOCK_FILE_NAME), 'a') as lfh:
+                try:
+                    fcntl.flock(lfh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except (IOError, OSError):
+                    # prebuild is running
+                    return False
+                #
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+            return False
+        #
+        return len(self.__getMissingList(cifObj, cifFile, maxCount)) > 0
+
+    def getCandidateList(self, cifObj):
+        """ Return list of (chopper option, instance list) likely to be opened from summary page
+        """
+        candidateList = []
+        if not cifObj:
+            return candidateList
+        #
+        for d in cifObj.getValueList('pdbx_split_polymer_residue_info'):
+            if 'instance_id' in d:
+                candidateList.append((SPLIT_OPTION, [d['instance_id']]))
+            #
+        #
+        for d in cifObj.getValueList('pdbx_non_polymer_info'):
+            if ('instance_id' in d) and (d.get('action_required', '') == 'Y'):
+                candidateList.append((MERGE_SPLIT_OPTION, [d['instance_id']]))
+            #
+        #
+        return candidateList
+
+    def getPrebuildCount(self):
+        try:
+            return int(getSiteConfig(self.__siteId).get(PREBUILD_KEY) or 0)
+        except (TypeError, ValueError):
+            return 0
+        #
+
+    def getStatus(self, semaphore='', instId=''):
+        """ Return index entry of workspace started with semaphore or built as instId (None if not found)
+        """
+        for entry in self.__read().values():
+            if (semaphore and (entry.get('semaphore') == semaphore)) or (instId and (entry.get('instid') == instId)):
+                if (entry['status'] == 'running') and (not self.__isAlive(entry.get('pid'))):
+                    entry['status'] = 'failed'
+                #
+                return entry
+            #
+        #
+        return None
+
+    def __getKey(self, submitValue, instList):
+        return submitValue + '|' + ','.join(instList)
+
+    def __getModelStamp(self, cifFile):
+        """ Return [size, mtime] of model file cifFile (in session directory), None if it does not exist
+        """
+        try:
+            statInfo = os.stat(os.path.join(self.__sessionPath, cifFile))
+            return [statInfo.st_size, statInfo.st_mtime]
+        except (OSError, TypeError):
+            return None
+        #
+
+    def __isCurrent(self, entry, modelStamp):
+        """ True if workspace entry was built from the current model file
+        """
+        return (modelStamp is not None) and (entry.get('model') == modelStamp)
+
+    def __getMissingList(self, cifObj, cifFile, maxCount):
+        """ Return chopper candidates without workspace (or with failed or stale workspace) built from current model file
+        """
+        modelStamp = self.__getModelStamp(cifFile)
+        indexD = self.__read()
+        missingList = []
+        for submitValue, instList in self.getCandidateList(cifObj)[:maxCount]:
+            entry = indexD.get(self.__getKey(submitValue, instList))
+            if (entry is None) or (not self.__isCurrent(entry, modelStamp)):
+                missingList.append((submitValue, instList))
+            #
+        #
+        return missingList
+
+    def __getEntry(self, key):
+        return self.__read().get(key)
+
+    def __claim(self, key, semaphore, modelStamp):
+        """ Mark unclaimed workspace built from current model file (modelStamp) as claimed (by request with semaphore)
+            and return its entry. A stale entry is removed.
+        """
+        claimL = []
+
+        def _claim(indexD):
+            if (key in indexD) and (not self.__isCurrent(indexD[key], modelStamp)):
+                if self.__verbose:
+                    self.__lfh.write("+ChopperPrepUtil.__claim() - drop stale workspace %s for %s\n" % (indexD[key]['instid'], key))
+                #
+                del indexD[key]
+                return True
+            #
+            if (key in indexD) and (not indexD[key]['claimed']) and (indexD[key]['status'] != 'failed'):
+                indexD[key]['claimed'] = True
+                indexD[key]['semaphore'] = semaphore
+                claimL.append(dict(indexD[key]))
+                return True
+            #
+            return False
+        #
+        self.__update(_claim)
+        if claimL:
+            return claimL[0]
+        #
+        return None
+
+    def __setEntry(self, key, entry, replaceRunning=True):
+        setL = []
+
+        def _set(indexD):
+            if (not replaceRunning) and (key in indexD) and self.__isCurrent(indexD[key], entry['model']):
+                return False
+            #
+            indexD[key] = entry
+            setL.append(True)
+            return True
+        #
+        self.__update(_set)
+        return bool(setL)
+
+    def __updateEntry(self, key, entry, valueD):
+        """ Update index entry of key if it still is the build started with entry (not replaced by a synchronous build)
+        """
+        def _update(indexD):
+            if (key not in indexD) or (indexD[key].get('pid') != entry['pid']) or (indexD[key].get('start') != entry['start']):
+                return False
+            #
+            indexD[key].update(valueD)
+            return True
+        #
+        self.__update(_update)
+
+    def __read(self):
+        if not os.access(self.__indexPath, os.F_OK):
+            return {}
+        #
+        try:
+            with open(self.__indexPath, 'r') as ifh:
+                fcntl.flock(ifh.fileno(), fcntl.LOCK_SH)
+                text = ifh.read()
+            #
+            if text:
+                return json.loads(text)
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return {}
+
+    def __update(self, func):
+        """ Lock index, apply func(indexD) and rewrite index if func returns True
+        """
+        try:
+            with open(self.__indexPath, 'a+') as fh:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                fh.seek(0)
+                text = fh.read()
+                indexD = {}
+                if text:
+                    indexD = json.loads(text)
+                #
+                if func(indexD):
+                    fh.seek(0)
+                    fh.truncate()
+                    fh.write(json.dumps(indexD, indent=1, sort_keys=True))
+                    fh.flush()
+                #
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+
+    def __isAlive(self, pid):
+        if not pid:
+            return False
+        #
+        try:
+            os.kill(pid, 0)
+            return True
+        except OSError:
+            return False
+        #
+
+    def __getSession(self):
+        """ Join existing session or create new session as required.
+        """
+        #
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
+        self.__sessionPath = self.__sObj.getPath()
+        if (self.__verbose):
+            self.__lfh.write("------------------------------------------------------\n")
+            self.__lfh.write("+ChopperPrepUtil.__getSession() - creating/joining session %s\n" % self.__sObj.getId())
+            self.__lfh.write("+ChopperPrepUtil.__getSession() - session path %s\n" % self.__sessionPath)
+        #
@@ -2,6 +2,13 @@
 # File:  CombineCoord.py
 # Date:  06-Dec-2012
 # Updates:
+#  19-Oct-2026  zf   use CommandUtil result cache for updateComponent & annotateComp
+#  19-Oct-2026  zf   get chopper instance id from session manifest counter
+#  19-Oct-2026  zf   report chopper instance id in command traces
+#  19-Oct-2026  zf   add progress callback reporting preparation stage
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
+#  19-Oct-2026  zf   updateComponent changes its input in place, run it without the result cache
+#  19-Oct-2026  zf   record combined instances in <instId>.pkl (targets of staged chopper edits)
 ##
 """
 Combine selected instances into single residue.
@@ -33,6 +40,8 @@ import sys
 
 from wwpdb.apps.entity_transform.utils.CommandUtil import CommandUtil
 from wwpdb.apps.entity_transform.utils.GetLogMessage import GetLogMessage
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SessionManifest import SessionManifest
 #
 
 
@@ -52,6 +61,7 @@ class CombineCoord(object):
         self.__instId = ''
         self.__message = ''
         self.__submitValue = ''
+        self.__progressCallback = None
         #
         self.__getSession()
         self.__getInstId()
@@ -60,8 +70,15 @@ class CombineCoord(object):
         #
         self.__cmdUtil = CommandUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
 
+    def setProgressCallback(self, callback):
+        """ Set function called with stage name ('combine', 'copy', 'update_component', 'annotate_comp') as preparation proceeds
+        """
+        self.__progressCallback = callback
+
     def processWithCombine(self, submitValue=''):
         #
+        self.__writeInstanceInfo(False)
+        self.__reportProgress('combine')
         self.__runCombineScript(submitValue=submitValue)
         #
         if self.__message:
@@ -73,20 +90,10 @@ class CombineCoord(object):
         #
         self.__submitValue = submitValue
         #
-        if self.__submitValue and (len(self.__instList) == 1) and self.__instList[0]:
-            pickleFilePath = os.path.join(self.__instancePath, self.__instId + ".pkl")
-            if os.access(pickleFilePath, os.F_OK):
-                os.remove(pickleFilePath)
-            #
-            pickleD = {}
-            pickleD['residue'] = self.__instList[0]
-            pickleD['submit'] = self.__submitValue
-            #
-            fb = open(pickleFilePath, "wb")
-            pickle.dump(pickleD, fb)
-            fb.close()
-        #
+        self.__writeInstanceInfo(bool(self.__submitValue) and (len(self.__instList) == 1) and bool(self.__instList[0]))
+        self.__reportProgress('copy')
         if not self.__runCopyScript():
+            self.__reportProgress('combine')
             self.__runCombineScript(submitValue=submitValue)
         #
         if self.__message:
@@ -101,17 +108,44 @@ class CombineCoord(object):
         return self.__message
 
     def __getInstId(self):
-        count = 1
+        """ Get next chopper_inst_N from session manifest counter (probe session directory if no manifest can be written)
+        """
+        manifest = SessionManifest(dirPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+        count = 0
         while True:
+            nextCount = manifest.nextCounter('chopper_inst')
+            if nextCount is None:
+                count += 1
+            else:
+                count = nextCount
+            #
             self.__instId = 'chopper_inst_' + str(count)
             pth = os.path.join(self.__sessionPath, self.__instId)
             if not os.access(pth, os.F_OK):
                 os.makedirs(pth)
+                manifest.addFile(self.__instId, 'chopper_instance')
                 break
             #
-            count += 1
         #
 
+    def __writeInstanceInfo(self, residueFlag):
+        """ Write <instId>.pkl with the instances combined in the workspace ('instances') and, for a single residue
+            split with the chopper, the residue instance ('residue') and chopper option ('submit')
+        """
+        pickleFilePath = os.path.join(self.__instancePath, self.__instId + ".pkl")
+        if os.access(pickleFilePath, os.F_OK):
+            os.remove(pickleFilePath)
+        #
+        pickleD = {}
+        pickleD['instances'] = [instId for instId in self.__instList if instId]
+        if residueFlag:
+            pickleD['residue'] = self.__instList[0]
+            pickleD['submit'] = self.__submitValue
+        #
+        fb = open(pickleFilePath, "wb")
+        pickle.dump(pickleD, fb)
+        fb.close()
+
     def __runCombineScript(self, submitValue=''):
         if not self.__instList or not self.__instList[0]:
             self.__message = 'No instance found.'
@@ -123,6 +157,7 @@ class CombineCoord(object):
             + self.__instId + '.comp.cif -group ' + ','.join(self.__instList) + ' '
         #
         self.__cmdUtil.setSessionPath(self.__instancePath)
+        self.__cmdUtil.setInstanceId(self.__instId)
         self.__cmdUtil.runAnnotCmd('GetCombineCoord', ciffile, '', 'run-comb.log', 'run-comb.clog', options)
         #
         logfile = os.path.join(self.__instancePath, 'run-comb.log')
@@ -160,19 +195,26 @@ class CombineCoord(object):
             return
         #
         self.__cmdUtil.setSessionPath(self.__instancePath)
+        self.__reportProgress('update_component')
         self.__cmdUtil.runCCToolCmd('updateComponent', '', '', '', 'update-comp.clog', ' -f ' + self.__instId + '.comp.cif ')
-        self.__cmdUtil.runAnnotateComp(self.__instId + '.comp.cif', self.__instId + '.comp.cif.new', 'update-comp.clog')
+        self.__reportProgress('annotate_comp')
+        self.__cmdUtil.runAnnotateComp(self.__instId + '.comp.cif', self.__instId + '.comp.cif.new', 'update-comp.clog', useCache=True)
         #
         source = os.path.join(self.__instancePath, self.__instId + '.comp.cif.new')
         if os.access(source, os.F_OK):
             os.rename(source, target)
         #
 
+    def __reportProgress(self, stage):
+        if self.__progressCallback is not None:
+            self.__progressCallback(stage)
+        #
+
     def __getSession(self):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionPath = self.__sObj.getPath()
         if (self.__verbose):
             self.__lfh.write("------------------------------------------------------\n")
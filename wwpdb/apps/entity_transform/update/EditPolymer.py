@@ -2,6 +2,7 @@
 # File:  EditPolymer.py
 # Date:  23-Jul-2020
 # Updates:
+#  19-Oct-2026  zf   pass changed chains to _runUpdateScript for staged edits
 ##
 """
 Split polymer(s) in coordinate cif file.
@@ -40,7 +41,7 @@ class EditPolymer(UpdateBase):
         if self._message:
             return
         #
-        self._runUpdateScript('EditPolymer', 'Remove residue(s) from polymer sequence(s)', 'run-edit', options)
+        self._runUpdateScript('EditPolymer', 'Remove residue(s) from polymer sequence(s)', 'run-edit', options, targetList=self._targetList)
 
     def __getUsrDefinedOptions(self):
         """ get user defined options
@@ -68,6 +69,7 @@ class EditPolymer(UpdateBase):
             clist = chainList.split(',')
             for chain_id in clist:
                 options += ' -delete ' + str(chain_id) + ':' + deletes
+                self._targetList.append('chain:' + str(chain_id))
             #
         #
         return options
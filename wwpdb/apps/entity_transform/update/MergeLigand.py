@@ -2,6 +2,7 @@
 # File:  MergeLigand.py
 # Date:  09-Feb-2019
 # Updates:
+#  19-Oct-2026  zf   pass changed chains/ligands to _runUpdateScript for staged edits
 ##
 """
 Merge ligands in coordinate cif file.
@@ -37,5 +38,5 @@ class MergeLigand(UpdateBase):
         """
         options = self._getMergeOptions(ligandFlag=True)
         if options:
-            self._runUpdateScript('MergeLigand', 'Merge to ligand', 'run-merge', options)
+            self._runUpdateScript('MergeLigand', 'Merge to ligand', 'run-merge', options, targetList=self._targetList)
         #
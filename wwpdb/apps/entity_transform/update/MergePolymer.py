@@ -2,6 +2,7 @@
 # File:  MergePolymer.py
 # Date:  04-Dec-2012
 # Updates:
+#  19-Oct-2026  zf   pass changed chains/ligands to _runUpdateScript for staged edits
 ##
 """
 Merge polymer(s) in coordinate cif file.
@@ -37,5 +38,5 @@ class MergePolymer(UpdateBase):
         """
         options = self._getMergeOptions()
         if options:
-            self._runUpdateScript('MergePolymer', 'Merge to polymer', 'run-merge', options)
+            self._runUpdateScript('MergePolymer', 'Merge to polymer', 'run-merge', options, targetList=self._targetList)
         #
@@ -2,6 +2,7 @@
 # File:  SplitPolymer.py
 # Date:  12-Dec-2012
 # Updates:
+#  19-Oct-2026  zf   pass changed chains to _runUpdateScript for staged edits
 ##
 """
 Split polymer(s) in coordinate cif file.
@@ -40,7 +41,7 @@ class SplitPolymer(UpdateBase):
         if self._message:
             return
         #
-        self._runUpdateScript('SplitPolymer', 'Split polymer to polymer(s)/non-polymer(s)', 'run-split', options)
+        self._runUpdateScript('SplitPolymer', 'Split polymer to polymer(s)/non-polymer(s)', 'run-split', options, targetList=self._targetList)
 
     def __getUsrDefinedOptions(self):
         """ get user defined options
@@ -68,6 +69,7 @@ class SplitPolymer(UpdateBase):
             clist = chainList.split(',')
             for chain_id in clist:
                 options += ' -split ' + str(chain_id) + ':' + splits
+                self._targetList.append('chain:' + str(chain_id))
             #
         #
         return options
@@ -0,0 +1,116 @@
+##
+# File:  StagedUpdate.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   snapshot model file in session snapshot journal before it is replaced
+#  19-Oct-2026  zf   replace model file through SnapshotJournal.finish()
+#  19-Oct-2026  zf   remove only the committed edits from the change-set
+##
+"""
+Commit/discard coordinate edits staged in session change-set.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import shutil
+import sys
+import traceback
+
+from wwpdb.apps.entity_transform.update.UpdateBase import UpdateBase
+
+
+class StagedUpdate(UpdateBase):
+    """ Class responsible for applying the staged edits of a session in one pass.
+
+        The edits are grouped by update program (see ChangeSet.getCommitGroups()), so independent merge/split/edit/
+        UpdateEntry edits of one kind run as a single program call, dependent edits in staging order. The programs
+        run on a working copy of the model file, which replaces the model file only after every program succeeded;
+        a failing edit leaves the model file and the change-set untouched. Only the committed edits are removed from
+        the change-set, edits staged while the commit runs are kept.
+    """
+    def __init__(self, reqObj=None, summaryCifObj=None, verbose=False, log=sys.stderr):
+        super(StagedUpdate, self).__init__(reqObj=reqObj, summaryCifObj=summaryCifObj, verbose=verbose, log=log)
+        #
+        self.__changeSet = self._getChangeSet()
+
+    def getEditList(self):
+        """ Return staged edit records
+        """
+        return self.__changeSet.getEditList()
+
+    def discard(self):
+        """ Remove staged edits
+        """
+        self.__changeSet.discard()
+        self._message = 'Staged edits discarded.'
+
+    def commit(self):
+        """ Apply staged edits, return True if the model file was updated
+        """
+        modelPath = os.path.join(self._sessionPath, self._modelCIFile)
+        if not os.access(modelPath, os.F_OK):
+            self._message = 'Model coordinate file ' + self._modelCIFile + ' does not exist.'
+            return False
+        #
+        groupList = self.__changeSet.getCommitGroups()
+        if not groupList:
+            self._message = 'No staged edit found.'
+            return False
+        #
+        editIdList = [editId for groupD in groupList for editId in groupD['edits']]
+        numEdits = len(editIdList)
+        self._message = self.__changeSet.checkModel()
+        if self._message:
+            return False
+        #
+        workFile = self._identifier + '_model_P1.staged.cif'
+        workPath = os.path.join(self._sessionPath, workFile)
+        try:
+            shutil.copyfile(modelPath, workPath)
+            for i, groupD in enumerate(groupList):
+                if self._verbose:
+                    self._lfh.write("+StagedUpdate.commit() - running %s for staged edit(s) %s\n" % (groupD['program'], groupD['edits']))
+                #
+                error = self._runProgram(groupD['program'], groupD['task'], 'staged-' + str(i + 1) + '-' + groupD['log_root'], groupD['options'], workFile)
+                if error:
+                    self._message = 'Staged edit(s) ' + ', '.join([str(editId) for editId in groupD['edits']]) + ' failed:\n' + error
+                    return False
+                #
+            #
+            journal = self._getSnapshotJournal()
+            step = journal.capture('Commit ' + str(numEdits) + ' staged edit(s)')
+            if not step:
+                self._message = 'Saving snapshot of ' + self._modelCIFile + ' failed.'
+                return False
+            #
+            os.rename(workPath, os.path.join(self._sessionPath, journal.getOutputFile(step)))
+            journal.finish(step)
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self._lfh)
+            self._message = 'Committing staged edits failed.'
+            return False
+        finally:
+            if os.access(workPath, os.F_OK):
+                os.remove(workPath)
+            #
+        #
+        self.__changeSet.removeEdits(editIdList)
+        if self._cifObj:
+            self._message = 'Entry ' + self._cifObj.getEntryIds() + ' updated (' + str(numEdits) + ' staged edit(s)).'
+        else:
+            self._message = 'Entry updated (' + str(numEdits) + ' staged edit(s)).'
+        #
+        return True
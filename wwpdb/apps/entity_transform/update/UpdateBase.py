@@ -2,6 +2,10 @@
 # File:  UpdateBase.py
 # Date:  04-Dec-2012
 # Updates:
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
+#  19-Oct-2026  zf   stage edit in session change-set instead of running it if request has staged=yes
+#  19-Oct-2026  zf   snapshot model file in session snapshot journal before each update program run
+#  19-Oct-2026  zf   update program writes temporary file renamed over the model file, model file stays in place
 ##
 """
 Merge polymer(s) in coordinate cif file.
@@ -25,8 +29,11 @@ import os
 import sys
 import inspect
 
+from wwpdb.apps.entity_transform.update.ChangeSet import ChangeSet
 from wwpdb.apps.entity_transform.utils.CommandUtil import CommandUtil
 from wwpdb.apps.entity_transform.utils.GetLogMessage import GetLogMessage
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SnapshotJournal import SnapshotJournal
 
 
 class UpdateBase(object):
@@ -46,6 +53,7 @@ class UpdateBase(object):
         self._modelCIFile = self._identifier + '_model_P1.cif'
         #
         self._message = ''
+        self._targetList = []
         self.__groups = []
         #
         self.__getSession()
@@ -59,7 +67,7 @@ class UpdateBase(object):
         """ Join existing session or create new session as required.
         """
         #
-        self._sObj = self._reqObj.newSessionObj()
+        self._sObj = getRequestContext(self._reqObj).getSessionObj()
         self._sessionPath = self._sObj.getPath()
         if self._verbose:
             self._lfh.write("------------------------------------------------------\n")
@@ -77,35 +85,85 @@ class UpdateBase(object):
         options = ''
         for group in self.__groups:
             options += ' -group ' + ','.join(group) + ' '
+            for v in (group[1:] if ligandFlag else group):
+                if len(v.split('_')) > 1:
+                    self._targetList.append('ligand:' + v)
+                else:
+                    self._targetList.append('chain:' + v)
+                #
+            #
         #
         return options
 
-    def _runUpdateScript(self, progName, taskName, logRootName, options):
-        """ Run update program
+    def _isStaged(self):
+        """ True if edits are staged in the session change-set instead of being applied (staged=yes)
+        """
+        return str(self._reqObj.getValue('staged')) == 'yes'
+
+    def _getChangeSet(self):
+        return ChangeSet(sessionPath=self._sessionPath, modelFile=self._modelCIFile, verbose=self._verbose, log=self._lfh)
+
+    def _getSnapshotJournal(self):
+        return SnapshotJournal(sessionPath=self._sessionPath, fileName=self._modelCIFile, verbose=self._verbose, log=self._lfh)
+
+    def _runUpdateScript(self, progName, taskName, logRootName, options, targetList=None, commonOptions=''):
+        """ Run update program (or stage it, see _isStaged()). targetList holds the chains/ligands/instances
+            changed by the edit, commonOptions the options which are not specific to them.
         """
         if not os.access(os.path.join(self._sessionPath, self._modelCIFile), os.F_OK):
             self._message = 'Model coordinate file ' + self._modelCIFile + ' does not exist.'
             return
         #
+        if self._isStaged():
+            changeSet = self._getChangeSet()
+            error = changeSet.addEdit(taskName, progName, logRootName, options, targetList=targetList, commonOptions=commonOptions)
+            if error:
+                self._message = error
+            else:
+                self._message = 'Option "' + taskName + '" staged (' + str(len(changeSet.getEditList())) + ' staged edit(s)).'
+            #
+            return
+        #
+        error = self._runProgram(progName, taskName, logRootName, commonOptions + options, self._modelCIFile)
+        if error:
+            self._message = error
+        elif self._cifObj:
+            self._message = 'Entry ' + self._cifObj.getEntryIds() + ' updated.'
+        else:
+            self._message = 'Entry updated.'
+        #
+
+    def _runProgram(self, progName, taskName, logRootName, options, cifFile):
+        """ Run update program on cifFile, return error message. For the model file a snapshot is added to the
+            snapshot journal first; the program writes a temporary file which replaces the model file when it is done.
+        """
         if not self._cmdUtil:
             self._cmdUtil = CommandUtil(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
         #
         self._cmdUtil.setSessionPath(self._sessionPath)
-        self._cmdUtil.runAnnotCmd(progName, self._modelCIFile, self._modelCIFile, logRootName + '.log', logRootName + '.clog', options)
+        if cifFile == self._modelCIFile:
+            journal = self._getSnapshotJournal()
+            step = journal.capture(taskName)
+            if not step:
+                return 'Saving snapshot of ' + cifFile + ' failed.'
+            #
+            try:
+                self._cmdUtil.runAnnotCmd(progName, cifFile, journal.getOutputFile(step), logRootName + '.log', logRootName + '.clog', options)
+            finally:
+                journal.finish(step)
+            #
+        else:
+            self._cmdUtil.runAnnotCmd(progName, cifFile, cifFile, logRootName + '.log', logRootName + '.clog', options)
         #
         logfile = os.path.join(self._sessionPath, logRootName + '.log')
         if not os.access(logfile, os.F_OK):
-            self._message = 'Option "' + taskName + '" failed. No log file found.'
-            return
+            return 'Option "' + taskName + '" failed. No log file found.'
         #
         error = GetLogMessage(logfile)
         if error:
-            self._message = '<pre>\n' + error + '</pre>\n'
-        elif self._cifObj:
-            self._message = 'Entry ' + self._cifObj.getEntryIds() + ' updated.'
-        else:
-            self._message = 'Entry updated.'
+            return '<pre>\n' + error + '</pre>\n'
         #
+        return ''
 
     def __getGroups(self, ligandFlag):
         """ Get groups
@@ -2,6 +2,7 @@
 # File:  UpdateFile.py
 # Date:  16-Oct-2012
 # Updates:
+#  19-Oct-2026  zf   pass changed instances and common option to _runUpdateScript for staged edits
 ##
 """
 Update coordinate cif file.
@@ -47,7 +48,8 @@ class UpdateFile(UpdateBase):
         if self._message:
             return
         #
-        self._runUpdateScript('UpdateEntry', 'Update Entry', 'update-entry', options)
+        self._runUpdateScript('UpdateEntry', 'Update Entry', 'update-entry', options, targetList=self._targetList,
+                              commonOptions=str(self._reqObj.getValue('option')))
 
     def __getSelectedInstIds(self):
         """ Get selected instance IDs
@@ -90,10 +92,6 @@ class UpdateFile(UpdateBase):
             self._message = '<pre>\nNothing selected.\n</pre>\n'
             return optionlist
         #
-        extraOption = str(self._reqObj.getValue('option'))
-        if extraOption:
-            optionlist += extraOption
-        #
         error = ''
         for dic in self.__selectedInstIds:
             error1 = self.__runGraphMatch(dic)
@@ -113,6 +111,7 @@ class UpdateFile(UpdateBase):
             if 'only' in dic:
                 mapfile += ':metadataonly'
             optionlist += ' -mapping ' + mapfile
+            self._targetList.append('instance:' + dic['instid'])
         #
         optionlist += ' '
         if error:
@@ -0,0 +1,172 @@
+##
+# File:  BundleFileUtil.py
+# Date:  19-Oct-2026
+# Updates:
+##
+"""
+Stream zip or tar.gz bundle of session files with fixed memory.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import sys
+import tarfile
+import traceback
+import zipfile
+import zlib
+
+
+class _StreamBuffer(object):
+    """ Minimal non-seekable file object which collects written data until it is drained
+    """
+    def __init__(self):
+        self.__chunks = []
+        self.__offset = 0
+
+    def write(self, data):
+        if data:
+            self.__chunks.append(bytes(data))
+            self.__offset += len(data)
+        #
+        return len(data)
+
+    def tell(self):
+        return self.__offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.__chunks)
+        self.__chunks = []
+        return data
+
+
+class BundleFileUtil(object):
+    """ Class responsible for streaming an archive of session files.
+
+        The archive is produced block by block through a generator, so neither the archive nor the input files are
+        ever held in memory or written to disk as a whole.
+    """
+    def __init__(self, blockSize=1048576, verbose=False, log=sys.stderr):
+        self.__blockSize = blockSize
+        self.__verbose = verbose
+        self.__lfh = log
+
+    def getContentType(self, bundleFormat):
+        if bundleFormat == 'tgz':
+            return 'application/gzip'
+        #
+        return 'application/zip'
+
+    def getFileName(self, rootName, bundleFormat):
+        if bundleFormat == 'tgz':
+            return rootName + '.tar.gz'
+        #
+        return rootName + '.zip'
+
+    def iterBundle(self, fileList, bundleFormat='zip'):
+        """ Yield archive data for list of (file path, archive name) tuples
+        """
+        if bundleFormat == 'tgz':
+            return self.__iterTarGz(fileList)
+        #
+        return self.__iterZip(fileList)
+
+    def __iterZip(self, fileList):
+        sink = _StreamBuffer()
+        zf = zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+        for filePath, arcName in fileList:
+            if not os.access(filePath, os.F_OK):
+                continue
+            #
+            try:
+                zinfo = zipfile.ZipInfo.from_file(filePath, arcname=arcName)
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                with open(filePath, 'rb') as ifh:
+                    with zf.open(zinfo, mode='w', force_zip64=True) as ofh:
+                        for block in iter(lambda: ifh.read(self.__blockSize), b''):  # pylint: disable=cell-var-from-loop
+                            ofh.write(block)
+                            data = sink.drain()
+                            if data:
+                                yield data
+                            #
+                        #
+                    #
+                #
+            except:  # noqa: E722 pylint: disable=bare-except
+                traceback.print_exc(file=self.__lfh)
+            #
+            data = sink.drain()
+            if data:
+                yield data
+            #
+            if self.__verbose:
+                self.__lfh.write("+BundleFileUtil.__iterZip() - added %s\n" % filePath)
+            #
+        #
+        zf.close()
+        data = sink.drain()
+        if data:
+            yield data
+        #
+
+    def __iterTarGz(self, fileList):
+        """ Tar members are written header/data/padding by hand so each input block is compressed and yielded at once
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        tf = tarfile.TarFile(fileobj=_StreamBuffer(), mode='w', format=tarfile.PAX_FORMAT)
+        for filePath, arcName in fileList:
+            if not os.access(filePath, os.F_OK):
+                continue
+            #
+            try:
+                tinfo = tf.gettarinfo(filePath, arcname=arcName)
+                data = compressor.compress(tinfo.tobuf(format=tarfile.PAX_FORMAT, encoding=tarfile.ENCODING, errors='surrogateescape'))
+                if data:
+                    yield data
+                #
+                size = 0
+                with open(filePath, 'rb') as ifh:
+                    for block in iter(lambda: ifh.read(self.__blockSize), b''):  # pylint: disable=cell-var-from-loop
+                        size += len(block)
+                        if size > tinfo.size:
+                            block = block[:len(block) - (size - tinfo.size)]
+                            size = tinfo.size
+                        #
+                        data = compressor.compress(block)
+                        if data:
+                            yield data
+                        #
+                        if size == tinfo.size:
+                            break
+                        #
+                    #
+                #
+                # pad member to tinfo.size (file shrunk while reading) and to tar block boundary
+                padding = (tinfo.size - size) + (tarfile.BLOCKSIZE - tinfo.size % tarfile.BLOCKSIZE) % tarfile.BLOCKSIZE
+                data = compressor.compress(tarfile.NUL * padding)
+                if data:
+                    yield data
+                #
+            except:  # noqa: E722 pylint: disable=bare-except
+                traceback.print_exc(file=self.__lfh)
+            #
+            if self.__verbose:
+                self.__lfh.write("+BundleFileUtil.__iterTarGz() - added %s\n" % filePath)
+            #
+        #
+        yield compressor.compress(tarfile.NUL * (2 * tarfile.BLOCKSIZE)) + compressor.flush()
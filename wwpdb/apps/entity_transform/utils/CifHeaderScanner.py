@@ -0,0 +1,263 @@
+##
+# File:  CifHeaderScanner.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   continue after atom_site (skipping its records) if a header category was not found before it
+##
+"""
+Streaming scanner for entry header categories (database_2, struct) in coordinate cif file.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import sys
+
+
+class CifHeaderScanner(object):
+    """ Class responsible for collecting header category values from cif data fed in arbitrary sized chunks.
+        Scanning stops at the first atom_site item, so the coordinate records are never tokenized. If a header category
+        was not found before atom_site, the rest of the file is scanned with the atom_site records skipped line by line.
+    """
+    def __init__(self, categoryList=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        if categoryList is None:
+            categoryList = ['database_2', 'struct']
+        #
+        self.__categoryList = categoryList
+        self.__values = {}
+        for catName in self.__categoryList:
+            self.__values[catName] = []
+        #
+        self.__buffer = b''
+        self.__done = False
+        self.__textLines = None
+        self.__skipAtomSite = False
+        self.__skipText = False
+        #
+        self.__mode = ''
+        self.__loopNames = []
+        self.__loopRow = []
+        self.__kvCatName = ''
+        self.__kvRow = {}
+        self.__pendingName = ''
+
+    def feed(self, data):
+        """ Feed next chunk of (bytes) cif data
+        """
+        if self.__done or not data:
+            return
+        #
+        self.__buffer += data
+        lines = self.__buffer.split(b'\n')
+        self.__buffer = lines.pop()
+        for line in lines:
+            self.__processLine(line.decode('utf-8', 'replace').rstrip('\r'))
+            if self.__done:
+                self.__buffer = b''
+                break
+            #
+        #
+
+    def close(self):
+        """ Process remaining buffered data
+        """
+        if self.__buffer and not self.__done:
+            self.__processLine(self.__buffer.decode('utf-8', 'replace').rstrip('\r'))
+        #
+        self.__buffer = b''
+        self.__endCategory()
+        self.__done = True
+
+    def scanFile(self, filePath, blockSize=1048576):
+        """ Scan cif file from disk
+        """
+        with open(filePath, 'rb') as ifh:
+            while not self.__done:
+                data = ifh.read(blockSize)
+                if not data:
+                    break
+                #
+                self.feed(data)
+            #
+        #
+        self.close()
+
+    def isDone(self):
+        return self.__done
+
+    def GetValue(self, catName):
+        """ Return category values as a list of dictionaries with item name as key (same as mmCIFUtil.GetValue)
+        """
+        if catName in self.__values:
+            return self.__values[catName]
+        #
+        return []
+
+    def GetSingleValue(self, catName, itemName):
+        """ Return the first value of item name 'itemName' in 'catName' category
+        """
+        dlist = self.GetValue(catName)
+        if dlist and (itemName in dlist[0]):
+            return dlist[0][itemName]
+        #
+        return ''
+
+    def __processLine(self, line):
+        if self.__skipAtomSite:
+            if line.startswith(';'):
+                self.__skipText = not self.__skipText
+                return
+            #
+            token = line.lstrip().lower()
+            if self.__skipText or (not token.startswith(('_', 'loop_', 'data_'))) or token.startswith('_atom_site.'):
+                return
+            #
+            self.__skipAtomSite = False
+        #
+        if self.__textLines is not None:
+            if line.startswith(';'):
+                self.__processToken('value', '\n'.join(self.__textLines))
+                self.__textLines = None
+            else:
+                self.__textLines.append(line)
+            #
+            return
+        #
+        if line.startswith(';'):
+            self.__textLines = [line[1:]]
+            return
+        #
+        for tokenType, token in self.__tokenize(line):
+            self.__processToken(tokenType, token)
+            if self.__done or self.__skipAtomSite:
+                return
+            #
+        #
+
+    def __tokenize(self, line):
+        """ Split a cif line into (type, token) tuples
+        """
+        tokenList = []
+        idx = 0
+        length = len(line)
+        while idx < length:
+            if line[idx].isspace():
+                idx += 1
+                continue
+            #
+            if line[idx] == '#':
+                break
+            #
+            if line[idx] in ('"', "'"):
+                quote = line[idx]
+                end = idx + 1
+                while end < length:
+                    if line[end] == quote and (end + 1 == length or line[end + 1].isspace()):
+                        break
+                    #
+                    end += 1
+                #
+                tokenList.append(('value', line[idx + 1:end]))
+                idx = end + 1
+                continue
+            #
+            end = idx
+            while end < length and not line[end].isspace():
+                end += 1
+            #
+            token = line[idx:end]
+            idx = end
+            if token.startswith('_'):
+                tokenList.append(('name', token))
+            elif token.lower() == 'loop_':
+                tokenList.append(('loop', token))
+            elif token.lower().startswith('data_'):
+                tokenList.append(('data', token))
+            else:
+                tokenList.append(('value', token))
+            #
+        #
+        return tokenList
+
+    def __processToken(self, tokenType, token):
+        if tokenType == 'name':
+            catName, itemName = self.__splitName(token)
+            if catName == 'atom_site':
+                self.__endCategory()
+                if all(self.__values.values()):
+                    self.__done = True
+                else:
+                    self.__skipAtomSite = True
+                #
+                return
+            #
+            if (self.__mode == 'loop') and (not self.__loopRow) and (not self.__loopNames or self.__loopNames[0][0] == catName):
+                self.__loopNames.append((catName, itemName))
+                return
+            #
+            if (self.__mode != 'kv') or (catName != self.__kvCatName):
+                self.__endCategory()
+                self.__mode = 'kv'
+                self.__kvCatName = catName
+            #
+            self.__pendingName = itemName
+        elif tokenType == 'value':
+            if self.__mode == 'loop' and self.__loopNames:
+                self.__loopRow.append(token)
+                if len(self.__loopRow) == len(self.__loopNames):
+                    self.__addRow(self.__loopNames[0][0], dict(zip([name[1] for name in self.__loopNames], self.__loopRow)))
+                    self.__loopRow = []
+                #
+            elif self.__mode == 'kv' and self.__pendingName:
+                self.__kvRow[self.__pendingName] = token
+                self.__pendingName = ''
+            #
+        elif tokenType == 'loop':
+            self.__endCategory()
+            self.__mode = 'loop'
+        elif tokenType == 'data':
+            self.__endCategory()
+        #
+
+    def __splitName(self, name):
+        tlist = name[1:].split('.', 1)
+        if len(tlist) == 2:
+            return tlist[0].lower(), tlist[1]
+        #
+        return tlist[0].lower(), ''
+
+    def __endCategory(self):
+        if self.__mode == 'kv' and self.__kvRow:
+            self.__addRow(self.__kvCatName, self.__kvRow)
+        #
+        self.__mode = ''
+        self.__loopNames = []
+        self.__loopRow = []
+        self.__kvCatName = ''
+        self.__kvRow = {}
+        self.__pendingName = ''
+
+    def __addRow(self, catName, row):
+        if catName not in self.__values:
+            return
+        #
+        tD = {}
+        for itemName, value in row.items():
+            if value != '?' and value != '.':
+                tD[itemName] = value
+            #
+        #
+        if tD:
+            self.__values[catName].append(tD)
+        #
@@ -0,0 +1,278 @@
+##
+# File:  CommandCacheUtil.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   track blob store size in size file, walk the cache only when it exceeds maxSize
+##
+"""
+Content-addressed result cache for back-end command invocations.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import sys
+import traceback
+
+
+class CommandCacheUtil(object):
+    """ Class responsible for storing and restoring declared output files of back-end commands.
+
+        Entries are keyed on (tool name, tool version, options, SHA-256 of each input file). Output files are kept once
+        per content hash under blobs/, entries under entries/. The size of the blobs is added up in the size file as
+        they are stored; when it exceeds maxSize bytes, the least recently used entries are evicted, unreferenced
+        blobs removed and the size file reset to the size found on disk.
+    """
+    def __init__(self, cachePath=None, maxSize=1073741824, verbose=False, log=sys.stderr):
+        self.__cachePath = cachePath
+        self.__maxSize = maxSize
+        self.__verbose = verbose
+        self.__lfh = log
+
+    def getKey(self, toolPath, options, inputFileList):
+        """ Get cache key, or None if the tool or one of the inputs is not available
+        """
+        if not os.access(toolPath, os.F_OK):
+            return None
+        #
+        statinfo = os.stat(toolPath)
+        keyList = [os.path.basename(toolPath), os.path.realpath(toolPath) + ':' + str(statinfo.st_size) + ':' + repr(statinfo.st_mtime),
+                   ' '.join(options.split())]
+        for inputFile in inputFileList:
+            if not os.access(inputFile, os.F_OK):
+                return None
+            #
+            keyList.append(self.__getChecksum(inputFile))
+        #
+        return hashlib.sha256('\n'.join(keyList).encode('utf-8')).hexdigest()
+
+    def restore(self, key, outputFileList):
+        """ Copy cached outputs to outputFileList. Returns True on cache hit.
+        """
+        entryPath = self.__getEntryPath(key)
+        if not os.access(entryPath, os.F_OK):
+            return False
+        #
+        try:
+            with open(entryPath, 'r') as ifh:
+                blobList = json.load(ifh)
+            #
+            if len(blobList) != len(outputFileList):
+                return False
+            #
+            for blob in blobList:
+                if blob and not os.access(self.__getBlobPath(blob), os.F_OK):
+                    return False
+                #
+            #
+            for blob, outputFile in zip(blobList, outputFileList):
+                if os.access(outputFile, os.F_OK):
+                    os.remove(outputFile)
+                #
+                if blob:
+                    shutil.copyfile(self.__getBlobPath(blob), outputFile)
+                    os.utime(self.__getBlobPath(blob), None)
+                #
+            #
+            os.utime(entryPath, None)
+            if self.__verbose:
+                self.__lfh.write("+CommandCacheUtil.restore() - cache hit %s\n" % key)
+            #
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return False
+
+    def store(self, key, outputFileList):
+        """ Store outputs of a finished command. Outputs which were not produced are recorded as absent; nothing is
+            stored if none of them was produced.
+        """
+        try:
+            blobList = []
+            addedSize = 0
+            for outputFile in outputFileList:
+                if not os.access(outputFile, os.F_OK):
+                    blobList.append('')
+                    continue
+                #
+                blob = self.__getChecksum(outputFile)
+                blobPath = self.__getBlobPath(blob)
+                if not os.access(blobPath, os.F_OK):
+                    self.__makeDir(os.path.dirname(blobPath))
+                    tmpPath = blobPath + '.' + str(os.getpid())
+                    shutil.copyfile(outputFile, tmpPath)
+                    os.rename(tmpPath, blobPath)
+                    addedSize += os.path.getsize(blobPath)
+                #
+                blobList.append(blob)
+            #
+            if not any(blobList):
+                return
+            #
+            entryPath = self.__getEntryPath(key)
+            self.__makeDir(os.path.dirname(entryPath))
+            tmpPath = entryPath + '.' + str(os.getpid())
+            with open(tmpPath, 'w') as ofh:
+                json.dump(blobList, ofh)
+            #
+            os.rename(tmpPath, entryPath)
+            #
+            if addedSize:
+                totalSize = self.__updateSize(addedSize)
+                if (totalSize is None) or (totalSize > self.__maxSize):
+                    self.__evict()
+                #
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+
+    def __evict(self):
+        """ Remove least recently used entries until the blob store is below maxSize
+        """
+        blobD = self.__listFiles(os.path.join(self.__cachePath, 'blobs'))
+        totalSize = sum([statinfo.st_size for statinfo in blobD.values()])
+        if totalSize <= self.__maxSize:
+            self.__updateSize(0, totalSize)
+            return
+        #
+        entryD = self.__listFiles(os.path.join(self.__cachePath, 'entries'))
+        entryList = sorted(entryD.keys(), key=lambda entryPath: entryD[entryPath].st_mtime)
+        referenceD = {}
+        for entryPath in entryList:
+            try:
+                with open(entryPath, 'r') as ifh:
+                    referenceD[entryPath] = [blob for blob in json.load(ifh) if blob]
+                #
+            except (IOError, OSError, ValueError):
+                referenceD[entryPath] = []
+            #
+        #
+        countD = {}
+        for blobList in referenceD.values():
+            for blob in blobList:
+                countD[blob] = countD.get(blob, 0) + 1
+            #
+        #
+        for blobPath, statinfo in blobD.items():
+            # unreferenced blobs first (left from interrupted stores or evicted entries)
+            if os.path.basename(blobPath) not in countD:
+                self.__removeFile(blobPath)
+                totalSize -= statinfo.st_size
+            #
+        #
+        for entryPath in entryList:
+            if totalSize <= self.__maxSize:
+                break
+            #
+            self.__removeFile(entryPath)
+            for blob in referenceD[entryPath]:
+                countD[blob] -= 1
+                if countD[blob] == 0:
+                    blobPath = self.__getBlobPath(blob)
+                    if blobPath in blobD:
+                        self.__removeFile(blobPath)
+                        totalSize -= blobD[blobPath].st_size
+                    #
+                #
+            #
+        #
+        self.__updateSize(0, totalSize)
+
+    def __updateSize(self, addedSize, totalSize=None):
+        """ Add addedSize to the blob store size recorded in size file (or reset it to totalSize). Returns the new
+            size, or None if it is not known yet (no size file)
+        """
+        sizePath = os.path.join(self.__cachePath, 'size')
+        try:
+            with open(sizePath, 'a+') as ofh:
+                fcntl.flock(ofh, fcntl.LOCK_EX)
+                if totalSize is None:
+                    ofh.seek(0)
+                    try:
+                        totalSize = int(ofh.read()) + addedSize
+                    except ValueError:
+                        return None
+                    #
+                #
+                ofh.seek(0)
+                ofh.truncate()
+                ofh.write(str(totalSize))
+                ofh.flush()
+            #
+            return totalSize
+        except (IOError, OSError):
+            traceback.print_exc(file=self.__lfh)
+        #
+        return None
+
+    def __listFiles(self, topPath):
+        fileD = {}
+        if not os.access(topPath, os.F_OK):
+            return fileD
+        #
+        for dirPath, _dirNames, fileNames in os.walk(topPath):
+            for fileName in fileNames:
+                filePath = os.path.join(dirPath, fileName)
+                try:
+                    fileD[filePath] = os.stat(filePath)
+                except OSError:
+                    pass
+                #
+            #
+        #
+        return fileD
+
+    def __getEntryPath(self, key):
+        return os.path.join(self.__cachePath, 'entries', key[:2], key + '.json')
+
+    def __getBlobPath(self, blob):
+        return os.path.join(self.__cachePath, 'blobs', blob[:2], blob)
+
+    def __makeDir(self, dirPath):
+        if not os.access(dirPath, os.F_OK):
+            try:
+                os.makedirs(dirPath)
+            except OSError:
+                pass
+            #
+        #
+
+    def __removeFile(self, filePath):
+        try:
+            os.remove(filePath)
+        except OSError:
+            pass
+        #
+
+    def __getChecksum(self, filePath, blockSize=1048576):
+        """ Get SHA-256 checksum of file
+        """
+        sha = hashlib.sha256()
+        with open(filePath, 'rb') as ifh:
+            while True:
+                block = ifh.read(blockSize)
+                if not block:
+                    break
+                #
+                sha.update(block)
+            #
+        #
+        return sha.hexdigest()
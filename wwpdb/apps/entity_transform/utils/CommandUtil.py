@@ -2,6 +2,13 @@
 # File:  CommandUtil.py
 # Date:  21-Jan-2018
 # Updates:
+#  19-Oct-2026  zf   opt-in content-addressed result cache for commands with declared outputs
+#  19-Oct-2026  zf   record back-end tool spans (tool, time, exit code) in request metrics
+#  19-Oct-2026  zf   trace back-end tool runs (Chrome trace-event spans with child RSS & output sizes)
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
+#  19-Oct-2026  zf   cache outputs only of commands which exited with status 0 (no timeout), never cache in-place outputs
+#  19-Oct-2026  zf   cache log/clog files with the declared outputs so that they are restored on cache hit
 ##
 """
 Class for running back-end commands
@@ -29,7 +36,11 @@ import sys
 import time
 import traceback
 
-from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon, ConfigInfoAppCc
+from wwpdb.apps.entity_transform.utils import MetricsUtil
+from wwpdb.apps.entity_transform.utils import TraceUtil
+from wwpdb.apps.entity_transform.utils.CommandCacheUtil import CommandCacheUtil
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
 
 
 class CommandUtil(object):
@@ -42,8 +53,10 @@ class CommandUtil(object):
         self.__sObj = None
         self.__sessionPath = None
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__cICommon = ConfigInfoAppCommon(self.__siteId)
-        self.__cIcc = ConfigInfoAppCc(self.__siteId, verbose=verbose, log=log)
+        self.__siteConfig = getSiteConfig(self.__siteId)
+        self.__cacheUtil = None
+        self.__cacheKey = None
+        self.__instanceId = str(self.__reqObj.getValue("instanceid"))
         #
 
     def setSessionPath(self, sessionPath):
@@ -51,35 +64,68 @@ class CommandUtil(object):
         """
         self.__sessionPath = sessionPath
 
-    def runAnnotCmd(self, command, inputFile, outputFile, logFile, clogFile, extraOptions):
+    def setInstanceId(self, instanceId):
+        """ Set instance id reported in traces of following commands
+        """
+        self.__instanceId = instanceId
+
+    def runAnnotCmd(self, command, inputFile, outputFile, logFile, clogFile, extraOptions, cacheInputs=None, cacheOutputs=None):
         """ Run Annot package back-end commands
+
+            Passing cacheOutputs (list of output files, relative to session path) opts the call into the result cache:
+            the outputs are restored from the cache when the tool, options, inputFile and cacheInputs are unchanged.
+            Outputs are stored only if the command exited with status 0; outputs which are also inputs (files
+            changed in place) are never cached. The logFile/clogFile are cached and restored with the outputs.
         """
+        toolPath = os.path.join(self.__siteConfig.getAnnotToolsPath(), "bin", command)
+        cacheOutputs = self.__addLogFiles(cacheOutputs, logFile, clogFile)
+        if self.__restoreFromCache(toolPath, inputFile, extraOptions, cacheInputs, cacheOutputs):
+            return
+        #
         cmd = self.__getCmd(command="${BINPATH}/" + command, setting=self.__getAnnotSetting(), inputFile=inputFile, outputFile=outputFile,
                             logFile=logFile, clogFile=clogFile, extraOptions=extraOptions)
-        self.__runCmd(command=cmd)
+        exitCode = self.__runCmd(command=cmd, toolName=command, outputFileList=self.__getOutputFileList(outputFile, logFile, clogFile, cacheOutputs))
+        self.__storeToCache(cacheOutputs, exitCode)
 
-    def runCCToolCmd(self, command, inputFile, outputFile, logFile, clogFile, extraOptions):
-        """ Run CC_TOOLS package back-end commands
+    def runCCToolCmd(self, command, inputFile, outputFile, logFile, clogFile, extraOptions, cacheInputs=None, cacheOutputs=None):
+        """ Run CC_TOOLS package back-end commands (see runAnnotCmd for cacheInputs/cacheOutputs)
         """
+        toolPath = os.path.join(self.__siteConfig.getCCAppsPath(), "bin", command)
+        cacheOutputs = self.__addLogFiles(cacheOutputs, logFile, clogFile)
+        if self.__restoreFromCache(toolPath, inputFile, extraOptions, cacheInputs, cacheOutputs):
+            return
+        #
         cmd = self.__getCmd(command="${CC_TOOLS}/" + command, setting=self.__getCCToolSetting(), inputComand=" -i ", inputFile=inputFile,
                             outputComand=" -o ", outputFile=outputFile, logFile=logFile, clogFile=clogFile, extraOptions=extraOptions)
-        self.__runCmd(command=cmd)
+        exitCode = self.__runCmd(command=cmd, toolName=command, outputFileList=self.__getOutputFileList(outputFile, logFile, clogFile, cacheOutputs))
+        self.__storeToCache(cacheOutputs, exitCode)
 
-    def runCCToolCmdWithTimeOut(self, command, inputFile, outputFile, logFile, clogFile, extraOptions, timeOut=240):
-        """ Run CC_TOOLS package back-end commands
+    def runCCToolCmdWithTimeOut(self, command, inputFile, outputFile, logFile, clogFile, extraOptions, timeOut=240, cacheInputs=None, cacheOutputs=None):
+        """ Run CC_TOOLS package back-end commands (see runAnnotCmd for cacheInputs/cacheOutputs)
         """
+        toolPath = os.path.join(self.__siteConfig.getCCAppsPath(), "bin", command)
+        cacheOutputs = self.__addLogFiles(cacheOutputs, logFile, clogFile)
+        if self.__restoreFromCache(toolPath, inputFile, extraOptions, cacheInputs, cacheOutputs):
+            return
+        #
         cmd = self.__getCmd(command="${CC_TOOLS}/" + command, setting=self.__getCCToolSetting(), inputComand=" -i ", inputFile=inputFile,
                             outputComand=" -o ", outputFile=outputFile, logFile=logFile, clogFile=clogFile, extraOptions=extraOptions)
         #
-        self.__runCmd_with_Timeout(cmd, timeout=timeOut)
+        exitCode = self.__runCmd_with_Timeout(cmd, timeout=timeOut, toolName=command,
+                                              outputFileList=self.__getOutputFileList(outputFile, logFile, clogFile, cacheOutputs))
+        self.__storeToCache(cacheOutputs, exitCode)
 
-    def runAnnotateComp(self, inputFile, outputFile, clogFile):
+    def runAnnotateComp(self, inputFile, outputFile, clogFile, useCache=False):
         """ Run ${CC_TOOLS}/annotateComp command
         """
         extraOptions = " -vv -op 'stereo-cactvs|aro-cactvs|descriptor-oe|descriptor-cactvs|descriptor-inchi|" \
             + "name-oe|name-acd|xyz-ideal-corina|xyz-model-h-oe|rename|fix' "
         #
-        self.runCCToolCmd("annotateComp", inputFile, outputFile, "", clogFile, extraOptions)
+        cacheOutputs = None
+        if useCache:
+            cacheOutputs = [outputFile]
+        #
+        self.runCCToolCmd("annotateComp", inputFile, outputFile, "", clogFile, extraOptions, cacheOutputs=cacheOutputs)
 
     def getRootFileName(self, prefix):
         """ Generate unique root file name
@@ -99,11 +145,77 @@ class CommandUtil(object):
             #
         #
 
+    def __addLogFiles(self, cacheOutputs, logFile, clogFile):
+        """ Add log files to declared outputs of opted-in call (GetLogMessage reads them after cache hit too)
+        """
+        if cacheOutputs is None:
+            return None
+        #
+        fileList = list(cacheOutputs)
+        for fileName in (logFile, clogFile):
+            if fileName and (fileName not in fileList):
+                fileList.append(fileName)
+            #
+        #
+        return fileList
+
+    def __restoreFromCache(self, toolPath, inputFile, extraOptions, cacheInputs, cacheOutputs):
+        """ Compute cache key for opted-in call and restore declared outputs on cache hit
+        """
+        self.__cacheKey = None
+        if cacheOutputs is None:
+            return False
+        #
+        if not self.__sessionPath:
+            self.__getSession()
+        #
+        topSessionPath = str(self.__reqObj.getValue("TopSessionPath"))
+        if not topSessionPath or not os.access(topSessionPath, os.W_OK):
+            return False
+        #
+        inputFileList = []
+        if inputFile:
+            inputFileList.append(inputFile)
+        #
+        if cacheInputs:
+            inputFileList.extend(cacheInputs)
+        #
+        inPlaceList = [f for f in cacheOutputs if f in inputFileList]
+        if inPlaceList:
+            # restoring would replace an input whose content is part of the key
+            self.__lfh.write("+CommandUtil.__restoreFromCache() - %s changed in place, not cached\n" % ','.join(inPlaceList))
+            return False
+        #
+        self.__cacheUtil = CommandCacheUtil(cachePath=os.path.join(topSessionPath, "entity_transform_cache", "command"), log=self.__lfh)
+        try:
+            self.__cacheKey = self.__cacheUtil.getKey(toolPath, extraOptions, [os.path.join(self.__sessionPath, f) for f in inputFileList])
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        if self.__cacheKey is None:
+            return False
+        #
+        return self.__cacheUtil.restore(self.__cacheKey, [os.path.join(self.__sessionPath, f) for f in cacheOutputs])
+
+    def __storeToCache(self, cacheOutputs, exitCode):
+        """ Store declared outputs of opted-in call after the command has run successfully (exitCode 0)
+        """
+        if (cacheOutputs is None) or (self.__cacheKey is None):
+            return
+        #
+        if exitCode != 0:
+            self.__lfh.write("+CommandUtil.__storeToCache() - exit code %s, outputs not cached\n" % exitCode)
+            self.__cacheKey = None
+            return
+        #
+        self.__cacheUtil.store(self.__cacheKey, [os.path.join(self.__sessionPath, f) for f in cacheOutputs])
+        self.__cacheKey = None
+
     def __getSession(self):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionPath = self.__sObj.getPath()
 
     def __getCmd(self, command="", setting="", inputComand=" -input ", inputFile="", outputComand=" -output ", outputFile="",
@@ -138,60 +250,72 @@ class CommandUtil(object):
         self.__lfh.write("cmd=%s\n" % cmd)
         return cmd
 
-    def __runCmd(self, command=""):
-        """ Run back-end command with os.system
+    def __runCmd(self, command="", toolName="", outputFileList=None):
+        """ Run back-end command with os.system, return exit code (None if there is no command)
         """
+        exitCode = None
         if command:
-            os.system(command)
+            with TraceUtil.span(toolName, "tool", outputFileList=outputFileList, argD={"instance_id": self.__instanceId}) as span:
+                startTime = time.time()
+                status = os.system(command)
+                exitCode = MetricsUtil.getExitCode(status)
+                MetricsUtil.addToolSpan(toolName, startTime, time.time(), exitCode)
+                span.setExitCode(exitCode)
+            #
         #
+        return exitCode
 
-    def __runCmd_with_Timeout(self, cmd, timeout=240):
-        """ Run back-end command using subprocess with timeout limitation
+    def __runCmd_with_Timeout(self, cmd, timeout=240, toolName="", outputFileList=None):
+        """ Run back-end command using subprocess with timeout limitation, return exit code (-SIGKILL on timeout,
+            None if the command could not be run)
         """
-        start = datetime.datetime.now()
-        try:
-            process = subprocess.Popen(cmd, stderr=subprocess.PIPE,  # pylint: disable=subprocess-popen-preexec-fn
-                                       stdout=subprocess.PIPE, close_fds=True,
-                                       preexec_fn=os.setsid, shell=True)
-            while process.poll() is None:
-                time.sleep(0.1)
-                now = datetime.datetime.now()
-                if (now - start).seconds > timeout:
-                    os.killpg(process.pid, signal.SIGKILL)
-                    os.waitpid(-1, os.WNOHANG)
-                    return
+        with TraceUtil.span(toolName, "tool", outputFileList=outputFileList, argD={"instance_id": self.__instanceId, "timeout": timeout}) as span:
+            start = datetime.datetime.now()
+            startTime = time.time()
+            try:
+                process = subprocess.Popen(cmd, stderr=subprocess.PIPE,  # pylint: disable=subprocess-popen-preexec-fn
+                                           stdout=subprocess.PIPE, close_fds=True,
+                                           preexec_fn=os.setsid, shell=True)
+                while process.poll() is None:
+                    time.sleep(0.1)
+                    now = datetime.datetime.now()
+                    if (now - start).seconds > timeout:
+                        os.killpg(process.pid, signal.SIGKILL)
+                        os.waitpid(-1, os.WNOHANG)
+                        MetricsUtil.addToolSpan(toolName, startTime, time.time(), -signal.SIGKILL)
+                        span.setExitCode(-signal.SIGKILL)
+                        return -signal.SIGKILL
+                    #
                 #
+                MetricsUtil.addToolSpan(toolName, startTime, time.time(), process.returncode)
+                span.setExitCode(process.returncode)
+                return process.returncode
+            except:  # noqa: E722 pylint: disable=bare-except
+                traceback.print_exc(file=self.__lfh)
             #
-        except:  # noqa: E722 pylint: disable=bare-except
-            traceback.print_exc(file=self.__lfh)
         #
+        return None
+
+    def __getOutputFileList(self, outputFile, logFile, clogFile, cacheOutputs):
+        """ Return paths of files written by command (reported with their sizes in traces)
+        """
+        fileList = []
+        for fileName in [outputFile, logFile, clogFile] + list(cacheOutputs or []):
+            if fileName and (os.path.join(self.__sessionPath, fileName) not in fileList):
+                fileList.append(os.path.join(self.__sessionPath, fileName))
+            #
+        #
+        return fileList
 
     def __getAnnotSetting(self):
         """ Get Annot package bash setting
         """
-        setting = " RCSBROOT=" + self.__cICommon.get_site_annot_tools_path() + "; export RCSBROOT; PDB2GLYCAN=" \
-            + os.path.join(os.path.abspath(self.__cICommon.get_site_packages_path()), "pdb2glycan", "bin", "PDB2Glycan") + "; export PDB2GLYCAN; " \
-            + " COMP_PATH=" + self.__cIcc.get_site_cc_cvs_path() + "; export COMP_PATH; " \
-            + " PRD_PATH=" + self.__cIcc.get_site_prd_cvs_path() + "; export PRD_PATH; " \
-            + " BINPATH=${RCSBROOT}/bin; export BINPATH; "
-        #
-        return setting
+        return self.__siteConfig.getAnnotSetting()
 
     def __getCCToolSetting(self):
         """ Get CC_TOOLS package bash setting
         """
-        setting = " CC_TOOLS=" + self.__cICommon.get_site_cc_apps_path() + "/bin; export CC_TOOLS; " \
-            + " OE_DIR=" + self.__cICommon.get_site_cc_oe_dir() + "; export OE_DIR; " \
-            + " OE_LICENSE=" + self.__cICommon.get_site_cc_oe_licence() + "; export OE_LICENSE; " \
-            + " ACD_DIR=" + self.__cICommon.get_site_cc_acd_dir() + "; export ACD_DIR; " \
-            + " CACTVS_DIR=" + self.__cICommon.get_site_cc_cactvs_dir() + "; export CACTVS_DIR; " \
-            + " CORINA_DIR=" + self.__cICommon.get_site_cc_corina_dir() + "/bin; export CORINA_DIR; " \
-            + " BABEL_DIR=" + self.__cICommon.get_site_cc_babel_dir() + "; export BABEL_DIR; " \
-            + " BABEL_DATADIR=" + self.__cICommon.get_site_cc_babel_datadir() + "; export BABEL_DATADIR; " \
-            + " LD_LIBRARY_PATH=" + self.__cICommon.get_site_cc_babel_lib() + ":" \
-            + os.path.join(self.__cICommon.get_site_local_apps_path(), "lib") + "; export LD_LIBRARY_PATH; "
-        #
-        return setting
+        return self.__siteConfig.getCCToolSetting()
 
     def __removeFile(self, filePath):
         """ Remove existing file
@@ -2,6 +2,7 @@
 # File:  CompUtil.py
 # Date:  17-Oct-2012
 # Updates:
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
 ##
 """
 Checking Comp/PRD ID and finding chemical component file.
@@ -25,7 +26,7 @@ import os
 import sys
 
 from wwpdb.io.file.mmCIFUtil import mmCIFUtil
-from wwpdb.io.locator.ChemRefPathInfo import ChemRefPathInfo
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
 
 
 class CompUtil(object):
@@ -37,7 +38,7 @@ class CompUtil(object):
 
         self.__reqObj = reqObj
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__crpi = ChemRefPathInfo(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        self.__crpi = getSiteConfig(self.__siteId).getChemRefPathInfo()
         #
 
     def checkInputId(self, id):  # pylint: disable=redefined-builtin
@@ -0,0 +1,228 @@
+##
+# File:  ConditionalResponseUtil.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   validators computed once per request (before the operation changes request values) and
+#                    passed to isNotModified()/getHeaders(), server/handler set request values not hashed
+#  19-Oct-2026  zf   deploy stamp from the files of the package/template directories (directory mtime misses edits)
+##
+"""
+HTTP validators (ETag/Last-Modified) computed from the session files a page depends on, conditional GET (304)
+handling and gzip compression of large text responses.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import email.utils
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+
+# request values carrying the HTTP request headers (set by doServiceRequestWebOb.wsgi/fcgi)
+IF_NONE_MATCH = 'http_if_none_match'
+IF_MODIFIED_SINCE = 'http_if_modified_since'
+ACCEPT_ENCODING = 'http_accept_encoding'
+#
+# request values set by the application or by the operation handlers (not by the client), not part of the ETag
+SERVER_REQUEST_KEYS = ('return_format', 'semaphore', 'TopSessionPath', 'TemplatePath', 'TopPath', 'WWPDB_SITE_ID',
+                       'datafile', 'context', 'datablockname')
+#
+# text responses smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = 4096
+COMPRESS_CONTENT_TYPES = ('text/html', 'text/plain', 'application/json')
+#
+# path -> (newest mtime, hash of file stamps) of deployed code/templates, part of every validator so that a new
+# release invalidates pages
+_deployStampD = {}
+
+
+def compressResponse(rspD, acceptEncoding, minSize=COMPRESS_MIN_SIZE):
+    """ gzip RETURN_STRING of text response dictionary rspD in place if client accepts gzip and content is large enough
+    """
+    if (not acceptEncoding) or ('gzip' not in str(acceptEncoding).lower()):
+        return False
+    #
+    if rspD.get('ENCODING') or ('RETURN_ITERATOR' in rspD) or ('FILE_ITERATOR' in rspD) or rspD.get('STATUS'):
+        return False
+    #
+    contentType = str(rspD.get('CONTENT_TYPE', '')).split(';')[0].strip().lower()
+    if contentType not in COMPRESS_CONTENT_TYPES:
+        return False
+    #
+    content = rspD.get('RETURN_STRING')
+    if not content:
+        return False
+    #
+    if not isinstance(content, bytes):
+        content = content.encode('utf-8')
+        if contentType == 'text/html':
+            rspD['CONTENT_TYPE'] = 'text/html; charset=utf-8'
+        #
+    #
+    if len(content) < minSize:
+        return False
+    #
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6, mtime=0) as ofh:
+        ofh.write(content)
+    #
+    rspD['RETURN_STRING'] = buf.getvalue()
+    rspD['ENCODING'] = 'gzip'
+    rspD.setdefault('HEADERS', []).append(('Vary', 'Accept-Encoding'))
+    return True
+
+
+def _getDeployStamp(pathList):
+    stampList = []
+    for path in pathList:
+        if not path:
+            continue
+        #
+        if path not in _deployStampD:
+            _deployStampD[path] = _getPathStamp(path)
+        #
+        stampList.append(_deployStampD[path])
+    #
+    return stampList
+
+
+def _getPathStamp(path):
+    """ Return (newest mtime, hash of (name, mtime, size) of every file) of file or directory tree path (once per process)
+    """
+    fileList = []
+    if os.path.isdir(path):
+        for dirPath, dirNames, fileNames in os.walk(path):
+            dirNames[:] = sorted([dirName for dirName in dirNames if dirName != '__pycache__'])
+            for fileName in sorted(fileNames):
+                if not fileName.endswith('.pyc'):
+                    fileList.append(os.path.join(dirPath, fileName))
+                #
+            #
+        #
+    else:
+        fileList.append(path)
+    #
+    lastModified = 0
+    sha = hashlib.sha1()
+    for filePath in fileList:
+        try:
+            statInfo = os.stat(filePath)
+        except OSError:
+            continue
+        #
+        lastModified = max(lastModified, statInfo.st_mtime)
+        sha.update(('%s:%r:%d\n' % (os.path.relpath(filePath, path), statInfo.st_mtime, statInfo.st_size)).encode('utf-8'))
+    #
+    return (lastModified, sha.hexdigest())
+
+
+class ConditionalResponseUtil(object):
+    """ Class computing the validators of a page which is a pure function of request parameters and session files:
+
+            ETag           hash of request path, request parameters, (path, mtime, size) of every input file and
+                           the deployed code/template stamp
+            Last-Modified  newest mtime of the input files
+
+        The validators are computed once, before the page is rendered (operation handlers change request values):
+
+            validators = cacheUtil.getValidators(filePathList)
+            if cacheUtil.isNotModified(validators): ... 304 ...
+            ... render page, response headers cacheUtil.getHeaders(validators) ...
+
+        isNotModified() answers If-None-Match (or If-Modified-Since when no If-None-Match is given).
+    """
+    def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__reqObj = reqObj
+        self.__deployPathList = [os.path.dirname(os.path.dirname(os.path.abspath(__file__))), str(self.__reqObj.getValue("TemplatePath"))]
+
+    def getValidators(self, filePathList):
+        """ Return (etag, last modified time) of page built from files in filePathList, (None, None) if none of them exists
+        """
+        if not filePathList:
+            return None, None
+        #
+        statList = []
+        lastModified = 0
+        deployStamp = _getDeployStamp(self.__deployPathList)
+        for filePath in filePathList:
+            try:
+                statInfo = os.stat(filePath)
+            except OSError:
+                statList.append((filePath, None, None))
+                continue
+            #
+            statList.append((filePath, statInfo.st_mtime, statInfo.st_size))
+            lastModified = max(lastModified, int(statInfo.st_mtime))
+        #
+        if not lastModified:
+            return None, None
+        #
+        paramD = {}
+        for key, value in self.__reqObj.getDictionary().items():
+            if (not key.startswith('http_')) and (key not in SERVER_REQUEST_KEYS):
+                paramD[key] = value
+            #
+        #
+        text = json.dumps([self.__reqObj.getRequestPath(), paramD, statList, deployStamp], sort_keys=True, default=str)
+        etag = 'W/"' + hashlib.sha1(text.encode('utf-8')).hexdigest() + '"'
+        return etag, max([lastModified] + [int(stamp[0]) for stamp in deployStamp])
+
+    def isNotModified(self, validators):
+        """ True if the client copy of the page with validators (etag, last modified time) is still valid
+        """
+        ifNoneMatch = str(self.__reqObj.getValue(IF_NONE_MATCH)).strip()
+        ifModifiedSince = str(self.__reqObj.getValue(IF_MODIFIED_SINCE)).strip()
+        if (not ifNoneMatch) and (not ifModifiedSince):
+            return False
+        #
+        etag, lastModified = validators
+        if not etag:
+            return False
+        #
+        if ifNoneMatch:
+            if ifNoneMatch == '*':
+                return True
+            #
+            for tag in ifNoneMatch.split(','):
+                tag = tag.strip()
+                if tag.startswith('W/'):
+                    tag = tag[2:]
+                #
+                if tag == etag[2:]:
+                    return True
+                #
+            #
+            return False
+        #
+        try:
+            since = email.utils.mktime_tz(email.utils.parsedate_tz(ifModifiedSince))
+        except:  # noqa: E722 pylint: disable=bare-except
+            return False
+        #
+        return lastModified <= since
+
+    def getHeaders(self, validators):
+        """ Return list of (header, value) response headers of the page with validators (etag, last modified time)
+        """
+        etag, lastModified = validators
+        if not etag:
+            return []
+        #
+        return [('ETag', etag), ('Last-Modified', email.utils.formatdate(lastModified, usegmt=True)), ('Cache-Control', 'private, no-cache')]
@@ -2,6 +2,13 @@
 # File:  DownloadFile.py
 # Date:  16-Oct-2012
 # Updates:
+#  19-Oct-2026  zf   run PRD name updates and dictionary checks in a bounded thread pool, cache results per
+#                    (file hash, dictionary version) in session
+#  19-Oct-2026  zf   list PRD files from session manifest
+#  19-Oct-2026  zf   record UpdatePrdCcName & check-cif runs in request metrics
+#  19-Oct-2026  zf   trace UpdatePrdCcName & check-cif runs
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
 ##
 """
 Download files.
@@ -21,13 +28,29 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle as pickle
+#
+
+import hashlib
+import multiprocessing
 import os
 import sys
+import time
 import traceback
 
-from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from concurrent.futures import ThreadPoolExecutor
+
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 
+from wwpdb.apps.entity_transform.utils import MetricsUtil
+from wwpdb.apps.entity_transform.utils import TraceUtil
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.SessionManifest import SessionManifest
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
+
 
 class DownloadFile(object):
     """ Class responsible for download files.
@@ -41,7 +64,7 @@ class DownloadFile(object):
         self.__sessionPath = None
         # self.__rltvSessionPath = None
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__cI = ConfigInfo(self.__siteId)
+        self.__cI = getSiteConfig(self.__siteId)
         #
         self.__getSession()
         #
@@ -52,7 +75,7 @@ class DownloadFile(object):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionId = self.__sObj.getId()
         self.__sessionPath = self.__sObj.getPath()
         # self.__rltvSessionPath = self.__sObj.getRelativePath()
@@ -78,15 +101,23 @@ class DownloadFile(object):
             parameterDict = {}
         tPath = self.__reqObj.getValue("TemplatePath")
         fPath = os.path.join(tPath, fn)
-        ifh = open(fPath, "r")
-        sIn = ifh.read()
-        ifh.close()
-        return (sIn % parameterDict)
+        with MetricsUtil.timer("template_render"):
+            MetricsUtil.addCount("file_read")
+            ifh = open(fPath, "r")
+            sIn = ifh.read()
+            ifh.close()
+            return (sIn % parameterDict)
+        #
 
     def __findPRDFiles(self):
         fileList = []
         #
-        for files in os.listdir(self.__sessionPath):
+        manifest = SessionManifest(dirPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+        nameList = manifest.getFileList(prefix="PRD")
+        if nameList is None:
+            nameList = os.listdir(self.__sessionPath)
+        #
+        for files in nameList:
             if files.endswith(".cif") and (files.startswith("PRD_") or files.startswith("PRDCC_")):
                 list1 = files.split(".")
                 if len(list1) > 2:
@@ -99,49 +130,45 @@ class DownloadFile(object):
         return fileList
 
     def __updatePrdCcChemName(self):
-        setting = " RCSBROOT=" + self.__cI.get("SITE_ANNOT_TOOLS_PATH") + "; export RCSBROOT; "
+        """ Update PRDCC chemical names and run dictionary check for all PRD files in session. Files which have not
+            changed since the last check (same content hash and dictionary version) are not processed again.
+        """
+        dictVersion = self.__getDictVersion()
+        cacheD = self.__readCheckCache()
         #
-        dictCheckMsg = ""
+        resultD = {}
+        todoList = []
         for prdid in self.__PrdIds:
             prdfile = os.path.join(self.__sessionPath, prdid + ".cif")
             if not os.access(prdfile, os.F_OK):
                 continue
             #
-            prdccid = prdid.replace("PRD", "PRDCC")
-            prdccfile = os.path.join(self.__sessionPath, prdccid + ".cif")
-            if not os.access(prdccfile, os.F_OK):
-                cmd = setting + "${RCSBROOT}/bin/UpdatePrdCcName -prd " + prdfile + " -log " \
-                    + os.path.join(self.__sessionPath, prdid + "-name-update.log") + "  > " \
-                    + os.path.join(self.__sessionPath, prdid + "-name-update.clog") + " 2>&1; "
+            if (prdid in cacheD) and (cacheD[prdid][0] == self.__getCheckKey(prdid, dictVersion)):
+                resultD[prdid] = cacheD[prdid][1]
             else:
-                cmd = setting + "${RCSBROOT}/bin/UpdatePrdCcName -prd " + prdfile + " -prdcc " + prdccfile + " -log " \
-                    + os.path.join(self.__sessionPath, prdid + "-name-update.log") + "  > " \
-                    + os.path.join(self.__sessionPath, prdid + "-name-update.clog") + " 2>&1; "
+                todoList.append(prdid)
             #
-            os.system(cmd)
-            #
-            logfile = os.path.join(self.__sessionPath, "checking-" + prdid + ".log")
-            if os.access(logfile, os.F_OK):
-                os.remove(logfile)
-            #
-            try:
-                dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                dp.imp(prdfile)
-                dp.op("check-cif")
-                dp.exp(logfile)
-                if os.access(logfile, os.F_OK):
-                    ifh = open(logfile, "r")
-                    sIn = ifh.read()
-                    ifh.close()
-                    if not sIn:
-                        dictCheckMsg += "\n" + prdid + ": OK\n"
-                    else:
-                        dictCheckMsg += "\n" + prdid + ":\n" + sIn + "\n"
+        #
+        if todoList:
+            numThreads = max(1, min(len(todoList), int(multiprocessing.cpu_count() / 2)))
+            with ThreadPoolExecutor(max_workers=numThreads) as executor:
+                futureD = {}
+                for prdid in todoList:
+                    futureD[prdid] = executor.submit(self.__checkPrd, prdid, MetricsUtil.getCurrentRequest(), TraceUtil.getCurrentTrace())
+                #
+                for prdid in todoList:
+                    resultD[prdid] = futureD[prdid].result()
+                    if resultD[prdid] is not None:
+                        cacheD[prdid] = (self.__getCheckKey(prdid, dictVersion), resultD[prdid])
                     #
                 #
-                dp.cleanup()
-            except:  # noqa: E722 pylint: disable=bare-except
-                traceback.print_exc(file=self.__lfh)
+            #
+            self.__writeCheckCache(cacheD)
+        #
+        dictCheckMsg = ""
+        for prdid in self.__PrdIds:
+            if (prdid in resultD) and resultD[prdid]:
+                dictCheckMsg += resultD[prdid]
             #
         #
         if not dictCheckMsg:
@@ -150,6 +177,129 @@ class DownloadFile(object):
             return "<pre>\nCIF Dictionary Check:\n" + dictCheckMsg + "</pre>\n"
         #
 
+    def __checkPrd(self, prdid, metricsRequest=None, trace=None):
+        """ Run UpdatePrdCcName & dictionary check for single PRD. Returns check message or None if the check failed.
+        """
+        MetricsUtil.setCurrentRequest(metricsRequest)
+        TraceUtil.setCurrentTrace(trace)
+        setting = " RCSBROOT=" + self.__cI.get("SITE_ANNOT_TOOLS_PATH") + "; export RCSBROOT; "
+        #
+        prdfile = os.path.join(self.__sessionPath, prdid + ".cif")
+        prdccid = prdid.replace("PRD", "PRDCC")
+        prdccfile = os.path.join(self.__sessionPath, prdccid + ".cif")
+        if not os.access(prdccfile, os.F_OK):
+            cmd = setting + "${RCSBROOT}/bin/UpdatePrdCcName -prd " + prdfile + " -log " \
+                + os.path.join(self.__sessionPath, prdid + "-name-update.log") + "  > " \
+                + os.path.join(self.__sessionPath, prdid + "-name-update.clog") + " 2>&1; "
+        else:
+            cmd = setting + "${RCSBROOT}/bin/UpdatePrdCcName -prd " + prdfile + " -prdcc " + prdccfile + " -log " \
+                + os.path.join(self.__sessionPath, prdid + "-name-update.log") + "  > " \
+                + os.path.join(self.__sessionPath, prdid + "-name-update.clog") + " 2>&1; "
+        #
+        with TraceUtil.span("UpdatePrdCcName", "tool", outputFileList=[prdccfile, os.path.join(self.__sessionPath, prdid + "-name-update.log")],
+                            argD={"instance_id": prdid}) as span:
+            startTime = time.time()
+            status = os.system(cmd)
+            MetricsUtil.addToolSpan("UpdatePrdCcName", startTime, time.time(), MetricsUtil.getExitCode(status))
+            span.setExitCode(MetricsUtil.getExitCode(status))
+        #
+        logfile = os.path.join(self.__sessionPath, "checking-" + prdid + ".log")
+        if os.access(logfile, os.F_OK):
+            os.remove(logfile)
+        #
+        msg = None
+        try:
+            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            dp.imp(prdfile)
+            with TraceUtil.span("RcsbDpUtility:check-cif", "rcsbdp", outputFileList=[logfile], argD={"instance_id": prdid}) as span:
+                startTime = time.time()
+                status = dp.op("check-cif")
+                MetricsUtil.addToolSpan("RcsbDpUtility:check-cif", startTime, time.time(), status if isinstance(status, int) else 0)
+                span.setExitCode(status if isinstance(status, int) else 0)
+                dp.exp(logfile)
+            #
+            if os.access(logfile, os.F_OK):
+                ifh = open(logfile, "r")
+                sIn = ifh.read()
+                ifh.close()
+                if not sIn:
+                    msg = "\n" + prdid + ": OK\n"
+                else:
+                    msg = "\n" + prdid + ":\n" + sIn + "\n"
+                #
+            #
+            dp.cleanup()
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return msg
+
+    def __getDictVersion(self):
+        """ Get dictionary name and modification time used for cif check
+        """
+        dictName = str(self.__cI.get("SITE_PDBX_DICT_NAME"))
+        dictPath = self.__cI.get("SITE_PDBX_DICT_PATH")
+        version = dictName
+        if dictPath:
+            for ext in (".sdb", ".odb", ".dic"):
+                dictFile = os.path.join(dictPath, dictName + ext)
+                if os.access(dictFile, os.F_OK):
+                    version += ":" + repr(os.stat(dictFile).st_mtime)
+                    break
+                #
+            #
+        #
+        return version
+
+    def __getCheckKey(self, prdid, dictVersion):
+        """ Get cache key from content hash of PRD/PRDCC files and dictionary version
+        """
+        sha = hashlib.sha256()
+        for fileName in (prdid + ".cif", prdid.replace("PRD", "PRDCC") + ".cif"):
+            filePath = os.path.join(self.__sessionPath, fileName)
+            if not os.access(filePath, os.F_OK):
+                continue
+            #
+            with open(filePath, "rb") as ifh:
+                for block in iter(lambda: ifh.read(1048576), b""):  # pylint: disable=cell-var-from-loop
+                    sha.update(block)
+                #
+            #
+            sha.update(b"\0")
+        #
+        return sha.hexdigest() + "|" + dictVersion
+
+    def __readCheckCache(self):
+        """ Read cached PRD check results from session
+        """
+        cacheFile = os.path.join(self.__sessionPath, "prd-check-cache.pic")
+        if not os.access(cacheFile, os.F_OK):
+            return {}
+        #
+        try:
+            fb = open(cacheFile, "rb")
+            cacheD = pickle.load(fb)
+            fb.close()
+            return cacheD
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return {}
+
+    def __writeCheckCache(self, cacheD):
+        """ Write cached PRD check results to session
+        """
+        cacheFile = os.path.join(self.__sessionPath, "prd-check-cache.pic")
+        tmpFile = cacheFile + "." + str(os.getpid())
+        try:
+            fb = open(tmpFile, "wb")
+            pickle.dump(cacheD, fb)
+            fb.close()
+            os.rename(tmpFile, cacheFile)
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+
     def ListFiles(self):
         myD = {}
         myD["sessionid"] = self.__sessionId
@@ -167,6 +317,22 @@ class DownloadFile(object):
         #
         return content
 
+    def getBundleFileList(self, fileIdList=None):
+        """ Return list of (file path, archive name) tuples for model and PRD/PRDCC files in session,
+            restricted to fileIdList if given.
+        """
+        allFileList = [self.__fileId]
+        allFileList.extend(sorted(self.__findPRDFiles()))
+        #
+        fileList = []
+        for fileId in allFileList:
+            if fileIdList and (fileId not in fileIdList):
+                continue
+            #
+            fileList.append((os.path.join(self.__sessionPath, fileId), fileId))
+        #
+        return fileList
+
     def ListPrds(self):
         if not self.__PrdIds:
             return ""
@@ -0,0 +1,178 @@
+##
+# File:  FileImportUtil.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   checksum option verifies copied files (source SHA-256 computed while copying)
+##
+"""
+Import files into session directory with reflinks/hard links when possible.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import hashlib
+import os
+import shutil
+import sys
+import traceback
+
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+#
+
+# Linux ioctl request number for copy-on-write file clone (FICLONE)
+FICLONE = 0x40049409
+
+
+class FileImportUtil(object):
+    """ Class responsible for importing files into session directory.
+
+        Files on the same file system as the session directory are cloned with a copy-on-write reflink. Files declared as
+        read-only in the session are hard linked if the file system does not support reflinks. Everything else is copied.
+        With checksum=True the SHA-256 of the source, computed while copying, is compared with the SHA-256 of the copy;
+        reflinks and hard links share the source data blocks and are not verified.
+    """
+    def __init__(self, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+
+    def importFiles(self, transferList, checksum=False, numThreads=4):
+        """ Import list of (source path, target path, read only flag) tuples concurrently
+        """
+        if not transferList:
+            return True
+        #
+        if len(transferList) == 1:
+            srcPath, dstPath, readOnly = transferList[0]
+            return self.importFile(srcPath, dstPath, readOnly=readOnly, checksum=checksum)
+        #
+        with ThreadPoolExecutor(max_workers=min(numThreads, len(transferList))) as executor:
+            futureList = [executor.submit(self.importFile, srcPath, dstPath, readOnly, checksum) for srcPath, dstPath, readOnly in transferList]
+            statusList = [future.result() for future in futureList]
+        #
+        return all(statusList)
+
+    def importFile(self, srcPath, dstPath, readOnly=False, checksum=False):
+        """ Import single file. Returns True if the file is available at dstPath.
+        """
+        try:
+            if os.access(dstPath, os.F_OK):
+                os.remove(dstPath)
+            #
+            method = 'copy'
+            if self.__isSameFileSystem(srcPath, dstPath):
+                if self.__reflinkFile(srcPath, dstPath):
+                    method = 'reflink'
+                elif readOnly and self.__hardlinkFile(srcPath, dstPath):
+                    method = 'hardlink'
+                #
+            #
+            srcChecksum = None
+            if method == 'copy':
+                if checksum:
+                    srcChecksum = self.__copyFile(srcPath, dstPath)
+                else:
+                    shutil.copyfile(srcPath, dstPath)
+                #
+            #
+            if self.__verbose:
+                self.__lfh.write("+FileImportUtil.importFile() - %s %s to %s\n" % (method, srcPath, dstPath))
+            #
+            if (srcChecksum is not None) and (srcChecksum != self.__getChecksum(dstPath)):
+                self.__lfh.write("+FileImportUtil.importFile() - checksum mismatch between %s and %s\n" % (srcPath, dstPath))
+                os.remove(dstPath)
+                return False
+            #
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return False
+
+    def __isSameFileSystem(self, srcPath, dstPath):
+        """ Check if source file and target directory are on the same device
+        """
+        try:
+            return os.stat(srcPath).st_dev == os.stat(os.path.dirname(os.path.abspath(dstPath))).st_dev
+        except OSError:
+            return False
+        #
+
+    def __reflinkFile(self, srcPath, dstPath):
+        """ Clone file with FICLONE ioctl (btrfs, xfs with reflink support, ...)
+        """
+        if fcntl is None:
+            return False
+        #
+        try:
+            with open(srcPath, 'rb') as ifh:
+                with open(dstPath, 'wb') as ofh:
+                    fcntl.ioctl(ofh.fileno(), FICLONE, ifh.fileno())
+                #
+            #
+            return True
+        except (IOError, OSError):
+            if os.access(dstPath, os.F_OK):
+                os.remove(dstPath)
+            #
+        #
+        return False
+
+    def __hardlinkFile(self, srcPath, dstPath):
+        """ Hard link file
+        """
+        try:
+            os.link(srcPath, dstPath)
+            return True
+        except OSError:
+            return False
+        #
+
+    def __copyFile(self, srcPath, dstPath, blockSize=1048576):
+        """ Copy file and return SHA-256 checksum of the data read from the source
+        """
+        sha = hashlib.sha256()
+        with open(srcPath, 'rb') as ifh:
+            with open(dstPath, 'wb') as ofh:
+                while True:
+                    block = ifh.read(blockSize)
+                    if not block:
+                        break
+                    #
+                    sha.update(block)
+                    ofh.write(block)
+                #
+            #
+        #
+        return sha.hexdigest()
+
+    def __getChecksum(self, filePath, blockSize=1048576):
+        """ Get SHA-256 checksum of file
+        """
+        sha = hashlib.sha256()
+        with open(filePath, 'rb') as ifh:
+            while True:
+                block = ifh.read(blockSize)
+                if not block:
+                    break
+                #
+                sha.update(block)
+            #
+        #
+        return sha.hexdigest()
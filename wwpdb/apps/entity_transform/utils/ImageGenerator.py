@@ -2,6 +2,12 @@
 # File:  ImageGenerator.py
 # Date:  09-Jan-2018
 # Updates:
+#  19-Oct-2026  zf   use CommandUtil result cache for updateComponent, annotateComp & makeCompReport
+#  19-Oct-2026  zf   time image generation in request metrics and trace
+#  19-Oct-2026  zf   join session through request context shared by all helpers of the request
+#  19-Oct-2026  zf   write search image manifest (with thumbnails) after generating images
+#  19-Oct-2026  zf   add setNumProc(), generate images in calling process if numProc is 1
+#  19-Oct-2026  zf   updateComponent changes its input in place, run it without the result cache
 ##
 """
 Generate instance's image
@@ -26,7 +32,11 @@ import os
 import sys
 
 
+from wwpdb.apps.entity_transform.utils import MetricsUtil
+from wwpdb.apps.entity_transform.utils import TraceUtil
 from wwpdb.apps.entity_transform.utils.CommandUtil import CommandUtil
+from wwpdb.apps.entity_transform.utils.ImageManifest import ImageManifest
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
 from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
 
 
@@ -42,12 +52,19 @@ class ImageGenerator(object):
         self.__sessionPath = None
         self.__sObj = None
         self.__cmdUtil = None
+        self.__numProc = None
 
     def setSessionPath(self, path):
         """
         """
         self.__sessionPath = path
 
+    def setNumProc(self, numProc):
+        """ Set number of image generation processes (default: half of the CPUs). With numProc=1 images are generated
+            in the calling process, e.g. in the worker processes of a batch pool which can not fork their own workers.
+        """
+        self.__numProc = numProc
+
     def run(self, instList):
         """
         """
@@ -59,11 +76,21 @@ class ImageGenerator(object):
         #
         self.__cmdUtil = CommandUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
-        numProc = int(multiprocessing.cpu_count() / 2)
-        mpu = MultiProcUtil(verbose=True)
-        mpu.set(workerObj=self, workerMethod="runMultiProcess")
-        mpu.setWorkingDir(self.__sessionPath)
-        _ok, _failList, _retLists, _diagList = mpu.runMulti(dataList=instList, numProc=numProc, numResults=1)
+        numProc = self.__numProc or int(multiprocessing.cpu_count() / 2)
+        with MetricsUtil.timer('image_generation'), TraceUtil.span('image_generation', 'section', argD={'instances': len(instList)}):
+            if numProc == 1:
+                self.runMultiProcess(instList, 'main', {}, self.__sessionPath)
+            else:
+                mpu = MultiProcUtil(verbose=True)
+                mpu.set(workerObj=self, workerMethod="runMultiProcess")
+                mpu.setWorkingDir(self.__sessionPath)
+                _ok, _failList, _retLists, _diagList = mpu.runMulti(dataList=instList, numProc=numProc, numResults=1)
+            #
+        #
+        with MetricsUtil.timer('image_manifest'):
+            manifest = ImageManifest(searchPath=os.path.join(self.__sessionPath, self.__subPath), verbose=self.__verbose, log=self.__lfh)
+            manifest.build([instData[0] for instData in instList])
+        #
 
     def runMultiProcess(self, dataList, procName, optionsD, workingDir):  # pylint: disable=unused-argument
         """
@@ -78,7 +105,7 @@ class ImageGenerator(object):
     def __getSession(self):
         """
         """
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = getRequestContext(self.__reqObj).getSessionObj()
         self.__sessionPath = self.__sObj.getPath()
 
     def __generate2DImage(self, inst_id, label):
@@ -98,7 +125,7 @@ class ImageGenerator(object):
         rootName = self.__cmdUtil.getRootFileName('update-comp')
         self.__cmdUtil.runCCToolCmd('updateComponent', '', '', '', rootName + '.clog', ' -f ' + inst_id + '.' + self.__fileExt + ' ')
         rootName = self.__cmdUtil.getRootFileName('annotate-comp')
-        self.__cmdUtil.runAnnotateComp(inst_id + '.' + self.__fileExt, inst_id + '.' + self.__fileExt + '.new', rootName + '.clog')
+        self.__cmdUtil.runAnnotateComp(inst_id + '.' + self.__fileExt, inst_id + '.' + self.__fileExt + '.new', rootName + '.clog', useCache=True)
         #
         source = os.path.join(instancePath, inst_id + '.' + self.__fileExt + '.new')
         if os.access(source, os.F_OK):
@@ -106,7 +133,8 @@ class ImageGenerator(object):
         #
         rootName = self.__cmdUtil.getRootFileName('comp-report')
         self.__cmdUtil.runCCToolCmdWithTimeOut('makeCompReport', '', '', '', rootName + '.clog', ' -v -i ' + inst_id + '.' + self.__fileExt
-                                               + ' -type html-cctools -path "./" -of report.html -noaromatic ')
+                                               + ' -type html-cctools -path "./" -of report.html -noaromatic ',
+                                               cacheInputs=[inst_id + '.' + self.__fileExt], cacheOutputs=[het_id + '-500.gif', het_id + '-500.png'])
         #
         source = os.path.join(instancePath, het_id + '-500.gif')
         if os.access(source, os.F_OK):
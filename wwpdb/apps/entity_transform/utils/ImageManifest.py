@@ -0,0 +1,279 @@
+##
+# File:  ImageManifest.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   build() merges and rewrites the manifest under an exclusive lock on the manifest file
+##
+"""
+Manifest of 2D images (full size, 200 px ligand images and thumbnails) available in session search directories.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import fcntl
+import json
+import os
+import sys
+import traceback
+
+MANIFEST_FILE_NAME = 'image_manifest.json'
+MANIFEST_VERSION = 1
+#
+# largest width/height of thumbnails
+THUMBNAIL_SIZE = 120
+THUMBNAIL_SUFFIX = '.thumb'
+#
+IMAGE_EXTENSIONS = ('.gif', '.png')
+LIGAND_IMAGE_SUFFIX = '-200'
+#
+# [PIL.Image module or None, thumbnail format], imaging library is imported when the first thumbnail is needed
+_imageLib = []
+
+
+def _getImageLib():
+    if not _imageLib:
+        try:
+            from PIL import Image, features  # pylint: disable=import-outside-toplevel
+            _imageLib.extend([Image, 'webp' if features.check('webp') else 'png'])
+        except ImportError:
+            _imageLib.extend([None, ''])
+        #
+    #
+    return _imageLib
+
+
+class ImageManifest(object):
+    """ Class responsible for the image manifest of a session search directory (<session>/search/image_manifest.json):
+
+            {"version": 1, "thumbnail_format": "webp",
+             "instances": {instance id: {"images": {name: image record}, "ligand_images": {key: image record}}}}
+
+        with image record {"file": ..., "thumbnail": ..., "thumbnail_size": [width, height]}. "images" holds the
+        full size (500 px) images named <label>.gif/png, "ligand_images" the <key>-200.gif/png images. Thumbnails are
+        written in WebP (PNG if the imaging library has no WebP support) when the Python Imaging Library is installed;
+        without it records have no thumbnail.
+
+        build() indexes every instance directory with one directory listing and creates missing/outdated thumbnails.
+        It runs after ImageGenerator has produced the images, so pages only read the manifest instead of testing
+        candidate image files for every row. build() reads, merges and rewrites the manifest under an exclusive lock
+        on the manifest file; load() reads it under a shared lock.
+    """
+    def __init__(self, searchPath=None, verbose=False, log=sys.stderr):
+        self.__searchPath = searchPath
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__manifestPath = os.path.join(self.__searchPath, MANIFEST_FILE_NAME)
+        self.__manifestD = None
+
+    def exists(self):
+        return os.access(self.__manifestPath, os.F_OK)
+
+    def load(self, buildFlag=True):
+        """ Read manifest (built first if it does not exist and buildFlag is set)
+        """
+        if self.__manifestD is not None:
+            return self.__manifestD
+        #
+        if self.exists():
+            manifestD = self.__read()
+            if manifestD.get('version') == MANIFEST_VERSION:
+                self.__manifestD = manifestD
+                return self.__manifestD
+            #
+        #
+        if buildFlag:
+            return self.build()
+        #
+        self.__manifestD = {'version': MANIFEST_VERSION, 'instances': {}}
+        return self.__manifestD
+
+    def build(self, instIdList=None):
+        """ Index images of instances in instIdList (all instance directories if None), create thumbnails and write manifest.
+            Entries of instances not in instIdList are kept from the existing manifest.
+        """
+        def _build(manifestD):
+            instanceD = {}
+            if (instIdList is not None) and (manifestD.get('version') == MANIFEST_VERSION):
+                instanceD = dict(manifestD.get('instances', {}))
+            #
+            idList = instIdList
+            if os.path.isdir(self.__searchPath):
+                if idList is None:
+                    idList = [name for name in os.listdir(self.__searchPath) if os.path.isdir(os.path.join(self.__searchPath, name))]
+                #
+                for instId in idList:
+                    instanceD.pop(instId, None)
+                    recordD = self.__indexInstance(instId)
+                    if recordD:
+                        instanceD[instId] = recordD
+                    #
+                #
+            #
+            return {'version': MANIFEST_VERSION, 'thumbnail_format': self.__getThumbnailFormat(), 'instances': instanceD}
+        #
+        self.__manifestD = self.__update(_build)
+        if self.__manifestD is None:
+            self.__manifestD = {'version': MANIFEST_VERSION, 'instances': {}}
+        #
+        return self.__manifestD
+
+    def getImage(self, instId, name):
+        """ Return image record of full size image name (label) of instance instId, None if there is no image
+        """
+        return self.load().get('instances', {}).get(instId, {}).get('images', {}).get(name)
+
+    def getLigandImage(self, instId, key):
+        """ Return image record of 200 px image of ligand key in instance instId, None if there is no image
+        """
+        return self.load().get('instances', {}).get(instId, {}).get('ligand_images', {}).get(key)
+
+    def __indexInstance(self, instId):
+        instPath = os.path.join(self.__searchPath, instId)
+        try:
+            nameList = os.listdir(instPath)
+        except OSError:
+            return {}
+        #
+        nameSet = set(nameList)
+        imageD = {}
+        ligandD = {}
+        for fileName in sorted(nameList):
+            root, ext = os.path.splitext(fileName)
+            if (ext not in IMAGE_EXTENSIONS) or root.endswith(THUMBNAIL_SUFFIX):
+                continue
+            #
+            if root.endswith(LIGAND_IMAGE_SUFFIX):
+                targetD = ligandD
+                key = root[:-len(LIGAND_IMAGE_SUFFIX)]
+            else:
+                targetD = imageD
+                key = root
+            #
+            # .gif is preferred over .png (same order as the former file tests)
+            if (key in targetD) or (not key):
+                continue
+            #
+            record = self.__getImageRecord(instPath, fileName, nameSet)
+            if record:
+                targetD[key] = record
+            #
+        #
+        recordD = {}
+        if imageD:
+            recordD['images'] = imageD
+        #
+        if ligandD:
+            recordD['ligand_images'] = ligandD
+        #
+        return recordD
+
+    def __getImageRecord(self, instPath, fileName, nameSet):
+        imagePath = os.path.join(instPath, fileName)
+        try:
+            statInfo = os.stat(imagePath)
+        except OSError:
+            return None
+        #
+        if statInfo.st_size == 0:
+            return None
+        #
+        record = {'file': fileName}
+        thumbnailFormat = self.__getThumbnailFormat()
+        if not thumbnailFormat:
+            return record
+        #
+        thumbnailName = os.path.splitext(fileName)[0] + THUMBNAIL_SUFFIX + '.' + thumbnailFormat
+        thumbnailPath = os.path.join(instPath, thumbnailName)
+        try:
+            if (thumbnailName not in nameSet) or (os.stat(thumbnailPath).st_mtime < statInfo.st_mtime):
+                size = self.__writeThumbnail(imagePath, thumbnailPath, thumbnailFormat)
+            else:
+                with _getImageLib()[0].open(thumbnailPath) as img:
+                    size = img.size
+                #
+            #
+            record['thumbnail'] = thumbnailName
+            record['thumbnail_size'] = list(size)
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return record
+
+    def __writeThumbnail(self, imagePath, thumbnailPath, thumbnailFormat):
+        with _getImageLib()[0].open(imagePath) as img:
+            img = img.convert('RGBA')
+            img.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            tmpPath = thumbnailPath + '.tmp'
+            if thumbnailFormat == 'webp':
+                img.save(tmpPath, 'WEBP', quality=80, method=4)
+            else:
+                img.save(tmpPath, 'PNG', optimize=True)
+            #
+            os.rename(tmpPath, thumbnailPath)
+            if self.__verbose:
+                self.__lfh.write("+ImageManifest.__writeThumbnail() - created %s %s\n" % (thumbnailPath, img.size))
+            #
+            return img.size
+        #
+
+    def __getThumbnailFormat(self):
+        return _getImageLib()[1]
+
+    def __read(self):
+        try:
+            with open(self.__manifestPath, 'r') as ifh:
+                fcntl.flock(ifh.fileno(), fcntl.LOCK_SH)
+                return self.__parse(ifh)
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return {}
+
+    def __update(self, func):
+        """ Lock manifest, apply func(manifestD) to the current manifest and write the returned manifest
+        """
+        if not os.access(self.__searchPath, os.W_OK):
+            # manifest of a read-only search directory is only built in memory
+            return func(self.__read() if self.exists() else {})
+        #
+        try:
+            with open(self.__manifestPath, 'a+') as fh:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                fh.seek(0)
+                manifestD = func(self.__parse(fh))
+                fh.seek(0)
+                fh.truncate()
+                json.dump(manifestD, fh, sort_keys=True)
+                fh.flush()
+            #
+            return manifestD
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return None
+
+    def __parse(self, fh):
+        text = fh.read()
+        if not text.strip():
+            # manifest created by a writer that has not written it yet (or was interrupted)
+            return {}
+        #
+        try:
+            return json.loads(text)
+        except ValueError:
+            traceback.print_exc(file=self.__lfh)
+        #
+        return {}
@@ -0,0 +1,68 @@
+##
+# File:  LazyImport.py
+# Date:  19-Oct-2026
+# Updates:
+##
+"""
+Deferred import of classes/functions, resolved on first use.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import importlib
+import threading
+
+_lock = threading.Lock()
+
+
+class LazyImport(object):
+    """ Stand-in for 'from moduleName import attrName'. The module is imported when the object is first called
+        or one of its attributes is accessed, e.g.
+
+            EditorDepict = LazyImport('wwpdb.apps.editormodule.depict.EditorDepict', 'EditorDepict')
+            ...
+            depict = EditorDepict(verbose=False)    # imports editor module here
+    """
+    def __init__(self, moduleName, attrName):
+        self.__moduleName = moduleName
+        self.__attrName = attrName
+        self.__target = None
+
+    def resolve(self):
+        """ Import module (once) and return the named object
+        """
+        if self.__target is None:
+            with _lock:
+                if self.__target is None:
+                    self.__target = getattr(importlib.import_module(self.__moduleName), self.__attrName)
+                #
+            #
+        #
+        return self.__target
+
+    def isResolved(self):
+        return self.__target is not None
+
+    def getModuleName(self):
+        return self.__moduleName
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith('_LazyImport__'):
+            raise AttributeError(name)
+        #
+        return getattr(self.resolve(), name)
@@ -0,0 +1,352 @@
+##
+# File:  MetricsUtil.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   read site configuration through process-wide SiteConfig
+##
+"""
+Per-request timing and metrics collection for entity transform operations.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import fcntl
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
+
+# site configuration key of metrics directory; metrics are disabled when it is not set
+METRICS_PATH_KEY = 'SITE_ENTITY_TRANSFORM_METRICS_PATH'
+METRICS_FILE_NAME = 'entity-transform-metrics.jsonl'
+SUMMARY_FILE_NAME = 'entity-transform-metrics-summary.json'
+LOCK_FILE_NAME = '.entity-transform-metrics.lock'
+
+DURATION_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0]
+
+# siteId -> metrics directory ('' when disabled), read once per process
+_metricsPathD = {}
+_local = threading.local()
+
+
+class _NullTimer(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        return False
+
+
+class _SectionTimer(object):
+    def __init__(self, request, name):
+        self.__request = request
+        self.__name = name
+        self.__start = None
+
+    def __enter__(self):
+        self.__start = time.time()
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        self.__request.addSection(self.__name, time.time() - self.__start)
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class RequestMetrics(object):
+    """ Metrics collected for one request: section timers, event counters and back-end tool spans
+    """
+    def __init__(self, metricsPath, op, sessionId):
+        self.metricsPath = metricsPath
+        self.op = op
+        self.sessionId = sessionId
+        self.start = time.time()
+        self.sectionD = {}
+        self.counterD = {}
+        self.toolList = []
+
+    def addSection(self, name, seconds):
+        if name in self.sectionD:
+            self.sectionD[name][0] += 1
+            self.sectionD[name][1] += seconds
+        else:
+            self.sectionD[name] = [1, seconds]
+        #
+
+    def addCount(self, name, count):
+        self.counterD[name] = self.counterD.get(name, 0) + count
+
+    def addToolSpan(self, tool, start, end, exitCode):
+        self.toolList.append({'tool': tool, 'start': round(start, 6), 'seconds': round(end - start, 6), 'exit_code': exitCode})
+
+    def getRecord(self, status):
+        return {'time': round(self.start, 6), 'host': socket.gethostname(), 'pid': os.getpid(), 'op': self.op,
+                'session_id': self.sessionId, 'status': status, 'seconds': round(time.time() - self.start, 6),
+                'sections': dict([(name, {'count': v[0], 'seconds': round(v[1], 6)}) for name, v in self.sectionD.items()]),
+                'counters': self.counterD, 'tools': self.toolList}
+
+
+def getMetricsPath(siteId):
+    """ Return metrics directory configured for site (read once per process), or '' if metrics are disabled
+    """
+    if siteId not in _metricsPathD:
+        path = ''
+        try:
+            path = getSiteConfig(siteId).get(METRICS_PATH_KEY) or ''
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=sys.stderr)
+        #
+        _metricsPathD[siteId] = str(path)
+    #
+    return _metricsPathD[siteId]
+
+
+def startRequest(siteId, op, sessionId=''):
+    """ Start collecting metrics of request in current thread (no-op when metrics are disabled)
+    """
+    metricsPath = getMetricsPath(siteId)
+    if metricsPath:
+        _local.request = RequestMetrics(metricsPath, op, sessionId)
+    else:
+        _local.request = None
+    #
+
+
+def endRequest(status='ok', log=sys.stderr):
+    """ Write metrics of request in current thread
+    """
+    request = getattr(_local, 'request', None)
+    if request is None:
+        return
+    #
+    _local.request = None
+    MetricsUtil(metricsPath=request.metricsPath, log=log).write(request.getRecord(status))
+
+
+def timer(name):
+    """ Context manager adding elapsed time (and one call) to section 'name' of current request
+    """
+    request = getattr(_local, 'request', None)
+    if request is None:
+        return _NULL_TIMER
+    #
+    return _SectionTimer(request, name)
+
+
+def addCount(name, count=1):
+    request = getattr(_local, 'request', None)
+    if request is not None:
+        request.addCount(name, count)
+    #
+
+
+def addToolSpan(tool, start, end, exitCode):
+    """ Record back-end tool run (time.time() start/end values and exit code)
+    """
+    request = getattr(_local, 'request', None)
+    if request is not None:
+        request.addToolSpan(tool, start, end, exitCode)
+    #
+
+
+def isEnabled():
+    return getattr(_local, 'request', None) is not None
+
+
+def getCurrentRequest():
+    """ Return metrics of request in current thread (None if disabled), to be handed to worker threads
+    """
+    return getattr(_local, 'request', None)
+
+
+def setCurrentRequest(request):
+    """ Attach worker thread to request metrics returned by getCurrentRequest()
+    """
+    _local.request = request
+
+
+def getExitCode(status):
+    """ Convert os.system() wait status to exit code (negative signal number if killed)
+    """
+    if not isinstance(status, int):
+        return 0
+    #
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    #
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+    #
+    return status
+
+
+class MetricsUtil(object):
+    """ Class responsible for the metrics files in metrics directory:
+
+            entity-transform-metrics.jsonl          one JSON record per request, rotated at maxBytes (backups .1 ... .N)
+            entity-transform-metrics-summary.json   running totals used for Prometheus text exposition
+
+        Both files are updated under an exclusive lock, so all web server processes can share one directory.
+    """
+    def __init__(self, metricsPath=None, maxBytes=16777216, backupCount=5, verbose=False, log=sys.stderr):
+        self.__metricsPath = metricsPath
+        self.__maxBytes = maxBytes
+        self.__backupCount = backupCount
+        self.__verbose = verbose
+        self.__lfh = log
+
+    def write(self, record):
+        try:
+            if not os.access(self.__metricsPath, os.F_OK):
+                os.makedirs(self.__metricsPath)
+            #
+            with open(os.path.join(self.__metricsPath, LOCK_FILE_NAME), 'a') as lfh:
+                fcntl.flock(lfh.fileno(), fcntl.LOCK_EX)
+                self.__appendRecord(record)
+                self.__updateSummary(record)
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+
+    def getSummary(self):
+        summaryPath = os.path.join(self.__metricsPath, SUMMARY_FILE_NAME)
+        if not os.access(summaryPath, os.F_OK):
+            return {}
+        #
+        try:
+            with open(summaryPath, 'r') as ifh:
+                return json.load(ifh)
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return {}
+
+    def getPrometheusText(self):
+        """ Return running totals in Prometheus text exposition format
+        """
+        summaryD = self.getSummary()
+        lines = []
+        #
+        lines.append('# HELP entity_transform_requests_total Requests handled per operation and status.')
+        lines.append('# TYPE entity_transform_requests_total counter')
+        for op, opD in sorted(summaryD.get('ops', {}).items()):
+            for status, count in sorted(opD['status'].items()):
+                lines.append('entity_transform_requests_total{op="%s",status="%s"} %d' % (self.__escape(op), self.__escape(status), count))
+            #
+        #
+        lines.append('# HELP entity_transform_request_duration_seconds Request latency per operation.')
+        lines.append('# TYPE entity_transform_request_duration_seconds histogram')
+        for op, opD in sorted(summaryD.get('ops', {}).items()):
+            label = self.__escape(op)
+            cumulative = 0
+            for idx, bound in enumerate(DURATION_BUCKETS):
+                cumulative += opD['buckets'][idx]
+                lines.append('entity_transform_request_duration_seconds_bucket{op="%s",le="%s"} %d' % (label, repr(bound), cumulative))
+            #
+            lines.append('entity_transform_request_duration_seconds_bucket{op="%s",le="+Inf"} %d' % (label, opD['count']))
+            lines.append('entity_transform_request_duration_seconds_sum{op="%s"} %.6f' % (label, opD['seconds']))
+            lines.append('entity_transform_request_duration_seconds_count{op="%s"} %d' % (label, opD['count']))
+        #
+        lines.append('# HELP entity_transform_section_seconds_total Time spent in instrumented sections (cif parsing, templates, images).')
+        lines.append('# TYPE entity_transform_section_seconds_total counter')
+        for name, sectionD in sorted(summaryD.get('sections', {}).items()):
+            lines.append('entity_transform_section_seconds_total{section="%s"} %.6f' % (self.__escape(name), sectionD['seconds']))
+        #
+        lines.append('# HELP entity_transform_section_calls_total Calls of instrumented sections.')
+        lines.append('# TYPE entity_transform_section_calls_total counter')
+        for name, sectionD in sorted(summaryD.get('sections', {}).items()):
+            lines.append('entity_transform_section_calls_total{section="%s"} %d' % (self.__escape(name), sectionD['count']))
+        #
+        lines.append('# HELP entity_transform_events_total Counted events (template renders, file reads).')
+        lines.append('# TYPE entity_transform_events_total counter')
+        for name, count in sorted(summaryD.get('counters', {}).items()):
+            lines.append('entity_transform_events_total{event="%s"} %d' % (self.__escape(name), count))
+        #
+        lines.append('# HELP entity_transform_tool_runs_total Back-end tool runs per tool and result.')
+        lines.append('# TYPE entity_transform_tool_runs_total counter')
+        for tool, toolD in sorted(summaryD.get('tools', {}).items()):
+            lines.append('entity_transform_tool_runs_total{tool="%s",result="ok"} %d' % (self.__escape(tool), toolD['count'] - toolD['failures']))
+            lines.append('entity_transform_tool_runs_total{tool="%s",result="failed"} %d' % (self.__escape(tool), toolD['failures']))
+        #
+        lines.append('# HELP entity_transform_tool_seconds_total Time spent in back-end tools.')
+        lines.append('# TYPE entity_transform_tool_seconds_total counter')
+        for tool, toolD in sorted(summaryD.get('tools', {}).items()):
+            lines.append('entity_transform_tool_seconds_total{tool="%s"} %.6f' % (self.__escape(tool), toolD['seconds']))
+        #
+        return '\n'.join(lines) + '\n'
+
+    def __appendRecord(self, record):
+        filePath = os.path.join(self.__metricsPath, METRICS_FILE_NAME)
+        if os.access(filePath, os.F_OK) and (os.path.getsize(filePath) >= self.__maxBytes):
+            for idx in range(self.__backupCount - 1, 0, -1):
+                if os.access(filePath + '.' + str(idx), os.F_OK):
+                    os.rename(filePath + '.' + str(idx), filePath + '.' + str(idx + 1))
+                #
+            #
+            os.rename(filePath, filePath + '.1')
+        #
+        with open(filePath, 'a') as ofh:
+            ofh.write(json.dumps(record, sort_keys=True) + '\n')
+        #
+
+    def __updateSummary(self, record):
+        summaryD = self.getSummary()
+        for key in ('ops', 'sections', 'counters', 'tools'):
+            summaryD.setdefault(key, {})
+        #
+        opD = summaryD['ops'].setdefault(record['op'], {'count': 0, 'seconds': 0.0, 'status': {}, 'buckets': [0] * len(DURATION_BUCKETS)})
+        opD['count'] += 1
+        opD['seconds'] += record['seconds']
+        opD['status'][record['status']] = opD['status'].get(record['status'], 0) + 1
+        for idx, bound in enumerate(DURATION_BUCKETS):
+            if record['seconds'] <= bound:
+                opD['buckets'][idx] += 1
+                break
+            #
+        #
+        for name, sectionD in record['sections'].items():
+            totalD = summaryD['sections'].setdefault(name, {'count': 0, 'seconds': 0.0})
+            totalD['count'] += sectionD['count']
+            totalD['seconds'] += sectionD['seconds']
+        #
+        for name, count in record['counters'].items():
+            summaryD['counters'][name] = summaryD['counters'].get(name, 0) + count
+        #
+        for span in record['tools']:
+            toolD = summaryD['tools'].setdefault(span['tool'], {'count': 0, 'seconds': 0.0, 'failures': 0})
+            toolD['count'] += 1
+            toolD['seconds'] += span['seconds']
+            if span['exit_code'] != 0:
+                toolD['failures'] += 1
+            #
+        #
+        summaryPath = os.path.join(self.__metricsPath, SUMMARY_FILE_NAME)
+        tmpPath = summaryPath + '.' + str(os.getpid())
+        with open(tmpPath, 'w') as ofh:
+            json.dump(summaryD, ofh)
+        #
+        os.rename(tmpPath, summaryPath)
+
+    def __escape(self, value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -2,6 +2,8 @@
 # File:  RemoveEmptyCategories.py
 # Date:  28-Apr-2013
 # Updates:
+#  19-Oct-2026  zf   replace PdbxReader/PdbxWriter round trip with single pass streaming cleaner,
+#                    atomic swap of the cleaned file and mtime based "already clean" marker
 ##
 """
 Remove empty categories in cif file
@@ -21,11 +23,13 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
+import os
+import shutil
 import sys
+import tempfile
 import traceback
 from mmcif.io.PdbxReader import PdbxReader
 from mmcif.io.PdbxWriter import PdbxWriter
-from mmcif.api.PdbxContainers import DataContainer
 #
 
 
@@ -59,31 +63,234 @@ def WriteCif(myBlock, filepath):
 #
 
 
-def RemoveEmptyCategories(filepath):
-    myBlock = ReadCif(filepath)
-    blockName = myBlock.getName()
-    newBlock = DataContainer(blockName)
+def _getMarkerPath(filepath):
+    """ Return the path of the "already clean" marker file kept next to filepath
+    """
+    dirName, fileName = os.path.split(os.path.abspath(filepath))
+    return os.path.join(dirName, '.' + fileName + '.clean')
+
+
+def _getFileStamp(filepath):
+    """ Return modification time and size of filepath as a single string
+    """
+    statinfo = os.stat(filepath)
+    return repr(statinfo.st_mtime) + ' ' + str(statinfo.st_size)
+
+
+def _isMarkedClean(filepath):
+    """ Check if filepath has not changed since it was last cleaned
+    """
+    markerPath = _getMarkerPath(filepath)
+    if not os.access(markerPath, os.F_OK):
+        return False
+    #
+    try:
+        f = open(markerPath, 'r')
+        stamp = f.read().strip()
+        f.close()
+        return stamp == _getFileStamp(filepath)
+    except:  # noqa: E722 pylint: disable=bare-except
+        return False
     #
-    catList = myBlock.getObjNameList()
-    for catName in catList:
-        myCat = myBlock.getObj(catName)
-        row = myCat.getRowCount()
-        if row > 1:
-            newBlock.append(myCat)
+
+
+def _markClean(filepath):
+    """ Record the current modification time and size of filepath in its marker file
+    """
+    try:
+        f = open(_getMarkerPath(filepath), 'w')
+        f.write(_getFileStamp(filepath) + '\n')
+        f.close()
+    except:  # noqa: E722 pylint: disable=bare-except
+        traceback.print_exc(file=sys.stderr)
+    #
+
+
+def _hasValue(line):
+    """ Check if a data line holds at least one value other than '?' or '.'
+    """
+    idx = 0
+    length = len(line)
+    while idx < length:
+        if line[idx].isspace():
+            idx += 1
             continue
         #
-        has_value = False
-        attributeList = myCat.getAttributeList()
-        for attr in attributeList:
-            val = myCat.getValue(attr, 0)
-            if val != '?' and val != '.':
-                has_value = True
-                break
+        if line[idx] == '#':
+            return False
+        #
+        if line[idx] in ('"', "'"):
+            quote = line[idx]
+            end = idx + 1
+            while end < length:
+                if line[end] == quote and (end + 1 == length or line[end + 1].isspace()):
+                    break
+                #
+                end += 1
             #
+            token = line[idx + 1:end]
+            idx = end + 1
+        else:
+            end = idx
+            while end < length and not line[end].isspace():
+                end += 1
+            #
+            token = line[idx:end]
+            idx = end
+        #
+        if token != '?' and token != '.':
+            return True
         #
-        if has_value:
-            newBlock.append(myCat)
+    #
+    return False
+
+
+class _CategoryFilter(object):
+    """ Buffer the lines of one category at a time and write them out only if the category has a value
+    """
+    def __init__(self, ofh):
+        self.__ofh = ofh
+        self.__lines = []
+        self.__catName = ''
+        self.__loopFlag = False
+        self.__loopValueFlag = False
+        self.__hasValue = False
+        self.__removed = False
+
+    def isRemoved(self):
+        return self.__removed
+
+    def write(self, line):
+        """ Write line directly when it does not belong to a category
+        """
+        if self.__lines:
+            self.__lines.append(line)
+        else:
+            self.__ofh.write(line)
+        #
+
+    def flush(self):
+        """ Write out or drop the buffered category
+        """
+        if self.__lines:
+            if self.__hasValue or not self.__catName:
+                self.__ofh.write(''.join(self.__lines))
+            else:
+                self.__removed = True
+            #
+        #
+        self.__lines = []
+        self.__catName = ''
+        self.__loopFlag = False
+        self.__loopValueFlag = False
+        self.__hasValue = False
+
+    def startLoop(self, line):
+        self.flush()
+        self.__loopFlag = True
+        self.__lines.append(line)
+
+    def addItem(self, line):
+        """ Add '_category.item [value]' line
+        """
+        tokens = line.split(None, 1)
+        catName = tokens[0][1:].split('.')[0].lower()
+        if self.__loopFlag and not self.__loopValueFlag and (not self.__catName or self.__catName == catName):
+            self.__catName = catName
+            self.__lines.append(line)
+            return
         #
+        if self.__loopFlag or catName != self.__catName:
+            self.flush()
+            self.__catName = catName
+        #
+        self.__lines.append(line)
+        if len(tokens) > 1 and _hasValue(tokens[1]):
+            self.__hasValue = True
+        #
+
+    def addValue(self, line, textFlag=False):
+        """ Add data value line or semicolon text field line
+        """
+        if self.__loopFlag:
+            self.__loopValueFlag = True
+        #
+        self.write(line)
+        if textFlag or _hasValue(line):
+            self.__hasValue = True
+        #
+
+
+def _streamRemoveEmptyCategories(ifh, ofh):
+    """ Copy cif data from ifh to ofh, dropping categories in which all values are '?' or '.'
+
+        Returns True if any category has been dropped.
+    """
+    cFilter = _CategoryFilter(ofh)
+    textFlag = False
+    for line in ifh:
+        if textFlag:
+            cFilter.addValue(line, textFlag=True)
+            if line.startswith(';'):
+                textFlag = False
+            #
+            continue
+        #
+        if line.startswith(';'):
+            textFlag = True
+            cFilter.addValue(line, textFlag=True)
+            continue
+        #
+        sline = line.strip()
+        if (not sline) or sline.startswith('#'):
+            cFilter.write(line)
+        elif sline[:5].lower() == 'data_':
+            cFilter.flush()
+            cFilter.write(line)
+        elif sline[:5].lower() == 'loop_':
+            cFilter.startLoop(line)
+        elif sline.startswith('_'):
+            cFilter.addItem(line)
+        else:
+            cFilter.addValue(line)
+        #
+    #
+    cFilter.flush()
+    return cFilter.isRemoved()
+
+
+def RemoveEmptyCategories(filepath):
+    """ Remove categories without any value from filepath.  The file is rewritten (through a temporary
+        file in the same directory and an atomic rename) only when a category has actually been removed,
+        and is skipped entirely when it has not changed since the last cleaning.
+    """
+    if not os.access(filepath, os.F_OK):
+        return
+    #
+    if _isMarkedClean(filepath):
+        return
+    #
+    dirName = os.path.dirname(os.path.abspath(filepath))
+    fd, tmpPath = tempfile.mkstemp(prefix='.rmcat_', dir=dirName)
+    ok = False
+    try:
+        ofh = os.fdopen(fd, 'w')
+        ifh = open(filepath, 'r')
+        removed = _streamRemoveEmptyCategories(ifh, ofh)
+        ifh.close()
+        ofh.close()
+        if removed:
+            shutil.copymode(filepath, tmpPath)
+            os.rename(tmpPath, filepath)
+        #
+        ok = True
+    except:  # noqa: E722 pylint: disable=bare-except
+        traceback.print_exc(file=sys.stderr)
+    #
+    if os.access(tmpPath, os.F_OK):
+        os.remove(tmpPath)
+    #
+    if ok:
+        _markClean(filepath)
     #
-    WriteCif(newBlock, filepath)
 #
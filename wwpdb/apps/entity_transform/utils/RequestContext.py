@@ -0,0 +1,129 @@
+##
+# File:  RequestContext.py
+# Date:  19-Oct-2026
+# Updates:
+##
+"""
+Request-scoped context (session, identifier, summary cif object and site configuration) shared by all subsystems.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import sys
+import threading
+
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
+from wwpdb.apps.entity_transform.utils.SummaryCifUtil import SummaryCifUtil
+
+# attribute of request object holding its RequestContext
+CONTEXT_ATTRIBUTE = '_entity_transform_request_context'
+
+
+def getRequestContext(reqObj, verbose=False, log=sys.stderr):
+    """ Return RequestContext attached to reqObj, creating and attaching it on first use (or when the request
+        has been switched to another session)
+    """
+    context = getattr(reqObj, CONTEXT_ATTRIBUTE, None)
+    if (context is None) or (not context.isValid()):
+        context = RequestContext(reqObj=reqObj, verbose=verbose, log=log)
+        setattr(reqObj, CONTEXT_ATTRIBUTE, context)
+    #
+    return context
+
+
+class RequestContext(object):
+    """ Class holding state resolved once per request. EntityWebAppWorker.doOp creates it and every helper built with
+        the same request object gets it through getRequestContext(reqObj) instead of calling reqObj.newSessionObj()
+        (which joins/creates the session directory on every call).
+
+        The session is joined/created on first use, so operations which do not need a session do not create one.
+        The summary cif object is read once and read again only when the summary file has changed.
+    """
+    def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__reqObj = reqObj
+        self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
+        self.__siteConfig = getSiteConfig(self.__siteId)
+        self.__sObj = None
+        self.__summaryKey = None
+        self.__summaryCifObj = None
+        self.__lock = threading.RLock()
+
+    def isValid(self):
+        """ False if session has been resolved and request has since been given another session id
+        """
+        return (self.__sObj is None) or (self.__sObj.getId() == str(self.__reqObj.getValue("sessionid")))
+
+    def getSiteId(self):
+        return self.__siteId
+
+    def getSiteConfig(self):
+        return self.__siteConfig
+
+    def getSessionObj(self):
+        """ Join existing session or create new session (once per request)
+        """
+        if self.__sObj is None:
+            with self.__lock:
+                if self.__sObj is None:
+                    sObj = self.__reqObj.newSessionObj()
+                    if self.__verbose:
+                        self.__lfh.write("------------------------------------------------------\n")
+                        self.__lfh.write("+RequestContext.getSessionObj() - creating/joining session %s\n" % sObj.getId())
+                        self.__lfh.write("+RequestContext.getSessionObj() - session path %s\n" % sObj.getPath())
+                    #
+                    self.__sObj = sObj
+                #
+            #
+        #
+        return self.__sObj
+
+    def getSessionId(self):
+        return self.getSessionObj().getId()
+
+    def getSessionPath(self):
+        return self.getSessionObj().getPath()
+
+    def getRelativeSessionPath(self):
+        return self.getSessionObj().getRelativePath()
+
+    def getIdentifier(self):
+        return str(self.__reqObj.getValue("identifier"))
+
+    def getSummaryFilePath(self):
+        identifier = self.getIdentifier()
+        if not identifier:
+            return ''
+        #
+        return os.path.join(self.getSessionPath(), identifier + '_prd-summary_P1.cif')
+
+    def getSummaryCifObj(self):
+        """ Return SummaryCifUtil object of <identifier>_prd-summary_P1.cif in session (None if file does not exist)
+        """
+        filePath = self.getSummaryFilePath()
+        if (not filePath) or (not os.access(filePath, os.F_OK)):
+            return None
+        #
+        statInfo = os.stat(filePath)
+        key = (filePath, statInfo.st_mtime, statInfo.st_size)
+        with self.__lock:
+            if key != self.__summaryKey:
+                self.__summaryCifObj = SummaryCifUtil(summaryFile=filePath, verbose=self.__verbose, log=self.__lfh)
+                self.__summaryKey = key
+            #
+            return self.__summaryCifObj
+        #
@@ -0,0 +1,197 @@
+##
+# File:  SessionManifest.py
+# Date:  19-Oct-2026
+# Updates:
+##
+"""
+Append-only manifest of files created in session directory.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import fcntl
+import json
+import os
+import re
+import sys
+import traceback
+
+MANIFEST_FILE_NAME = '.session_manifest'
+
+
+class SessionManifest(object):
+    """ Class responsible for recording artifacts created in a session (or instance) directory.
+
+        The manifest is a JSON-lines file inside the directory with one record per change:
+            {"op": "add", "name": ..., "type": ...}, {"op": "remove", "name": ...}, {"op": "counter", "name": ..., "value": ...}
+        Every read-modify-append runs under an exclusive lock on the manifest file. A directory without manifest is
+        indexed by a single directory listing the first time it is opened with createFlag=True.
+    """
+    def __init__(self, dirPath=None, createFlag=True, verbose=False, log=sys.stderr):
+        self.__dirPath = dirPath
+        self.__createFlag = createFlag
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__manifestPath = os.path.join(self.__dirPath, MANIFEST_FILE_NAME)
+
+    def exists(self):
+        return os.access(self.__manifestPath, os.F_OK)
+
+    def addFile(self, name, fileType=''):
+        """ Record file (or directory) name
+        """
+        self.__update(lambda fileD, counterD: [{'op': 'add', 'name': name, 'type': fileType}])
+
+    def removeFile(self, name):
+        """ Record removal of file name
+        """
+        self.__update(lambda fileD, counterD: [{'op': 'remove', 'name': name}] if name in fileD else [])
+
+    def nextCounter(self, name):
+        """ Atomically hand out next value of counter 'name'. A new counter starts after the largest N of
+            recorded entries named name_N or name_N.ext
+        """
+        valueL = []
+
+        def _next(fileD, counterD):
+            if name in counterD:
+                value = counterD[name] + 1
+            else:
+                value = 1
+                pattern = re.compile('^' + re.escape(name) + r'_(\d+)(\..*)?$')
+                for fileName in fileD:
+                    match = pattern.match(fileName)
+                    if match:
+                        value = max(value, int(match.group(1)) + 1)
+                    #
+                #
+            #
+            valueL.append(value)
+            return [{'op': 'counter', 'name': name, 'value': value}]
+        #
+        if not self.__update(_next):
+            return None
+        #
+        return valueL[0]
+
+    def getFileList(self, prefix='', suffix='', fileType=None):
+        """ Return sorted recorded names matching prefix/suffix (and type), or None if no manifest is available
+        """
+        state = self.__read()
+        if state is None:
+            return None
+        #
+        fileD, _counterD = state
+        fileList = []
+        for name, ftype in fileD.items():
+            if name.startswith(prefix) and name.endswith(suffix) and ((fileType is None) or (ftype == fileType)):
+                fileList.append(name)
+            #
+        #
+        return sorted(fileList)
+
+    def __read(self):
+        if not self.exists():
+            if not self.__createFlag:
+                return None
+            #
+            if not self.__update(lambda fileD, counterD: []):
+                return None
+            #
+        #
+        try:
+            with open(self.__manifestPath, 'r') as ifh:
+                fcntl.flock(ifh.fileno(), fcntl.LOCK_SH)
+                return self.__parse(ifh)
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return None
+
+    def __update(self, func):
+        """ Lock manifest, apply func(fileD, counterD) to the current state and append the returned records
+        """
+        if not os.access(self.__dirPath, os.W_OK):
+            return False
+        #
+        if (not self.__createFlag) and (not self.exists()):
+            return False
+        #
+        try:
+            with open(self.__manifestPath, 'a+') as fh:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                fh.seek(0)
+                recordList = []
+                if not fh.read(1):
+                    recordList = self.__getInitialRecords()
+                #
+                fh.seek(0)
+                fileD, counterD = self.__parse(fh)
+                for record in recordList:
+                    self.__apply(record, fileD, counterD)
+                #
+                recordList.extend(func(fileD, counterD))
+                if recordList:
+                    fh.seek(0, os.SEEK_END)
+                    fh.write(''.join([json.dumps(record) + '\n' for record in recordList]))
+                    fh.flush()
+                #
+            #
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return False
+
+    def __getInitialRecords(self):
+        """ Index existing directory content (one listing for directories created before the manifest)
+        """
+        recordList = [{'op': 'init'}]
+        for name in sorted(os.listdir(self.__dirPath)):
+            if name != MANIFEST_FILE_NAME:
+                recordList.append({'op': 'add', 'name': name, 'type': ''})
+            #
+        #
+        if self.__verbose:
+            self.__lfh.write("+SessionManifest.__getInitialRecords() - indexed %d entries in %s\n" % (len(recordList) - 1, self.__dirPath))
+        #
+        return recordList
+
+    def __parse(self, fh):
+        fileD = {}
+        counterD = {}
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            #
+            try:
+                self.__apply(json.loads(line), fileD, counterD)
+            except ValueError:
+                # partial line left by an interrupted writer
+                continue
+            #
+        #
+        return fileD, counterD
+
+    def __apply(self, record, fileD, counterD):
+        if record['op'] == 'add':
+            fileD[record['name']] = record['type']
+        elif record['op'] == 'remove':
+            fileD.pop(record['name'], None)
+        elif record['op'] == 'counter':
+            counterD[record['name']] = record['value']
+        #
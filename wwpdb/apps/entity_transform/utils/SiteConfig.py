@@ -0,0 +1,192 @@
+##
+# File:  SiteConfig.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   configD values override site configuration (SiteConfig(siteId, configD)), setSiteConfig() installs a snapshot
+##
+"""
+Process-wide, read-only snapshot of the site configuration used by the entity transform module.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import sys
+import threading
+
+from wwpdb.io.locator.ChemRefPathInfo import ChemRefPathInfo
+from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon, ConfigInfoAppCc
+
+# siteId -> SiteConfig
+_siteConfigD = {}
+_siteConfigLock = threading.Lock()
+
+
+def getSiteConfig(siteId):
+    """ Return the SiteConfig snapshot of siteId, created once per process
+    """
+    siteId = str(siteId)
+    try:
+        return _siteConfigD[siteId]
+    except KeyError:
+        pass
+    #
+    with _siteConfigLock:
+        if siteId not in _siteConfigD:
+            _siteConfigD[siteId] = SiteConfig(siteId)
+        #
+        return _siteConfigD[siteId]
+    #
+
+
+def setSiteConfig(siteConfig):
+    """ Install siteConfig as the snapshot returned by getSiteConfig() for its site id (e.g. one created with configD overrides)
+    """
+    with _siteConfigLock:
+        _siteConfigD[siteConfig.getSiteId()] = siteConfig
+    #
+
+
+class SiteConfig(object):
+    """ Class holding the configuration values, paths and back-end shell settings of one site.
+
+        Every value is looked up from ConfigInfo/ConfigInfoAppCommon/ConfigInfoAppCc the first time it is asked for
+        and then kept unchanged for the life of the process, so helpers created on every request share the same
+        resolved values instead of rebuilding the configuration objects. Use getSiteConfig(siteId) to get it.
+
+        Values in configD (ConfigInfo key -> value) take precedence over the site configuration for get() and for the
+        SITE_ANNOT_TOOLS_PATH, SITE_CC_APPS_PATH, SITE_PACKAGES_PATH and SITE_LOCAL_APPS_PATH based paths/settings.
+    """
+    def __init__(self, siteId, configD=None):
+        self.__siteId = str(siteId)
+        self.__configD = dict(configD or {})
+        self.__valueD = {}
+        self.__lock = threading.RLock()
+        self.__cI = None
+        self.__cICommon = None
+        self.__cIcc = None
+
+    def getSiteId(self):
+        return self.__siteId
+
+    def get(self, key):
+        """ Return ConfigInfo value of key
+        """
+        if key in self.__configD:
+            return self.__configD[key]
+        #
+        return self.__resolve('config:' + key, lambda: self.__getConfigInfo().get(key))
+
+    def getAnnotToolsPath(self):
+        return self.__resolve('annot_tools_path', lambda: self.__configD.get('SITE_ANNOT_TOOLS_PATH')
+                              or self.__getConfigInfoAppCommon().get_site_annot_tools_path())
+
+    def getCCAppsPath(self):
+        return self.__resolve('cc_apps_path', lambda: self.__configD.get('SITE_CC_APPS_PATH') or self.__getConfigInfoAppCommon().get_site_cc_apps_path())
+
+    def getMmcifDictPath(self):
+        return self.__resolve('mmcif_dict_path', lambda: self.__getConfigInfoAppCommon().get_mmcif_dict_path())
+
+    def getMmcifArchiveNextDictFileName(self):
+        return self.__resolve('mmcif_archive_next_dict_filename', lambda: self.__getConfigInfoAppCommon().get_mmcif_archive_next_dict_filename())
+
+    def getCCCvsPath(self):
+        return self.__resolve('cc_cvs_path', lambda: self.__getConfigInfoAppCc().get_site_cc_cvs_path())
+
+    def getPrdCvsPath(self):
+        return self.__resolve('prd_cvs_path', lambda: self.__getConfigInfoAppCc().get_site_prd_cvs_path())
+
+    def getPrdccCvsPath(self):
+        return self.__resolve('prdcc_cvs_path', lambda: self.__getConfigInfoAppCc().get_site_prdcc_cvs_path())
+
+    def getUnusedPrdFile(self):
+        return self.__resolve('unused_prd_file', lambda: self.__getConfigInfoAppCc().get_unused_prd_file())
+
+    def getChemRefPathInfo(self):
+        """ Return shared ChemRefPathInfo (file path look up of CC/PRD/PRDCC definitions)
+        """
+        return self.__resolve('chem_ref_path_info', lambda: ChemRefPathInfo(siteId=self.__siteId, verbose=False, log=sys.stderr))
+
+    def getAnnotSetting(self):
+        """ Return Annot package bash setting
+        """
+        return self.__resolve('annot_setting', self.__buildAnnotSetting)
+
+    def getCCToolSetting(self):
+        """ Return CC_TOOLS package bash setting
+        """
+        return self.__resolve('cc_tool_setting', self.__buildCCToolSetting)
+
+    def __resolve(self, key, func):
+        try:
+            return self.__valueD[key]
+        except KeyError:
+            pass
+        #
+        with self.__lock:
+            if key not in self.__valueD:
+                self.__valueD[key] = func()
+            #
+            return self.__valueD[key]
+        #
+
+    def __getPackagesPath(self):
+        return self.__configD.get('SITE_PACKAGES_PATH') or self.__getConfigInfoAppCommon().get_site_packages_path()
+
+    def __getLocalAppsPath(self):
+        return self.__configD.get('SITE_LOCAL_APPS_PATH') or self.__getConfigInfoAppCommon().get_site_local_apps_path()
+
+    def __buildAnnotSetting(self):
+        setting = " RCSBROOT=" + self.getAnnotToolsPath() + "; export RCSBROOT; PDB2GLYCAN=" \
+            + os.path.join(os.path.abspath(self.__getPackagesPath()), "pdb2glycan", "bin", "PDB2Glycan") + "; export PDB2GLYCAN; " \
+            + " COMP_PATH=" + self.getCCCvsPath() + "; export COMP_PATH; " \
+            + " PRD_PATH=" + self.getPrdCvsPath() + "; export PRD_PATH; " \
+            + " BINPATH=${RCSBROOT}/bin; export BINPATH; "
+        #
+        return setting
+
+    def __buildCCToolSetting(self):
+        cICommon = self.__getConfigInfoAppCommon()
+        setting = " CC_TOOLS=" + self.getCCAppsPath() + "/bin; export CC_TOOLS; " \
+            + " OE_DIR=" + cICommon.get_site_cc_oe_dir() + "; export OE_DIR; " \
+            + " OE_LICENSE=" + cICommon.get_site_cc_oe_licence() + "; export OE_LICENSE; " \
+            + " ACD_DIR=" + cICommon.get_site_cc_acd_dir() + "; export ACD_DIR; " \
+            + " CACTVS_DIR=" + cICommon.get_site_cc_cactvs_dir() + "; export CACTVS_DIR; " \
+            + " CORINA_DIR=" + cICommon.get_site_cc_corina_dir() + "/bin; export CORINA_DIR; " \
+            + " BABEL_DIR=" + cICommon.get_site_cc_babel_dir() + "; export BABEL_DIR; " \
+            + " BABEL_DATADIR=" + cICommon.get_site_cc_babel_datadir() + "; export BABEL_DATADIR; " \
+            + " LD_LIBRARY_PATH=" + cICommon.get_site_cc_babel_lib() + ":" \
+            + os.path.join(self.__getLocalAppsPath(), "lib") + "; export LD_LIBRARY_PATH; "
+        #
+        return setting
+
+    def __getConfigInfo(self):
+        if self.__cI is None:
+            self.__cI = ConfigInfo(self.__siteId)
+        #
+        return self.__cI
+
+    def __getConfigInfoAppCommon(self):
+        if self.__cICommon is None:
+            self.__cICommon = ConfigInfoAppCommon(self.__siteId)
+        #
+        return self.__cICommon
+
+    def __getConfigInfoAppCc(self):
+        if self.__cIcc is None:
+            self.__cIcc = ConfigInfoAppCc(self.__siteId)
+        #
+        return self.__cIcc
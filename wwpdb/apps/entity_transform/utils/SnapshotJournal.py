@@ -0,0 +1,332 @@
+##
+# File:  SnapshotJournal.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   keep file in place: snapshot by link/copy, edit output renamed over the file in finish(),
+#                    rollback restores by reflink/copy
+#  19-Oct-2026  zf   keep at most MAX_SNAPSHOTS steps; compress() gzips old snapshots outside of capture() and the lock
+##
+"""
+Snapshot journal of a session file (model coordinate file) with undo/rollback to any prior step.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import fcntl
+import gzip
+import json
+import os
+import shutil
+import sys
+import time
+import traceback
+
+from wwpdb.apps.entity_transform.utils.FileImportUtil import FileImportUtil
+
+JOURNAL_DIR_NAME = 'snapshots'
+JOURNAL_VERSION = 1
+#
+# number of most recent snapshots kept uncompressed, older snapshots are gzip compressed by compress()
+MAX_FULL_SNAPSHOTS = 10
+# number of steps kept in the journal, the oldest steps are dropped
+MAX_SNAPSHOTS = 50
+
+
+class SnapshotJournal(object):
+    """ Class responsible for the snapshots of one file in session directory (<session>/snapshots/<file>.journal):
+
+            {"version": 1, "file": ..., "steps": [{"step", "label", "snapshot", "size", "mtime", "time", "compressed"}]}
+
+        An edit of the file is run as
+
+            step = journal.capture(label)
+            try:
+                ... program reads the file and writes journal.getOutputFile(step) ...
+            finally:
+                journal.finish(step)
+
+        capture() links the current file into the journal (reflink or hard link, copy if neither is supported) and
+        leaves the file in place; finish() renames the new output over the file, or drops the step if the edit wrote
+        nothing. The file is therefore never written in place and always exists. rollback() restores a snapshot by
+        reflink or copy, so the restored file never shares an inode with its snapshot. The rollback itself is a
+        journal step, so it can be undone too. The journal keeps the maxSnapshots most recent steps. compress() gzips
+        snapshots older than the maxFullSnapshots most recent ones; it is run by the detached prd-search after an edit,
+        not in the request which captures the snapshot. Compressed snapshots are decompressed on rollback.
+    """
+    def __init__(self, sessionPath=None, fileName=None, maxFullSnapshots=MAX_FULL_SNAPSHOTS, maxSnapshots=MAX_SNAPSHOTS, verbose=False, log=sys.stderr):
+        """
+         :param `sessionPath`: session directory
+         :param `fileName`: name of the journaled file in sessionPath
+        """
+        self.__sessionPath = sessionPath
+        self.__fileName = fileName
+        self.__maxFullSnapshots = maxFullSnapshots
+        self.__maxSnapshots = maxSnapshots
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__filePath = os.path.join(self.__sessionPath, self.__fileName)
+        self.__journalPath = os.path.join(self.__sessionPath, JOURNAL_DIR_NAME)
+        self.__journalFile = os.path.join(self.__journalPath, self.__fileName + '.journal')
+
+    def getStepList(self):
+        """ Return journal step records (oldest first)
+        """
+        if not os.access(self.__journalFile, os.F_OK):
+            return []
+        #
+        try:
+            with open(self.__journalFile, 'r') as ifh:
+                fcntl.flock(ifh.fileno(), fcntl.LOCK_SH)
+                return self.__parse(ifh)['steps']
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return []
+
+    def capture(self, label):
+        """ Add snapshot of the current file as new step before it is changed. Return step number, None if the
+            file does not exist or capturing failed.
+        """
+        stepList = []
+
+        def _capture(journalD):
+            stepD = self.__addSnapshot(journalD, label)
+            if not stepD:
+                return False
+            #
+            stepList.append(stepD['step'])
+            return True
+        #
+        if not self.__update(_capture):
+            return None
+        #
+        return stepList[0]
+
+    def getOutputFile(self, step):
+        """ Return name (in session directory) of the file the edit of step writes instead of the journaled file
+        """
+        return self.__fileName + '.' + str(step) + '.tmp'
+
+    def finish(self, step):
+        """ Called after the edit of step: rename its output over the file. If the edit wrote no output, the
+            file is unchanged and the step is dropped. Return True if the file was updated.
+        """
+        outputPath = os.path.join(self.__sessionPath, self.getOutputFile(step))
+        try:
+            if os.path.getsize(outputPath) > 0:
+                os.rename(outputPath, self.__filePath)
+                return True
+            #
+            os.remove(outputPath)
+        except OSError:
+            pass
+        #
+
+        def _drop(journalD):
+            stepList = [stepD for stepD in journalD['steps'] if stepD['step'] == step]
+            if not stepList:
+                return False
+            #
+            journalD['steps'].remove(stepList[0])
+            self.__removeSnapshot(stepList[0])
+            return True
+        #
+        self.__update(_drop)
+        return False
+
+    def rollback(self, step):
+        """ Restore file to its state before journal step 'step', return error message ('' if restored)
+        """
+        messageList = []
+        restorePath = self.__filePath + '.restore'
+
+        def _rollback(journalD):
+            stepList = [stepD for stepD in journalD['steps'] if stepD['step'] == step]
+            if not stepList:
+                messageList.append('Snapshot ' + str(step) + ' not found.')
+                return False
+            #
+            if not self.__restore(stepList[0], restorePath):
+                messageList.append('Restoring snapshot ' + str(step) + ' failed.')
+                return False
+            #
+            if os.access(self.__filePath, os.F_OK) and (not self.__addSnapshot(journalD, 'Rollback to snapshot ' + str(step))):
+                os.remove(restorePath)
+                messageList.append('Saving current ' + self.__fileName + ' failed.')
+                return False
+            #
+            os.rename(restorePath, self.__filePath)
+            return True
+        #
+        if not self.__update(_rollback):
+            return messageList[0] if messageList else 'Rollback failed.'
+        #
+        return ''
+
+    def compress(self):
+        """ gzip snapshots older than the maxFullSnapshots most recent ones. Snapshots are compressed without holding
+            the journal lock (snapshot files never change); the journal is only locked to swap in the compressed files.
+            Return number of compressed snapshots.
+        """
+        fullList = [stepD for stepD in self.getStepList() if not stepD['compressed']]
+        tmpD = {}
+        for stepD in fullList[:max(0, len(fullList) - self.__maxFullSnapshots)]:
+            tmpPath = self.__compressSnapshot(stepD)
+            if tmpPath:
+                tmpD[stepD['snapshot']] = tmpPath
+            #
+        #
+        if not tmpD:
+            return 0
+        #
+        countList = []
+
+        def _swap(journalD):
+            for stepD in journalD['steps']:
+                tmpPath = tmpD.pop(stepD['snapshot'], None)
+                if (not tmpPath) or stepD['compressed']:
+                    continue
+                #
+                os.rename(tmpPath, os.path.join(self.__journalPath, stepD['snapshot'] + '.gz'))
+                self.__removeSnapshot(stepD)
+                stepD['snapshot'] += '.gz'
+                stepD['compressed'] = True
+                countList.append(stepD['step'])
+            #
+            return bool(countList)
+        #
+        self.__update(_swap)
+        # steps dropped (or compressed by another process) in the meantime
+        for tmpPath in tmpD.values():
+            if os.access(tmpPath, os.F_OK):
+                os.remove(tmpPath)
+            #
+        #
+        if self.__verbose:
+            self.__lfh.write("+SnapshotJournal.compress() - compressed %d snapshot(s) of %s\n" % (len(countList), self.__fileName))
+        #
+        return len(countList)
+
+    def __addSnapshot(self, journalD, label):
+        """ Link current file into journal directory, add and return step record
+        """
+        try:
+            statInfo = os.stat(self.__filePath)
+        except OSError:
+            return None
+        #
+        step = max([0] + [stepD['step'] for stepD in journalD['steps']]) + 1
+        stepD = {'step': step, 'label': label, 'snapshot': self.__fileName + '.' + str(step), 'size': statInfo.st_size,
+                 'mtime': statInfo.st_mtime, 'time': time.time(), 'compressed': False}
+        # the file is only ever replaced by rename, so a hard link keeps the captured content
+        importUtil = FileImportUtil(verbose=self.__verbose, log=self.__lfh)
+        if not importUtil.importFile(self.__filePath, os.path.join(self.__journalPath, stepD['snapshot']), readOnly=True):
+            return None
+        #
+        journalD['steps'].append(stepD)
+        if self.__verbose:
+            self.__lfh.write("+SnapshotJournal.__addSnapshot() - step %d '%s' %s\n" % (step, label, stepD['snapshot']))
+        #
+        for oldStepD in journalD['steps'][:max(0, len(journalD['steps']) - self.__maxSnapshots)]:
+            journalD['steps'].remove(oldStepD)
+            self.__removeSnapshot(oldStepD)
+        #
+        return stepD
+
+    def __removeSnapshot(self, stepD):
+        snapshotPath = os.path.join(self.__journalPath, stepD['snapshot'])
+        if os.access(snapshotPath, os.F_OK):
+            os.remove(snapshotPath)
+        #
+
+    def __restore(self, stepD, restorePath):
+        """ Restore snapshot of stepD as restorePath (reflink or copy, never a hard link to the snapshot)
+        """
+        snapshotPath = os.path.join(self.__journalPath, stepD['snapshot'])
+        if stepD['compressed']:
+            with gzip.open(snapshotPath, 'rb') as ifh:
+                with open(restorePath, 'wb') as ofh:
+                    shutil.copyfileobj(ifh, ofh)
+                #
+            #
+            return True
+        #
+        try:
+            statInfo = os.stat(snapshotPath)
+        except OSError:
+            return False
+        #
+        if (statInfo.st_size != stepD['size']) or (statInfo.st_mtime != stepD['mtime']):
+            # the file was written in place while it was hard linked to the snapshot
+            self.__lfh.write("+SnapshotJournal.__restore() - snapshot %s was modified\n" % snapshotPath)
+            return False
+        #
+        return FileImportUtil(verbose=self.__verbose, log=self.__lfh).importFile(snapshotPath, restorePath, readOnly=False)
+
+    def __compressSnapshot(self, stepD):
+        """ Write gzip compressed copy of the snapshot of stepD, return its path (None if failed)
+        """
+        snapshotPath = os.path.join(self.__journalPath, stepD['snapshot'])
+        tmpPath = snapshotPath + '.gz.%d.tmp' % os.getpid()
+        try:
+            with open(snapshotPath, 'rb') as ifh:
+                with gzip.open(tmpPath, 'wb', compresslevel=6) as ofh:
+                    shutil.copyfileobj(ifh, ofh)
+                #
+            #
+            return tmpPath
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        if os.access(tmpPath, os.F_OK):
+            os.remove(tmpPath)
+        #
+        return None
+
+    def __parse(self, fh):
+        text = fh.read()
+        if text.strip():
+            journalD = json.loads(text)
+            if journalD.get('version') == JOURNAL_VERSION:
+                return journalD
+            #
+        #
+        return {'version': JOURNAL_VERSION, 'file': self.__fileName, 'steps': []}
+
+    def __update(self, func):
+        """ Lock journal, apply func(journalD) and write the journal if func returns True
+        """
+        try:
+            if not os.access(self.__journalPath, os.F_OK):
+                os.makedirs(self.__journalPath)
+            #
+            with open(self.__journalFile, 'a+') as fh:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                fh.seek(0)
+                journalD = self.__parse(fh)
+                if not func(journalD):
+                    return False
+                #
+                fh.seek(0)
+                fh.truncate()
+                json.dump(journalD, fh, indent=1, sort_keys=True)
+                fh.flush()
+            #
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return False
@@ -3,6 +3,7 @@
 # Date:  17-Oct-2012
 # Updates:
 #  25-Aug-2024  zf   add getPcmLabel() method to read PCM information from '_entry.pcm_label' item
+#  19-Oct-2026  zf   count and time summary file parsing in request metrics
 ##
 """
 Read and handle search summary cif file.
@@ -25,6 +26,7 @@ __version__ = "V0.07"
 import sys
 
 from wwpdb.io.file.mmCIFUtil import mmCIFUtil
+from wwpdb.apps.entity_transform.utils import MetricsUtil
 #
 
 
@@ -34,7 +36,10 @@ class SummaryCifUtil(object):
     def __init__(self, summaryFile=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
         # self.__verbose = verbose
         # self.__lfh = log
-        self.__cifObj = mmCIFUtil(filePath=summaryFile)
+        with MetricsUtil.timer('cif_parse'):
+            MetricsUtil.addCount('file_read')
+            self.__cifObj = mmCIFUtil(filePath=summaryFile)
+        #
         #
         self.__seqs = {}
         self.__labels = {}
@@ -0,0 +1,211 @@
+##
+# File:  TraceUtil.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   read site configuration through process-wide SiteConfig
+##
+"""
+Per-request trace of back-end command execution exported as Chrome trace-event JSON.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import traceback
+
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
+
+# site configuration key of trace directory; tracing is disabled when it is not set
+TRACE_PATH_KEY = 'SITE_ENTITY_TRANSFORM_TRACE_PATH'
+
+# siteId -> trace directory ('' when disabled), read once per process
+_tracePathD = {}
+_local = threading.local()
+
+
+class _NullSpan(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        return False
+
+    def setExitCode(self, exitCode):
+        pass
+
+    def addOutputFiles(self, fileList):
+        pass
+
+
+class _Span(object):
+    """ One complete ('X') trace event. Output file sizes and peak child RSS are taken when the span ends.
+    """
+    def __init__(self, trace, name, category, outputFileList, argD):
+        self.__trace = trace
+        self.__name = name
+        self.__category = category
+        self.__outputFileList = list(outputFileList or [])
+        self.__argD = argD or {}
+        self.__start = None
+        self.__rssBefore = 0
+
+    def __enter__(self):
+        self.__rssBefore = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        self.__start = time.time()
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        end = time.time()
+        rssAfter = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        argD = {'parent_op': self.__trace.op, 'session_id': self.__trace.sessionId, 'instance_id': self.__trace.instanceId,
+                'start': round(self.__start, 6), 'end': round(end, 6), 'peak_child_rss_kb': rssAfter,
+                'new_child_rss_peak': rssAfter > self.__rssBefore}
+        argD.update(self.__argD)
+        if excType is not None:
+            argD['exception'] = excType.__name__
+        #
+        sizeD = {}
+        for filePath in self.__outputFileList:
+            if os.access(filePath, os.F_OK):
+                sizeD[os.path.basename(filePath)] = os.path.getsize(filePath)
+            else:
+                sizeD[os.path.basename(filePath)] = None
+            #
+        #
+        argD['output_file_sizes'] = sizeD
+        self.__trace.addEvent(self.__name, self.__category, self.__start, end, argD)
+        return False
+
+    def setExitCode(self, exitCode):
+        self.__argD['exit_code'] = exitCode
+
+    def addOutputFiles(self, fileList):
+        self.__outputFileList.extend(fileList)
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class RequestTrace(object):
+    """ Trace events collected for one request
+    """
+    def __init__(self, tracePath, op, sessionId, instanceId):
+        self.tracePath = tracePath
+        self.op = op
+        self.sessionId = sessionId
+        self.instanceId = instanceId
+        self.start = time.time()
+        self.pid = os.getpid()
+        self.tid = threading.current_thread().ident
+        self.eventList = []
+        self.__lock = threading.Lock()
+
+    def addEvent(self, name, category, start, end, argD):
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': int(start * 1000000), 'dur': max(1, int((end - start) * 1000000)),
+                 'pid': self.pid, 'tid': threading.current_thread().ident, 'args': argD}
+        with self.__lock:
+            self.eventList.append(event)
+        #
+
+    def getTraceDict(self, status):
+        end = time.time()
+        opEvent = {'name': self.op, 'cat': 'op', 'ph': 'X', 'ts': int(self.start * 1000000), 'dur': max(1, int((end - self.start) * 1000000)),
+                   'pid': self.pid, 'tid': self.tid, 'args': {'session_id': self.sessionId, 'instance_id': self.instanceId, 'status': status}}
+        metaList = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': self.tid, 'args': {'name': 'entity_transform %d' % self.pid}}]
+        with self.__lock:
+            eventList = metaList + [opEvent] + list(self.eventList)
+        #
+        return {'traceEvents': eventList, 'displayTimeUnit': 'ms',
+                'otherData': {'op': self.op, 'session_id': self.sessionId, 'instance_id': self.instanceId, 'status': status}}
+
+
+def getTracePath(siteId):
+    """ Return trace directory configured for site (read once per process), or '' if tracing is disabled
+    """
+    if siteId not in _tracePathD:
+        path = ''
+        try:
+            path = getSiteConfig(siteId).get(TRACE_PATH_KEY) or ''
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=sys.stderr)
+        #
+        _tracePathD[siteId] = str(path)
+    #
+    return _tracePathD[siteId]
+
+
+def startTrace(siteId, op, sessionId='', instanceId=''):
+    """ Start collecting trace of request in current thread (no-op when tracing is disabled)
+    """
+    tracePath = getTracePath(siteId)
+    if tracePath:
+        _local.trace = RequestTrace(tracePath, op, sessionId, instanceId)
+    else:
+        _local.trace = None
+    #
+
+
+def endTrace(status='ok', log=sys.stderr):
+    """ Write trace of request in current thread to <trace path>/<session id>/<time>-<op>-<pid>.json.
+        Returns file path or None.
+    """
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return None
+    #
+    _local.trace = None
+    try:
+        dirPath = os.path.join(trace.tracePath, trace.sessionId or 'no_session')
+        if not os.access(dirPath, os.F_OK):
+            os.makedirs(dirPath)
+        #
+        fileName = '%s-%s-%d.json' % (time.strftime('%Y%m%d%H%M%S', time.localtime(trace.start)), trace.op.strip('/').replace('/', '_'), trace.pid)
+        filePath = os.path.join(dirPath, fileName)
+        with open(filePath + '.tmp', 'w') as ofh:
+            json.dump(trace.getTraceDict(status), ofh)
+        #
+        os.rename(filePath + '.tmp', filePath)
+        return filePath
+    except:  # noqa: E722 pylint: disable=bare-except
+        traceback.print_exc(file=log)
+    #
+    return None
+
+
+def span(name, category='tool', outputFileList=None, argD=None):
+    """ Context manager recording span 'name' of current request trace
+    """
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return _NULL_SPAN
+    #
+    return _Span(trace, name, category, outputFileList, argD)
+
+
+def getCurrentTrace():
+    """ Return trace of request in current thread (None if disabled), to be handed to worker threads
+    """
+    return getattr(_local, 'trace', None)
+
+
+def setCurrentTrace(trace):
+    """ Attach worker thread to request trace returned by getCurrentTrace()
+    """
+    _local.trace = trace
@@ -0,0 +1,193 @@
+##
+# File:  UploadFileUtil.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   deflate (zlib/raw) decompression, SHA-256 checksum of written data, optional trailing newline
+#  19-Oct-2026  zf   fix duplicated input at the start of the next member of concatenated gzip/deflate streams
+#  19-Oct-2026  zf   setCompression() rejects unknown compression names
+#  19-Oct-2026  zf   truncated compressed upload raises EOFError, partial output file is removed
+##
+"""
+Chunked streaming copy of uploaded file into session directory.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import bz2
+import hashlib
+import os
+import sys
+import zlib
+
+from wwpdb.apps.entity_transform.utils.CifHeaderScanner import CifHeaderScanner
+
+# compression names accepted by setCompression()
+COMPRESSION_LIST = ('gzip', 'bzip2', 'deflate', 'deflate-raw', 'none')
+
+
+class UploadFileUtil(object):
+    """ Class responsible for writing uploaded file stream to disk in fixed size chunks.
+
+        Gzip, bzip2 and deflate (zlib) compressed uploads are decompressed on the fly, and the entry header categories
+        are collected by CifHeaderScanner while the data are written. The SHA-256 checksum of the uncompressed data
+        is available from getChecksum() afterwards.
+    """
+    def __init__(self, blockSize=1048576, verbose=False, log=sys.stderr):
+        self.__blockSize = blockSize
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__scanner = CifHeaderScanner(verbose=verbose, log=log)
+        self.__compression = ''
+        self.__compressionHint = ''
+        self.__decompressor = None
+        self.__checksum = None
+
+    def setCompression(self, compression):
+        """ Force compression (one of COMPRESSION_LIST) instead of detecting it from the data. Returns False (and
+            keeps detecting the compression) if compression is not a known name.
+        """
+        compression = str(compression).strip().lower()
+        if compression not in COMPRESSION_LIST:
+            self.__lfh.write("+UploadFileUtil.setCompression() - unknown compression '%s', expected one of %s\n"
+                             % (compression, ', '.join(COMPRESSION_LIST)))
+            return False
+        #
+        self.__compressionHint = compression
+        return True
+
+    def write(self, ifh, outputPath, ensureNewline=False):
+        """ Copy data from file handle ifh to outputPath (adding final newline if ensureNewline is set). Raises EOFError
+            for a truncated compressed stream; outputPath is removed if the copy fails.
+        """
+        sha = hashlib.sha256()
+        lastData = b''
+        try:
+            with open(outputPath, 'wb') as ofh:
+                for data in self.__readStream(ifh):
+                    ofh.write(data)
+                    sha.update(data)
+                    self.__scanner.feed(data)
+                    lastData = data
+                #
+                if ensureNewline and (not lastData.endswith(b'\n')):
+                    ofh.write(b'\n')
+                #
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            if os.access(outputPath, os.F_OK):
+                os.remove(outputPath)
+            #
+            raise
+        #
+        self.__checksum = sha.hexdigest()
+        self.__scanner.close()
+        if self.__verbose:
+            self.__lfh.write("+UploadFileUtil.write() - wrote %s (compression: %s)\n" % (outputPath, self.__compression or 'none'))
+        #
+
+    def getHeaderScanner(self):
+        """ Return CifHeaderScanner object holding database_2 & struct values
+        """
+        return self.__scanner
+
+    def getCompression(self):
+        return self.__compression
+
+    def getChecksum(self):
+        """ Return SHA-256 hex digest of uncompressed data written by last write() call
+        """
+        return self.__checksum
+
+    def __readStream(self, ifh):
+        """ Yield uncompressed data blocks of at most blockSize bytes
+        """
+        data = ifh.read(self.__blockSize)
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        #
+        self.__compression = ''
+        if self.__compressionHint:
+            if self.__compressionHint != 'none':
+                self.__compression = self.__compressionHint
+            #
+        elif data[:2] == b'\x1f\x8b':
+            self.__compression = 'gzip'
+        elif data[:3] == b'BZh':
+            self.__compression = 'bzip2'
+        elif (len(data) > 1) and ((bytearray(data[:1])[0] & 0x0f) == 8) and ((bytearray(data[:1])[0] * 256 + bytearray(data[1:2])[0]) % 31 == 0):
+            self.__compression = 'deflate'
+        #
+        self.__decompressor = self.__getDecompressor()
+        while data:
+            if self.__decompressor:
+                for block in self.__decompress(data):
+                    yield block
+                #
+            else:
+                yield data
+            #
+            data = ifh.read(self.__blockSize)
+            if not isinstance(data, bytes):
+                data = data.encode('utf-8')
+            #
+        #
+        if self.__compression in ('gzip', 'deflate', 'deflate-raw'):
+            block = self.__decompressor.flush()
+            if block:
+                yield block
+            #
+        #
+        if self.__decompressor and (not self.__decompressor.eof):
+            raise EOFError("%s compressed upload ended before the end-of-stream marker was reached" % self.__compression)
+        #
+
+    def __decompress(self, data):
+        """ Decompress one input block; pending input is kept by the decompressor so output blocks stay within blockSize
+        """
+        while True:
+            block = self.__decompressor.decompress(data, self.__blockSize)
+            if self.__compression in ('gzip', 'deflate', 'deflate-raw'):
+                data = self.__decompressor.unconsumed_tail
+                moreFlag = bool(data)
+            else:
+                data = b''
+                moreFlag = (not self.__decompressor.eof) and (not self.__decompressor.needs_input)
+            #
+            if block:
+                yield block
+            #
+            if self.__decompressor.eof and self.__decompressor.unused_data:
+                # concatenated compressed streams: unused_data holds all input after the end of the stream (zlib also
+                # reports it as unconsumed_tail)
+                data = self.__decompressor.unused_data
+                self.__decompressor = self.__getDecompressor()
+                moreFlag = True
+            #
+            if not moreFlag:
+                break
+            #
+        #
+
+    def __getDecompressor(self):
+        if self.__compression == 'gzip':
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.__compression == 'deflate':
+            return zlib.decompressobj(zlib.MAX_WBITS)
+        elif self.__compression == 'deflate-raw':
+            return zlib.decompressobj(-zlib.MAX_WBITS)
+        elif self.__compression == 'bzip2':
+            return bz2.BZ2Decompressor()
+        #
+        return None
@@ -3,6 +3,8 @@
 # Date:    03-Apr-2013
 #
 # Update:
+#  19-Oct-2026  zf   import model and prd-search files concurrently through FileImportUtil (reflink/hard link/copy)
+#  19-Oct-2026  zf   fail import without model file, session file names from PathInfo, import files as read-only
 #
 ##
 
@@ -21,6 +23,7 @@ import sys
 import os
 import os.path
 
+from wwpdb.apps.entity_transform.utils.FileImportUtil import FileImportUtil
 from wwpdb.io.file.DataExchange import DataExchange
 from wwpdb.io.locator.PathInfo import PathInfo
 
@@ -46,13 +49,30 @@ class WFDataIOUtil(object):
         self.__instance = str(self.__reqObj.getValue("instance")).strip()
         self.__siteId = self.__reqObj.getValue("WWPDB_SITE_ID")
 
-    def ImportData(self):
-        de = DataExchange(reqObj=self.__reqObj, depDataSetId=self.__identifier, wfInstanceId=self.__instance,
-                          fileSource=self.__fileSource, verbose=self.__verbose, log=self.__lfh)
-        de.copyToSession(contentType="model", formatType="pdbx", version="latest", partitionNumber=1)
-        de.copyToSession(contentType="prd-search", formatType="pdbx", version="latest", partitionNumber=1)
-
+    def ImportData(self, checksum=False):
         pI = PathInfo(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+        #
+        transferList = []
+        for contentType in ("model", "prd-search"):
+            filePath = pI.getFilePath(dataSetId=self.__identifier, wfInstanceId=self.__instance, contentType=contentType,
+                                      formatType="pdbx", fileSource=self.__fileSource, versionId="latest", partNumber=1)
+            if (not filePath) or (not os.access(filePath, os.R_OK)):
+                self.__lfh.write("+WFDataIOUtil.ImportData() - no %s file found for %s\n" % (contentType, self.__identifier))
+                if contentType == "model":
+                    return False
+                #
+                continue
+            #
+            # Both files are only ever replaced by rename within the session (model edits through SnapshotJournal, prd-search
+            # output exported to temporary file), so they may be hard linked to the workflow copies
+            fileName = pI.getFileName(dataSetId=self.__identifier, wfInstanceId=self.__instance, contentType=contentType,
+                                      formatType="pdbx", fileSource=self.__fileSource, versionId="none", partNumber=1)
+            transferList.append((filePath, os.path.join(self.__sessionPath, fileName), True))
+        #
+        importUtil = FileImportUtil(verbose=self.__verbose, log=self.__lfh)
+        if not importUtil.importFiles(transferList, checksum=checksum):
+            self.__statusOK = False
+        #
         wfdirPath = pI.getDirPath(dataSetId=self.__identifier, wfInstanceId=self.__instance,
                                   contentType="model", formatType="pdbx", fileSource=self.__fileSource,
                                   versionId="latest", partNumber=1)
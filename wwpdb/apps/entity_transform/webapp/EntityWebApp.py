@@ -4,6 +4,36 @@
 #
 # Updates:
 #  09-Dec-2024  zf   get ext_pdb_id from '_database_2.pdbx_database_accession' field
+#  19-Oct-2026  zf   import archive model file through FileImportUtil (reflink when possible)
+#  19-Oct-2026  zf   chunked streaming upload with gzip/bzip2 decompression and streaming header scan
+#  19-Oct-2026  zf   add download_bundle operation streaming zip/tar.gz of session files
+#  19-Oct-2026  zf   add chopper_progress operation reporting 'apply to all' instance search progress
+#  19-Oct-2026  zf   per-request metrics (op timers, template/file counters, tool spans) and metrics operation
+#  19-Oct-2026  zf   per-request Chrome trace-event export of back-end command spans
+#  19-Oct-2026  zf   defer imports of editor, OpenEye, PRD, depiction and workflow subsystems to first use of each operation
+#  19-Oct-2026  zf   asynchronous chopper workspace preparation (launch_fixer async=yes, chopper_prepare_status) and
+#                    speculative chopper workspace pre-build from summary view
+#  19-Oct-2026  zf   get site configuration from process-wide SiteConfig snapshot
+#  19-Oct-2026  zf   resolve session & summary cif object once per request in RequestContext created by doOp
+#  19-Oct-2026  zf   add summary_data operation returning PRD summary tree, structure summary or search results as JSON
+#  19-Oct-2026  zf   ETag/Last-Modified validators from session files for read-only views, 304 answers to conditional
+#                    GET and gzip compression of large text responses
+#  19-Oct-2026  zf   summary_data validators from search image manifest
+#  19-Oct-2026  zf   staged coordinate edits: staged_edits, discard_staged_edits and commit_staged_edits operations
+#                    (commit applies all staged edits, then re-runs PRD search once in detached process)
+#  19-Oct-2026  zf   model_snapshots and rollback_model operations for the model file snapshot journal
+#  19-Oct-2026  zf   validate instanceid of chopper_progress
+#  19-Oct-2026  zf   compute ETag/Last-Modified once before dispatch and reuse them for the response headers
+#  19-Oct-2026  zf   fork chopper prebuild only if needed (not running, workspace missing or stale)
+#  19-Oct-2026  zf   serve entity_summary_render.js (summary_render_js operation) and load it in the summary pages
+#  19-Oct-2026  zf   verify archive/workflow files copied into the session with SHA-256 checksums
+#  19-Oct-2026  zf   rollback_model re-runs prd-search; prd-search compresses old model snapshots
+#  19-Oct-2026  zf   detached workers (prd-search, summary render, commit, chopper prebuild) write their own trace/metrics
+#  19-Oct-2026  zf   PRD/structure summary pages render from summary_data with EntitySummary.load()
+#  19-Oct-2026  zf   validate download_file list page from PRD/PRDCC files recorded in the session manifest
+#  19-Oct-2026  zf   prd-search result exported to temporary file renamed over the summary file (may be a hard link)
+#  19-Oct-2026  zf   summary_view answered with 304 still schedules the chopper prebuild
+#  19-Oct-2026  zf   add EntityWebAppWorker.getAppPathD()
 #
 ##
 """
@@ -24,46 +54,66 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
+import json
 import os
 import sys
 import time
 import traceback
 import ntpath
-import shutil
-
-from wwpdb.utils.config.ConfigInfo import ConfigInfo
-from wwpdb.utils.wf.dbapi.WfTracking import WfTracking
-from wwpdb.apps.editormodule.depict.EditorDepict import EditorDepict
-from wwpdb.apps.editormodule.io.PdbxDataIo import PdbxDataIo
-from wwpdb.apps.editormodule.config.AccessTemplateFiles import get_template_file_path as get_editor_template_file_path
-from wwpdb.apps.entity_transform.depict.LinkDepict import LinkDepict
-from wwpdb.apps.entity_transform.depict.PrdSummaryDepict import PrdSummaryDepict
-from wwpdb.apps.entity_transform.depict.StrSummaryDepict import StrSummaryDepict
-from wwpdb.apps.entity_transform.depict.StrFormDepict import StrFormDepict
-from wwpdb.apps.entity_transform.depict.ResultDepict import ResultDepict
-from wwpdb.apps.entity_transform.openeye_util.OpenEyeUtil import OpenEyeUtil
-from wwpdb.apps.entity_transform.prd.BuildPrd import BuildPrd
-from wwpdb.apps.entity_transform.prd.CVSCommit import CVSCommit
-from wwpdb.apps.entity_transform.prd.DepictPrd import DepictPrd
-from wwpdb.apps.entity_transform.prd.UpdatePrd import UpdatePrd
-from wwpdb.apps.entity_transform.update.ChopperHandler import ChopperHandler
-from wwpdb.apps.entity_transform.update.MergePolymer import MergePolymer
-from wwpdb.apps.entity_transform.update.MergeLigand import MergeLigand
-from wwpdb.apps.entity_transform.update.SplitPolymer import SplitPolymer
-from wwpdb.apps.entity_transform.update.EditPolymer import EditPolymer
-from wwpdb.apps.entity_transform.update.UpdateFile import UpdateFile
-from wwpdb.apps.entity_transform.utils.DownloadFile import DownloadFile
+
+from wwpdb.apps.entity_transform.utils import MetricsUtil
+from wwpdb.apps.entity_transform.utils import TraceUtil
+from wwpdb.apps.entity_transform.utils.CifHeaderScanner import CifHeaderScanner
+from wwpdb.apps.entity_transform.utils.ConditionalResponseUtil import ACCEPT_ENCODING, ConditionalResponseUtil, compressResponse
+from wwpdb.apps.entity_transform.utils.FileImportUtil import FileImportUtil
 from wwpdb.apps.entity_transform.utils.GetLogMessage import GetLogMessage
-from wwpdb.apps.entity_transform.utils.SummaryCifUtil import SummaryCifUtil
+from wwpdb.apps.entity_transform.utils.ImageManifest import MANIFEST_FILE_NAME as IMAGE_MANIFEST_FILE_NAME
+from wwpdb.apps.entity_transform.utils.LazyImport import LazyImport
+from wwpdb.apps.entity_transform.utils.SessionManifest import MANIFEST_FILE_NAME as SESSION_MANIFEST_FILE_NAME
+from wwpdb.apps.entity_transform.utils.SessionManifest import SessionManifest
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
+from wwpdb.apps.entity_transform.utils.SnapshotJournal import SnapshotJournal
 from wwpdb.apps.entity_transform.utils.RemoveEmptyCategories import RemoveEmptyCategories
-from wwpdb.apps.entity_transform.utils.WFDataIOUtil import WFDataIOUtil
+from wwpdb.apps.entity_transform.utils.RequestContext import getRequestContext
+from wwpdb.apps.entity_transform.utils.UploadFileUtil import UploadFileUtil
 from wwpdb.apps.entity_transform.webapp.FormPreProcess import FormPreProcess
 from wwpdb.utils.detach.DetachUtils import DetachUtils
-from wwpdb.io.file.mmCIFUtil import mmCIFUtil
 from wwpdb.io.locator.PathInfo import PathInfo
-from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.utils.session.WebRequest import InputRequest, ResponseContent
 #
+# Subsystems used by single operations are imported on first use (see EntityWebAppWorker.__opImportD)
+# fmt:off
+WfTracking = LazyImport('wwpdb.utils.wf.dbapi.WfTracking', 'WfTracking')
+EditorDepict = LazyImport('wwpdb.apps.editormodule.depict.EditorDepict', 'EditorDepict')
+PdbxDataIo = LazyImport('wwpdb.apps.editormodule.io.PdbxDataIo', 'PdbxDataIo')
+get_editor_template_file_path = LazyImport('wwpdb.apps.editormodule.config.AccessTemplateFiles', 'get_template_file_path')
+LinkDepict = LazyImport('wwpdb.apps.entity_transform.depict.LinkDepict', 'LinkDepict')
+PrdSummaryDepict = LazyImport('wwpdb.apps.entity_transform.depict.PrdSummaryDepict', 'PrdSummaryDepict')
+StrSummaryDepict = LazyImport('wwpdb.apps.entity_transform.depict.StrSummaryDepict', 'StrSummaryDepict')
+StrFormDepict = LazyImport('wwpdb.apps.entity_transform.depict.StrFormDepict', 'StrFormDepict')
+ResultDepict = LazyImport('wwpdb.apps.entity_transform.depict.ResultDepict', 'ResultDepict')
+OpenEyeUtil = LazyImport('wwpdb.apps.entity_transform.openeye_util.OpenEyeUtil', 'OpenEyeUtil')
+BuildPrd = LazyImport('wwpdb.apps.entity_transform.prd.BuildPrd', 'BuildPrd')
+CVSCommit = LazyImport('wwpdb.apps.entity_transform.prd.CVSCommit', 'CVSCommit')
+DepictPrd = LazyImport('wwpdb.apps.entity_transform.prd.DepictPrd', 'DepictPrd')
+UpdatePrd = LazyImport('wwpdb.apps.entity_transform.prd.UpdatePrd', 'UpdatePrd')
+ChopperHandler = LazyImport('wwpdb.apps.entity_transform.update.ChopperHandler', 'ChopperHandler')
+ChopperPrepUtil = LazyImport('wwpdb.apps.entity_transform.update.ChopperPrepUtil', 'ChopperPrepUtil')
+MergePolymer = LazyImport('wwpdb.apps.entity_transform.update.MergePolymer', 'MergePolymer')
+MergeLigand = LazyImport('wwpdb.apps.entity_transform.update.MergeLigand', 'MergeLigand')
+SplitPolymer = LazyImport('wwpdb.apps.entity_transform.update.SplitPolymer', 'SplitPolymer')
+EditPolymer = LazyImport('wwpdb.apps.entity_transform.update.EditPolymer', 'EditPolymer')
+UpdateFile = LazyImport('wwpdb.apps.entity_transform.update.UpdateFile', 'UpdateFile')
+StagedUpdate = LazyImport('wwpdb.apps.entity_transform.update.StagedUpdate', 'StagedUpdate')
+BundleFileUtil = LazyImport('wwpdb.apps.entity_transform.utils.BundleFileUtil', 'BundleFileUtil')
+DownloadFile = LazyImport('wwpdb.apps.entity_transform.utils.DownloadFile', 'DownloadFile')
+WFDataIOUtil = LazyImport('wwpdb.apps.entity_transform.utils.WFDataIOUtil', 'WFDataIOUtil')
+RcsbDpUtility = LazyImport('wwpdb.utils.dp.RcsbDpUtility', 'RcsbDpUtility')
+# fmt:on
+#
+# client-side renderer of summary_data responses (shipped with the package, see setup.py package_data)
+SUMMARY_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'entity_summary_render.js')
+#
 
 
 class EntityWebApp(object):
@@ -86,7 +136,7 @@ class EntityWebApp(object):
         self.__lfh = log
         self.__debug = False
         self.__siteId = siteId
-        self.__cI = ConfigInfo(self.__siteId)
+        self.__cI = getSiteConfig(self.__siteId)
         self.__topPath = self.__cI.get('SITE_WEB_APPS_TOP_PATH')
         #
 
@@ -143,7 +193,18 @@ class EntityWebApp(object):
         #
         # Package return according to the request return_format -
         #
-        return rC.get()
+        rspD = rC.get()
+        streamD = stw.getStreamResponse()
+        if streamD:
+            rspD.pop('ENCODING', None)
+            rspD.update(streamD)
+        #
+        headerList = stw.getResponseHeaders()
+        if headerList:
+            rspD.setdefault('HEADERS', []).extend(headerList)
+        #
+        compressResponse(rspD, self.__reqObj.getValue(ACCEPT_ENCODING))
+        return rspD
 
     def __dumpRequest(self):
         """Utility method to format the contents of the internal parameter dictionary
@@ -178,12 +239,13 @@ class EntityWebAppWorker(object):
         self.__verbose = verbose
         self.__lfh = log
         self.__reqObj = reqObj
+        self.__context = None
         self.__sObj = None
         self.__sessionId = None
         self.__sessionPath = None
         self.__rltvSessionPath = None
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__cI = ConfigInfo(self.__siteId)
+        self.__cI = getSiteConfig(self.__siteId)
         self.__identifier = ''
         self.__modelfileId = ''
         self.__summaryfileId = ''
@@ -193,6 +255,9 @@ class EntityWebAppWorker(object):
         self.__title = ''
         #
         self.__message = ''
+        self.__streamD = None
+        self.__headerList = []
+        self.__detachedMethod = ''
         #
         # fmt:off
         self.__appPathD = {'/service/environment/dump':                       '_dumpOp',                # noqa: E241
@@ -201,9 +266,13 @@ class EntityWebAppWorker(object):
                            '/service/entity/refresh_struct_summary':          '_reRunPrdSearchOp',      # noqa: E241
                            '/service/entity/check_running_status':            '_checkRunningStatusOp',  # noqa: E241
                            '/service/entity/chopper_output':                  '_chopperHandler',        # noqa: E241
+                           '/service/entity/chopper_progress':                '_chopperProgress',       # noqa: E241
+                           '/service/entity/chopper_prepare_status':          '_chopperPrepareStatus',  # noqa: E241
+                           '/service/entity/metrics':                         '_metricsOp',             # noqa: E241
                            '/service/entity/build_prd':                       '_buildPRD',              # noqa: E241
                            '/service/entity/update_prd':                      '_updatePRD',             # noqa: E241
                            '/service/entity/download_file':                   '_downloadFile',          # noqa: E241
+                           '/service/entity/download_bundle':                 '_downloadBundle',        # noqa: E241
                            '/service/entity/commit_prd_to_cvs':               '_commitPRD',             # noqa: E241
                            '/service/entity/gif_view':                        '_gifView',               # noqa: E241
                            '/service/entity/jmol_view':                       '_jmolView',              # noqa: E241
@@ -217,9 +286,58 @@ class EntityWebAppWorker(object):
                            '/service/entity/split_polymer':                   '_splitPolymer',          # noqa: E241
                            '/service/entity/edit_polymer':                    '_editPolymer',           # noqa: E241
                            '/service/entity/summary_view':                    '_StructSummaryView',     # noqa: E241
+                           '/service/entity/summary_data':                    '_summaryDataOp',         # noqa: E241
+                           '/service/entity/summary_render_js':               '_summaryRenderScriptOp',  # noqa: E241
                            '/service/entity/update_file':                     '_updateFile',            # noqa: E241
+                           '/service/entity/staged_edits':                    '_stagedEditsOp',         # noqa: E241
+                           '/service/entity/discard_staged_edits':            '_discardStagedEditsOp',  # noqa: E241
+                           '/service/entity/commit_staged_edits':             '_commitStagedEditsOp',   # noqa: E241
+                           '/service/entity/model_snapshots':                 '_modelSnapshotsOp',      # noqa: E241
+                           '/service/entity/rollback_model':                  '_rollbackModelOp',       # noqa: E241
                            '/service/entity/exit_finished':                   '_exit_Finished'          # noqa: E241
                            }
+        #
+        # deferred imports resolved before the operation runs (anything missed is still imported on first call)
+        self.__opImportD = {'_StandaloneOp':          (RcsbDpUtility, PrdSummaryDepict),                                 # noqa: E241
+                            '_WorkflowOp':            (WfTracking, WFDataIOUtil, RcsbDpUtility, PrdSummaryDepict),       # noqa: E241
+                            '_reRunPrdSearchOp':      (RcsbDpUtility, PrdSummaryDepict),                                 # noqa: E241
+                            '_chopperHandler':        (ChopperHandler,),                                                 # noqa: E241
+                            '_buildPRD':              (BuildPrd, DepictPrd, PdbxDataIo, EditorDepict, get_editor_template_file_path),  # noqa: E241
+                            '_updatePRD':             (UpdatePrd, DepictPrd),                                            # noqa: E241
+                            '_downloadFile':          (DownloadFile,),                                                   # noqa: E241
+                            '_downloadBundle':        (DownloadFile, BundleFileUtil),                                    # noqa: E241
+                            '_commitPRD':             (CVSCommit,),                                                      # noqa: E241
+                            '_LaunchFixer':           (StrFormDepict, ChopperPrepUtil),                                  # noqa: E241
+                            '_chopperPrepareStatus':  (ChopperPrepUtil,),                                                # noqa: E241
+                            '_LaunchEditor':          (StrFormDepict,),                                                  # noqa: E241
+                            '_LinkView':              (LinkDepict,),                                                     # noqa: E241
+                            '_OpenEyeMatchView':      (OpenEyeUtil,),                                                    # noqa: E241
+                            '_mergePolymer':          (MergePolymer,),                                                   # noqa: E241
+                            '_mergeLigand':           (MergeLigand,),                                                    # noqa: E241
+                            '_resultView':            (ResultDepict,),                                                   # noqa: E241
+                            '_splitPolymer':          (SplitPolymer,),                                                   # noqa: E241
+                            '_editPolymer':           (EditPolymer,),                                                    # noqa: E241
+                            '_StructSummaryView':     (StrSummaryDepict, ChopperPrepUtil),                               # noqa: E241
+                            '_summaryDataOp':         (PrdSummaryDepict, StrSummaryDepict, ResultDepict),                # noqa: E241
+                            '_updateFile':            (UpdateFile,),                                                     # noqa: E241
+                            '_stagedEditsOp':         (StagedUpdate,),                                                   # noqa: E241
+                            '_discardStagedEditsOp':  (StagedUpdate,),                                                   # noqa: E241
+                            '_commitStagedEditsOp':   (StagedUpdate, RcsbDpUtility, PrdSummaryDepict),                   # noqa: E241
+                            '_exit_Finished':         (WfTracking, WFDataIOUtil)                                         # noqa: E241
+                            }
+        #
+        # read-only views whose output only depends on the summary file, request parameters and the files listed by
+        # the dependency method; conditional GET of these views is answered with 304 without rendering the page
+        self.__cacheDependencyD = {'_StructSummaryView':  self.__summaryDependencies,       # noqa: E241
+                                   '_LinkView':           self.__summaryDependencies,       # noqa: E241
+                                   '_jmolView':           self.__summaryDependencies,       # noqa: E241
+                                   '_gifView':            self.__gifViewDependencies,       # noqa: E241
+                                   '_resultView':         self.__resultViewDependencies,    # noqa: E241
+                                   '_downloadFile':       self.__downloadFileDependencies,  # noqa: E241
+                                   '_summaryDataOp':      self.__summaryDataDependencies    # noqa: E241
+                                   }
+        # work of read-only views which must also be done when the view is answered with 304 (page not rendered)
+        self.__notModifiedHookD = {'_StructSummaryView': self.__startSummaryViewPrebuild}
         # fmt:on
 
     def __updateFileId(self):
@@ -234,7 +352,7 @@ class EntityWebAppWorker(object):
 
     def __updateTitle(self):
         if os.access(self.__summaryfilePath, os.F_OK):
-            self.__summaryCifObj = SummaryCifUtil(summaryFile=self.__summaryfilePath, verbose=self.__verbose, log=self.__lfh)
+            self.__summaryCifObj = self.__getContext().getSummaryCifObj()
             self.__pdbId = self.__summaryCifObj.getPdbId()
             self.__title = self.__summaryCifObj.getTitle()
         #
@@ -248,6 +366,11 @@ class EntityWebAppWorker(object):
         """
         return self.__doOpException()
 
+    def getAppPathD(self):
+        """ Return copy of request path -> operation method name map
+        """
+        return dict(self.__appPathD)
+
     def setLogHandle(self, log=sys.stderr):
         """  Reset the stream for logging output.
         """
@@ -266,6 +389,7 @@ class EntityWebAppWorker(object):
             Operation output is packaged in a ResponseContent() object.
         """
         #
+        self.__context = getRequestContext(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         reqPath = self.__reqObj.getRequestPath()
         if reqPath not in self.__appPathD:
             # bail out if operation is unknown -
@@ -285,21 +409,174 @@ class EntityWebAppWorker(object):
             Operation output is packaged in a ResponseContent() object.
         """
         #
+        self.__context = getRequestContext(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        reqPath = self.__reqObj.getRequestPath()
+        MetricsUtil.startRequest(self.__siteId, reqPath, sessionId=str(self.__reqObj.getValue("sessionid")))
+        TraceUtil.startTrace(self.__siteId, reqPath, sessionId=str(self.__reqObj.getValue("sessionid")),
+                             instanceId=str(self.__reqObj.getValue("instanceid")))
+        status = 'ok'
         try:
-            reqPath = self.__reqObj.getRequestPath()
             if reqPath not in self.__appPathD:
                 # bail out if operation is unknown -
                 rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
                 rC.setError(errMsg='Unknown operation')
+                status = 'unknown'
             else:
-                mth = getattr(self, self.__appPathD[reqPath], None)
+                methodName = self.__appPathD[reqPath]
+                self.__resolveImports(methodName)
+                cacheUtil = None
+                fileList = self.__getCacheDependencies(methodName)
+                if fileList:
+                    cacheUtil = ConditionalResponseUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+                    # computed before dispatch, the operation changes request values (return_format, semaphore ...)
+                    validators = cacheUtil.getValidators(fileList)
+                    if cacheUtil.isNotModified(validators):
+                        status = 'not_modified'
+                        if methodName in self.__notModifiedHookD:
+                            self.__notModifiedHookD[methodName]()
+                        #
+                        return self.__notModifiedResponse(cacheUtil.getHeaders(validators))
+                    #
+                #
+                mth = getattr(self, methodName, None)
                 rC = mth()
+                if cacheUtil and (not rC.isError()):
+                    self.__headerList = cacheUtil.getHeaders(validators)
+                #
             return rC
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
+            status = 'exception'
             rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
             rC.setError(errMsg='Operation failure')
             return rC
+        finally:
+            MetricsUtil.endRequest(status=status, log=self.__lfh)
+            TraceUtil.endTrace(status=status, log=self.__lfh)
+
+    def __runDetach(self, workerMethod):
+        """ Run workerMethod in detached process (through _detachedWorker)
+        """
+        self.__detachedMethod = workerMethod
+        dU = DetachUtils(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        dU.set(workerObj=self, workerMethod="_detachedWorker")
+        dU.runDetach()
+
+    def _detachedWorker(self):
+        """ Run detached worker method as its own traced/metered request: the trace and metrics of the request which
+            started it are written by the parent process before the worker finishes
+        """
+        op = self.__reqObj.getRequestPath() + ':' + self.__detachedMethod
+        MetricsUtil.startRequest(self.__siteId, op, sessionId=str(self.__reqObj.getValue("sessionid")))
+        TraceUtil.startTrace(self.__siteId, op, sessionId=str(self.__reqObj.getValue("sessionid")),
+                             instanceId=str(self.__reqObj.getValue("instanceid")))
+        status = 'ok'
+        try:
+            return getattr(self, self.__detachedMethod)()
+        except:  # noqa: E722 pylint: disable=bare-except
+            status = 'exception'
+            raise
+        finally:
+            MetricsUtil.endRequest(status=status, log=self.__lfh)
+            TraceUtil.endTrace(status=status, log=self.__lfh)
+        #
+
+    def __getCacheDependencies(self, methodName):
+        """ Return files (summary file first) the output of a read-only operation is built from, None if the operation
+            output can not be validated from files (not a read-only view, no existing session or no summary file)
+        """
+        if methodName not in self.__cacheDependencyD:
+            return None
+        #
+        if (not str(self.__reqObj.getValue("sessionid"))) or (not str(self.__reqObj.getValue("identifier"))):
+            return None
+        #
+        try:
+            context = self.__getContext()
+            summaryFilePath = context.getSummaryFilePath()
+            if not os.access(summaryFilePath, os.F_OK):
+                return None
+            #
+            fileList = [summaryFilePath]
+            fileList.extend(self.__cacheDependencyD[methodName](context))
+            return fileList
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+            return None
+        #
+
+    def __summaryDependencies(self, context):  # pylint: disable=unused-argument
+        return []
+
+    def __gifViewDependencies(self, context):
+        instDir = os.path.join(context.getSessionPath(), 'search', str(self.__reqObj.getValue('instanceid')))
+        label = str(self.__reqObj.getValue('label'))
+        return [os.path.join(instDir, label + '.gif'), os.path.join(instDir, label + '.png')]
+
+    def __resultViewDependencies(self, context):
+        resultObj = ResultDepict(reqObj=self.__reqObj, summaryCifObj=context.getSummaryCifObj(), verbose=self.__verbose, log=self.__lfh)
+        return resultObj.getReferenceFilePaths()
+
+    def __downloadFileDependencies(self, context):
+        sessionPath = context.getSessionPath()
+        fullFilePath = str(self.__reqObj.getValue('filepath'))
+        fileId = str(self.__reqObj.getValue('fileid'))
+        if fullFilePath:
+            return [fullFilePath]
+        elif fileId:
+            instId = str(self.__reqObj.getValue("instanceid"))
+            if instId:
+                return [os.path.join(sessionPath, 'search', instId, fileId)]
+            #
+            return [os.path.join(sessionPath, fileId)]
+        #
+        # file list page: model file and PRD/PRDCC files in session (the manifest changes when files are added/removed)
+        fileList = [os.path.join(sessionPath, context.getIdentifier() + '_model_P1.cif')]
+        manifest = SessionManifest(dirPath=sessionPath, verbose=self.__verbose, log=self.__lfh)
+        nameList = manifest.getFileList(prefix='PRD')
+        if nameList is None:
+            fileList.append(sessionPath)
+            nameList = sorted(os.listdir(sessionPath))
+        else:
+            fileList.append(os.path.join(sessionPath, SESSION_MANIFEST_FILE_NAME))
+        #
+        for fileName in nameList:
+            if fileName.endswith('.cif') and (fileName.startswith('PRD_') or fileName.startswith('PRDCC_')):
+                fileList.append(os.path.join(sessionPath, fileName))
+            #
+        #
+        return fileList
+
+    def __summaryDataDependencies(self, context):
+        view = str(self.__reqObj.getValue('view'))
+        if view == 'structure':
+            return []
+        elif view == 'result':
+            return self.__resultViewDependencies(context)
+        #
+        # 2D images are looked up in search image manifest
+        searchPath = os.path.join(context.getSessionPath(), 'search')
+        return [searchPath, os.path.join(searchPath, IMAGE_MANIFEST_FILE_NAME)]
+
+    def __notModifiedResponse(self, headerList):
+        """ Empty '304 Not Modified' response (validators in headerList)
+        """
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        self.__headerList = headerList
+        self.__streamD = {}
+        self.__streamD['STATUS'] = '304 Not Modified'
+        self.__streamD['CONTENT_TYPE'] = 'text/html'
+        self.__streamD['RETURN_STRING'] = b''
+        return rC
+
+    def __resolveImports(self, methodName):
+        """ Import subsystems registered for operation in self.__opImportD
+        """
+        with MetricsUtil.timer('lazy_import'):
+            for lazyObj in self.__opImportD.get(methodName, ()):
+                lazyObj.resolve()
+            #
+        #
 
     ################################################################################################################
     # ------------------------------------------------------------------------------------------------------------
@@ -338,9 +615,7 @@ class EntityWebAppWorker(object):
             return rC
         #
         #
-        dU = DetachUtils(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
-        dU.set(workerObj=self, workerMethod="_runPrdSearch")
-        dU.runDetach()
+        self.__runDetach("_runPrdSearch")
         #
         return self.__returnPrdSummaryPage()
 
@@ -373,9 +648,7 @@ class EntityWebAppWorker(object):
         #
         self.__getPrdSearchResult()
         #
-        dU = DetachUtils(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
-        dU.set(workerObj=self, workerMethod="_getSummaryHtml")
-        dU.runDetach()
+        self.__runDetach("_getSummaryHtml")
         #
         return self.__returnPrdSummaryPage()
 
@@ -388,9 +661,7 @@ class EntityWebAppWorker(object):
         self.__getSession()
         self.__updateFileId()
         #
-        dU = DetachUtils(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
-        dU.set(workerObj=self, workerMethod="_runPrdSearch")
-        dU.runDetach()
+        self.__runDetach("_runPrdSearch")
         #
         self.__reqObj.setReturnFormat(return_format="json")
         rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
@@ -433,13 +704,27 @@ class EntityWebAppWorker(object):
         dp.imp(os.path.join(self.__sessionPath, self.__modelfileId))
         dp.addInput(name='firstmodel', value=firstModelPath)
         dp.addInput(name='logfile', value=logFilePath)
-        dp.op('prd-search')
-        dp.exp(os.path.join(self.__sessionPath, self.__summaryfileId))
+        outputFileList = [os.path.join(self.__sessionPath, self.__summaryfileId), firstModelPath, logFilePath]
+        with TraceUtil.span('RcsbDpUtility:prd-search', 'rcsbdp', outputFileList=outputFileList) as span:
+            startTime = time.time()
+            status = dp.op('prd-search')
+            MetricsUtil.addToolSpan('RcsbDpUtility:prd-search', startTime, time.time(), status if isinstance(status, int) else 0)
+            span.setExitCode(status if isinstance(status, int) else 0)
+            # the summary file may be hard linked to the workflow copy (see WFDataIOUtil), replace it instead of rewriting it
+            summaryFilePath = os.path.join(self.__sessionPath, self.__summaryfileId)
+            dp.exp(summaryFilePath + '.' + str(os.getpid()))
+            if os.access(summaryFilePath + '.' + str(os.getpid()), os.F_OK):
+                os.rename(summaryFilePath + '.' + str(os.getpid()), summaryFilePath)
+            #
+        #
         self.__getLogMessage(logFilePath)
         if not self.__message:
             self.__updateTitle()
         #
-        return self._getSummaryHtml(iFlag=True)
+        status = self._getSummaryHtml(iFlag=True)
+        # compress old model snapshots here instead of in the requests which capture them
+        SnapshotJournal(sessionPath=self.__sessionPath, fileName=self.__modelfileId, verbose=self.__verbose, log=self.__lfh).compress()
+        return status
 
     def __getPrdSearchResult(self):
         # Update WF status database --
@@ -450,7 +735,7 @@ class EntityWebAppWorker(object):
                 self.__lfh.write("+EntityWebAppWorker._WorkflowOp() Tracking status set to open\n")
             #
             ioUtil = WFDataIOUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
-            ok = ioUtil.ImportData()
+            ok = ioUtil.ImportData(checksum=True)
             if not ok:
                 self.__message = "Get WorkFlow result(s) failed for session %s \n" % self.__sessionId
             else:
@@ -472,7 +757,7 @@ class EntityWebAppWorker(object):
         myD['title'] = self.__title
         myD['sph'] = self.__reqObj.getSemaphore()
         #
-        rC.setHtmlText(self.__processTemplate('summary_view/prd_summary_tmplt.html', myD))
+        rC.setHtmlText(self.__addSummaryScript(self.__processTemplate('summary_view/prd_summary_tmplt.html', myD)))
         return rC
 
     def _getSummaryHtml(self, iFlag=False):
@@ -486,9 +771,12 @@ class EntityWebAppWorker(object):
         if self.__message:
             ofh.write(self.__message + '\n')
         else:
-            summaryObj = PrdSummaryDepict(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
-            form_data = summaryObj.DoRenderSummaryPage(imageFlag=iFlag)
-            ofh.write(form_data + '\n')
+            if iFlag:
+                # generate 2D images once here, the tree itself is rendered by the browser from summary_data
+                summaryObj = PrdSummaryDepict(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
+                summaryObj.getSummaryData(imageFlag=True)
+            #
+            ofh.write(self.__getSummaryLoader('prd') + '\n')
         #
         ofh.close()
         #
@@ -516,12 +804,43 @@ class EntityWebAppWorker(object):
         else:
             summaryObj = StrSummaryDepict(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
             myD['pdbid'] = summaryObj.GetPDBID()
-            myD['form_data'] = summaryObj.DoRenderSummaryPage()
+            myD['form_data'] = self.__getSummaryLoader('structure')
         #
-        rC.setHtmlText(self.__processTemplate('summary_view/str_summary_tmplt.html', myD))
+        rC.setHtmlText(self.__addSummaryScript(self.__processTemplate('summary_view/str_summary_tmplt.html', myD)))
         #
+        self.__startChopperPrebuild()
         return rC
 
+    def __startChopperPrebuild(self):
+        """ Speculatively prepare chopper workspaces in detached process (if enabled for site)
+        """
+        if not self.__summaryCifObj:
+            return
+        #
+        prepUtil = ChopperPrepUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        if not prepUtil.needPrebuild(self.__summaryCifObj, self.__modelfileId):
+            # disabled, already running or every candidate has a workspace built from the current model file
+            return
+        #
+        self.__reqObj.setValue('semaphore', 'chopper_prebuild_' + str(int(time.time())))
+        self.__runDetach("_prebuildChopper")
+
+    def __startSummaryViewPrebuild(self):
+        """ Schedule chopper prebuild for summary_view answered with 304 (see _StructSummaryView)
+        """
+        try:
+            self.__getSession()
+            self.__updateFileId()
+            self.__startChopperPrebuild()
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+
+    def _prebuildChopper(self):
+        prepUtil = ChopperPrepUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        prepUtil.prebuild(self.__summaryCifObj, self.__modelfileId)
+        return True
+
     def _LaunchFixer(self):
         """ Launch Entity fixer view interface
         """
@@ -554,10 +873,53 @@ class EntityWebAppWorker(object):
             rC.setHtmlText(self.__processTemplate('summary_view/str_summary_error_tmplt.html', myD))
             return rC
         #
+        submitValue = str(self.__reqObj.getValue('submit'))
+        if (str(self.__reqObj.getValue('async')) == 'yes') and (submitValue in ('Split with chopper', 'Merge/Split with chopper')):
+            # prepare chopper workspace in detached process, poll with chopper_prepare_status & check_running_status
+            self.__runDetach("_launchFixerDetached")
+            #
+            self.__reqObj.setReturnFormat(return_format="json")
+            rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            rC.setStatusCode('running')
+            return rC
+        #
         strObj = StrFormDepict(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
         rC.setHtmlText(strObj.LaunchFixer())
         return rC
 
+    def _launchFixerDetached(self):
+        """ Write chopper page for semaphore (read back by check_running_status)
+        """
+        strObj = StrFormDepict(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
+        html = strObj.LaunchFixer()
+        htmlFilePath = os.path.join(self.__sessionPath, self.__reqObj.getSemaphore() + '.html')
+        ofh = open(htmlFilePath, 'w')
+        ofh.write(html + '\n')
+        ofh.close()
+        return True
+
+    def _chopperPrepareStatus(self):
+        """ Report preparation stage of chopper workspace requested with semaphore (or built as instanceid)
+        """
+        self.__getSession()
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        prepUtil = ChopperPrepUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        entry = prepUtil.getStatus(semaphore=str(self.__reqObj.getSemaphore()), instId=str(self.__reqObj.getValue('instanceid')))
+        if not entry:
+            rC.setStatusCode('unknown')
+            return rC
+        #
+        myD = {}
+        myD['statuscode'] = 'ok'
+        myD['status'] = entry['status']
+        myD['stage'] = entry['stage']
+        myD['instanceid'] = entry['instid']
+        myD['elapsed'] = round(entry.get('end', time.time()) - entry['start'], 1)
+        rC.addDictionaryItems(myD)
+        return rC
+
     def _LaunchEditor(self):
         """ Launch Entity fixer view interface
         """
@@ -937,6 +1299,52 @@ class EntityWebAppWorker(object):
         #
         return rC
 
+    def _downloadBundle(self):
+        """ Stream zip (default) or tar.gz bundle of selected session files ('fileids', comma separated, default all)
+        """
+        if (self.__verbose):
+            self.__lfh.write("+EntityWebAppWorker._downloadBundle() Starting now\n")
+        #
+        self.__getSession()
+        self.__updateFileId()
+        #
+        bundleFormat = str(self.__reqObj.getValue('format')).strip().lower()
+        if bundleFormat not in ('zip', 'tgz'):
+            bundleFormat = 'zip'
+        #
+        fileIdList = [fileId.strip() for fileId in str(self.__reqObj.getValue('fileids')).split(',') if fileId.strip()]
+        #
+        downloadObj = DownloadFile(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        fileList = downloadObj.getBundleFileList(fileIdList=fileIdList)
+        for filePath, fileId in fileList:
+            if fileId.startswith('PRD_'):
+                RemoveEmptyCategories(filePath)
+            #
+        #
+        self.__reqObj.setReturnFormat(return_format="html")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        if not fileList:
+            rC.setError(errMsg='No file found')
+            return rC
+        #
+        bundleUtil = BundleFileUtil(verbose=self.__verbose, log=self.__lfh)
+        self.__streamD = {}
+        self.__streamD['CONTENT_TYPE'] = bundleUtil.getContentType(bundleFormat)
+        self.__streamD['DISPOSITION'] = 'attachment; filename=%s' % bundleUtil.getFileName(self.__identifier or self.__sessionId, bundleFormat)
+        self.__streamD['RETURN_STRING'] = b''
+        self.__streamD['RETURN_ITERATOR'] = bundleUtil.iterBundle(fileList, bundleFormat=bundleFormat)
+        return rC
+
+    def getResponseHeaders(self):
+        """ Return list of (header, value) pairs added to response (validators of read-only views)
+        """
+        return self.__headerList
+
+    def getStreamResponse(self):
+        """ Return response dictionary entries (with 'RETURN_ITERATOR' generator) for streamed output or None
+        """
+        return self.__streamD
+
     def _commitPRD(self):
         """ Commit PRD to CVS archive
         """
@@ -971,6 +1379,136 @@ class EntityWebAppWorker(object):
         rC.setStatusCode(returnCode)
         return rC
 
+    def _chopperProgress(self):
+        """ Report number of finished/total SearchAllInstances shards for chopper 'apply to all' request
+        """
+        self.__getSession()
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        instId = str(self.__reqObj.getValue('instanceid'))
+        if (not instId) or (instId != os.path.basename(instId)) or instId.startswith('.'):
+            rC.setError(errMsg='Invalid instance ID.')
+            return rC
+        #
+        progressFile = os.path.join(self.__sessionPath, instId, instId + '.search_progress')
+        if not os.access(progressFile, os.F_OK):
+            rC.setStatusCode('unknown')
+            return rC
+        #
+        done = 0
+        total = 0
+        ifh = open(progressFile, 'r')
+        for line in ifh:
+            tlist = line.split()
+            if len(tlist) == 2:
+                done += int(tlist[0])
+                total = int(tlist[1])
+            #
+        #
+        ifh.close()
+        #
+        myD = {}
+        myD['statuscode'] = 'ok'
+        myD['done'] = done
+        myD['total'] = total
+        rC.addDictionaryItems(myD)
+        return rC
+
+    def _summaryRenderScriptOp(self):
+        """ Return client-side renderer of summary_data responses (entity_summary_render.js)
+        """
+        self.__reqObj.setReturnFormat(return_format="html")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        try:
+            with open(SUMMARY_SCRIPT_PATH, 'rb') as ifh:
+                script = ifh.read()
+            #
+        except IOError:
+            rC.setError(errMsg='Summary renderer script not found')
+            return rC
+        #
+        self.__streamD = {}
+        self.__streamD['CONTENT_TYPE'] = 'application/javascript; charset=utf-8'
+        self.__streamD['RETURN_STRING'] = script
+        # the script URL carries the version of the file (see __addSummaryScript())
+        self.__headerList = [('Cache-Control', 'private, max-age=86400')]
+        return rC
+
+    def __addSummaryScript(self, html):
+        """ Load entity_summary_render.js in summary page html (before </body>, appended if there is none)
+        """
+        try:
+            statInfo = os.stat(SUMMARY_SCRIPT_PATH)
+        except OSError:
+            return html
+        #
+        tag = '<script type="text/javascript" src="/service/entity/summary_render_js?v=' + str(int(statInfo.st_mtime)) \
+            + '-' + str(statInfo.st_size) + '"></script>\n'
+        index = html.lower().rfind('</body>')
+        if index < 0:
+            return html + tag
+        #
+        return html[:index] + tag + html[index:]
+
+    def __getSummaryLoader(self, view):
+        """ Return placeholder which is filled by EntitySummary.load() from summary_data response.
+            The call waits for window load if entity_summary_render.js (see __addSummaryScript()) is not loaded yet
+        """
+        params = json.dumps({'sessionid': self.__sessionId, 'identifier': self.__identifier, 'view': view}).replace('</', '<\\/')
+        return '<div id="entity_summary_' + view + '"></div>\n' \
+            + '<script type="text/javascript">\n' \
+            + '(function () {\n' \
+            + '    function run() { EntitySummary.load(' + params + ', document.getElementById("entity_summary_' + view + '")); }\n' \
+            + '    if (window.EntitySummary) { run(); } else { window.addEventListener("load", run); }\n' \
+            + '}());\n' \
+            + '</script>'
+
+    def _summaryDataOp(self):
+        """ Return PRD summary tree (view=prd, default), structure summary (view=structure) or search results
+            (view=result, optional instanceid) as compact JSON for client-side rendering
+        """
+        self.__getSession()
+        self.__updateFileId()
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        if not self.__summaryCifObj:
+            rC.setError(errMsg='Can not find summary result file.')
+            return rC
+        #
+        view = str(self.__reqObj.getValue('view'))
+        if view == 'structure':
+            summaryObj = StrSummaryDepict(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
+            myD = summaryObj.getSummaryData()
+        elif view == 'result':
+            resultObj = ResultDepict(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
+            myD = resultObj.getResultData(str(self.__reqObj.getValue('instanceid')))
+        else:
+            summaryObj = PrdSummaryDepict(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
+            myD = summaryObj.getSummaryData()
+        #
+        self.__streamD = {}
+        self.__streamD['CONTENT_TYPE'] = 'application/json; charset=utf-8'
+        self.__streamD['RETURN_STRING'] = json.dumps(myD, separators=(',', ':')).encode('utf-8')
+        return rC
+
+    def _metricsOp(self):
+        """ Return request metrics totals in Prometheus text exposition format
+        """
+        self.__reqObj.setReturnFormat(return_format="html")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        metricsPath = MetricsUtil.getMetricsPath(self.__siteId)
+        if not metricsPath:
+            rC.setError(errMsg='Metrics collection is not enabled')
+            return rC
+        #
+        metricsUtil = MetricsUtil.MetricsUtil(metricsPath=metricsPath, verbose=self.__verbose, log=self.__lfh)
+        self.__streamD = {}
+        self.__streamD['CONTENT_TYPE'] = 'text/plain; version=0.0.4; charset=utf-8'
+        self.__streamD['RETURN_STRING'] = metricsUtil.getPrometheusText().encode('utf-8')
+        return rC
+
     def _LinkView(self):
         """ Launch Link view interface
         """
@@ -1044,6 +1582,115 @@ class EntityWebAppWorker(object):
         rC.setHtmlText(self.__processTemplate('update_form/update_result_tmplt.html', myD))
         return rC
 
+    def _stagedEditsOp(self):
+        """ Return coordinate edits staged (staged=yes) in session change-set
+        """
+        self.__getSession()
+        self.__updateFileId()
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        stagedObj = StagedUpdate(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
+        editList = []
+        for editD in stagedObj.getEditList():
+            editList.append({'id': editD['id'], 'task': editD['task'], 'targets': [target.split(':', 1)[-1] for target in editD['targets']]})
+        #
+        myD = {}
+        myD['statuscode'] = 'ok'
+        myD['edits'] = editList
+        rC.addDictionaryItems(myD)
+        return rC
+
+    def _discardStagedEditsOp(self):
+        """ Remove all staged coordinate edits
+        """
+        self.__getSession()
+        self.__updateFileId()
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        stagedObj = StagedUpdate(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
+        stagedObj.discard()
+        rC.setStatusCode('ok')
+        return rC
+
+    def _commitStagedEditsOp(self):
+        """ Apply all staged coordinate edits and re-run PRD search once (detached, see _checkRunningStatusOp)
+        """
+        if (self.__verbose):
+            self.__lfh.write("+EntityWebAppWorker._commitStagedEditsOp() Starting now\n")
+        #
+        self.__getSession()
+        self.__updateFileId()
+        #
+        self.__runDetach("_commitStagedEdits")
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC.setStatusCode('running')
+        return rC
+
+    def _commitStagedEdits(self):
+        stagedObj = StagedUpdate(reqObj=self.__reqObj, summaryCifObj=self.__summaryCifObj, verbose=self.__verbose, log=self.__lfh)
+        if not stagedObj.commit():
+            self.__message = stagedObj.getMessage()
+            return self._getSummaryHtml()
+        #
+        return self._runPrdSearch()
+
+    def _modelSnapshotsOp(self):
+        """ Return snapshots of model coordinate file taken before each update (see rollback_model)
+        """
+        self.__getSession()
+        self.__updateFileId()
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        journal = SnapshotJournal(sessionPath=self.__sessionPath, fileName=self.__modelfileId, verbose=self.__verbose, log=self.__lfh)
+        snapshotList = []
+        for stepD in journal.getStepList():
+            snapshotList.append({'step': stepD['step'], 'label': stepD['label'], 'time': stepD['time'], 'size': stepD['size']})
+        #
+        myD = {}
+        myD['statuscode'] = 'ok'
+        myD['snapshots'] = snapshotList
+        rC.addDictionaryItems(myD)
+        return rC
+
+    def _rollbackModelOp(self):
+        """ Restore model coordinate file to its state before update 'step' (the current file is kept as new snapshot).
+            The PRD search summary file and search results describe the current model, so prd-search is re-run in a
+            detached process (poll with check_running_status).
+        """
+        if (self.__verbose):
+            self.__lfh.write("+EntityWebAppWorker._rollbackModelOp() Starting now\n")
+        #
+        self.__getSession()
+        self.__updateFileId()
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        try:
+            step = int(str(self.__reqObj.getValue('step')))
+        except ValueError:
+            rC.setError(errMsg='Invalid snapshot step.')
+            return rC
+        #
+        journal = SnapshotJournal(sessionPath=self.__sessionPath, fileName=self.__modelfileId, verbose=self.__verbose, log=self.__lfh)
+        error = journal.rollback(step)
+        if error:
+            rC.setError(errMsg=error)
+            return rC
+        #
+        self.__runDetach("_runPrdSearch")
+        #
+        rC.setStatusCode('running')
+        return rC
+
     def _exit_Finished(self):
         """ Exiting Entity Transform Module when annotator has completed all necessary processing
         """
@@ -1125,11 +1772,19 @@ class EntityWebAppWorker(object):
         #
         return bSuccess
 
+    def __getContext(self):
+        """ Return request context (created by doOp, or on first use when a method is called directly)
+        """
+        if (self.__context is None) or (not self.__context.isValid()):
+            self.__context = getRequestContext(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        return self.__context
+
     def __getSession(self):
         """ Join existing session or create new session as required.
         """
         #
-        self.__sObj = self.__reqObj.newSessionObj()
+        self.__sObj = self.__getContext().getSessionObj()
         self.__sessionId = self.__sObj.getId()
         self.__sessionPath = self.__sObj.getPath()
         self.__rltvSessionPath = self.__sObj.getRelativePath()
@@ -1160,8 +1815,8 @@ class EntityWebAppWorker(object):
         if archiveFilePath and os.access(archiveFilePath, os.R_OK):
             self.__reqObj.setValue("identifier", depId)
             self.__getInputFileInfo(archiveFilePath)
-            shutil.copyfile(archiveFilePath, os.path.join(self.__sessionPath, self.__modelfileId))
-            return True
+            importUtil = FileImportUtil(verbose=self.__verbose, log=self.__lfh)
+            return importUtil.importFile(archiveFilePath, os.path.join(self.__sessionPath, self.__modelfileId), checksum=True)
         #
         return False
 
@@ -1199,12 +1854,11 @@ class EntityWebAppWorker(object):
                 self.__identifier = flist[0][0:idx]
             #
             uploadFilePath = os.path.join(self.__sessionPath, '_upload_' + str(time.strftime("%Y%m%d%H%M%S", time.localtime())))
-            ofh = open(uploadFilePath, 'wb')
-            ofh.write(fs.file.read())
-            ofh.close()
+            uploadUtil = UploadFileUtil(verbose=self.__verbose, log=self.__lfh)
+            uploadUtil.write(fs.file, uploadFilePath)
             #
             if os.access(uploadFilePath, os.F_OK):
-                self.__getInputFileInfo(uploadFilePath)
+                self.__processInputFileInfo(uploadUtil.getHeaderScanner())
                 os.rename(uploadFilePath, os.path.join(self.__sessionPath, self.__modelfileId))
                 if (self.__verbose):
                     self.__lfh.write("+EntityWebApp.__uploadFile() Uploaded file\n")
@@ -1223,7 +1877,19 @@ class EntityWebAppWorker(object):
         """
         """
         try:
-            cifObj = mmCIFUtil(filePath=inputFileName)
+            cifObj = CifHeaderScanner(verbose=self.__verbose, log=self.__lfh)
+            cifObj.scanFile(inputFileName)
+            self.__processInputFileInfo(cifObj)
+        except:  # noqa: E722 pylint: disable=bare-except
+            if (self.__verbose):
+                traceback.print_exc(file=self.__lfh)
+            #
+        #
+
+    def __processInputFileInfo(self, cifObj):
+        """ Get identifier, PDB ID and title from scanned database_2 & struct categories
+        """
+        try:
             dList = cifObj.GetValue('database_2')
             for d in dList:
                 if ('database_id' not in d) or (not d['database_id']) or ('database_code' not in d) or (not d['database_code']):
@@ -1268,10 +1934,13 @@ class EntityWebAppWorker(object):
             parameterDict = {}
         tPath = self.__reqObj.getValue("TemplatePath")
         fPath = os.path.join(tPath, fn)
-        ifh = open(fPath, 'r')
-        sIn = ifh.read()
-        ifh.close()
-        return (sIn % parameterDict)
+        with MetricsUtil.timer('template_render'):
+            MetricsUtil.addCount('file_read')
+            ifh = open(fPath, 'r')
+            sIn = ifh.read()
+            ifh.close()
+            return (sIn % parameterDict)
+        #
 
     def __isWorkflow(self):
         """ Determine if currently operating in Workflow Managed environment
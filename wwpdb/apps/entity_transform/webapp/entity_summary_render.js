@@ -0,0 +1,345 @@
+/*
+ * File:  entity_summary_render.js
+ * Date:  19-Oct-2026
+ *
+ * Client-side rendering of /service/entity/summary_data responses (PRD summary tree, structure summary and
+ * search results). The page only receives the compact JSON once and builds the same lists/tables which
+ * PrdSummaryDepict, StrSummaryDepict and ResultDepict used to render on the server.
+ *
+ * Usage:
+ *     EntitySummary.load({sessionid: ..., identifier: ..., view: 'prd'}, document.getElementById('summary'));
+ */
+var EntitySummary = (function () {
+    'use strict';
+
+    var PCM_WARNINGS = {
+        '1': ['orange', 'Unknown CCD ID covalently linked to a polymer residue, or in the polymer sequence'],
+        '2': ['orange', 'Existing CCD ID without PCM data covalently linked to a polymer residue, or in the polymer sequence'],
+        '3': ['red', 'CCD ID that should be not used as PCM/PTM observed  covalently linked to a polymer residue, or in the polymer sequence']
+    };
+    var PCM_DOC_URL = 'https://rcsbpdb.atlassian.net/wiki/spaces/WT/pages/2375385215/Protein+Modifications+Annotation+Documentation';
+
+    function escapeHtml(value) {
+        return String(value === undefined || value === null ? '' : value)
+            .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+    }
+
+    function query(params) {
+        var parts = [];
+        for (var key in params) {
+            if (params.hasOwnProperty(key)) {
+                parts.push(encodeURIComponent(key) + '=' + encodeURIComponent(params[key]));
+            }
+        }
+        return parts.join('&');
+    }
+
+    function link(path, params, text, extraClass) {
+        return '<a class="fltlft' + (extraClass ? ' ' + extraClass : '') + '" href="/service/entity/' + path + '?' + query(params)
+            + '" target="_blank"> ' + text + ' </a>';
+    }
+
+    /* ---------------------------------------------------------------- PRD summary tree */
+
+    function renderRows(data, node) {
+        var base = {sessionid: data.sessionid, identifier: data.identifier, pdbid: data.pdbid};
+        var html = '<table>\n';
+        for (var i = 0; i < node.rows.length; i++) {
+            var row = {};
+            for (var j = 0; j < data.row_fields.length; j++) {
+                row[data.row_fields[j]] = node.rows[i][j];
+            }
+            var params = {sessionid: base.sessionid, identifier: base.identifier, pdbid: base.pdbid,
+                          instanceid: row.id, label: row.label, focus: row.focus};
+            html += '<tr><td>' + escapeHtml(row.label) + '</td>';
+            html += '<td>' + link('jmol_view', params, '3D View') + '</td>';
+            if (row.linked || row.matched) {
+                html += '<td>' + (row.has_2d ? link('gif_view', params, '2D View') : '&nbsp;') + '</td>';
+                html += '<td>' + link('build_prd', params, 'Build PRD') + '</td>';
+                if (row.matched) {
+                    html += '<td>' + link('result_view', {sessionid: base.sessionid, identifier: base.identifier, pdbid: base.pdbid,
+                                                          instanceid: row.id}, '<span style="color:red;">View Search Result</span>') + '</td>';
+                }
+            } else if (row.message) {
+                html += '<td colspan="2"><span class="warninfo"><a href="#" title="' + escapeHtml(row.message)
+                    + '" onclick="return false">Not connected</a></span></td>';
+            } else {
+                html += '<td colspan="2">Not connected</td>';
+            }
+            html += '</tr>\n';
+        }
+        return html + '</table>\n';
+    }
+
+    function renderTree(data, nodeList) {
+        var html = '';
+        for (var i = 0; i < nodeList.length; i++) {
+            var node = nodeList[i];
+            var open = node.open === 1;
+            var body = '';
+            var image = '';
+            if (node.residues !== undefined) {
+                // residue text is HTML (coloured residues) built by ProcessPrdSummary
+                body = '<li>\n' + node.residues + '</li>\n';
+                if (node.rows) {
+                    body += renderRows(data, node);
+                }
+                if (node.thumbnail) {
+                    // full size image is fetched when the list is expanded (see loadImages)
+                    image = '<img src="' + escapeHtml(node.thumbnail) + '" width="' + node.thumbnail_size[0] + '" height="'
+                        + node.thumbnail_size[1] + '" alt="2D" />';
+                    body = '<li><img class="es-lazy" data-src="' + escapeHtml(node.image) + '" alt="2D" /></li>\n' + body;
+                } else if (node.image) {
+                    image = '<img src="' + escapeHtml(node.image) + '" alt="2D" />';
+                }
+            } else if (node.list) {
+                body = renderTree(data, node.list);
+            }
+            html += '<li>\n<span class="ui-icon ' + (open ? 'ui-icon-circle-arrow-s' : 'ui-icon-circle-arrow-e') + ' fltlft es-toggle"'
+                + ' data-target="es_' + escapeHtml(node.id) + '_' + i + '"></span> ' + escapeHtml(node.text) + image
+                + '\n<ul id="es_' + escapeHtml(node.id) + '_' + i + '" style="display:' + (open ? 'block' : 'none') + '">\n' + body + '</ul>\n</li>\n';
+        }
+        return html;
+    }
+
+    function renderPrdSummary(data) {
+        var params = {sessionid: data.sessionid, identifier: data.identifier, pdbid: data.pdbid};
+        var flags = data.flags || {};
+        var html = '<ul>\n' + renderTree(data, data.tree || []);
+        html += '<li>' + link('summary_view', params, 'Access to split or merge') + '</li>\n';
+        if (flags.split_polymer_residue) {
+            html += '<li>' + link('result_view', extend(params, {type: 'split'}),
+                                  '<span style="color:red;">Split modified residue to standard residue + modification in polymer</span>') + '</li>\n';
+        }
+        if (flags.comb_residue) {
+            html += '<li>' + link('result_view', extend(params, {type: 'merge'}),
+                                  '<span style="color:red;">Merge standard amino acid residue + modification to modified amino acid residue in polymer</span>') + '</li>\n';
+        }
+        if (flags.match_result) {
+            html += '<li>' + link('result_view', params, '<span style="color:red;">View All Search Result(s)</span>') + '</li>\n';
+        }
+        if (flags.graph_match) {
+            html += '<li>' + link('result_view', extend(params, {type: 'match'}), 'Update Coordinate File with Match Result(s)') + '</li>\n';
+        }
+        html += '<li>' + link('result_view', extend(params, {type: 'input'}), 'Update Coordinate File with Input IDs') + '</li>\n';
+        html += '<li>' + link('result_view', extend(params, {type: 'split_with_input'}), 'Split non standard residue in polymer') + '</li>\n';
+        html += '<li>' + link('download_file', params, 'Download Files') + '</li>\n';
+        html += '<li><a class="fltlft" href="' + PCM_DOC_URL + '" target="_blank"> View PCM/PTM Documentation </a></li>\n';
+        var labels = data.pcm_labels || [];
+        for (var key in PCM_WARNINGS) {
+            if (PCM_WARNINGS.hasOwnProperty(key) && labels.indexOf(key) >= 0) {
+                html += '<li><span style="color:' + PCM_WARNINGS[key][0] + '" class="fltlft">' + PCM_WARNINGS[key][1] + '</span></li>\n';
+            }
+        }
+        return html + '</ul>\n';
+    }
+
+    /* ---------------------------------------------------------------- structure summary */
+
+    function linkCell(data, id, text) {
+        if (data.links.indexOf(id) < 0) {
+            return '<td> &nbsp; &nbsp; &nbsp; </td>';
+        }
+        return '<td>' + link('link_view', {sessionid: data.sessionid, pdbid: data.pdbid, identifier: data.identifier, id: id}, text) + '</td>';
+    }
+
+    function section(id, text, content) {
+        return '<li>\n<span class="ui-icon ui-icon-circle-arrow-e fltlft es-toggle" data-target="es_' + id + '"></span> ' + text
+            + '\n<ul id="es_' + id + '" style="display:none">\n' + content + '</ul>\n</li>\n';
+    }
+
+    function renderStructureSummary(data) {
+        var html = '<ul>\n';
+        var table, i, j;
+        if (data.entities) {
+            table = '<table>\n<tr><th>Entity ID</th><th>Chain ID/<br/>User Defined Group ID</th><th>Links</th><th>Molecule Name</th></tr>\n';
+            for (i = 0; i < data.entities.length; i++) {
+                var entity = data.entities[i];
+                var chains = '', links = '';
+                for (j = 0; j < entity[1].length; j++) {
+                    var c = escapeHtml(entity[1][j]);
+                    chains += '<input type="checkbox" name="chain" value="' + c + '" /> ' + c + ' &nbsp; &nbsp; <input type="text" name="chain_' + c
+                        + '" size="5" value="" />  <br/>\n';
+                    links += data.links.indexOf(entity[1][j]) < 0 ? ' &nbsp; ' : link('link_view', {sessionid: data.sessionid, pdbid: data.pdbid,
+                        identifier: data.identifier, id: entity[1][j]}, 'View Chain ' + c + "'s Link") + ' <br/>\n';
+                }
+                table += '<tr><td><input type="checkbox" name="entity" value="' + escapeHtml(entity[0]) + '" /> ' + escapeHtml(entity[0]) + ' </td>'
+                    + '<td>' + (chains || ' &nbsp; ') + '</td><td>' + (links || ' &nbsp; ') + '</td><td> ' + escapeHtml(entity[2]) + ' </td></tr>\n';
+            }
+            html += section('polymer', 'Polymers', table + '</table>\n');
+        } else if (data.chains && data.chains.length) {
+            table = '<table>\n<tr><th>Chain ID</th><th>User Defined<br/> Group ID</th><th>Links</th></tr>\n';
+            for (i = 0; i < data.chains.length; i++) {
+                var chain = escapeHtml(data.chains[i]);
+                table += '<tr><td><input type="checkbox" name="chain" value="' + chain + '" /> ' + chain + ' </td>'
+                    + '<td><input type="text" name="chain_' + chain + '" size="5" value="" /> </td>' + linkCell(data, data.chains[i], 'View Link') + '</tr>\n';
+            }
+            html += section('polymer', 'Polymers', table + '</table>\n');
+        }
+        if (data.ligands && data.ligands.length) {
+            table = '<table>\n<tr><th>Selection/<br/>User Defined Group ID<br/><input id="ligand_select_all" value="Select All" type="button"'
+                + ' onClick="select_ligand(\'ligand_select_all\');" /></th><th>3 Letter Code</th><th>Chain ID</th><th>ResNum</th><th>InsertCode</th>'
+                + '<th>Links</th></tr>\n';
+            for (i = 0; i < data.ligands.length; i++) {
+                var ligand = data.ligands[i];
+                var ligandId = ligand[1] + '_' + ligand[0] + '_' + ligand[2] + '_' + ligand[3];
+                table += '<tr><td><input type="checkbox" name="ligand" value="' + escapeHtml(ligandId) + '" /> &nbsp; &nbsp; <input type="text" name="ligand_'
+                    + escapeHtml(ligandId) + '" size="5" value="" /> </td>';
+                for (j = 0; j < ligand.length; j++) {
+                    table += '<td> ' + escapeHtml(ligand[j]) + ' </td>';
+                }
+                table += linkCell(data, ligandId, 'View Link') + '</tr>\n';
+            }
+            html += section('ligand', 'Non-polymers', table + '</table>\n');
+        }
+        if (data.groups && data.groups.length) {
+            table = '<table>\n<tr><th> &nbsp; &nbsp; &nbsp; </th><th>User Defined<br /> Group ID</th><th colspan="2">Description</th><th>Links</th></tr>\n';
+            for (i = 0; i < data.groups.length; i++) {
+                var group = (i + 1) + ',' + data.groups[i];
+                var labels = [];
+                var members = data.groups[i].split(',');
+                for (j = 0; j < members.length; j++) {
+                    var parts = members[j].split('_');
+                    labels.push(parts.length === 1 ? 'Chain ' + parts[0] : 'Residue ' + parts.join(' '));
+                }
+                table += '<tr><td><input type="checkbox" name="group" value="' + escapeHtml(group) + '" /> GROUP_' + (i + 1) + ' </td>'
+                    + '<td><input type="text" name="group_' + escapeHtml(data.groups[i]) + '" size="5" value="" /> </td>'
+                    + '<td colspan="2">' + escapeHtml(labels.join(', ')) + ' </td>'
+                    + (data.links.indexOf(data.groups[i]) < 0 ? '<td> &nbsp; &nbsp; &nbsp; </td>' : '<td>' + link('link_view', {sessionid: data.sessionid,
+                        pdbid: data.pdbid, identifier: data.identifier, id: group}, 'View Link') + '</td>') + '</tr>\n';
+            }
+            html += section('group', 'Connected residues(Groups)', table + '</table>\n');
+        }
+        if (data.pdbid && data.pdbid !== 'unknown') {
+            html += '<li>' + link('download_file', {struct: 'yes', sessionid: data.sessionid, identifier: data.identifier, pdbid: data.pdbid},
+                                  'Download Files') + '</li>\n';
+        }
+        html += '<li><a class="fltlft" href="' + PCM_DOC_URL + '" target="_blank"> View PCM/PTM Documentation </a></li>\n';
+        return html + '</ul>\n';
+    }
+
+    /* ---------------------------------------------------------------- search results */
+
+    function renderHits(data, hits) {
+        var html = '<table>\n';
+        for (var i = 0; i < hits.length; i++) {
+            var hit = hits[i];
+            html += '<tr><td>' + escapeHtml(hit.value) + '</td>';
+            if (hit.prdid) {
+                html += '<td>' + escapeHtml(hit.prdid) + ' (' + escapeHtml(data.status[hit.prdid]) + ')</td>';
+            }
+            if (hit.ccid) {
+                html += '<td>' + escapeHtml(hit.ccid) + ' (' + escapeHtml(data.status[hit.ccid]) + ')</td>';
+            }
+            if (hit.sequence) {
+                html += '<td>' + escapeHtml(hit.sequence) + '</td>';
+            }
+            html += '</tr>\n';
+        }
+        return html + '</table>\n';
+    }
+
+    function renderResult(data) {
+        var html = '';
+        for (var i = 0; i < data.instances.length; i++) {
+            var inst = data.instances[i];
+            html += '<h3>' + escapeHtml(inst.label) + '</h3>\n<p>' + escapeHtml(inst.sequence) + '</p>\n';
+            if (inst.graph) {
+                html += '<h4>Graph match</h4>\n' + renderHits(data, inst.graph);
+            }
+            if (inst.sequence_hits) {
+                html += '<h4>Sequence similarity</h4>\n' + renderHits(data, inst.sequence_hits);
+            }
+        }
+        return html;
+    }
+
+    /* ---------------------------------------------------------------- entry points */
+
+    function extend(target, source) {
+        var result = {}, key;
+        for (key in target) {
+            if (target.hasOwnProperty(key)) {
+                result[key] = target[key];
+            }
+        }
+        for (key in source) {
+            if (source.hasOwnProperty(key)) {
+                result[key] = source[key];
+            }
+        }
+        return result;
+    }
+
+    function loadImages(list) {
+        var images = list.getElementsByTagName('img');
+        for (var i = 0; i < images.length; i++) {
+            var src = images[i].getAttribute('data-src');
+            if (src) {
+                images[i].removeAttribute('data-src');
+                images[i].src = src;
+            }
+        }
+    }
+
+    function bindToggles(container) {
+        var lists = container.getElementsByTagName('ul');
+        for (var i = 0; i < lists.length; i++) {
+            if (lists[i].style.display === 'block') {
+                loadImages(lists[i]);
+            }
+        }
+        container.onclick = function (event) {
+            var target = event.target || event.srcElement;
+            if (!target.getAttribute || !target.getAttribute('data-target')) {
+                return;
+            }
+            var list = document.getElementById(target.getAttribute('data-target'));
+            var open = list.style.display !== 'none';
+            list.style.display = open ? 'none' : 'block';
+            if (!open) {
+                loadImages(list);
+            }
+            target.className = target.className.replace(open ? 'ui-icon-circle-arrow-s' : 'ui-icon-circle-arrow-e',
+                                                        open ? 'ui-icon-circle-arrow-e' : 'ui-icon-circle-arrow-s');
+        };
+    }
+
+    function render(data, container) {
+        if (data.type === 'structure_summary') {
+            container.innerHTML = renderStructureSummary(data);
+        } else if (data.type === 'result') {
+            container.innerHTML = renderResult(data);
+        } else {
+            container.innerHTML = renderPrdSummary(data);
+        }
+        bindToggles(container);
+    }
+
+    function load(params, container, callback) {
+        var request = new XMLHttpRequest();
+        request.open('GET', '/service/entity/summary_data?' + query(params), true);
+        request.onreadystatechange = function () {
+            if (request.readyState !== 4) {
+                return;
+            }
+            var data = null;
+            try {
+                data = JSON.parse(request.responseText);
+            } catch (e) {
+                data = null;
+            }
+            if (!data || !data.type) {
+                container.innerHTML = escapeHtml((data && data.errortext) || 'Can not find summary result file.');
+            } else {
+                render(data, container);
+            }
+            if (callback) {
+                callback(data);
+            }
+        };
+        request.send(null);
+    }
+
+    return {load: load, render: render};
+}());
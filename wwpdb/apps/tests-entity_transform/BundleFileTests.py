@@ -0,0 +1,93 @@
+##
+# File: BundleFileTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for streamed zip/tar.gz bundles of session files"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import io
+import shutil
+import tarfile
+import zipfile
+import unittest
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.BundleFileUtil import BundleFileUtil
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+
+class BundleFileTests(unittest.TestCase):
+    def setUp(self):
+        self.__sessionPath = os.path.join(TESTOUTPUT, "bundle-file")
+        if os.access(self.__sessionPath, os.F_OK):
+            shutil.rmtree(self.__sessionPath)
+        #
+        os.makedirs(os.path.join(self.__sessionPath, "search", "A_1"))
+        self.__contentD = {"D_000000_model_P1.cif": b"data_D_000000\n" + b"ATOM\n" * 5000,
+                           "search/A_1/A_1.cif": b"data_A_1\n",
+                           "empty.txt": b""}
+        self.__fileList = []
+        for arcName, content in self.__contentD.items():
+            filePath = os.path.join(self.__sessionPath, arcName)
+            with open(filePath, "wb") as ofh:
+                ofh.write(content)
+            #
+            self.__fileList.append((filePath, arcName))
+        #
+        # missing files are skipped
+        self.__fileList.append((os.path.join(self.__sessionPath, "missing.cif"), "missing.cif"))
+
+    def __getBundle(self, bundleFormat):
+        bundleUtil = BundleFileUtil(blockSize=1000)
+        blockList = list(bundleUtil.iterBundle(self.__fileList, bundleFormat=bundleFormat))
+        self.assertTrue(len(blockList) > 1)
+        return io.BytesIO(b"".join(blockList))
+
+    def testZipBundle(self):
+        """Streamed zip holds every existing file with its archive name and content"""
+        with zipfile.ZipFile(self.__getBundle("zip")) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(sorted(zf.namelist()), sorted(self.__contentD.keys()))
+            for arcName, content in self.__contentD.items():
+                self.assertEqual(zf.read(arcName), content)
+            #
+        #
+
+    def testTarGzBundle(self):
+        """Streamed tar.gz holds every existing file with its archive name and content"""
+        with tarfile.open(fileobj=self.__getBundle("tgz"), mode="r:gz") as tf:
+            self.assertEqual(sorted(tf.getnames()), sorted(self.__contentD.keys()))
+            for arcName, content in self.__contentD.items():
+                self.assertEqual(tf.extractfile(arcName).read(), content)
+            #
+        #
+
+    def testNames(self):
+        """Content type and file name follow the bundle format"""
+        bundleUtil = BundleFileUtil()
+        self.assertEqual(bundleUtil.getFileName("D_000000", "tgz"), "D_000000.tar.gz")
+        self.assertEqual(bundleUtil.getContentType("tgz"), "application/gzip")
+        self.assertEqual(bundleUtil.getFileName("D_000000", "zip"), "D_000000.zip")
+        self.assertEqual(bundleUtil.getContentType("zip"), "application/zip")
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
@@ -0,0 +1,110 @@
+##
+# File: ChangeSetTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for session change-set of staged coordinate edits"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import shutil
+import unittest
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.update.ChangeSet import ChangeSet
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+
+class ChangeSetTests(unittest.TestCase):
+    def setUp(self):
+        self.__sessionPath = os.path.join(TESTOUTPUT, "change-set")
+        if os.access(self.__sessionPath, os.F_OK):
+            shutil.rmtree(self.__sessionPath)
+        #
+        os.makedirs(self.__sessionPath)
+        self.__modelFile = "D_000000_model_P1.cif"
+        self.__writeModel("data_D_000000\n")
+
+    def __writeModel(self, text):
+        with open(os.path.join(self.__sessionPath, self.__modelFile), "w") as ofh:
+            ofh.write(text)
+        #
+
+    def __getChangeSet(self):
+        return ChangeSet(sessionPath=self.__sessionPath, modelFile=self.__modelFile)
+
+    def testStaging(self):
+        """Edits are kept in staging order with increasing IDs"""
+        changeSet = self.__getChangeSet()
+        self.assertEqual(changeSet.addEdit("Merge to polymer", "MergePolymer", "run-merge", " -group A,B ", targetList=["chain:A", "chain:B"]), "")
+        self.assertEqual(changeSet.addEdit("Update Entry", "UpdateEntry", "update-entry", " -mapping m1 ", targetList=["instance:C_1"]), "")
+        self.assertEqual([(editD["id"], editD["program"]) for editD in changeSet.getEditList()], [(1, "MergePolymer"), (2, "UpdateEntry")])
+        self.assertEqual(changeSet.checkModel(), "")
+
+    def testConflicts(self):
+        """Edits touching the same chain (by chain, ligand or instance ID) or a rewritten model file conflict"""
+        changeSet = self.__getChangeSet()
+        self.assertEqual(changeSet.addEdit("Merge to polymer", "MergePolymer", "run-merge", " -group A,B ", targetList=["chain:A", "chain:B"]), "")
+        self.assertIn("chain(s) A", changeSet.addEdit("Merge to ligand", "MergeLigand", "run-merge", " -group A_HEM_1 ", targetList=["ligand:A_HEM_1"]))
+        self.assertIn("chain(s) B", changeSet.addEdit("Update Entry", "UpdateEntry", "update-entry", " -mapping m1 ", targetList=["instance:B_1"]))
+        self.assertIn("whole model", changeSet.addEdit("Update Entry", "UpdateEntry", "update-entry", " -mapping m1 "))
+        self.assertEqual(changeSet.addEdit("Edit polymer", "EditPolymer", "run-edit", " -chain C ", targetList=["chain:C"]), "")
+        self.assertEqual(len(changeSet.getEditList()), 2)
+        #
+        self.__writeModel("data_D_000000\n_entry.id D_000000\n")
+        self.assertNotEqual(changeSet.checkModel(), "")
+        self.assertIn("Model coordinate file", changeSet.addEdit("Edit polymer", "EditPolymer", "run-edit", " -chain D ", targetList=["chain:D"]))
+
+    def testCommitGroups(self):
+        """Edits of one program and common options run together, groups follow the first edit of each group"""
+        changeSet = self.__getChangeSet()
+        changeSet.addEdit("Update Entry", "UpdateEntry", "update-entry", " -mapping m1 ", targetList=["instance:A_1"])
+        changeSet.addEdit("Edit polymer", "EditPolymer", "run-edit", " -chain B ", targetList=["chain:B"])
+        changeSet.addEdit("Update Entry", "UpdateEntry", "update-entry", " -mapping m3 ", targetList=["instance:C_1"])
+        changeSet.addEdit("Chopper split_residue", "UpdateEntry", "update-entry", " -mapping m4 ", targetList=["instance:D_1"],
+                          commonOptions=" -split_polymer_residue ")
+        groupList = changeSet.getCommitGroups()
+        self.assertEqual([(groupD["program"], groupD["edits"]) for groupD in groupList],
+                         [("UpdateEntry", [1, 3]), ("EditPolymer", [2]), ("UpdateEntry", [4])])
+        self.assertEqual(groupList[0]["options"], " -mapping m1  -mapping m3  ")
+        self.assertEqual(groupList[2]["options"], " -split_polymer_residue  -mapping m4  ")
+
+    def testChopperTargets(self):
+        """Chopper edits target the search instances of their workspace, not the chopper_inst_N directory"""
+        changeSet = self.__getChangeSet()
+        self.assertEqual(changeSet.addEdit("Chopper merge", "UpdateEntry", "update-entry", " -mapping chopper_inst_1/m ",
+                                           targetList=["instance:A_HEM_501"]), "")
+        self.assertEqual(changeSet.addEdit("Chopper merge", "UpdateEntry", "update-entry", " -mapping chopper_inst_2/m ",
+                                           targetList=["instance:B_HEM_501", "instance:C_HEM_501"]), "")
+        self.assertIn("chain(s) C", changeSet.addEdit("Merge to polymer", "MergePolymer", "run-merge", " -group C,D ", targetList=["chain:C", "chain:D"]))
+        self.assertEqual([groupD["edits"] for groupD in changeSet.getCommitGroups()], [[1, 2]])
+
+    def testRemoveEdits(self):
+        """Committed edits are removed, edits staged meanwhile are kept"""
+        changeSet = self.__getChangeSet()
+        changeSet.addEdit("Edit polymer", "EditPolymer", "run-edit", " -chain A ", targetList=["chain:A"])
+        changeSet.addEdit("Edit polymer", "EditPolymer", "run-edit", " -chain B ", targetList=["chain:B"])
+        editIdList = [editId for groupD in changeSet.getCommitGroups() for editId in groupD["edits"]]
+        changeSet.addEdit("Edit polymer", "EditPolymer", "run-edit", " -chain C ", targetList=["chain:C"])
+        self.assertTrue(changeSet.removeEdits(editIdList))
+        self.assertEqual([editD["id"] for editD in changeSet.getEditList()], [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
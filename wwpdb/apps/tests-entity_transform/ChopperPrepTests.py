@@ -0,0 +1,185 @@
+##
+# File: ChopperPrepTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for chopper workspace index and prebuild invalidation"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import fcntl
+import json
+import shutil
+import time
+import unittest
+import logging
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.update import ChopperPrepUtil as chopperPrepModule
+from wwpdb.apps.entity_transform.update.ChopperPrepUtil import ChopperPrepUtil, INDEX_FILE_NAME, PREBUILD_LOCK_FILE_NAME, SPLIT_OPTION
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+
+class SessionReplace(object):
+    def __init__(self, sessionPath):
+        self.__sessionPath = sessionPath
+
+    def getId(self):
+        return "abc"
+
+    def getPath(self):
+        return self.__sessionPath
+
+
+class RequestReplace(object):
+    def __init__(self, sessionPath):
+        self.__sessionPath = sessionPath
+        self.__valueD = {"sessionid": "abc", "WWPDB_SITE_ID": "WWPDB_DEPLOY"}
+
+    def getValue(self, key):
+        return self.__valueD.get(key, "")
+
+    def getSemaphore(self):
+        return "semaphore_1"
+
+    def newSessionObj(self):
+        return SessionReplace(self.__sessionPath)
+
+
+class CombineCoordReplace(object):
+    """ Records the workspaces built instead of running CombineCoord
+    """
+    buildList = []
+
+    def __init__(self, reqObj=None, instList=None, cifFile=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        CombineCoordReplace.buildList.append(list(instList))
+        self.__instId = "chopper_inst_" + str(len(CombineCoordReplace.buildList))
+
+    def getInstId(self):
+        return self.__instId
+
+    def setProgressCallback(self, func):
+        func("combine")
+
+    def processWithCopy(self, submitValue=""):
+        pass
+
+    def processWithCombine(self, submitValue=""):
+        pass
+
+    def getMessage(self):
+        return ""
+
+
+class SummaryCifReplace(object):
+    def getValueList(self, category):
+        if category == "pdbx_split_polymer_residue_info":
+            return [{"instance_id": "A_1"}, {"instance_id": "B_1"}]
+        #
+        return []
+
+
+class ChopperPrepTests(unittest.TestCase):
+    def setUp(self):
+        self.__sessionPath = os.path.join(TESTOUTPUT, "chopper-prep")
+        if os.access(self.__sessionPath, os.F_OK):
+            shutil.rmtree(self.__sessionPath)
+        #
+        os.makedirs(self.__sessionPath)
+        self.__cifFile = "D_000000_model_P1.cif"
+        self.__writeModel("data_D_000000\n")
+        CombineCoordReplace.buildList = []
+        self.__patchList = [patch.object(chopperPrepModule, "CombineCoord", CombineCoordReplace),
+                            patch.object(ChopperPrepUtil, "getPrebuildCount", return_value=2)]
+        for patcher in self.__patchList:
+            patcher.start()
+        #
+
+    def tearDown(self):
+        for patcher in self.__patchList:
+            patcher.stop()
+        #
+
+    def __writeModel(self, text):
+        with open(os.path.join(self.__sessionPath, self.__cifFile), "w") as ofh:
+            ofh.write(text)
+        #
+
+    def __getUtil(self):
+        return ChopperPrepUtil(reqObj=RequestReplace(self.__sessionPath))
+
+    def testClaimPrebuiltWorkspace(self):
+        """Workspace built in advance is handed out once and not rebuilt"""
+        prepUtil = self.__getUtil()
+        self.assertTrue(prepUtil.needPrebuild(SummaryCifReplace(), self.__cifFile))
+        prepUtil.prebuild(SummaryCifReplace(), self.__cifFile)
+        self.assertEqual(CombineCoordReplace.buildList, [["A_1"], ["B_1"]])
+        self.assertFalse(prepUtil.needPrebuild(SummaryCifReplace(), self.__cifFile))
+        #
+        self.assertEqual(prepUtil.getWorkspace(SPLIT_OPTION, ["A_1"], self.__cifFile), ("chopper_inst_1", ""))
+        self.assertEqual(len(CombineCoordReplace.buildList), 2)
+
+    def testStaleWorkspace(self):
+        """Workspace built from an older model file is dropped and rebuilt"""
+        prepUtil = self.__getUtil()
+        prepUtil.prebuild(SummaryCifReplace(), self.__cifFile)
+        self.__writeModel("data_D_000000\n_entry.id D_000000\n")
+        self.assertTrue(prepUtil.needPrebuild(SummaryCifReplace(), self.__cifFile))
+        #
+        self.assertEqual(prepUtil.getWorkspace(SPLIT_OPTION, ["A_1"], self.__cifFile), ("chopper_inst_3", ""))
+        prepUtil.prebuild(SummaryCifReplace(), self.__cifFile)
+        self.assertEqual(CombineCoordReplace.buildList, [["A_1"], ["B_1"], ["A_1"], ["B_1"]])
+        self.assertFalse(prepUtil.needPrebuild(SummaryCifReplace(), self.__cifFile))
+        self.assertEqual(prepUtil.getStatus(instId="chopper_inst_2"), None)
+
+    def testPrebuildRunning(self):
+        """No prebuild is started while another one holds the prebuild lock"""
+        prepUtil = self.__getUtil()
+        with open(os.path.join(self.__sessionPath, PREBUILD_LOCK_FILE_NAME), "a") as lfh:
+            fcntl.flock(lfh.fileno(), fcntl.LOCK_EX)
+            self.assertFalse(prepUtil.needPrebuild(SummaryCifReplace(), self.__cifFile))
+        #
+        self.assertTrue(prepUtil.needPrebuild(SummaryCifReplace(), self.__cifFile))
+
+    def testBuildStillRunning(self):
+        """Workspace still being built after waitSeconds is built synchronously, the replaced build leaves the entry alone"""
+        prepUtil = self.__getUtil()
+        indexPath = os.path.join(self.__sessionPath, INDEX_FILE_NAME)
+        entryD = {"instid": "chopper_inst_9", "status": "running", "stage": "combine", "message": "", "claimed": False,
+                  "speculative": True, "pid": os.getpid(), "semaphore": "", "start": 1.0,
+                  "model": [os.path.getsize(os.path.join(self.__sessionPath, self.__cifFile)),
+                            os.stat(os.path.join(self.__sessionPath, self.__cifFile)).st_mtime]}
+        with open(indexPath, "w") as ofh:
+            json.dump({SPLIT_OPTION + "|A_1": entryD}, ofh)
+        #
+        startTime = time.time()
+        self.assertEqual(prepUtil.getWorkspace(SPLIT_OPTION, ["A_1"], self.__cifFile, waitSeconds=1), ("chopper_inst_1", ""))
+        self.assertLess(time.time() - startTime, 10)
+        # background build finishing later does not overwrite the synchronous build
+        prepUtil._ChopperPrepUtil__updateEntry(SPLIT_OPTION + "|A_1", entryD, {"status": "done"})  # pylint: disable=protected-access,no-member
+        self.assertEqual(prepUtil.getStatus(instId="chopper_inst_1")["status"], "done")
+        self.assertEqual(prepUtil.getStatus(instId="chopper_inst_9"), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
@@ -0,0 +1,198 @@
+##
+# File: CommandCacheTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the result cache of back-end commands run by CommandUtil"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import shutil
+import stat
+import unittest
+import logging
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.CommandCacheUtil import CommandCacheUtil
+from wwpdb.apps.entity_transform.utils.CommandUtil import CommandUtil
+from wwpdb.apps.entity_transform.utils.SiteConfig import SiteConfig
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+# test tool: counts its runs, copies -input to -output (appending the run count), sleeps -sleep seconds and exits with
+# the -exit value
+TOOL_SCRIPT = """#!/bin/sh
+echo run >> %s
+while [ $# -gt 0 ]; do
+  case "$1" in
+    -input) input="$2"; shift ;;
+    -output) output="$2"; shift ;;
+    -exit) code="$2"; shift ;;
+    -sleep) pause="$2"; shift ;;
+  esac
+  shift
+done
+cp "$input" "$output"
+wc -l < %s >> "$output"
+sleep ${pause:-0}
+exit ${code:-0}
+"""
+
+
+class RequestReplace(object):
+    def __init__(self, topSessionPath):
+        self.__valueD = {"WWPDB_SITE_ID": "WWPDB_DEPLOY", "TopSessionPath": topSessionPath, "instanceid": ""}
+
+    def getValue(self, key):
+        return self.__valueD.get(key, "")
+
+
+class CommandCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__topPath = os.path.join(TESTOUTPUT, "command-cache")
+        if os.access(self.__topPath, os.F_OK):
+            shutil.rmtree(self.__topPath)
+        #
+        self.__sessionPath = os.path.join(self.__topPath, "sessions", "abc")
+        binPath = os.path.join(self.__topPath, "tools", "bin")
+        os.makedirs(self.__sessionPath)
+        os.makedirs(binPath)
+        self.__runFile = os.path.join(self.__topPath, "runs.txt")
+        toolPath = os.path.join(binPath, "CopyTool")
+        with open(toolPath, "w") as ofh:
+            ofh.write(TOOL_SCRIPT % (self.__runFile, self.__runFile))
+        #
+        os.chmod(toolPath, stat.S_IRWXU)
+        with open(os.path.join(self.__sessionPath, "in.cif"), "w") as ofh:
+            ofh.write("data_in\n")
+        #
+        setting = "BINPATH=" + binPath + "; CC_TOOLS=" + binPath + "; "
+        self.__patchList = [patch.object(SiteConfig, "getAnnotToolsPath", return_value=os.path.dirname(binPath)),
+                            patch.object(SiteConfig, "getAnnotSetting", return_value=setting),
+                            patch.object(SiteConfig, "getCCAppsPath", return_value=os.path.dirname(binPath)),
+                            patch.object(SiteConfig, "getCCToolSetting", return_value=setting)]
+        for patcher in self.__patchList:
+            patcher.start()
+        #
+
+    def tearDown(self):
+        for patcher in self.__patchList:
+            patcher.stop()
+        #
+
+    def __run(self, options="", outputFile="out.cif", inputFile="in.cif", timeOut=None):
+        cmdUtil = CommandUtil(reqObj=RequestReplace(self.__topPath))
+        cmdUtil.setSessionPath(self.__sessionPath)
+        if timeOut is None:
+            cmdUtil.runAnnotCmd("CopyTool", inputFile, outputFile, "", "", options, cacheOutputs=[outputFile])
+        else:
+            # runCCToolCmdWithTimeOut passes input/output as -i/-o, give them as options
+            cmdUtil.runCCToolCmdWithTimeOut("CopyTool", "", "", "", "", options + " -input " + inputFile + " -output " + outputFile,
+                                            timeOut=timeOut, cacheInputs=[inputFile], cacheOutputs=[outputFile])
+        #
+        with open(os.path.join(self.__sessionPath, outputFile), "r") as ifh:
+            return ifh.read().split()[-1]
+        #
+
+    def __getRunCount(self):
+        if not os.access(self.__runFile, os.F_OK):
+            return 0
+        #
+        with open(self.__runFile, "r") as ifh:
+            return len(ifh.readlines())
+        #
+
+    def testHitAndMiss(self):
+        """Second run with unchanged input and options is restored from the cache"""
+        self.assertEqual(self.__run(), "1")
+        self.assertEqual(self.__run(), "1")
+        self.assertEqual(self.__getRunCount(), 1)
+        # changed options
+        self.assertEqual(self.__run(options="-v"), "2")
+        # changed input
+        with open(os.path.join(self.__sessionPath, "in.cif"), "a") as ofh:
+            ofh.write("_entry.id in\n")
+        #
+        self.assertEqual(self.__run(), "3")
+        self.assertEqual(self.__getRunCount(), 3)
+
+    def testFailedRunNotCached(self):
+        """Outputs of a command with non-zero exit status are not cached"""
+        self.assertEqual(self.__run(options="-exit 3"), "1")
+        self.assertEqual(self.__run(options="-exit 3"), "2")
+        self.assertEqual(self.__getRunCount(), 2)
+
+    def testTimeoutNotCached(self):
+        """Outputs of a command killed at its timeout are not cached, successful timed runs are"""
+        self.assertEqual(self.__run(options="-sleep 0.1", timeOut=30), "1")
+        self.assertEqual(self.__run(options="-sleep 0.1", timeOut=30), "1")
+        self.assertEqual(self.__run(options="-exit 2", timeOut=30), "2")
+        self.assertEqual(self.__run(options="-exit 2", timeOut=30), "3")
+        # killed after more than timeOut seconds (output is written before the tool sleeps)
+        self.assertEqual(self.__run(options="-sleep 3", timeOut=0), "4")
+        self.assertEqual(self.__run(options="-sleep 3", timeOut=0), "5")
+        self.assertEqual(self.__getRunCount(), 5)
+
+    def testInPlaceNotCached(self):
+        """Command changing its input file in place is never cached"""
+        self.assertEqual(self.__run(outputFile="in.cif"), "1")
+        self.assertEqual(self.__run(outputFile="in.cif"), "2")
+        self.assertEqual(self.__getRunCount(), 2)
+
+    def testLogFilesRestored(self):
+        """Log files of a cached command are restored under the names given by the later call"""
+        for clogFile in ("first.clog", "second.clog"):
+            cmdUtil = CommandUtil(reqObj=RequestReplace(self.__topPath))
+            cmdUtil.setSessionPath(self.__sessionPath)
+            cmdUtil.runAnnotCmd("CopyTool", "in.cif", "out.cif", "", clogFile, "", cacheOutputs=["out.cif"])
+            self.assertTrue(os.access(os.path.join(self.__sessionPath, clogFile), os.F_OK))
+        #
+        self.assertEqual(self.__getRunCount(), 1)
+
+    def testEviction(self):
+        """Cache is only walked when the recorded blob store size exceeds maxSize"""
+        cachePath = os.path.join(self.__topPath, "cache")
+        cacheUtil = CommandCacheUtil(cachePath=cachePath, maxSize=250)
+        listFiles = cacheUtil._CommandCacheUtil__listFiles  # pylint: disable=protected-access,no-member
+        with patch.object(CommandCacheUtil, "_CommandCacheUtil__listFiles", side_effect=listFiles) as mockList:
+            for i in range(4):
+                outputFile = os.path.join(self.__sessionPath, "out%d.cif" % i)
+                with open(outputFile, "w") as ofh:
+                    ofh.write(str(i) * 100)
+                #
+                cacheUtil.store("key%d" % i, [outputFile])
+                # distinct last use times
+                os.utime(os.path.join(cachePath, "entries", "ke", "key%d.json" % i), (1000 + i, 1000 + i))
+            #
+            # first store finds no size file (blobs walked), third and fourth store exceed maxSize (blobs and entries walked)
+            self.assertEqual(mockList.call_count, 5)
+        #
+        with open(os.path.join(cachePath, "size"), "r") as ifh:
+            self.assertEqual(int(ifh.read()), 200)
+        #
+        self.assertFalse(cacheUtil.restore("key0", [os.path.join(self.__sessionPath, "restore.cif")]))
+        self.assertFalse(cacheUtil.restore("key1", [os.path.join(self.__sessionPath, "restore.cif")]))
+        self.assertTrue(cacheUtil.restore("key3", [os.path.join(self.__sessionPath, "restore.cif")]))
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
@@ -0,0 +1,141 @@
+##
+# File: ConditionalResponseTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for ETag/Last-Modified validators and conditional GET (304) answers"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import shutil
+import email.utils
+import unittest
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils import ConditionalResponseUtil as ConditionalResponseModule
+from wwpdb.apps.entity_transform.utils.ConditionalResponseUtil import ConditionalResponseUtil, IF_MODIFIED_SINCE, IF_NONE_MATCH
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+
+class RequestReplace(object):
+    """ Minimal request object (values dictionary and request path)
+    """
+    def __init__(self, requestPath, valueD):
+        self.__requestPath = requestPath
+        self.__valueD = valueD
+
+    def getRequestPath(self):
+        return self.__requestPath
+
+    def getDictionary(self):
+        return self.__valueD
+
+    def getValue(self, key):
+        return self.__valueD.get(key, "")
+
+    def setValue(self, key, value):
+        self.__valueD[key] = value
+
+
+class ConditionalResponseTests(unittest.TestCase):
+    def setUp(self):
+        self.__sessionPath = os.path.join(TESTOUTPUT, "conditional-response")
+        if os.access(self.__sessionPath, os.F_OK):
+            shutil.rmtree(self.__sessionPath)
+        #
+        os.makedirs(self.__sessionPath)
+        self.__summaryFile = os.path.join(self.__sessionPath, "D_000000_summary.cif")
+        with open(self.__summaryFile, "w") as ofh:
+            ofh.write("data_summary\n")
+        #
+        os.utime(self.__summaryFile, (1700000000, 1700000000))
+
+    def __getRequest(self, **kwargs):
+        valueD = {"sessionid": "abc", "TemplatePath": self.__sessionPath, "return_format": "html"}
+        valueD.update(kwargs)
+        return RequestReplace("/service/entity/summary_data", valueD)
+
+    def testNotModifiedRoundTrip(self):
+        """ETag sent with the page answers the next conditional request with 304"""
+        reqObj = self.__getRequest()
+        cacheUtil = ConditionalResponseUtil(reqObj=reqObj)
+        validators = cacheUtil.getValidators([self.__summaryFile])
+        self.assertFalse(cacheUtil.isNotModified(validators))
+        # operation handler changes request values after the validators were computed
+        reqObj.setValue("return_format", "json")
+        reqObj.setValue("semaphore", "chopper_prebuild_1")
+        headerD = dict(cacheUtil.getHeaders(validators))
+        self.assertEqual(headerD["ETag"], validators[0])
+        #
+        reqObj = self.__getRequest(**{IF_NONE_MATCH: headerD["ETag"]})
+        cacheUtil = ConditionalResponseUtil(reqObj=reqObj)
+        self.assertTrue(cacheUtil.isNotModified(cacheUtil.getValidators([self.__summaryFile])))
+        #
+        reqObj = self.__getRequest(**{IF_MODIFIED_SINCE: headerD["Last-Modified"]})
+        cacheUtil = ConditionalResponseUtil(reqObj=reqObj)
+        self.assertTrue(cacheUtil.isNotModified(cacheUtil.getValidators([self.__summaryFile])))
+
+    def testModified(self):
+        """Changed input file or request parameter invalidates the ETag"""
+        etag = ConditionalResponseUtil(reqObj=self.__getRequest()).getValidators([self.__summaryFile])[0]
+        #
+        reqObj = self.__getRequest(instanceid="PRD_000001", **{IF_NONE_MATCH: etag})
+        cacheUtil = ConditionalResponseUtil(reqObj=reqObj)
+        self.assertFalse(cacheUtil.isNotModified(cacheUtil.getValidators([self.__summaryFile])))
+        #
+        with open(self.__summaryFile, "a") as ofh:
+            ofh.write("_entry.id D_000000\n")
+        #
+        reqObj = self.__getRequest(**{IF_NONE_MATCH: etag, IF_MODIFIED_SINCE: email.utils.formatdate(1700000000, usegmt=True)})
+        cacheUtil = ConditionalResponseUtil(reqObj=reqObj)
+        self.assertFalse(cacheUtil.isNotModified(cacheUtil.getValidators([self.__summaryFile])))
+
+    def testMissingFiles(self):
+        """No validators (and no response headers) if none of the files exists"""
+        cacheUtil = ConditionalResponseUtil(reqObj=self.__getRequest(**{IF_NONE_MATCH: "*"}))
+        validators = cacheUtil.getValidators([os.path.join(self.__sessionPath, "missing.cif")])
+        self.assertEqual(validators, (None, None))
+        self.assertFalse(cacheUtil.isNotModified(validators))
+        self.assertEqual(cacheUtil.getHeaders(validators), [])
+
+    def testDeployStamp(self):
+        """Template edited in place (directory mtime unchanged) invalidates the ETag"""
+        templatePath = os.path.join(self.__sessionPath, "templates")
+        templateFile = os.path.join(templatePath, "summary_view", "str_summary_tmplt.html")
+        os.makedirs(os.path.dirname(templateFile))
+        with open(templateFile, "w") as ofh:
+            ofh.write("<html>%(form_data)s</html>\n")
+        #
+        os.utime(templateFile, (1700000000, 1700000000))
+        etagList = []
+        for _i in range(2):
+            ConditionalResponseModule._deployStampD.clear()  # pylint: disable=protected-access
+            dirTime = os.stat(os.path.dirname(templateFile)).st_mtime
+            etagList.append(ConditionalResponseUtil(reqObj=self.__getRequest(TemplatePath=templatePath)).getValidators([self.__summaryFile])[0])
+            with open(templateFile, "w") as ofh:
+                ofh.write("<html><body>%(form_data)s</body></html>\n")
+            #
+            os.utime(templateFile, (1700000100, 1700000100))
+            self.assertEqual(os.stat(os.path.dirname(templateFile)).st_mtime, dirTime)
+        #
+        self.assertNotEqual(etagList[0], etagList[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
@@ -0,0 +1,114 @@
+##
+# File: DictEnumTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the process-wide cache of PRD form enumerations"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import io
+import shutil
+import unittest
+import logging
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.prd import DictEnumUtil as DictEnumModule
+from wwpdb.apps.entity_transform.prd.DictEnumUtil import DictEnumUtil, PRD_ENUM_ITEM_LIST
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+DIC_DATA = """data_test.dic
+save__pdbx_reference_molecule.class
+loop_
+_item_enumeration.value
+Inhibitor
+Antibiotic
+save_
+"""
+
+
+class RequestReplace(object):
+    def __init__(self, topSessionPath):
+        self.__topSessionPath = topSessionPath
+
+    def getValue(self, key):
+        if key == "TopSessionPath":
+            return self.__topSessionPath
+        #
+        return ""
+
+
+class DictEnumTests(unittest.TestCase):
+    def setUp(self):
+        self.__testPath = os.path.join(TESTOUTPUT, "dict-enum")
+        if os.access(self.__testPath, os.F_OK):
+            shutil.rmtree(self.__testPath)
+        #
+        os.makedirs(self.__testPath)
+        self.__dictPath = os.path.join(self.__testPath, "test.odb")
+        with open(self.__dictPath, "w") as ofh:
+            ofh.write("serialized\n")
+        #
+        with open(os.path.join(self.__testPath, "test.dic"), "w") as ofh:
+            ofh.write(DIC_DATA)
+        #
+        DictEnumModule._enumIndexD.clear()  # pylint: disable=protected-access
+
+    def __getEnumUtil(self):
+        return DictEnumUtil(reqObj=RequestReplace(self.__testPath), dictPath=self.__dictPath, sessionPath=self.__testPath, log=io.StringIO())
+
+    def __getIndexFileList(self):
+        cachePath = os.path.join(self.__testPath, "entity_transform_cache")
+        if not os.access(cachePath, os.F_OK):
+            return []
+        #
+        return os.listdir(cachePath)
+
+    def testIncompleteIndexNotCached(self):
+        """Enumerations from failed GetEnumValue runs are neither kept in memory nor written to the index file"""
+        with patch.object(DictEnumUtil, "_DictEnumUtil__runGetEnumValue", return_value=[]) as mockRun:
+            self.assertEqual(self.__getEnumUtil().getEnumList("_pdbx_reference_molecule.class"), ["", "Antibiotic", "Inhibitor"])
+            self.assertEqual(self.__getEnumUtil().getEnumList("_pdbx_reference_molecule.type"), [])
+            self.assertEqual(mockRun.call_count, 2 * (len(PRD_ENUM_ITEM_LIST) - 1))
+        #
+        self.assertEqual(DictEnumModule._enumIndexD, {})  # pylint: disable=protected-access
+        self.assertEqual(self.__getIndexFileList(), [])
+
+    def testCompleteIndexCached(self):
+        """Complete enumeration index is built once, kept in memory and written to the index file"""
+        with patch.object(DictEnumUtil, "_DictEnumUtil__runGetEnumValue", return_value=["", "A", "B"]) as mockRun:
+            self.assertEqual(self.__getEnumUtil().getEnumList("_pdbx_reference_molecule.type"), ["", "A", "B"])
+            self.assertEqual(self.__getEnumUtil().getEnumList("_pdbx_prd_audit.action_type"), ["", "A", "B"])
+            self.assertEqual(mockRun.call_count, len(PRD_ENUM_ITEM_LIST) - 1)
+        #
+        self.assertEqual(len(self.__getIndexFileList()), 1)
+        # index file is used by new process
+        DictEnumModule._enumIndexD.clear()  # pylint: disable=protected-access
+        with patch.object(DictEnumUtil, "_DictEnumUtil__runGetEnumValue", return_value=[]) as mockRun:
+            self.assertEqual(self.__getEnumUtil().getEnumList("_pdbx_reference_molecule.class"), ["", "Antibiotic", "Inhibitor"])
+            self.assertEqual(mockRun.call_count, 0)
+        #
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
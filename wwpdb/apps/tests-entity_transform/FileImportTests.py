@@ -0,0 +1,112 @@
+##
+# File: FileImportTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for importing files into the session directory"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import io
+import hashlib
+import shutil
+import unittest
+import logging
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.FileImportUtil import FileImportUtil
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+
+class FileImportTests(unittest.TestCase):
+    def setUp(self):
+        self.__testPath = os.path.join(TESTOUTPUT, "file-import")
+        if os.access(self.__testPath, os.F_OK):
+            shutil.rmtree(self.__testPath)
+        #
+        os.makedirs(os.path.join(self.__testPath, "session"))
+        self.__data = b"data_D_000000\n" + b"ATOM\n" * 300000
+        self.__srcPath = os.path.join(self.__testPath, "D_000000_model_P1.cif.V1")
+        with open(self.__srcPath, "wb") as ofh:
+            ofh.write(self.__data)
+        #
+        self.__dstPath = os.path.join(self.__testPath, "session", "D_000000_model_P1.cif")
+
+    def __read(self, filePath):
+        with open(filePath, "rb") as ifh:
+            return ifh.read()
+        #
+
+    def testVerifiedCopy(self):
+        """Copy with checksum has the source content; a copy differing from the source is removed"""
+        importUtil = FileImportUtil(log=io.StringIO())
+        with patch.object(FileImportUtil, "_FileImportUtil__reflinkFile", return_value=False):
+            self.assertTrue(importUtil.importFile(self.__srcPath, self.__dstPath, checksum=True))
+            self.assertEqual(self.__read(self.__dstPath), self.__data)
+            # copy corrupted on the way: source checksum is taken from the data read, copy differs
+            with patch.object(FileImportUtil, "_FileImportUtil__copyFile", side_effect=self.__corruptCopy):
+                self.assertFalse(importUtil.importFile(self.__srcPath, self.__dstPath, checksum=True))
+            #
+        #
+        self.assertFalse(os.access(self.__dstPath, os.F_OK))
+
+    def __corruptCopy(self, srcPath, dstPath):
+        with open(dstPath, "wb") as ofh:
+            ofh.write(self.__data[:-1])
+        #
+        return hashlib.sha256(self.__read(srcPath)).hexdigest()
+
+    def testLinksNotVerified(self):
+        """Reflinks and hard links share the source data and are not read back for checksums"""
+        importUtil = FileImportUtil()
+        with patch.object(FileImportUtil, "_FileImportUtil__reflinkFile", return_value=False):
+            with patch.object(FileImportUtil, "_FileImportUtil__getChecksum") as mockChecksum:
+                self.assertTrue(importUtil.importFile(self.__srcPath, self.__dstPath, readOnly=True, checksum=True))
+                self.assertEqual(os.stat(self.__dstPath).st_ino, os.stat(self.__srcPath).st_ino)
+                mockChecksum.assert_not_called()
+            #
+        #
+
+    def testImportFiles(self):
+        """Concurrent import of several files, existing targets are replaced"""
+        transferList = []
+        for i in range(3):
+            srcPath = os.path.join(self.__testPath, "file_%d" % i)
+            with open(srcPath, "wb") as ofh:
+                ofh.write(b"content %d\n" % i)
+            #
+            dstPath = os.path.join(self.__testPath, "session", "file_%d" % i)
+            with open(dstPath, "wb") as ofh:
+                ofh.write(b"old\n")
+            #
+            transferList.append((srcPath, dstPath, False))
+        #
+        self.assertTrue(FileImportUtil().importFiles(transferList, checksum=True))
+        for i, (_srcPath, dstPath, _readOnly) in enumerate(transferList):
+            self.assertEqual(self.__read(dstPath), b"content %d\n" % i)
+        #
+        self.assertFalse(FileImportUtil(log=io.StringIO()).importFiles(transferList + [(self.__srcPath + ".missing", self.__dstPath, False)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
@@ -0,0 +1,103 @@
+##
+# File: ImageManifestTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the image manifest of session search directories"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import io
+import shutil
+import multiprocessing
+import unittest
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.ImageManifest import MANIFEST_FILE_NAME, ImageManifest
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+
+def _build(searchPath, instId):
+    for _i in range(10):
+        ImageManifest(searchPath=searchPath).build(instIdList=[instId])
+    #
+    return instId
+
+
+class ImageManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.__searchPath = os.path.join(TESTOUTPUT, "image-manifest", "search")
+        if os.access(self.__searchPath, os.F_OK):
+            shutil.rmtree(self.__searchPath)
+        #
+        self.__instIdList = ["A_%d" % i for i in range(1, 9)]
+        for instId in self.__instIdList:
+            self.__addImage(instId, instId + ".gif")
+            self.__addImage(instId, "HEM-200.png")
+        #
+
+    def __addImage(self, instId, fileName):
+        instPath = os.path.join(self.__searchPath, instId)
+        if not os.path.isdir(instPath):
+            os.makedirs(instPath)
+        #
+        with open(os.path.join(instPath, fileName), "wb") as ofh:
+            ofh.write(b"GIF89a")
+        #
+
+    def testBuild(self):
+        """Full size and ligand images are indexed; partial build keeps entries of other instances"""
+        manifest = ImageManifest(searchPath=self.__searchPath)
+        manifestD = manifest.build()
+        self.assertEqual(sorted(manifestD["instances"].keys()), self.__instIdList)
+        self.assertEqual(manifest.getImage("A_1", "A_1")["file"], "A_1.gif")
+        self.assertEqual(manifest.getLigandImage("A_1", "HEM")["file"], "HEM-200.png")
+        self.assertIsNone(manifest.getImage("A_1", "A_2"))
+        #
+        self.__addImage("A_2", "A_2_new.png")
+        manifest = ImageManifest(searchPath=self.__searchPath)
+        manifest.build(instIdList=["A_2"])
+        manifest = ImageManifest(searchPath=self.__searchPath)
+        self.assertEqual(manifest.getImage("A_2", "A_2_new")["file"], "A_2_new.png")
+        self.assertEqual(sorted(manifest.load()["instances"].keys()), self.__instIdList)
+
+    def testConcurrentBuild(self):
+        """Concurrent builds of different instances do not drop each other's entries"""
+        pool = multiprocessing.Pool(4)
+        try:
+            pool.starmap(_build, [(self.__searchPath, instId) for instId in self.__instIdList])
+        finally:
+            pool.close()
+            pool.join()
+        #
+        manifest = ImageManifest(searchPath=self.__searchPath)
+        self.assertEqual(sorted(manifest.load(buildFlag=False)["instances"].keys()), self.__instIdList)
+
+    def testEmptyManifest(self):
+        """Empty manifest left by an interrupted writer is rebuilt"""
+        with open(os.path.join(self.__searchPath, MANIFEST_FILE_NAME), "w") as ofh:
+            ofh.write("")
+        #
+        manifest = ImageManifest(searchPath=self.__searchPath, log=io.StringIO())
+        self.assertEqual(sorted(manifest.load()["instances"].keys()), self.__instIdList)
+        self.assertEqual(sorted(ImageManifest(searchPath=self.__searchPath).load(buildFlag=False)["instances"].keys()), self.__instIdList)
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
@@ -0,0 +1,81 @@
+##
+# File: ProcessSummaryBatchTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for batch pre-computation of PRD search result images"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import shutil
+import time
+import unittest
+import logging
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.depict import ProcessSummaryBatch as ProcessSummaryBatchModule
+from wwpdb.apps.entity_transform.depict.ProcessPrdSummary import ProcessPrdSummary
+from wwpdb.apps.entity_transform.depict.ProcessSummaryBatch import ProcessSummaryBatch
+from wwpdb.apps.entity_transform.utils.ImageManifest import MANIFEST_FILE_NAME
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+
+class ProcessSummaryBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.__dirPath = os.path.join(TESTOUTPUT, "summary-batch")
+        if os.access(self.__dirPath, os.F_OK):
+            shutil.rmtree(self.__dirPath)
+        #
+        os.makedirs(os.path.join(self.__dirPath, "search"))
+        self.__summaryFile = os.path.join(self.__dirPath, "D_1000000001.summary.cif")
+        with open(self.__summaryFile, "w") as ofh:
+            ofh.write("data_D_1000000001\n")
+        #
+        # manifest left from a search run before the summary file was updated
+        self.__manifestPath = os.path.join(self.__dirPath, "search", MANIFEST_FILE_NAME)
+        with open(self.__manifestPath, "w") as ofh:
+            ofh.write('{"version": 1, "instances": {}}')
+        #
+        oldTime = time.time() - 3600
+        os.utime(self.__manifestPath, (oldTime, oldTime))
+
+    def testEntryWithoutImagesUpToDate(self):
+        """Processed entry without generated images is skipped by the next run"""
+        batch = ProcessSummaryBatch(numProc=1)
+        batch.addEntry(self.__summaryFile)
+        self.assertFalse(batch._ProcessSummaryBatch__isUpToDate(self.__summaryFile, self.__dirPath))  # pylint: disable=protected-access,no-member
+        # worker function run in this process, without back-end image generation
+        with patch.object(ProcessPrdSummary, "run"), patch.object(ProcessPrdSummary, "getImageCount", return_value=0):
+            ProcessSummaryBatchModule._initWorker({})  # pylint: disable=protected-access
+            resultD = ProcessSummaryBatchModule._processEntry((self.__summaryFile, self.__dirPath))  # pylint: disable=protected-access
+        #
+        self.assertEqual(resultD["status"], "processed")
+        self.assertEqual(resultD["images"], 0)
+        self.assertGreaterEqual(os.stat(self.__manifestPath).st_mtime, os.stat(self.__summaryFile).st_mtime)
+        reportD = batch.run()
+        self.assertEqual(reportD["skipped"], 1)
+        self.assertEqual(reportD["processed"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
@@ -0,0 +1,131 @@
+##
+# File: RemoveEmptyCategoriesTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for streaming removal of empty categories from cif files"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import shutil
+import unittest
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.RemoveEmptyCategories import ReadCif, RemoveEmptyCategories
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+CIF_TEXT = """data_PRD_000001
+#
+_pdbx_reference_molecule.prd_id    PRD_000001
+_pdbx_reference_molecule.name      'Actinomycin D'
+_pdbx_reference_molecule.formula   ?
+#
+_pdbx_reference_molecule_details.prd_id   ?
+_pdbx_reference_molecule_details.text     .
+#
+loop_
+_pdbx_reference_entity_list.prd_id
+_pdbx_reference_entity_list.ref_entity_id
+_pdbx_reference_entity_list.type
+? . ?
+? ? .
+#
+loop_
+_pdbx_reference_entity_poly_seq.prd_id
+_pdbx_reference_entity_poly_seq.num
+_pdbx_reference_entity_poly_seq.mon_id
+PRD_000001 1 THR
+PRD_000001 2 DVA
+#
+_pdbx_prd_audit.prd_id        ?
+_pdbx_prd_audit.details
+;
+? not empty text field
+;
+#
+_pdbx_reference_molecule_synonyms.prd_id   ?
+_pdbx_reference_molecule_synonyms.name     '? quoted'
+#
+"""
+
+
+class RemoveEmptyCategoriesTests(unittest.TestCase):
+    def setUp(self):
+        self.__testPath = os.path.join(TESTOUTPUT, "remove-empty-categories")
+        if os.access(self.__testPath, os.F_OK):
+            shutil.rmtree(self.__testPath)
+        #
+        os.makedirs(self.__testPath)
+        self.__filePath = os.path.join(self.__testPath, "PRD_000001.cif")
+        self.__write(CIF_TEXT)
+
+    def __write(self, text):
+        with open(self.__filePath, "w") as ofh:
+            ofh.write(text)
+        #
+
+    def __read(self):
+        with open(self.__filePath, "r") as ifh:
+            return ifh.read()
+        #
+
+    def testRemoveEmptyCategories(self):
+        """Categories with only '?'/'.' values are dropped, all other lines are kept unchanged"""
+        RemoveEmptyCategories(self.__filePath)
+        text = self.__read()
+        self.assertNotIn("_pdbx_reference_molecule_details.", text)
+        self.assertNotIn("_pdbx_reference_entity_list.", text)
+        for catName in ("pdbx_reference_molecule", "pdbx_reference_entity_poly_seq", "pdbx_prd_audit", "pdbx_reference_molecule_synonyms"):
+            self.assertIn("_" + catName + ".prd_id", text)
+        #
+        self.assertIn("_pdbx_reference_molecule.formula   ?\n", text)
+        self.assertIn("? not empty text field\n", text)
+        #
+        block = ReadCif(self.__filePath)
+        self.assertEqual(sorted(block.getObjNameList()), ["pdbx_prd_audit", "pdbx_reference_entity_poly_seq", "pdbx_reference_molecule",
+                                                          "pdbx_reference_molecule_synonyms"])
+        self.assertEqual(block.getObj("pdbx_reference_entity_poly_seq").getRowCount(), 2)
+        self.assertEqual(block.getObj("pdbx_reference_molecule").getValue("name", 0), "Actinomycin D")
+
+    def testCleanFileUnchanged(self):
+        """File without empty categories is not rewritten; a cleaned file is skipped until it changes"""
+        RemoveEmptyCategories(self.__filePath)
+        cleanText = self.__read()
+        inode = os.stat(self.__filePath).st_ino
+        RemoveEmptyCategories(self.__filePath)
+        self.assertEqual(os.stat(self.__filePath).st_ino, inode)
+        # without "already clean" marker the file is read again but not rewritten
+        os.remove(os.path.join(self.__testPath, ".PRD_000001.cif.clean"))
+        RemoveEmptyCategories(self.__filePath)
+        self.assertEqual(self.__read(), cleanText)
+        self.assertEqual(os.stat(self.__filePath).st_ino, inode)
+        self.assertEqual([fileName for fileName in os.listdir(self.__testPath) if fileName.startswith(".rmcat_")], [])
+        # changed file is cleaned again
+        self.__write(CIF_TEXT + "_pdbx_reference_molecule_family.family_prd_id ?\n")
+        RemoveEmptyCategories(self.__filePath)
+        self.assertEqual(self.__read(), cleanText)
+
+    def testMissingFile(self):
+        """Missing file is ignored"""
+        RemoveEmptyCategories(os.path.join(self.__testPath, "missing.cif"))
+        self.assertFalse(os.access(os.path.join(self.__testPath, "missing.cif"), os.F_OK))
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
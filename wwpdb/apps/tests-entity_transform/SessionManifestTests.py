@@ -0,0 +1,122 @@
+##
+# File: SessionManifestTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the session directory file manifest"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import io
+import shutil
+import multiprocessing
+import unittest
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.SessionManifest import MANIFEST_FILE_NAME, SessionManifest
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+
+def _getCounters(dirPath, number):
+    manifest = SessionManifest(dirPath=dirPath)
+    return [manifest.nextCounter("prd_summary") for _i in range(number)]
+
+
+class SessionManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.__sessionPath = os.path.join(TESTOUTPUT, "session-manifest")
+        if os.access(self.__sessionPath, os.F_OK):
+            shutil.rmtree(self.__sessionPath)
+        #
+        os.makedirs(self.__sessionPath)
+
+    def __touch(self, name):
+        with open(os.path.join(self.__sessionPath, name), "w") as ofh:
+            ofh.write("\n")
+        #
+
+    def testAddRemove(self):
+        """Recorded files are listed by prefix, suffix and type; removed files are dropped"""
+        manifest = SessionManifest(dirPath=self.__sessionPath)
+        manifest.addFile("PRD_000001.cif", fileType="prd")
+        manifest.addFile("PRD_000002.cif", fileType="prd")
+        manifest.addFile("PRD_000001.log")
+        manifest.addFile("search")
+        self.assertEqual(manifest.getFileList(prefix="PRD_"), ["PRD_000001.cif", "PRD_000001.log", "PRD_000002.cif"])
+        self.assertEqual(manifest.getFileList(suffix=".cif"), ["PRD_000001.cif", "PRD_000002.cif"])
+        self.assertEqual(manifest.getFileList(fileType="prd"), ["PRD_000001.cif", "PRD_000002.cif"])
+        manifest.removeFile("PRD_000001.cif")
+        manifest.removeFile("not_recorded.cif")
+        self.assertEqual(SessionManifest(dirPath=self.__sessionPath).getFileList(suffix=".cif"), ["PRD_000002.cif"])
+
+    def testInitialIndex(self):
+        """Directory without manifest is indexed once; without createFlag no manifest is created"""
+        self.__touch("PRD_000001.cif")
+        self.__touch("summary_3.html")
+        os.makedirs(os.path.join(self.__sessionPath, "search"))
+        manifest = SessionManifest(dirPath=self.__sessionPath, createFlag=False)
+        self.assertIsNone(manifest.getFileList())
+        self.assertIsNone(manifest.nextCounter("summary"))
+        self.assertFalse(manifest.exists())
+        #
+        manifest = SessionManifest(dirPath=self.__sessionPath, log=io.StringIO())
+        self.assertEqual(manifest.getFileList(), ["PRD_000001.cif", "search", "summary_3.html"])
+        self.assertTrue(manifest.exists())
+        # files created later without addFile() are not listed
+        self.__touch("PRD_000002.cif")
+        self.assertEqual(manifest.getFileList(prefix="PRD_"), ["PRD_000001.cif"])
+        self.assertNotIn(MANIFEST_FILE_NAME, manifest.getFileList())
+
+    def testCounter(self):
+        """New counter starts after the largest recorded name_N, then increases by one"""
+        self.__touch("summary_3.html")
+        self.__touch("summary_12")
+        self.__touch("summary_x.html")
+        manifest = SessionManifest(dirPath=self.__sessionPath)
+        self.assertEqual(manifest.nextCounter("summary"), 13)
+        self.assertEqual(manifest.nextCounter("summary"), 14)
+        self.assertEqual(manifest.nextCounter("other"), 1)
+        self.assertEqual(SessionManifest(dirPath=self.__sessionPath).nextCounter("summary"), 15)
+
+    def testConcurrentCounter(self):
+        """Counters handed out by concurrent processes are unique"""
+        SessionManifest(dirPath=self.__sessionPath).addFile("start")
+        pool = multiprocessing.Pool(4)
+        try:
+            resultList = pool.starmap(_getCounters, [(self.__sessionPath, 25)] * 4)
+        finally:
+            pool.close()
+            pool.join()
+        #
+        valueList = sorted([value for result in resultList for value in result])
+        self.assertEqual(valueList, list(range(1, 101)))
+
+    def testPartialLine(self):
+        """Partial record left by an interrupted writer is ignored"""
+        manifest = SessionManifest(dirPath=self.__sessionPath)
+        manifest.addFile("PRD_000001.cif")
+        with open(os.path.join(self.__sessionPath, MANIFEST_FILE_NAME), "a") as ofh:
+            ofh.write('{"op": "add", "na\n')
+        #
+        manifest.addFile("PRD_000002.cif")
+        self.assertEqual(manifest.getFileList(prefix="PRD_"), ["PRD_000001.cif", "PRD_000002.cif"])
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
@@ -0,0 +1,149 @@
+##
+# File: SnapshotJournalTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for model file snapshot journal"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import shutil
+import unittest
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.SnapshotJournal import SnapshotJournal
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+
+class SnapshotJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.__sessionPath = os.path.join(TESTOUTPUT, "snapshot-journal")
+        if os.access(self.__sessionPath, os.F_OK):
+            shutil.rmtree(self.__sessionPath)
+        #
+        os.makedirs(self.__sessionPath)
+        self.__fileName = "D_000000_model_P1.cif"
+        self.__filePath = os.path.join(self.__sessionPath, self.__fileName)
+        self.__write(self.__filePath, "v0")
+
+    def __write(self, filePath, text):
+        with open(filePath, "w") as ofh:
+            ofh.write(text + "\n")
+        #
+
+    def __read(self):
+        with open(self.__filePath, "r") as ifh:
+            return ifh.read().strip()
+        #
+
+    def __edit(self, journal, text):
+        """Edit as run by update programs: read file in place, write output file"""
+        step = journal.capture("edit " + text)
+        self.assertIsNotNone(step)
+        try:
+            self.assertTrue(os.access(self.__filePath, os.F_OK))
+            if text:
+                self.__write(os.path.join(self.__sessionPath, journal.getOutputFile(step)), text)
+            #
+        finally:
+            journal.finish(step)
+        #
+        return step
+
+    def testCaptureKeepsFile(self):
+        """Model file stays in place during the edit and snapshots keep the captured content"""
+        journal = SnapshotJournal(sessionPath=self.__sessionPath, fileName=self.__fileName)
+        for i in range(1, 4):
+            self.__edit(journal, "v%d" % i)
+        #
+        self.assertEqual(self.__read(), "v3")
+        self.assertEqual([stepD["step"] for stepD in journal.getStepList()], [1, 2, 3])
+
+    def testFailedEditDropsStep(self):
+        """Edit without output leaves the file unchanged and drops its step"""
+        journal = SnapshotJournal(sessionPath=self.__sessionPath, fileName=self.__fileName)
+        self.__edit(journal, "v1")
+        self.__edit(journal, "")
+        self.assertEqual(self.__read(), "v1")
+        self.assertEqual(len(journal.getStepList()), 1)
+
+    def testExceptionInEditKeepsFile(self):
+        """finish() in finally block keeps the file when the edit raises"""
+        journal = SnapshotJournal(sessionPath=self.__sessionPath, fileName=self.__fileName)
+        step = journal.capture("edit")
+        try:
+            raise RuntimeError("program killed")
+        except RuntimeError:
+            pass
+        finally:
+            journal.finish(step)
+        #
+        self.assertEqual(self.__read(), "v0")
+        self.assertEqual(journal.getStepList(), [])
+
+    def testRollback(self):
+        """Rollback restores prior states, is itself undoable and does not share the inode with the snapshot"""
+        journal = SnapshotJournal(sessionPath=self.__sessionPath, fileName=self.__fileName)
+        for i in range(1, 4):
+            self.__edit(journal, "v%d" % i)
+        #
+        self.assertEqual(journal.rollback(2), "")
+        self.assertEqual(self.__read(), "v1")
+        self.assertEqual(os.stat(self.__filePath).st_nlink, 1)
+        # in place write to the restored file must not change the snapshot
+        self.__write(self.__filePath, "changed in place")
+        self.assertEqual(journal.rollback(2), "")
+        self.assertEqual(self.__read(), "v1")
+        # undo the first rollback
+        self.assertEqual(journal.rollback(4), "")
+        self.assertEqual(self.__read(), "v3")
+        self.assertNotEqual(journal.rollback(99), "")
+
+    def testCompressedRollback(self):
+        """capture() does not compress; compress() gzips older snapshots, which can still be restored"""
+        journal = SnapshotJournal(sessionPath=self.__sessionPath, fileName=self.__fileName, maxFullSnapshots=2)
+        for i in range(1, 6):
+            self.__edit(journal, "v%d" % i)
+        #
+        self.assertEqual([stepD["compressed"] for stepD in journal.getStepList()], [False] * 5)
+        self.assertEqual(journal.compress(), 3)
+        self.assertEqual(journal.compress(), 0)
+        stepList = journal.getStepList()
+        self.assertEqual([stepD["compressed"] for stepD in stepList], [True, True, True, False, False])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.__sessionPath, "snapshots"))),
+                         sorted([stepD["snapshot"] for stepD in stepList] + [self.__fileName + ".journal"]))
+        self.assertEqual(journal.rollback(1), "")
+        self.assertEqual(self.__read(), "v0")
+
+    def testBoundedHistory(self):
+        """Only the maxSnapshots most recent steps are kept"""
+        journal = SnapshotJournal(sessionPath=self.__sessionPath, fileName=self.__fileName, maxSnapshots=3)
+        for i in range(1, 6):
+            self.__edit(journal, "v%d" % i)
+        #
+        stepList = journal.getStepList()
+        self.assertEqual([stepD["step"] for stepD in stepList], [3, 4, 5])
+        self.assertEqual(len(os.listdir(os.path.join(self.__sessionPath, "snapshots"))), 4)
+        self.assertNotEqual(journal.rollback(1), "")
+        self.assertEqual(journal.rollback(3), "")
+        self.assertEqual(self.__read(), "v2")
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
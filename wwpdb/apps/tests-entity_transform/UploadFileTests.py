@@ -0,0 +1,180 @@
+##
+# File: UploadFileTests.py
+# Date:  19-Oct-2026
+#
+# Updates:
+##
+"""Test cases for chunked upload decompression and streaming header scan"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import os
+import bz2
+import gzip
+import hashlib
+import io
+import shutil
+import zlib
+import unittest
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.CifHeaderScanner import CifHeaderScanner
+from wwpdb.apps.entity_transform.utils.UploadFileUtil import UploadFileUtil
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger()
+
+CIF_HEADER = """data_D_1000000001
+#
+loop_
+_database_2.database_id
+_database_2.database_code
+PDB  1ABC
+WWPDB D_1000000001
+#
+_struct.entry_id   D_1000000001
+_struct.title
+;Crystal structure of
+ actinomycin D
+;
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+"""
+
+
+def _getCifData():
+    lines = [CIF_HEADER]
+    for i in range(1, 3001):
+        lines.append("ATOM %d CA\n" % i)
+    #
+    return "".join(lines).encode("utf-8")
+
+
+class UploadFileTests(unittest.TestCase):
+    def setUp(self):
+        self.__testPath = os.path.join(TESTOUTPUT, "upload-file")
+        if os.access(self.__testPath, os.F_OK):
+            shutil.rmtree(self.__testPath)
+        #
+        os.makedirs(self.__testPath)
+        self.__outputPath = os.path.join(self.__testPath, "upload.cif")
+        self.__data = _getCifData()
+
+    def __upload(self, data, blockSize=1000, compression=None, ensureNewline=False):
+        uploadUtil = UploadFileUtil(blockSize=blockSize)
+        if compression:
+            uploadUtil.setCompression(compression)
+        #
+        uploadUtil.write(io.BytesIO(data), self.__outputPath, ensureNewline=ensureNewline)
+        with open(self.__outputPath, "rb") as ifh:
+            return uploadUtil, ifh.read()
+        #
+
+    def __checkHeader(self, scanner):
+        self.assertEqual(scanner.GetValue("database_2"), [{"database_id": "PDB", "database_code": "1ABC"},
+                                                          {"database_id": "WWPDB", "database_code": "D_1000000001"}])
+        self.assertEqual(scanner.GetSingleValue("struct", "entry_id"), "D_1000000001")
+        self.assertIn("actinomycin D", scanner.GetSingleValue("struct", "title"))
+
+    def testDecompression(self):
+        """gzip, bzip2 and deflate uploads are detected and decompressed in blocks"""
+        deflateObj = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        rawData = deflateObj.compress(self.__data) + deflateObj.flush()
+        for compression, data, hint in (("", self.__data, None), ("gzip", gzip.compress(self.__data), None),
+                                        ("bzip2", bz2.compress(self.__data), None), ("deflate", zlib.compress(self.__data), None),
+                                        ("deflate-raw", rawData, "deflate-raw")):
+            uploadUtil, written = self.__upload(data, compression=hint)
+            self.assertEqual(uploadUtil.getCompression(), compression)
+            self.assertEqual(written, self.__data)
+            self.assertEqual(uploadUtil.getChecksum(), hashlib.sha256(self.__data).hexdigest())
+            self.__checkHeader(uploadUtil.getHeaderScanner())
+        #
+
+    def testConcatenatedStreams(self):
+        """Concatenated gzip/bzip2 members are decompressed as one file"""
+        half = len(self.__data) // 2
+        for func in (gzip.compress, bz2.compress):
+            _uploadUtil, written = self.__upload(func(self.__data[:half]) + func(self.__data[half:]), blockSize=97)
+            self.assertEqual(written, self.__data)
+        #
+
+    def testTruncatedStreams(self):
+        """Truncated gzip/bzip2/deflate uploads raise EOFError and leave no partial output file"""
+        for func in (gzip.compress, bz2.compress, zlib.compress):
+            data = func(self.__data)
+            with self.assertRaises(EOFError):
+                self.__upload(data[:len(data) // 2])
+            #
+            self.assertFalse(os.access(self.__outputPath, os.F_OK))
+        #
+        # truncated second member of concatenated streams
+        data = gzip.compress(self.__data) + gzip.compress(self.__data)
+        with self.assertRaises(EOFError):
+            self.__upload(data[:-10])
+        #
+        self.assertFalse(os.access(self.__outputPath, os.F_OK))
+
+    def testForcedPlainAndNewline(self):
+        """Compression 'none' keeps compressed looking data unchanged; ensureNewline adds missing final newline"""
+        data = b"\x1f\x8bnot gzip"
+        uploadUtil, written = self.__upload(data, compression="none", ensureNewline=True)
+        self.assertEqual(uploadUtil.getCompression(), "")
+        self.assertEqual(written, data + b"\n")
+        _uploadUtil, written = self.__upload(self.__data, ensureNewline=True)
+        self.assertEqual(written, self.__data)
+
+    def testUnknownCompression(self):
+        """Unknown compression name is rejected and the compression is still detected from the data"""
+        uploadUtil = UploadFileUtil(log=io.StringIO())
+        self.assertFalse(uploadUtil.setCompression("zip"))
+        self.assertTrue(uploadUtil.setCompression(" GZIP "))
+        uploadUtil = UploadFileUtil(log=io.StringIO())
+        uploadUtil.setCompression("lzma")
+        uploadUtil.write(io.BytesIO(gzip.compress(self.__data)), self.__outputPath)
+        self.assertEqual(uploadUtil.getCompression(), "gzip")
+
+    def testHeaderScanStopsAtAtomSite(self):
+        """Header scan of file on disk finds header values and stops at atom_site"""
+        with open(self.__outputPath, "wb") as ofh:
+            ofh.write(self.__data)
+        #
+        scanner = CifHeaderScanner()
+        scanner.scanFile(self.__outputPath, blockSize=64)
+        self.assertTrue(scanner.isDone())
+        self.__checkHeader(scanner)
+        self.assertEqual(scanner.GetValue("atom_site"), [])
+
+    def testHeaderAfterAtomSite(self):
+        """Header categories written after atom_site are found by scanning the rest of the file"""
+        idx = self.__data.index(b"loop_\n_atom_site")
+        headerIdx = self.__data.index(b"loop_\n_database_2")
+        data = self.__data[:headerIdx] + self.__data[idx:] + b"#\n;text ATOM\n_struct.title\n;\n#\n" + self.__data[headerIdx:idx]
+        with open(self.__outputPath, "wb") as ofh:
+            ofh.write(data)
+        #
+        scanner = CifHeaderScanner()
+        scanner.scanFile(self.__outputPath, blockSize=64)
+        self.__checkHeader(scanner)
+        # streamed upload
+        uploadUtil, written = self.__upload(gzip.compress(data))
+        self.assertEqual(written, data)
+        self.__checkHeader(uploadUtil.getHeaderScanner())
+
+
+if __name__ == "__main__":
+    unittest.main()
+    #
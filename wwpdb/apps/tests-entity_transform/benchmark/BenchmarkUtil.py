@@ -0,0 +1,85 @@
+##
+# File:  BenchmarkUtil.py
+# Date:  19-Oct-2026
+# Updates:
+##
+"""
+Helpers shared by entity transform benchmarks.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import re
+
+import wwpdb.apps.entity_transform as entityTransformPackage
+
+
+def writeStubTemplates(templatePath):
+    """ Write an empty template for every 'xxx/yyy.html' name referenced in the entity_transform package, so pages can
+        be rendered without the UI template tree. Returns number of templates written.
+    """
+    topPath = os.path.dirname(os.path.abspath(entityTransformPackage.__file__))
+    pattern = re.compile(r"['\"]([\w/]+\.html)['\"]")
+    nameD = {}
+    for dirPath, _dirNames, fileNames in os.walk(topPath):
+        for fileName in fileNames:
+            if not fileName.endswith('.py'):
+                continue
+            #
+            with open(os.path.join(dirPath, fileName), 'r') as ifh:
+                for name in pattern.findall(ifh.read()):
+                    nameD[name] = 'yes'
+                #
+            #
+        #
+    #
+    for name in sorted(nameD.keys()):
+        filePath = os.path.join(templatePath, name)
+        if not os.access(os.path.dirname(filePath), os.F_OK):
+            os.makedirs(os.path.dirname(filePath))
+        #
+        with open(filePath, 'w') as ofh:
+            ofh.write('<div></div>\n')
+        #
+    #
+    return len(nameD)
+
+
+def getPercentile(sortedList, percent):
+    """ Nearest-rank percentile of sorted list
+    """
+    if not sortedList:
+        return 0.0
+    #
+    rank = int(round(percent / 100.0 * len(sortedList) + 0.5)) - 1
+    return sortedList[max(0, min(rank, len(sortedList) - 1))]
+
+
+def getTimingSummary(timeList):
+    """ Return min/median/p90/p99/mean/max (milliseconds, rounded to microseconds) of list of times in milliseconds
+    """
+    timeList = sorted(timeList)
+    count = len(timeList)
+    if count == 0:
+        return {}
+    #
+    if count % 2:
+        median = timeList[count // 2]
+    else:
+        median = (timeList[count // 2 - 1] + timeList[count // 2]) / 2.0
+    #
+    return {'min_ms': round(timeList[0], 3), 'median_ms': round(median, 3), 'p90_ms': round(getPercentile(timeList, 90), 3),
+            'p99_ms': round(getPercentile(timeList, 99), 3), 'mean_ms': round(sum(timeList) / count, 3), 'max_ms': round(timeList[-1], 3)}
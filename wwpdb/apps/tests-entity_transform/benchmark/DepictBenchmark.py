@@ -0,0 +1,274 @@
+##
+# File:  DepictBenchmark.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   components which raised are reported under "failures" (exit status 1) and count as regressions
+##
+"""
+Timing of summary cif parsing and HTML depiction on synthetic entries of several sizes.
+
+Usage:
+    python DepictBenchmark.py [-s small,medium,large] [-r repeat] [-o result.json] [-t template_path] [-w work_path]
+                              [-b baseline.json] [--tolerance 1.25]
+
+Results are written as JSON. Components which raised an exception are listed under "failures" and the script exits
+with status 1. With a baseline file, every component whose median time exceeds the baseline median by more than the
+tolerance factor, or which failed although it has a baseline time, is listed under "regressions" (status 1).
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import getopt
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+import traceback
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from BenchmarkUtil import getTimingSummary, writeStubTemplates  # pylint: disable=import-error
+    from SyntheticPrdSummary import SyntheticPrdSummary, getSizeNames, getSizeParameters  # pylint: disable=import-error
+else:
+    from .BenchmarkUtil import getTimingSummary, writeStubTemplates  # pylint: disable=relative-beyond-top-level
+    from .SyntheticPrdSummary import SyntheticPrdSummary, getSizeNames, getSizeParameters  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.depict.PrdSummaryDepict import PrdSummaryDepict
+from wwpdb.apps.entity_transform.depict.ProcessPrdSummary import ProcessPrdSummary
+from wwpdb.apps.entity_transform.depict.ResultDepict import ResultDepict
+from wwpdb.apps.entity_transform.depict.SeqDepict import SeqDepict
+from wwpdb.apps.entity_transform.depict.StrSummaryDepict import StrSummaryDepict
+from wwpdb.apps.entity_transform.utils.LinkUtil import LinkUtil
+from wwpdb.apps.entity_transform.utils.SummaryCifUtil import SummaryCifUtil
+from wwpdb.utils.config.ConfigInfo import getSiteId
+from wwpdb.utils.session.WebRequest import InputRequest
+
+
+class DepictBenchmark(object):
+    """ Class responsible for timing depiction components on generated prd-summary files.
+
+        When no template path is given, stub templates (without substitution placeholders) are written for every
+        template referenced by the entity_transform package, so only the Python side of page generation is measured.
+    """
+    def __init__(self, workPath=None, templatePath=None, repeat=5, verbose=False, log=sys.stderr):
+        self.__workPath = workPath
+        self.__templatePath = templatePath
+        self.__repeat = max(1, repeat)
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__devNull = open(os.devnull, 'w')
+        self.__stubFlag = False
+        #
+        if not self.__templatePath:
+            self.__stubFlag = True
+            self.__templatePath = os.path.join(self.__workPath, 'templates')
+            writeStubTemplates(self.__templatePath)
+        #
+        self.__reqObj = InputRequest({}, verbose=False, log=self.__devNull)
+        self.__reqObj.setValue('TopSessionPath', os.path.join(self.__workPath, 'sessions'))
+        self.__reqObj.setValue('TemplatePath', self.__templatePath)
+        self.__reqObj.setValue('WWPDB_SITE_ID', getSiteId())
+        self.__reqObj.setValue('identifier', 'D_8000000001')
+        self.__reqObj.setValue('pdbid', '9XYZ')
+        self.__reqObj.newSessionObj()
+
+    def run(self, sizeList):
+        resultList = []
+        for sizeName in sizeList:
+            resultList.append(self.runSize(sizeName, getSizeParameters(sizeName)))
+        #
+        return {'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'host': platform.node(),
+                'repeat': self.__repeat, 'templates': 'stub' if self.__stubFlag else self.__templatePath,
+                'results': resultList}
+
+    def runSize(self, sizeName, parameterD):
+        generator = SyntheticPrdSummary(**parameterD)
+        summaryFile = os.path.join(self.__workPath, 'prd-summary-' + sizeName + '.cif')
+        generator.write(summaryFile)
+        entityInfo = generator.getEntityInfo()
+        #
+        cifObj = SummaryCifUtil(summaryFile=summaryFile, verbose=False, log=self.__devNull)
+
+        def _parse():
+            obj = SummaryCifUtil(summaryFile=summaryFile, verbose=False, log=self.__devNull)
+            obj.getAllInstIds()
+            obj.getMatchResults()
+
+        def _process():
+            prdUtil = ProcessPrdSummary(reqObj=self.__reqObj, summaryCifObj=cifObj, verbose=False, log=self.__devNull)
+            prdUtil.run(imageFlag=False)
+
+        def _prdSummary():
+            depict = PrdSummaryDepict(reqObj=self.__reqObj, summaryCifObj=cifObj, verbose=False, log=self.__devNull)
+            depict.DoRenderSummaryPage(imageFlag=False)
+
+        def _strSummary():
+            depict = StrSummaryDepict(reqObj=self.__reqObj, summaryCifObj=cifObj, verbose=False, log=self.__devNull)
+            depict.DoRenderSummaryPage()
+
+        def _result(method, *args):
+            def _render():
+                depict = ResultDepict(reqObj=self.__reqObj, summaryCifObj=cifObj, verbose=False, log=self.__devNull)
+                getattr(depict, method)(*args)
+            return _render
+
+        def _link():
+            LinkUtil(cifObj=cifObj, verbose=False, log=self.__devNull).getLinks()
+
+        def _seq():
+            seqObj = SeqDepict(entityInfo=entityInfo, option='split', verbose=False, log=self.__devNull)
+            seqObj.getHtmlText()
+            seqObj.getScriptText()
+        #
+        componentList = [('SummaryCifUtil', _parse), ('ProcessPrdSummary', _process), ('PrdSummaryDepict', _prdSummary),
+                         ('StrSummaryDepict', _strSummary), ('ResultDepict.DoRenderResultPage', _result('DoRenderResultPage', '')),
+                         ('ResultDepict.DoRenderUpdatePage', _result('DoRenderUpdatePage')),
+                         ('ResultDepict.DoRenderSplitPage', _result('DoRenderSplitPage')),
+                         ('ResultDepict.DoRenderMergePage', _result('DoRenderMergePage')), ('LinkUtil', _link), ('SeqDepict', _seq)]
+        #
+        timingD = {}
+        for name, func in componentList:
+            timingD[name] = self.__time(func)
+            if self.__verbose:
+                self.__lfh.write("+DepictBenchmark.runSize() - %s %s: %s\n" % (sizeName, name, timingD[name]))
+            #
+        #
+        return {'size': sizeName, 'parameters': generator.getParameters(), 'file_size': os.path.getsize(summaryFile), 'timings': timingD}
+
+    def __time(self, func):
+        """ Run func repeat times (after one warm-up call) and return timing summary in milliseconds
+        """
+        try:
+            func()
+            timeList = []
+            for _i in range(self.__repeat):
+                start = timeit.default_timer()
+                func()
+                timeList.append((timeit.default_timer() - start) * 1000.0)
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+            return {'error': traceback.format_exc().strip().split('\n')[-1]}
+        #
+        return getTimingSummary(timeList)
+
+
+def getFailures(resultD):
+    """ Return list of (size, component, error) for components which raised an exception
+    """
+    failureList = []
+    for result in resultD['results']:
+        for name, timing in sorted(result['timings'].items()):
+            if 'error' in timing:
+                failureList.append([result['size'], name, timing['error']])
+            #
+        #
+    #
+    return failureList
+
+
+def compareResults(resultD, baselineD, tolerance):
+    """ Return list of (size, component, median, baseline median) for components slower than baseline * tolerance,
+        failed components with a baseline time are listed with median None
+    """
+    baselineMap = {}
+    for result in baselineD.get('results', []):
+        for name, timing in result.get('timings', {}).items():
+            if 'median_ms' in timing:
+                baselineMap[(result['size'], name)] = timing['median_ms']
+            #
+        #
+    #
+    regressionList = []
+    for result in resultD['results']:
+        for name, timing in result['timings'].items():
+            key = (result['size'], name)
+            if key not in baselineMap:
+                continue
+            #
+            if 'median_ms' not in timing:
+                regressionList.append([result['size'], name, None, baselineMap[key]])
+            elif timing['median_ms'] > baselineMap[key] * tolerance:
+                regressionList.append([result['size'], name, timing['median_ms'], baselineMap[key]])
+            #
+        #
+    #
+    return regressionList
+
+
+if __name__ == "__main__":
+    opts, args = getopt.getopt(sys.argv[1:], "s:r:o:t:w:b:v", ["sizes=", "repeat=", "output=", "template=", "work=", "baseline=", "tolerance=", "verbose"])
+
+    sizeList = ['small', 'medium', 'large']
+    repeat = 5
+    outputFile = None
+    templatePath = None
+    workPath = None
+    baselineFile = None
+    tolerance = 1.25
+    verbose = False
+    for opt, arg in opts:
+        if opt in ("-s", "--sizes"):
+            sizeList = [size for size in arg.split(',') if size in getSizeNames()]
+        elif opt in ("-r", "--repeat"):
+            repeat = int(arg)
+        elif opt in ("-o", "--output"):
+            outputFile = arg
+        elif opt in ("-t", "--template"):
+            templatePath = arg
+        elif opt in ("-w", "--work"):
+            workPath = arg
+        elif opt in ("-b", "--baseline"):
+            baselineFile = arg
+        elif opt == "--tolerance":
+            tolerance = float(arg)
+        elif opt in ("-v", "--verbose"):
+            verbose = True
+        #
+    #
+    if not workPath:
+        workPath = tempfile.mkdtemp(prefix='depict-benchmark-')
+    #
+    benchmark = DepictBenchmark(workPath=workPath, templatePath=templatePath, repeat=repeat, verbose=verbose, log=sys.stderr)
+    resultD = benchmark.run(sizeList)
+    #
+    status = 0
+    resultD['failures'] = getFailures(resultD)
+    if resultD['failures']:
+        status = 1
+    #
+    if baselineFile:
+        with open(baselineFile, 'r') as ifh:
+            regressionList = compareResults(resultD, json.load(ifh), tolerance)
+        #
+        resultD['baseline'] = baselineFile
+        resultD['tolerance'] = tolerance
+        resultD['regressions'] = regressionList
+        if regressionList:
+            status = 1
+        #
+    #
+    text = json.dumps(resultD, indent=2, sort_keys=True)
+    if outputFile:
+        with open(outputFile, 'w') as ofh:
+            ofh.write(text + '\n')
+        #
+    else:
+        sys.stdout.write(text + '\n')
+    #
+    sys.exit(status)
@@ -0,0 +1,192 @@
+##
+# File:  FakeToolTree.py
+# Date:  19-Oct-2026
+# Updates:
+##
+"""
+Directory of fake back-end tools which write canned outputs after a configurable delay.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import json
+import os
+import stat
+import sys
+
+# Annot & CC_TOOLS binaries run by entity transform (CommandUtil, DownloadFile) and common RcsbDpUtility binaries
+ANNOT_TOOL_LIST = ['GenMappingFile', 'GenPrdCCEntry', 'GenPrdEntry', 'GetCombineCoord', 'GetEnumValue', 'MatchInstanceWithTemplate',
+                   'MergeCompWithPrd', 'SearchAllInstances', 'UpdateEntry', 'UpdatePrdCcName', 'PrdSearch', 'CifCheck']
+CC_TOOL_LIST = ['annotateComp', 'makeCompReport', 'updateComponent']
+
+# options followed by a file the tool is expected to write
+OUTPUT_OPTION_LIST = ['-o', '-output', '-out', '-log', '-summary', '-mapping', '-firstmodel', '-logfile']
+
+_FAKE_TOOL_SCRIPT = '''#!/bin/sh
+# fake back-end tool (shell keeps start-up cost out of the measured Python side overhead)
+start=$(date +%%s.%%N)
+tool=$(basename "$0")
+. %(config)s
+eval "delay=\\${DELAY_${tool}:-${DELAY}}"
+sleep "${delay}"
+prev=""
+for arg in "$@"; do
+    case " ${OUTPUTS} " in
+        *" ${prev} "*)
+            ext=".${arg##*.}"
+            canned=""
+            for name in "${tool}${prev}" "${tool}${ext}" "default${ext}"; do
+                if [ -f "${CANNED}/${name}" ]; then
+                    canned="${CANNED}/${name}"
+                    break
+                fi
+            done
+            if [ -n "${canned}" ] && [ "${prev}" != "-log" ] && [ "${prev}" != "-logfile" ]; then
+                cp "${canned}" "${arg}" 2>/dev/null
+            else
+                : > "${arg}" 2>/dev/null
+            fi
+            ;;
+    esac
+    prev="${arg}"
+done
+# single short append is atomic with O_APPEND
+echo "{\\"tool\\": \\"${tool}\\", \\"start\\": ${start}, \\"end\\": $(date +%%s.%%N), \\"pid\\": $$}" >> "${CALLS}"
+'''
+
+
+class FakeToolTree(object):
+    """ Class responsible for laying out a fake site tool tree:
+
+            <topPath>/annotation/bin/<tool>   Annot tools (RCSBROOT)
+            <topPath>/cc-tools/bin/<tool>     CC_TOOLS
+            <topPath>/packages/dict/bin/      dictionary tools
+            <topPath>/canned/                 canned outputs: <tool><option>, <tool><ext> or default<ext>
+            <topPath>/tool-calls.jsonl        one {"tool", "start", "end", "pid"} record per tool run
+
+        Every tool is a link to a single script which sleeps (per-tool delay or default delay), writes the files named
+        after the options in OUTPUT_OPTION_LIST and records the call.
+    """
+    def __init__(self, topPath=None, delay=0.5, toolDelayD=None, extraToolList=None, verbose=False, log=sys.stderr):
+        self.__topPath = os.path.abspath(topPath)
+        self.__delay = delay
+        self.__toolDelayD = toolDelayD or {}
+        self.__extraToolList = extraToolList or []
+        self.__verbose = verbose
+        self.__lfh = log
+        #
+        self.__annotPath = os.path.join(self.__topPath, 'annotation')
+        self.__ccPath = os.path.join(self.__topPath, 'cc-tools')
+        self.__packagesPath = os.path.join(self.__topPath, 'packages')
+        self.__cannedPath = os.path.join(self.__topPath, 'canned')
+        self.__callsPath = os.path.join(self.__topPath, 'tool-calls.jsonl')
+
+    def build(self):
+        for dirPath in (os.path.join(self.__annotPath, 'bin'), os.path.join(self.__ccPath, 'bin'), os.path.join(self.__packagesPath, 'dict', 'bin'),
+                        os.path.join(self.__packagesPath, 'pdb2glycan', 'bin'), self.__cannedPath):
+            if not os.access(dirPath, os.F_OK):
+                os.makedirs(dirPath)
+            #
+        #
+        configPath = os.path.join(self.__topPath, 'fake-tool.conf')
+        with open(configPath, 'w') as ofh:
+            ofh.write("DELAY=%s\n" % self.__delay)
+            for tool, delay in self.__toolDelayD.items():
+                ofh.write("DELAY_%s=%s\n" % (tool, delay))
+            #
+            ofh.write("OUTPUTS='%s'\nCANNED='%s'\nCALLS='%s'\n" % (' '.join(OUTPUT_OPTION_LIST), self.__cannedPath, self.__callsPath))
+        #
+        scriptPath = os.path.join(self.__topPath, 'fake_tool.sh')
+        with open(scriptPath, 'w') as ofh:
+            ofh.write(_FAKE_TOOL_SCRIPT % {'config': configPath})
+        #
+        os.chmod(scriptPath, os.stat(scriptPath).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        #
+        for binPath, toolList in ((os.path.join(self.__annotPath, 'bin'), ANNOT_TOOL_LIST + self.__extraToolList),
+                                  (os.path.join(self.__ccPath, 'bin'), CC_TOOL_LIST),
+                                  (os.path.join(self.__packagesPath, 'dict', 'bin'), ['CifCheck'])):
+            for tool in toolList:
+                linkPath = os.path.join(binPath, tool)
+                if os.path.lexists(linkPath):
+                    os.remove(linkPath)
+                #
+                os.symlink(scriptPath, linkPath)
+            #
+        #
+        open(self.__callsPath, 'w').close()
+        if self.__verbose:
+            self.__lfh.write("+FakeToolTree.build() - fake tools installed under %s\n" % self.__topPath)
+        #
+
+    def addCannedFile(self, name, sourcePath):
+        """ Install canned output name (e.g. 'default.cif', 'SearchAllInstances-output') from sourcePath
+        """
+        with open(sourcePath, 'rb') as ifh:
+            data = ifh.read()
+        #
+        with open(os.path.join(self.__cannedPath, name), 'wb') as ofh:
+            ofh.write(data)
+        #
+
+    def getConfigOverrides(self):
+        """ Site configuration values pointing tool locations at the fake tree
+        """
+        return {'SITE_ANNOT_TOOLS_PATH': self.__annotPath, 'SITE_CC_APPS_PATH': self.__ccPath, 'SITE_PACKAGES_PATH': self.__packagesPath,
+                'SITE_LOCAL_APPS_PATH': self.__packagesPath, 'SITE_TOOLS_PATH': self.__topPath}
+
+    def getToolCalls(self, start=None, end=None):
+        """ Return recorded tool calls overlapping [start, end] (time.time() values)
+        """
+        callList = []
+        if not os.access(self.__callsPath, os.F_OK):
+            return callList
+        #
+        with open(self.__callsPath, 'r') as ifh:
+            for line in ifh:
+                try:
+                    call = json.loads(line)
+                except ValueError:
+                    continue
+                #
+                if ((start is not None) and (call['end'] < start)) or ((end is not None) and (call['start'] > end)):
+                    continue
+                #
+                callList.append(call)
+            #
+        #
+        return callList
+
+    def getToolTime(self, start, end):
+        """ Wall-clock seconds within [start, end] during which at least one fake tool was running
+        """
+        intervalList = sorted([(max(call['start'], start), min(call['end'], end)) for call in self.getToolCalls(start, end)])
+        total = 0.0
+        curStart = None
+        curEnd = None
+        for iStart, iEnd in intervalList:
+            if (curEnd is None) or (iStart > curEnd):
+                if curEnd is not None:
+                    total += curEnd - curStart
+                #
+                curStart = iStart
+                curEnd = iEnd
+            else:
+                curEnd = max(curEnd, iEnd)
+            #
+        #
+        if curEnd is not None:
+            total += curEnd - curStart
+        #
+        return total
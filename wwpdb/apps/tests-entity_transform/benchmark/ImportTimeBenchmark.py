@@ -0,0 +1,232 @@
+##
+# File:  ImportTimeBenchmark.py
+# Date:  19-Oct-2026
+# Updates:
+##
+"""
+Cold import time of the entity transform web responder module.
+
+Usage:
+    python ImportTimeBenchmark.py [-m module] [-r repeat] [-b budget_ms] [-d] [-o result.json]
+
+Every repeat imports the module in a fresh interpreter (python -X importtime) and reports wall-clock timings, the
+slowest imported packages and any subsystem which should only be imported on first use of an operation (see
+DEFERRED_MODULE_LIST). With -d, each LazyImport of the module is also resolved in its own interpreter to show the
+first-use cost per subsystem. The script exits with status 1 if the median import time exceeds the budget or a
+deferred subsystem is imported at module load.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import getopt
+import json
+import os
+import platform
+import subprocess
+import sys
+import traceback
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from BenchmarkUtil import getTimingSummary  # pylint: disable=import-error
+else:
+    from .BenchmarkUtil import getTimingSummary  # pylint: disable=relative-beyond-top-level
+
+DEFAULT_MODULE = 'wwpdb.apps.entity_transform.webapp.EntityWebApp'
+
+# packages which must not be loaded by importing the responder module
+DEFERRED_MODULE_LIST = ['wwpdb.apps.editormodule', 'wwpdb.utils.dp.RcsbDpUtility', 'wwpdb.utils.wf.dbapi', 'openeye',
+                        'wwpdb.apps.entity_transform.openeye_util', 'wwpdb.apps.entity_transform.prd', 'wwpdb.apps.entity_transform.depict',
+                        'wwpdb.apps.entity_transform.update']
+
+_IMPORT_SCRIPT = '''
+import json, sys, timeit
+start = timeit.default_timer()
+import %(module)s
+seconds = timeit.default_timer() - start
+sys.stdout.write(json.dumps({"seconds": seconds, "modules": sorted(sys.modules.keys())}))
+'''
+
+_RESOLVE_SCRIPT = '''
+import json, sys, timeit
+import %(module)s as target
+from wwpdb.apps.entity_transform.utils.LazyImport import LazyImport
+name = "%(name)s"
+if name:
+    start = timeit.default_timer()
+    getattr(target, name).resolve()
+    sys.stdout.write(json.dumps({"seconds": timeit.default_timer() - start}))
+else:
+    sys.stdout.write(json.dumps({"names": sorted([k for k, v in vars(target).items() if isinstance(v, LazyImport)])}))
+'''
+
+
+class ImportTimeBenchmark(object):
+    """ Class responsible for timing module import in fresh interpreters
+    """
+    def __init__(self, moduleName=DEFAULT_MODULE, repeat=5, topCount=15, verbose=False, log=sys.stderr):
+        self.__moduleName = moduleName
+        self.__repeat = repeat
+        self.__topCount = topCount
+        self.__verbose = verbose
+        self.__lfh = log
+
+    def run(self, deferredFlag=False):
+        resultD = {'module': self.__moduleName, 'python': platform.python_version(), 'repeat': self.__repeat}
+        timeList = []
+        importTimeD = {}
+        moduleList = []
+        for idx in range(0, self.__repeat):
+            outputD, stderr = self.__runScript(_IMPORT_SCRIPT % {'module': self.__moduleName}, importTime=(idx == 0))
+            if outputD is None:
+                resultD['error'] = stderr.strip().split('\n')[-1] if stderr.strip() else 'import failed'
+                return resultD
+            #
+            timeList.append(outputD['seconds'] * 1000.0)
+            if idx == 0:
+                moduleList = outputD['modules']
+                importTimeD = self.__parseImportTime(stderr)
+            #
+        #
+        # leave out packages imported by interpreter start-up
+        _outputD, stderr = self.__runScript('pass', importTime=True)
+        for name in self.__parseImportTime(stderr):
+            importTimeD.pop(name, None)
+        #
+        resultD['timings'] = getTimingSummary(timeList)
+        resultD['module_count'] = len(moduleList)
+        resultD['slowest_imports'] = sorted(importTimeD.items(), key=lambda item: item[1], reverse=True)[:self.__topCount]
+        resultD['deferred_loaded'] = [name for name in moduleList for prefix in DEFERRED_MODULE_LIST
+                                      if (name == prefix) or name.startswith(prefix + '.')]
+        if deferredFlag:
+            resultD['first_use'] = self.__runDeferred()
+        #
+        return resultD
+
+    def __runDeferred(self):
+        """ Time resolution of every LazyImport of the module, each in its own interpreter
+        """
+        firstUseD = {}
+        outputD, _stderr = self.__runScript(_RESOLVE_SCRIPT % {'module': self.__moduleName, 'name': ''})
+        if outputD is None:
+            return firstUseD
+        #
+        for name in outputD['names']:
+            timeList = []
+            for _idx in range(0, self.__repeat):
+                resolveD, stderr = self.__runScript(_RESOLVE_SCRIPT % {'module': self.__moduleName, 'name': name})
+                if resolveD is None:
+                    firstUseD[name] = {'error': stderr.strip().split('\n')[-1] if stderr.strip() else 'import failed'}
+                    break
+                #
+                timeList.append(resolveD['seconds'] * 1000.0)
+            #
+            if timeList:
+                firstUseD[name] = getTimingSummary(timeList)
+            #
+            if self.__verbose:
+                self.__lfh.write("+ImportTimeBenchmark - first use of %s: %s\n" % (name, firstUseD[name]))
+            #
+        #
+        return firstUseD
+
+    def __runScript(self, script, importTime=False):
+        """ Run script in fresh interpreter, return (decoded JSON output or None, stderr)
+        """
+        cmd = [sys.executable]
+        if importTime:
+            cmd.extend(['-X', 'importtime'])
+        #
+        cmd.extend(['-c', script])
+        try:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+            stdout, stderr = process.communicate()
+            if process.returncode == 0:
+                return json.loads(stdout or 'null'), stderr
+            #
+            return None, stderr
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return None, ''
+
+    def __parseImportTime(self, stderr):
+        """ Return {package: cumulative milliseconds} from '-X importtime' output
+        """
+        importTimeD = {}
+        for line in stderr.split('\n'):
+            if not line.startswith('import time:'):
+                continue
+            #
+            tList = line[len('import time:'):].split('|')
+            if len(tList) != 3:
+                continue
+            #
+            try:
+                importTimeD[tList[2].strip()] = round(int(tList[1].strip()) / 1000.0, 3)
+            except ValueError:
+                continue
+            #
+        #
+        return importTimeD
+
+
+if __name__ == "__main__":
+    opts, args = getopt.getopt(sys.argv[1:], "m:r:b:do:v", ["module=", "repeat=", "budget=", "deferred", "output=", "verbose"])
+
+    moduleName = DEFAULT_MODULE
+    repeat = 5
+    budget = None
+    deferredFlag = False
+    outputFile = None
+    verbose = False
+    for opt, arg in opts:
+        if opt in ("-m", "--module"):
+            moduleName = arg
+        elif opt in ("-r", "--repeat"):
+            repeat = int(arg)
+        elif opt in ("-b", "--budget"):
+            budget = float(arg)
+        elif opt in ("-d", "--deferred"):
+            deferredFlag = True
+        elif opt in ("-o", "--output"):
+            outputFile = arg
+        elif opt in ("-v", "--verbose"):
+            verbose = True
+        #
+    #
+    benchmark = ImportTimeBenchmark(moduleName=moduleName, repeat=repeat, verbose=verbose, log=sys.stderr)
+    resultD = benchmark.run(deferredFlag=deferredFlag)
+    #
+    status = 0
+    if ('error' in resultD) or resultD['deferred_loaded']:
+        status = 1
+    #
+    if budget is not None:
+        resultD['budget_ms'] = budget
+        if ('timings' in resultD) and (resultD['timings']['median_ms'] > budget):
+            resultD['over_budget'] = True
+            status = 1
+        #
+    #
+    text = json.dumps(resultD, indent=2, sort_keys=True)
+    if outputFile:
+        with open(outputFile, 'w') as ofh:
+            ofh.write(text + '\n')
+        #
+    else:
+        sys.stdout.write(text + '\n')
+    #
+    sys.exit(status)
@@ -0,0 +1,267 @@
+##
+# File:  OpLatencyHarness.py
+# Date:  19-Oct-2026
+# Updates:
+#  19-Oct-2026  zf   site configuration injected through SiteConfig(configD)/setSiteConfig(), request paths through appPathD
+##
+"""
+End-to-end latency of EntityWebApp operations with fake back-end tools.
+
+Usage:
+    python OpLatencyHarness.py [-d tool_delay] [-r repeat] [-o result.json] [-w work_path] [-s summary_size]
+                               [-x path,path] [-a] [-c KEY=VALUE] [-P name=value] [--tool-delay tool=seconds]
+
+A SiteConfig snapshot pointing at a FakeToolTree (tool paths), a scratch session directory and stub templates is
+installed with setSiteConfig(), then EntityWebApp.doOp() is driven for every path of EntityWebAppWorker.getAppPathD()
+(or the given appPathD). For each operation the wall-clock latency, the time spent in fake tools and the difference
+(Python side overhead) are reported as JSON percentiles. Library code reading ConfigInfo directly (e.g. RcsbDpUtility)
+still sees the unchanged site configuration.
+
+Operations writing outside the scratch area (CVS commit, workflow finish) are skipped unless -a is given. Work run
+through DetachUtils after an operation returns is not part of that operation's latency.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import getopt
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from BenchmarkUtil import getTimingSummary, writeStubTemplates  # pylint: disable=import-error
+    from FakeToolTree import FakeToolTree  # pylint: disable=import-error
+    from SyntheticPrdSummary import SyntheticPrdSummary, getSizeParameters  # pylint: disable=import-error
+else:
+    from .BenchmarkUtil import getTimingSummary, writeStubTemplates  # pylint: disable=relative-beyond-top-level
+    from .FakeToolTree import FakeToolTree  # pylint: disable=relative-beyond-top-level
+    from .SyntheticPrdSummary import SyntheticPrdSummary, getSizeParameters  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.SiteConfig import SiteConfig, setSiteConfig
+from wwpdb.apps.entity_transform.webapp.EntityWebApp import EntityWebApp, EntityWebAppWorker
+from wwpdb.utils.config.ConfigInfo import getSiteId
+from wwpdb.utils.session.WebRequest import InputRequest
+
+# operations with side effects outside the session directory
+SKIP_OP_LIST = ['/service/entity/commit_prd_to_cvs', '/service/entity/exit_finished', '/service/entity/new_session/wf']
+
+# request parameters added for specific operations
+# fmt:off
+OP_PARAMETERS = {
+    '/service/entity/result_view':     {'type': 'match', 'instanceid': 'polymer_1'},                          # noqa: E241
+    '/service/entity/gif_view':        {'instanceid': 'polymer_1', 'label': 'CHAIN_A'},                      # noqa: E241
+    '/service/entity/jmol_view':       {'instanceid': 'polymer_1', 'label': 'CHAIN_A', 'focus': 'A:1'},      # noqa: E241
+    '/service/entity/launch_editor':   {'instanceid': 'polymer_1', 'label': 'CHAIN_A'},                      # noqa: E241
+    '/service/entity/launch_fixer':    {'instanceid': 'polymer_1', 'label': 'CHAIN_A'},                      # noqa: E241
+    '/service/entity/link_view':       {'instanceid': 'polymer_1', 'label': 'CHAIN_A'},                      # noqa: E241
+    '/service/entity/mcs_match_view':  {'instanceid': 'polymer_1', 'label': 'CHAIN_A'},                      # noqa: E241
+    '/service/entity/chopper_output':  {'instanceid': 'polymer_1', 'label': 'CHAIN_A'},                      # noqa: E241
+    '/service/entity/download_bundle': {'format': 'zip'}                                                      # noqa: E241
+}
+# fmt:on
+
+
+class OpLatencyHarness(object):
+    """ Class responsible for timing EntityWebApp.doOp() per request path against a fake tool tree
+    """
+    def __init__(self, workPath=None, delay=0.5, toolDelayD=None, repeat=5, sizeName='small', configD=None, parameterD=None,
+                 appPathD=None, verbose=False, log=sys.stderr):
+        self.__workPath = os.path.abspath(workPath)
+        self.__repeat = max(1, repeat)
+        self.__sizeName = sizeName
+        self.__parameterD = parameterD or {}
+        self.__appPathD = appPathD
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__devNull = open(os.devnull, 'w')
+        self.__siteId = getSiteId()
+        self.__identifier = 'D_8000000001'
+        #
+        self.__toolTree = FakeToolTree(topPath=os.path.join(self.__workPath, 'tools'), delay=delay, toolDelayD=toolDelayD, verbose=verbose, log=log)
+        self.__toolTree.build()
+        #
+        topPath = os.path.join(self.__workPath, 'webapps')
+        writeStubTemplates(os.path.join(topPath, 'htdocs', 'entity_transform_ui', 'templates'))
+        siteConfigD = self.__toolTree.getConfigOverrides()
+        siteConfigD['SITE_WEB_APPS_TOP_PATH'] = topPath
+        siteConfigD['SITE_WEB_APPS_TOP_SESSIONS_PATH'] = os.path.join(self.__workPath, 'sessions')
+        siteConfigD.update(configD or {})
+        setSiteConfig(SiteConfig(self.__siteId, configD=siteConfigD))
+        #
+        self.__seedPath = os.path.join(self.__workPath, 'seed')
+        self.__sessionId = ''
+        self.__sessionPath = ''
+        self.__createSession(siteConfigD['SITE_WEB_APPS_TOP_SESSIONS_PATH'])
+
+    def run(self, excludeList=None):
+        appPathD = self.__appPathD
+        if appPathD is None:
+            reqObj = InputRequest({}, verbose=False, log=self.__devNull)
+            reqObj.setValue('WWPDB_SITE_ID', self.__siteId)
+            appPathD = EntityWebAppWorker(reqObj=reqObj, verbose=False, log=self.__devNull).getAppPathD()
+        #
+        resultList = []
+        for path in sorted(appPathD.keys()):
+            if excludeList and path in excludeList:
+                continue
+            #
+            result = self.runOp(path)
+            result['method'] = appPathD[path]
+            resultList.append(result)
+            if self.__verbose:
+                self.__lfh.write("+OpLatencyHarness.run() - %s: %s\n" % (path, result.get('latency', result.get('error'))))
+            #
+        #
+        return {'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'host': platform.node(),
+                'site_id': self.__siteId, 'repeat': self.__repeat, 'summary_size': self.__sizeName, 'results': resultList}
+
+    def runOp(self, path):
+        """ Run one warm-up and repeat timed doOp() calls for path, restoring the session files before each call
+        """
+        latencyList = []
+        toolList = []
+        pythonList = []
+        callCount = 0
+        responseD = {}
+        try:
+            for count in range(self.__repeat + 1):
+                self.__resetSession()
+                #
+                start = time.time()
+                app = EntityWebApp(parameterDict=self.__getParameterDict(path), verbose=False, log=self.__devNull, siteId=self.__siteId)
+                rspD = app.doOp()
+                end = time.time()
+                #
+                if count == 0:
+                    responseD = rspD
+                    continue
+                #
+                toolTime = self.__toolTree.getToolTime(start, end)
+                callCount += len(self.__toolTree.getToolCalls(start, end))
+                latencyList.append((end - start) * 1000.0)
+                toolList.append(toolTime * 1000.0)
+                pythonList.append((end - start - toolTime) * 1000.0)
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+            return {'path': path, 'error': traceback.format_exc().strip().split('\n')[-1]}
+        #
+        return {'path': path, 'latency': getTimingSummary(latencyList), 'tool': getTimingSummary(toolList), 'python': getTimingSummary(pythonList),
+                'tool_calls': round(float(callCount) / self.__repeat, 2), 'content_type': str(responseD.get('CONTENT_TYPE', '')),
+                'response_size': len(str(responseD.get('RETURN_STRING', '')))}
+
+    def __getParameterDict(self, path):
+        paramD = {'request_path': path, 'sessionid': self.__sessionId, 'identifier': self.__identifier, 'pdbid': '9XYZ'}
+        paramD.update(OP_PARAMETERS.get(path, {}))
+        paramD.update(self.__parameterD)
+        # storage model of web request parameters is a dictionary of lists
+        return dict([(key, [value]) for key, value in paramD.items()])
+
+    def __createSession(self, topSessionPath):
+        """ Create scratch session holding synthetic model and prd-summary files (kept in seed directory for reset)
+        """
+        if not os.access(self.__seedPath, os.F_OK):
+            os.makedirs(self.__seedPath)
+        #
+        summaryFile = os.path.join(self.__seedPath, self.__identifier + '_prd-summary_P1.cif')
+        SyntheticPrdSummary(**getSizeParameters(self.__sizeName)).write(summaryFile)
+        shutil.copyfile(summaryFile, os.path.join(self.__seedPath, self.__identifier + '_model_P1.cif'))
+        self.__toolTree.addCannedFile('default.cif', summaryFile)
+        #
+        reqObj = InputRequest({}, verbose=False, log=self.__devNull)
+        reqObj.setValue('TopSessionPath', topSessionPath)
+        sObj = reqObj.newSessionObj()
+        self.__sessionId = sObj.getId()
+        self.__sessionPath = sObj.getPath()
+
+    def __resetSession(self):
+        for fileName in os.listdir(self.__sessionPath):
+            filePath = os.path.join(self.__sessionPath, fileName)
+            if os.path.isdir(filePath) and not os.path.islink(filePath):
+                shutil.rmtree(filePath, ignore_errors=True)
+            else:
+                os.remove(filePath)
+            #
+        #
+        for fileName in os.listdir(self.__seedPath):
+            shutil.copyfile(os.path.join(self.__seedPath, fileName), os.path.join(self.__sessionPath, fileName))
+        #
+
+
+if __name__ == "__main__":
+    opts, args = getopt.getopt(sys.argv[1:], "d:r:o:w:s:x:ac:P:v", ["delay=", "repeat=", "output=", "work=", "size=", "exclude=", "all", "config=",
+                                                                    "parameter=", "tool-delay=", "verbose"])
+
+    delay = 0.5
+    toolDelayD = {}
+    repeat = 5
+    outputFile = None
+    workPath = None
+    sizeName = 'small'
+    excludeList = list(SKIP_OP_LIST)
+    configD = {}
+    parameterD = {}
+    verbose = False
+    for opt, arg in opts:
+        if opt in ("-d", "--delay"):
+            delay = float(arg)
+        elif opt == "--tool-delay":
+            tool, value = arg.split('=', 1)
+            toolDelayD[tool] = float(value)
+        elif opt in ("-r", "--repeat"):
+            repeat = int(arg)
+        elif opt in ("-o", "--output"):
+            outputFile = arg
+        elif opt in ("-w", "--work"):
+            workPath = arg
+        elif opt in ("-s", "--size"):
+            sizeName = arg
+        elif opt in ("-x", "--exclude"):
+            excludeList.extend(arg.split(','))
+        elif opt in ("-a", "--all"):
+            excludeList = []
+        elif opt in ("-c", "--config"):
+            key, value = arg.split('=', 1)
+            configD[key] = value
+        elif opt in ("-P", "--parameter"):
+            key, value = arg.split('=', 1)
+            parameterD[key] = value
+        elif opt in ("-v", "--verbose"):
+            verbose = True
+        #
+    #
+    if not workPath:
+        workPath = tempfile.mkdtemp(prefix='op-latency-')
+    #
+    harness = OpLatencyHarness(workPath=workPath, delay=delay, toolDelayD=toolDelayD, repeat=repeat, sizeName=sizeName, configD=configD,
+                               parameterD=parameterD, verbose=verbose, log=sys.stderr)
+    resultD = harness.run(excludeList=excludeList)
+    resultD['tool_delay'] = delay
+    resultD['excluded'] = excludeList
+    #
+    text = json.dumps(resultD, indent=2, sort_keys=True)
+    if outputFile:
+        with open(outputFile, 'w') as ofh:
+            ofh.write(text + '\n')
+        #
+    else:
+        sys.stdout.write(text + '\n')
+    #
@@ -0,0 +1,159 @@
+##
+# File:  SiteConfigBenchmark.py
+# Date:  19-Oct-2026
+# Updates:
+##
+"""
+Per-request cost of site configuration look up: configuration objects built by every helper versus the
+process-wide SiteConfig snapshot.
+
+Usage:
+    python SiteConfigBenchmark.py [-s site_id] [-n requests] [-r repeat] [-o result.json]
+
+For each repeat, the configuration work of n requests is timed in both ways and reported per request:
+
+    per_request     ConfigInfo, ConfigInfoAppCommon, ConfigInfoAppCc and ChemRefPathInfo built as each helper did
+                    before, plus the Annot/CC_TOOLS shell settings rebuilt for one back-end command
+    snapshot        the same values taken from getSiteConfig(siteId)
+    command_util    construction of CommandUtil plus both shell settings (as done for every command)
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import getopt
+import json
+import os
+import platform
+import sys
+import timeit
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from BenchmarkUtil import getTimingSummary  # pylint: disable=import-error
+else:
+    from .BenchmarkUtil import getTimingSummary  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.entity_transform.utils.CommandUtil import CommandUtil
+from wwpdb.apps.entity_transform.utils.SiteConfig import getSiteConfig
+from wwpdb.io.locator.ChemRefPathInfo import ChemRefPathInfo
+from wwpdb.utils.config.ConfigInfo import ConfigInfo, getSiteId
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon, ConfigInfoAppCc
+from wwpdb.utils.session.WebRequest import InputRequest
+
+
+class SiteConfigBenchmark(object):
+    """ Class responsible for timing configuration look up of one request
+    """
+    def __init__(self, siteId, requestCount=100, repeat=5, verbose=False, log=sys.stderr):
+        self.__siteId = siteId
+        self.__requestCount = requestCount
+        self.__repeat = repeat
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__reqObj = InputRequest({}, verbose=verbose, log=log)
+        self.__reqObj.setValue("WWPDB_SITE_ID", siteId)
+
+    def run(self):
+        resultD = {'site_id': self.__siteId, 'python': platform.python_version(), 'requests': self.__requestCount, 'repeat': self.__repeat}
+        for name, func in (('per_request', self.__perRequest), ('snapshot', self.__snapshot), ('command_util', self.__commandUtil)):
+            timeList = []
+            for _idx in range(0, self.__repeat):
+                start = timeit.default_timer()
+                for _count in range(0, self.__requestCount):
+                    func()
+                #
+                timeList.append((timeit.default_timer() - start) * 1000.0 / self.__requestCount)
+            #
+            resultD[name] = getTimingSummary(timeList)
+            if self.__verbose:
+                self.__lfh.write("+SiteConfigBenchmark - %s: %s\n" % (name, resultD[name]))
+            #
+        #
+        if resultD['snapshot']['median_ms'] > 0:
+            resultD['speedup'] = round(resultD['per_request']['median_ms'] / resultD['snapshot']['median_ms'], 1)
+        #
+        return resultD
+
+    def __perRequest(self):
+        cI = ConfigInfo(self.__siteId)
+        cICommon = ConfigInfoAppCommon(self.__siteId)
+        cIcc = ConfigInfoAppCc(self.__siteId)
+        ChemRefPathInfo(siteId=self.__siteId, verbose=False, log=self.__lfh)
+        cI.get('SITE_NAME')
+        cI.get('SITE_WEB_APPS_TOP_SESSIONS_PATH')
+        annotSetting = " RCSBROOT=" + cICommon.get_site_annot_tools_path() + "; export RCSBROOT; PDB2GLYCAN=" \
+            + os.path.join(os.path.abspath(cICommon.get_site_packages_path()), "pdb2glycan", "bin", "PDB2Glycan") + "; export PDB2GLYCAN; " \
+            + " COMP_PATH=" + cIcc.get_site_cc_cvs_path() + "; export COMP_PATH; " \
+            + " PRD_PATH=" + cIcc.get_site_prd_cvs_path() + "; export PRD_PATH; " \
+            + " BINPATH=${RCSBROOT}/bin; export BINPATH; "
+        ccToolSetting = " CC_TOOLS=" + cICommon.get_site_cc_apps_path() + "/bin; export CC_TOOLS; " \
+            + " OE_DIR=" + cICommon.get_site_cc_oe_dir() + "; export OE_DIR; " \
+            + " OE_LICENSE=" + cICommon.get_site_cc_oe_licence() + "; export OE_LICENSE; " \
+            + " ACD_DIR=" + cICommon.get_site_cc_acd_dir() + "; export ACD_DIR; " \
+            + " CACTVS_DIR=" + cICommon.get_site_cc_cactvs_dir() + "; export CACTVS_DIR; " \
+            + " CORINA_DIR=" + cICommon.get_site_cc_corina_dir() + "/bin; export CORINA_DIR; " \
+            + " BABEL_DIR=" + cICommon.get_site_cc_babel_dir() + "; export BABEL_DIR; " \
+            + " BABEL_DATADIR=" + cICommon.get_site_cc_babel_datadir() + "; export BABEL_DATADIR; " \
+            + " LD_LIBRARY_PATH=" + cICommon.get_site_cc_babel_lib() + ":" \
+            + os.path.join(cICommon.get_site_local_apps_path(), "lib") + "; export LD_LIBRARY_PATH; "
+        return annotSetting, ccToolSetting
+
+    def __snapshot(self):
+        siteConfig = getSiteConfig(self.__siteId)
+        siteConfig.getChemRefPathInfo()
+        siteConfig.get('SITE_NAME')
+        siteConfig.get('SITE_WEB_APPS_TOP_SESSIONS_PATH')
+        siteConfig.getAnnotSetting()
+        siteConfig.getCCToolSetting()
+
+    def __commandUtil(self):
+        cmdUtil = CommandUtil(reqObj=self.__reqObj, verbose=False, log=self.__lfh)
+        cmdUtil._CommandUtil__getAnnotSetting()  # pylint: disable=protected-access
+        cmdUtil._CommandUtil__getCCToolSetting()  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    opts, args = getopt.getopt(sys.argv[1:], "s:n:r:o:v", ["site=", "requests=", "repeat=", "output=", "verbose"])
+
+    siteId = None
+    requestCount = 100
+    repeat = 5
+    outputFile = None
+    verbose = False
+    for opt, arg in opts:
+        if opt in ("-s", "--site"):
+            siteId = arg
+        elif opt in ("-n", "--requests"):
+            requestCount = int(arg)
+        elif opt in ("-r", "--repeat"):
+            repeat = int(arg)
+        elif opt in ("-o", "--output"):
+            outputFile = arg
+        elif opt in ("-v", "--verbose"):
+            verbose = True
+        #
+    #
+    if not siteId:
+        siteId = getSiteId()
+    #
+    benchmark = SiteConfigBenchmark(siteId, requestCount=requestCount, repeat=repeat, verbose=verbose, log=sys.stderr)
+    text = json.dumps(benchmark.run(), indent=2, sort_keys=True)
+    if outputFile:
+        with open(outputFile, 'w') as ofh:
+            ofh.write(text + '\n')
+        #
+    else:
+        sys.stdout.write(text + '\n')
+    #
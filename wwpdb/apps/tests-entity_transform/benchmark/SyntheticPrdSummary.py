@@ -0,0 +1,327 @@
+##
+# File:  SyntheticPrdSummary.py
+# Date:  19-Oct-2026
+# Updates:
+##
+"""
+Generator of synthetic prd-summary cif files used by depiction benchmarks.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2012 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import random
+import string
+
+from mmcif.api.DataCategory import DataCategory
+from mmcif.api.PdbxContainers import DataContainer
+from mmcif.io.PdbxWriter import PdbxWriter
+
+_AMINO_ACIDS = [('A', 'ALA'), ('R', 'ARG'), ('N', 'ASN'), ('D', 'ASP'), ('C', 'CYS'), ('Q', 'GLN'), ('E', 'GLU'),
+                ('G', 'GLY'), ('H', 'HIS'), ('I', 'ILE'), ('L', 'LEU'), ('K', 'LYS'), ('M', 'MET'), ('F', 'PHE'),
+                ('P', 'PRO'), ('S', 'SER'), ('T', 'THR'), ('W', 'TRP'), ('Y', 'TYR'), ('V', 'VAL')]
+
+_MODIFIED_RESIDUES = ['MSE', 'SEP', 'TPO', 'PTR', 'HYP', 'MLY', 'CSO', 'KCX']
+
+_LIGANDS = ['HEM', 'NAG', 'MAN', 'BMA', 'FUC', 'GOL', 'SO4', 'ZN', 'MG', 'ATP', 'FAD', 'NAD']
+
+_COLORS = ['red', 'orange', 'blue', 'green']
+
+# fmt:off
+_SIZE_PARAMETERS = {
+    'small':  {'numPolymers': 2,  'seqLength': 120,  'numLigands': 10,   'numGroups': 2,  'numMatches': 20,   'numLinks': 10},    # noqa: E241
+    'medium': {'numPolymers': 8,  'seqLength': 300,  'numLigands': 80,   'numGroups': 10, 'numMatches': 200,  'numLinks': 100},   # noqa: E241
+    'large':  {'numPolymers': 24, 'seqLength': 600,  'numLigands': 400,  'numGroups': 40, 'numMatches': 1000, 'numLinks': 500},   # noqa: E241
+    'xlarge': {'numPolymers': 60, 'seqLength': 1000, 'numLigands': 1500, 'numGroups': 120, 'numMatches': 4000, 'numLinks': 2000}  # noqa: E241
+}
+# fmt:on
+
+
+def getSizeParameters(sizeName):
+    """ Return generator parameters for one of predefined sizes 'small', 'medium', 'large' or 'xlarge'
+    """
+    return dict(_SIZE_PARAMETERS[sizeName])
+
+
+def getSizeNames():
+    return ['small', 'medium', 'large', 'xlarge']
+
+
+class SyntheticPrdSummary(object):
+    """ Class responsible for writing a prd-summary cif file with the categories read by SummaryCifUtil,
+        ProcessPrdSummary, StrSummaryDepict, ResultDepict and LinkUtil.
+
+        Content is generated from a seeded random number generator, so the same parameters always give the same file.
+    """
+    def __init__(self, numPolymers=2, seqLength=120, numLigands=10, numGroups=2, numMatches=20, numLinks=10, seed=1):
+        self.__numPolymers = max(1, numPolymers)
+        self.__seqLength = max(2, seqLength)
+        self.__numLigands = numLigands
+        self.__numGroups = numGroups
+        self.__numMatches = numMatches
+        self.__numLinks = numLinks
+        self.__seed = seed
+        self.__random = None
+        #
+        self.__chainIds = []
+        self.__sequences = {}
+        self.__ligands = []
+        self.__groups = []
+        self.__merges = []
+        self.__splits = []
+
+    def getParameters(self):
+        return {'numPolymers': self.__numPolymers, 'seqLength': self.__seqLength, 'numLigands': self.__numLigands,
+                'numGroups': self.__numGroups, 'numMatches': self.__numMatches, 'numLinks': self.__numLinks}
+
+    def getEntityInfo(self):
+        """ Return entity list in the form used by SeqDepict: [entity_id, chain ids, name, one letter sequence, type, label]
+        """
+        entityInfo = []
+        for idx, chainId in enumerate(self.__chainIds):
+            oneLetterSeq = ''
+            for code, res in self.__sequences[chainId]:
+                if code:
+                    oneLetterSeq += code
+                else:
+                    oneLetterSeq += '(' + res + ')'
+                #
+            #
+            entityInfo.append([str(idx + 1), chainId, 'Synthetic protein ' + str(idx + 1), oneLetterSeq, 'polypeptide(L)', ''])
+        #
+        return entityInfo
+
+    def write(self, filePath):
+        self.__generate()
+        #
+        myBlock = DataContainer('prd_summary')
+        for cat in (self.__getEntryCategory(), self.__getStructCategory(), self.__getEntityPolyCategory(),
+                    self.__getEntityInfoCategory(), self.__getPolymerInfoCategory(), self.__getPolySeqSchemeCategory(),
+                    self.__getNonPolymerInfoCategory(), self.__getNonPolySchemeCategory(), self.__getGroupInfoCategory(),
+                    self.__getGroupListCategory(), self.__getMergeCategory(), self.__getSplitCategory(),
+                    self.__getMatchResultCategory(), self.__getStructConnCategory()):
+            if cat.getRowCount() > 0:
+                myBlock.append(cat)
+            #
+        #
+        ofh = open(filePath, 'w')
+        pdbxW = PdbxWriter(ofh)
+        pdbxW.write([myBlock])
+        ofh.close()
+
+    def __generate(self):
+        """ Build chains, ligand instances, groups, merged and split residues in memory
+        """
+        self.__random = random.Random(self.__seed)
+        chainLetters = string.ascii_uppercase + string.ascii_lowercase + string.digits
+        self.__chainIds = []
+        self.__sequences = {}
+        for idx in range(self.__numPolymers):
+            chainId = chainLetters[idx % len(chainLetters)]
+            if idx >= len(chainLetters):
+                chainId += chainLetters[idx // len(chainLetters) - 1]
+            #
+            self.__chainIds.append(chainId)
+            seq = []
+            for _pos in range(self.__seqLength):
+                if self.__random.random() < 0.01:
+                    seq.append(('', self.__random.choice(_MODIFIED_RESIDUES)))
+                else:
+                    seq.append(self.__random.choice(_AMINO_ACIDS))
+                #
+            #
+            self.__sequences[chainId] = seq
+        #
+        self.__ligands = []
+        for idx in range(self.__numLigands):
+            chainId = self.__random.choice(self.__chainIds)
+            self.__ligands.append((self.__random.choice(_LIGANDS), chainId, str(1001 + idx)))
+        #
+        self.__groups = []
+        for idx in range(self.__numGroups):
+            size = self.__random.randint(2, 5)
+            chainId = self.__random.choice(self.__chainIds)
+            self.__groups.append([(_LIGANDS[self.__random.randint(1, 4)], chainId, str(2001 + idx * 10 + pos)) for pos in range(size)])
+        #
+        self.__merges = []
+        self.__splits = []
+        for chainId in self.__chainIds:
+            for pos, (code, res) in enumerate(self.__sequences[chainId]):
+                if code:
+                    continue
+                #
+                self.__splits.append((res, chainId, str(pos + 1)))
+                if len(self.__merges) < max(1, self.__numMatches // 20):
+                    self.__merges.append((res, chainId, str(pos + 1)))
+                #
+            #
+        #
+
+    def __getResidueKey(self, residue):
+        # chain_residue_number_insertion as in pdbx_group_list.component_ids
+        return residue[1] + '_' + residue[0] + '_' + residue[2] + '_'
+
+    def __getFocus(self, residue):
+        return residue[1] + ':' + residue[2]
+
+    def __getCategory(self, name, attributeList, rowList):
+        cat = DataCategory(name)
+        for attribute in attributeList:
+            cat.appendAttribute(attribute)
+        #
+        for row in rowList:
+            cat.append(row)
+        #
+        return cat
+
+    def __getEntryCategory(self):
+        return self.__getCategory('entry', ['id', 'depid', 'file', 'pcm_label'], [['9XYZ', 'D_8000000001', 'D_8000000001_model_P1.cif', '1,2']])
+
+    def __getStructCategory(self):
+        return self.__getCategory('struct', ['title'], [['Synthetic entry with %d polymers and %d ligands' % (self.__numPolymers, self.__numLigands)]])
+
+    def __getEntityPolyCategory(self):
+        rowList = []
+        for idx, chainId in enumerate(self.__chainIds):
+            rowList.append([str(idx + 1), chainId, 'Synthetic protein ' + str(idx + 1)])
+        #
+        return self.__getCategory('entity_poly', ['entity_id', 'pdbx_strand_id', 'name'], rowList)
+
+    def __getEntityInfoCategory(self):
+        rowList = []
+        for entityInfo in self.getEntityInfo():
+            modList = sorted(set([res for code, res in self.__sequences[entityInfo[1]] if not code]))
+            colorResList = ''
+            if modList:
+                colorResList = 'red:' + ','.join(modList)
+            #
+            action = 'Y' if modList else 'N'
+            rowList.append([entityInfo[0], 'polymer', entityInfo[4], entityInfo[2], str(self.__seqLength), entityInfo[1], action,
+                            entityInfo[3], colorResList])
+        #
+        return self.__getCategory('pdbx_entity_info', ['entity_id', 'type', 'polymer_type', 'name', 'residue_number', 'pdb_chain_ids',
+                                                       'action_required', 'one_letter_seq', 'color_res_list'], rowList)
+
+    def __getPolymerInfoCategory(self):
+        rowList = []
+        for idx, chainId in enumerate(self.__chainIds):
+            linkage = 'linked' if idx % 2 == 0 else 'not linked'
+            threeLetterSeq = ' '.join([res for _code, res in self.__sequences[chainId]])
+            rowList.append(['polymer_' + str(idx + 1), chainId, str(idx + 1), threeLetterSeq, linkage, chainId + ':1-' + str(self.__seqLength)])
+        #
+        return self.__getCategory('pdbx_polymer_info', ['polymer_id', 'pdb_chain_id', 'entity_id', 'three_letter_seq', 'linkage_info', 'focus'], rowList)
+
+    def __getPolySeqSchemeCategory(self):
+        rowList = []
+        for chainId in self.__chainIds:
+            for pos, (_code, res) in enumerate(self.__sequences[chainId]):
+                rowList.append([chainId, res, str(pos + 1), '?'])
+            #
+        #
+        return self.__getCategory('pdbx_poly_seq_scheme', ['pdb_strand_id', 'pdb_mon_id', 'pdb_seq_num', 'pdb_ins_code'], rowList)
+
+    def __getNonPolymerInfoCategory(self):
+        rowList = []
+        for idx, ligand in enumerate(self.__ligands):
+            linkage = 'linked' if idx % 3 == 0 else 'not linked'
+            color = _COLORS[idx % len(_COLORS)] if idx % 5 == 0 else ''
+            action = 'Y' if idx % 7 == 0 else 'N'
+            rowList.append([ligand[1] + '_' + ligand[0] + '_' + ligand[2], ligand[0], linkage, self.__getFocus(ligand), color, action])
+        #
+        return self.__getCategory('pdbx_non_polymer_info', ['instance_id', 'residue_id', 'linkage_info', 'focus', 'highlight_with_color',
+                                                            'action_required'], rowList)
+
+    def __getNonPolySchemeCategory(self):
+        rowList = []
+        for ligand in self.__ligands:
+            rowList.append([ligand[0], ligand[1], ligand[2], '?'])
+        #
+        return self.__getCategory('pdbx_nonpoly_scheme', ['mon_id', 'pdbx_strand_id', 'pdb_seq_num', 'pdb_ins_code'], rowList)
+
+    def __getGroupInfoCategory(self):
+        rowList = []
+        for idx, group in enumerate(self.__groups):
+            residues = ' '.join([res[0] + '_' + res[1] + '_' + res[2] for res in group])
+            rowList.append(['group_' + str(idx + 1), 'oligosaccharide', residues, 'linked', self.__getFocus(group[0]), 'Y' if idx % 2 else 'N'])
+        #
+        return self.__getCategory('pdbx_group_info', ['group_id', 'descriptor', 'residues', 'linkage_info', 'focus', 'action_required'], rowList)
+
+    def __getGroupListCategory(self):
+        rowList = []
+        for group in self.__groups:
+            rowList.append([','.join([self.__getResidueKey(res) for res in group])])
+        #
+        return self.__getCategory('pdbx_group_list', ['component_ids'], rowList)
+
+    def __getMergeCategory(self):
+        rowList = []
+        for idx, residue in enumerate(self.__merges):
+            residues = residue[1] + '_' + residue[0] + '_' + residue[2]
+            rowList.append(['merge_' + str(idx + 1), residues, 'linked', self.__getFocus(residue)])
+        #
+        return self.__getCategory('pdbx_merge_polymer_residue_info', ['merge_id', 'residues', 'linkage_info', 'focus'], rowList)
+
+    def __getSplitCategory(self):
+        rowList = []
+        for residue in self.__splits:
+            rowList.append([residue[1] + '_' + residue[0] + '_' + residue[2], 'linked', self.__getFocus(residue)])
+        #
+        return self.__getCategory('pdbx_split_polymer_residue_info', ['instance_id', 'linkage_info', 'focus'], rowList)
+
+    def __getMatchResultCategory(self):
+        instIdList = ['polymer_' + str(idx + 1) for idx in range(len(self.__chainIds))]
+        instIdList.extend([ligand[1] + '_' + ligand[0] + '_' + ligand[2] for ligand in self.__ligands])
+        instIdList.extend(['group_' + str(idx + 1) for idx in range(len(self.__groups))])
+        mergeIdList = ['merge_' + str(idx + 1) for idx in range(len(self.__merges))]
+        #
+        rowList = []
+        for idx in range(self.__numMatches):
+            if mergeIdList and idx % 20 == 0:
+                instId = mergeIdList[(idx // 20) % len(mergeIdList)]
+            else:
+                instId = instIdList[idx % len(instIdList)]
+            #
+            method = 'graph' if idx % 2 == 0 else 'sequence'
+            matchType = self.__random.choice(['exact match', 'close match', 'partial match'])
+            if (idx % 3 == 0) and (not instId.startswith('merge')):
+                rowList.append([instId, 'PRD_%06d' % (900001 + idx), matchType, method, 'ALA GLY DPR', '?'])
+            else:
+                rowList.append([instId, self.__random.choice(_LIGANDS), matchType, method, '?', 'PRD_%06d' % (900001 + idx)])
+            #
+        #
+        return self.__getCategory('pdbx_match_result', ['inst_id', 'id', 'type', 'method', 'sequence', 'prd_id'], rowList)
+
+    def __getStructConnCategory(self):
+        """ Covalent links from ligand and group residues to polymer residues
+        """
+        partnerList = list(self.__ligands)
+        for group in self.__groups:
+            partnerList.extend(group)
+        #
+        rowList = []
+        for idx in range(self.__numLinks):
+            if not partnerList:
+                break
+            #
+            partner = partnerList[idx % len(partnerList)]
+            chainId = self.__random.choice(self.__chainIds)
+            pos = self.__random.randint(1, self.__seqLength)
+            res = self.__sequences[chainId][pos - 1][1]
+            rowList.append(['covale' + str(idx + 1), 'covale', chainId, res, str(pos), '?', 'ND2', '1_555',
+                            partner[1], partner[0], partner[2], '?', 'C1', '1_555'])
+        #
+        return self.__getCategory('struct_conn', ['id', 'conn_type_id', 'ptnr1_auth_asym_id', 'ptnr1_auth_comp_id', 'ptnr1_auth_seq_id',
+                                                  'pdbx_ptnr1_PDB_ins_code', 'ptnr1_label_atom_id', 'ptnr1_symmetry', 'ptnr2_auth_asym_id',
+                                                  'ptnr2_auth_comp_id', 'ptnr2_auth_seq_id', 'pdbx_ptnr2_PDB_ins_code', 'ptnr2_label_atom_id',
+                                                  'ptnr2_symmetry'], rowList)